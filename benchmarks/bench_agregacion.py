@@ -0,0 +1,90 @@
+"""
+Paridad y benchmark del BLOQUE 3: groupby por nivel vs. cubo mensual de una pasada.
+
+Compara el df_niveles del cálculo original (tres groupby y un merge por nivel) con
+mapa_seguridad.agregacion.resumen_por_niveles sobre benchmarks/datos/robos_medellin_limpio_legado.csv,
+exigiendo igualdad exacta, y mide ambos con el archivo repetido varias veces
+(cada copia desplazada un año, para que también crezca el número de meses).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_agregacion.py --escalas 1 10 50
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.agregacion import resumen_por_niveles  # noqa: E402
+from mapa_seguridad.normalizacion import normalizar_columnas  # noqa: E402
+
+ROBOS_LIMPIO = RAIZ / "benchmarks" / "datos" / "robos_medellin_limpio_legado.csv"
+
+
+def niveles_por_groupby(robos, niveles):
+    # 🐢 Cálculo original del BLOQUE 3 de 05_unir_y_riesgo.py (referencia)
+    resultados_niveles = []
+    for nivel in niveles:
+        datos = robos.groupby([nivel, "mes"], observed=True).size().reset_index(name="robos_mes")
+        promedios = datos.groupby(nivel, observed=True)["robos_mes"].mean().reset_index(name="promedio_robos")
+        totales = robos.groupby(nivel, observed=True).size().reset_index(name="casos_totales")
+        resumen = pd.merge(promedios, totales, on=nivel, how="outer")
+        resumen["nivel_geo"] = nivel
+        resultados_niveles.append(resumen)
+    return pd.concat(resultados_niveles, ignore_index=True)
+
+
+def cargar_robos():
+    robos = pd.read_csv(ROBOS_LIMPIO, encoding="utf-8-sig")
+    robos.columns = robos.columns.str.lower().str.strip()
+    col_fecha = next(c for c in robos.columns if "fecha" in c)
+    robos[col_fecha] = pd.to_datetime(robos[col_fecha], errors="coerce")
+    niveles = [c for c in robos.columns if any(x in c for x in ["barrio", "comuna", "sector", "municipio"])]
+    normalizar_columnas(robos, niveles)
+    return robos[[col_fecha] + niveles], col_fecha, niveles
+
+
+def escalar(robos, col_fecha, escala):
+    copias = []
+    for k in range(escala):
+        copia = robos.copy()
+        copia[col_fecha] = copia[col_fecha] + pd.DateOffset(years=k)
+        copias.append(copia)
+    df = pd.concat(copias, ignore_index=True)
+    df["mes"] = df[col_fecha].dt.to_period("M")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    robos, col_fecha, niveles = cargar_robos()
+    print(f"📍 Niveles: {niveles}\n")
+    print(f"{'filas':>12}{'groupby (s)':>14}{'cubo (s)':>12}{'aceleración':>14}   paridad")
+    for escala in args.escalas:
+        df = escalar(robos, col_fecha, escala)
+
+        inicio = time.perf_counter()
+        esperado = niveles_por_groupby(df, niveles)
+        t_groupby = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            obtenido = resumen_por_niveles(df, niveles, col_mes="mes")
+        t_cubo = time.perf_counter() - inicio
+
+        # ✅ Igualdad exacta: mismas filas, mismo orden, mismos valores y tipos
+        pd.testing.assert_frame_equal(obtenido, esperado, check_exact=True)
+        print(f"{len(df):>12,}{t_groupby:>14.3f}{t_cubo:>12.3f}{t_groupby / t_cubo:>13.1f}×   ✅ idéntico")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Paridad y benchmark de la recuperación de coordenadas: fila por fila vs. columna completa.
+
+Toma las columnas de latitud y longitud del archivo de Kaggle ("627.623.616",
+"-7.555.353.312"...), las repite varias veces y compara:
+  - una función por fila (apply) con la misma regla de reescalado
+  - mapa_seguridad.coordenadas.reparar_coordenada, sobre toda la columna
+exigiendo los mismos valores y los mismos motivos de rechazo.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_coordenadas.py --escalas 1 10 50
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.coordenadas import (  # noqa: E402
+    CIFRAS_ENTERAS, FUERA_DE_RANGO, LAT_MAX, LAT_MIN, LON_MAX, LON_MIN, NO_NUMERICA, VACIA,
+    reparar_coordenada,
+)
+
+
+def reparar_fila(valor, minimo, maximo):
+    # 🐢 La misma regla, un valor a la vez (referencia)
+    if pd.isna(valor) or str(valor).strip() == "":
+        return np.nan, VACIA
+    texto = str(valor).strip()
+    digitos = re.sub(r"[\s.,+-]", "", texto)
+    if not digitos.isdigit():
+        return np.nan, NO_NUMERICA
+    signo = -1.0 if texto.startswith("-") else 1.0
+    for enteras in CIFRAS_ENTERAS:
+        candidato = signo * int(digitos) / 10.0 ** (len(digitos) - enteras)
+        if minimo <= candidato <= maximo:
+            return candidato, None
+    return np.nan, FUERA_DE_RANGO
+
+
+def cargar_coordenadas():
+    ruta = RAIZ / "data" / "robbery of people in Medellin.csv"
+    with open(ruta, encoding="utf-8", errors="ignore") as f:
+        primera = f.readline()
+    sep = ";" if ";" in primera else "\t" if "\t" in primera else ","
+    df = pd.read_csv(ruta, sep=sep, encoding="utf-8", on_bad_lines="skip", dtype=str)
+    col_lat = next(c for c in df.columns if "latitud" in c.lower())
+    col_lon = next(c for c in df.columns if "longitud" in c.lower())
+    return df[col_lat], df[col_lon]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    latitudes, longitudes = cargar_coordenadas()
+    print(f"{'filas':>12}{'por fila (s)':>15}{'columna (s)':>14}{'aceleración':>14}{'recuperadas':>14}   paridad")
+    for escala in args.escalas:
+        columnas = [(pd.concat([latitudes] * escala, ignore_index=True), LAT_MIN, LAT_MAX),
+                    (pd.concat([longitudes] * escala, ignore_index=True), LON_MIN, LON_MAX)]
+
+        inicio = time.perf_counter()
+        esperado = [serie.apply(lambda v: reparar_fila(v, mn, mx)) for serie, mn, mx in columnas]
+        t_filas = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtenido = [reparar_coordenada(serie, mn, mx) for serie, mn, mx in columnas]
+        t_columna = time.perf_counter() - inicio
+
+        # ✅ Mismos valores (a precisión float32) y mismos motivos
+        for filas, (valores, motivo) in zip(esperado, obtenido):
+            referencia = np.array([v for v, _ in filas], dtype=np.float32)
+            np.testing.assert_array_equal(valores.to_numpy(), referencia)
+            assert motivo.tolist() == [m for _, m in filas]
+
+        recuperadas = int(obtenido[0][0].notna().sum())
+        print(f"{len(columnas[0][0]):>12,}{t_filas:>15.3f}{t_columna:>14.3f}{t_filas / t_columna:>13.1f}×"
+              f"{recuperadas:>14,}   ✅ idéntico")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Paridad y benchmark del cubo de estadísticas del panel lateral (mapa_seguridad.cubo).
+
+Para cada selección posible de los cuatro filtros (cada uno con "todos") se
+compara la celda del cubo con el cálculo directo sobre las filas filtradas:
+zonas, promedio de casos, arriendo promedio y municipio con más casos. Después se
+mide, con data_final ampliada a N filas (municipios y delitos repartidos al azar):
+  - recorrido: filtrar las N filas con máscaras y calcular el panel
+  - cubo: una búsqueda por llave (lo que hace app.js con cada cambio de filtro)
+y el tamaño del cubo en JSON y gzip.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_cubo.py --filas 10000 100000 1000000
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.almacen import cargar_intermedio  # noqa: E402
+from mapa_seguridad.consultas import DIMENSIONES, coalescer  # noqa: E402
+from mapa_seguridad.cubo import (  # noqa: E402
+    DIMENSIONES_CUBO, codificar_cubo, construir_cubo, llave_celda, medidas_por_fila,
+)
+
+
+def panel_directo(df, columnas, medidas, seleccion):
+    # 🐢 Referencia: máscara sobre todas las filas y cálculo del panel
+    mascara = np.ones(len(df), dtype=bool)
+    for nombre, valor in seleccion.items():
+        mascara &= columnas[nombre] == valor
+    casos = pd.Series(np.nan_to_num(medidas["casos"][mascara])).groupby(
+        columnas["municipio"][mascara], sort=True).sum()
+    return {
+        "zonas": int(mascara.sum()),
+        "promedio": np.nanmean(medidas["promedio"][mascara]) if np.isfinite(medidas["promedio"][mascara]).any() else None,
+        "arriendo": np.nanmean(medidas["arriendo"][mascara]) if np.isfinite(medidas["arriendo"][mascara]).any() else None,
+        "municipio_top": casos.idxmax() if len(casos) else None,
+    }
+
+
+def panel_cubo(valores, celdas, posicion, seleccion):
+    llave = llave_celda(valores, seleccion)
+    if llave not in posicion:
+        return {"zonas": 0, "promedio": None, "arriendo": None, "municipio_top": None}
+    celda = celdas[posicion[llave]]
+    return {
+        "zonas": int(celda["zonas"]),
+        "promedio": celda["suma_promedio"] / celda["n_promedio"] if celda["n_promedio"] else None,
+        "arriendo": celda["suma_arriendo"] / celda["n_arriendo"] if celda["n_arriendo"] else None,
+        "municipio_top": valores["municipio"][celda["municipio_top"]] if celda["municipio_top"] >= 0 else None,
+    }
+
+
+def selecciones(valores):
+    opciones = [[None] + valores[n] for n in DIMENSIONES_CUBO]
+    for combinacion in product(*opciones):
+        yield {n: v for n, v in zip(DIMENSIONES_CUBO, combinacion) if v is not None}
+
+
+def ampliar(df, filas, semilla=0):
+    """data_final con `filas` filas; municipio y tipo de delito se reparten al azar para llenar el cubo."""
+    rng = np.random.default_rng(semilla)
+    grande = df.iloc[rng.integers(0, len(df), filas)].reset_index(drop=True)
+    municipios = coalescer(df, DIMENSIONES["municipio"]).dropna().unique()
+    grande["municipio"] = rng.choice(municipios, filas) if len(municipios) else None
+    grande["tipo_delito"] = rng.choice(["Atraco", "Cosquilleo", "Descuido", "Raponazo", "Escopolamina"], filas)
+    return grande
+
+
+def preparar(df):
+    valores, celdas = construir_cubo(df)
+    registros = celdas.to_dict(orient="records")
+    posicion = {int(c["celda"]): i for i, c in enumerate(registros)}
+    columnas = {}
+    for nombre in DIMENSIONES_CUBO:
+        serie = coalescer(df, DIMENSIONES[nombre])
+        columnas[nombre] = np.full(len(df), None, dtype=object) if serie is None else serie.astype(object).to_numpy()
+    return valores, celdas, registros, posicion, columnas, medidas_por_fila(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--consultas", type=int, default=200, help="selecciones al azar por tamaño")
+    args = parser.parse_args()
+
+    # ✅ Paridad en todas las selecciones posibles de data_final
+    df = cargar_intermedio("data_final")
+    valores, _, registros, posicion, columnas, medidas = preparar(df)
+    revisadas = 0
+    for seleccion in selecciones(valores):
+        esperado = panel_directo(df, columnas, medidas, seleccion)
+        obtenido = panel_cubo(valores, registros, posicion, seleccion)
+        for clave in ("promedio", "arriendo"):
+            if esperado[clave] is not None:
+                assert np.isclose(obtenido[clave], esperado[clave]), (seleccion, clave)
+            else:
+                assert obtenido[clave] is None, (seleccion, clave)
+        assert obtenido["zonas"] == esperado["zonas"], seleccion
+        assert obtenido["municipio_top"] == esperado["municipio_top"], seleccion
+        revisadas += 1
+    print(f"✅ {revisadas:,} selecciones idénticas al cálculo directo ({len(df)} filas de data_final)\n")
+
+    print(f"{'filas':>10}{'construir (s)':>15}{'celdas':>9}{'JSON (KB)':>11}{'gzip (KB)':>11}"
+          f"{'recorrido (ms)':>16}{'cubo (µs)':>11}")
+    rng = np.random.default_rng(1)
+    for n in args.filas:
+        grande = ampliar(df, n)
+        inicio = time.perf_counter()
+        construir_cubo(grande)
+        t_construir = time.perf_counter() - inicio
+        valores, celdas, registros, posicion, columnas, medidas = preparar(grande)
+        contenido = json.dumps(codificar_cubo(valores, celdas), ensure_ascii=False, separators=(",", ":")).encode()
+
+        todas = list(selecciones(valores))
+        elegidas = [todas[i] for i in rng.integers(0, len(todas), args.consultas)]
+        inicio = time.perf_counter()
+        for seleccion in elegidas:
+            panel_directo(grande, columnas, medidas, seleccion)
+        t_recorrido = (time.perf_counter() - inicio) / len(elegidas)
+        inicio = time.perf_counter()
+        for seleccion in elegidas:
+            panel_cubo(valores, registros, posicion, seleccion)
+        t_cubo = (time.perf_counter() - inicio) / len(elegidas)
+
+        print(f"{n:>10,}{t_construir:>15.3f}{len(celdas):>9,}{len(contenido) / 1024:>11.1f}"
+              f"{len(gzip.compress(contenido)) / 1024:>11.1f}{t_recorrido * 1000:>16.2f}{t_cubo * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Paridad y escalamiento del cálculo de zonas calientes (mapa_seguridad.densidad).
+
+1. Paridad: el filtro de caja con sumas acumuladas se compara con la suma directa
+   de cada ventana (desplazando la matriz celda por celda) en la malla real.
+2. Escalamiento: se generan N robos sintéticos alrededor de los reales (cada uno
+   con un pequeño desplazamiento aleatorio) y se mide conteo + suavizado. Con la
+   malla fija, el tiempo debe crecer en línea recta con N.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_densidad.py --puntos 100000 1000000 3000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.coordenadas import reparar_coordenadas  # noqa: E402
+from mapa_seguridad.densidad import (  # noqa: E402
+    ANCHO_BANDA_M, PASADAS, TAM_CELDA_M, contar_en_malla, densidad, filtro_caja, malla_valle, radio_por_pasada,
+)
+
+
+def filtro_caja_directo(matriz, radio):
+    # 🐢 Referencia: sumar la matriz desplazada para cada posición de la ventana
+    filas, columnas = matriz.shape
+    relleno = np.pad(matriz.astype("float64"), radio)
+    suma = np.zeros((filas, columnas))
+    for df in range(2 * radio + 1):
+        for dc in range(2 * radio + 1):
+            suma += relleno[df:df + filas, dc:dc + columnas]
+    return suma
+
+
+def puntos_reales():
+    ruta = RAIZ / "data" / "robbery of people in Medellin.csv"
+    df = pd.read_csv(ruta, sep=";", encoding="utf-8", on_bad_lines="skip", dtype=str)
+    col_lat = next(c for c in df.columns if "latitud" in c)
+    col_lon = next(c for c in df.columns if "longitud" in c)
+    reparar_coordenadas(df, col_lat, col_lon)
+    df = df.dropna(subset=["latitud", "longitud"])
+    return df["latitud"].to_numpy("float64"), df["longitud"].to_numpy("float64")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--puntos", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    args = parser.parse_args()
+
+    lat, lon = puntos_reales()
+    malla = malla_valle(TAM_CELDA_M)
+    radio = radio_por_pasada(ANCHO_BANDA_M, TAM_CELDA_M, PASADAS)
+    conteos = contar_en_malla(lat, lon, malla)
+
+    # ✅ 1. Paridad del filtro de caja en la malla real
+    for r in sorted({1, radio, 5}):
+        inicio = time.perf_counter()
+        esperado = filtro_caja_directo(conteos, r)
+        t_directo = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        obtenido = filtro_caja(conteos, r)
+        t_acumulado = time.perf_counter() - inicio
+        np.testing.assert_allclose(obtenido, esperado, atol=1e-6)
+        print(f"🧮 Radio {r}: suma directa {t_directo:.3f} s, sumas acumuladas {t_acumulado:.3f} s   ✅ idéntico")
+
+    # ⏱️ 2. Escalamiento con el número de robos
+    print(f"\n🗺️ Malla de {malla.filas} × {malla.columnas} celdas, {len(lat):,} robos reales como semilla\n")
+    print(f"{'robos':>12}{'conteo (s)':>12}{'suavizado (s)':>15}{'total (s)':>11}{'s por millón':>14}")
+    rng = np.random.default_rng(0)
+    for n in args.puntos:
+        elegidos = rng.integers(0, len(lat), n)
+        desplazamiento = rng.normal(0, 0.002, (2, n))
+        lat_n, lon_n = lat[elegidos] + desplazamiento[0], lon[elegidos] + desplazamiento[1]
+
+        inicio = time.perf_counter()
+        conteos_n = contar_en_malla(lat_n, lon_n, malla)
+        t_conteo = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        densidad(conteos_n, radio, PASADAS)
+        t_suave = time.perf_counter() - inicio
+
+        total = t_conteo + t_suave
+        print(f"{n:>12,}{t_conteo:>12.3f}{t_suave:>15.3f}{total:>11.3f}{total / n * 1e6:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
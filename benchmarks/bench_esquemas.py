@@ -0,0 +1,122 @@
+"""
+Benchmark del registro de esquemas (mapa_seguridad.esquemas): tipos inferidos vs. declarados.
+
+Para cada archivo se compara la lectura de siempre (pd.read_csv con
+low_memory=False, pandas adivina los tipos y deja el texto como objetos de
+Python; las fechas se interpretan después con parsear_fechas, como hacían las
+etapas) con la lectura por esquema (usecols + categorías, enteros pequeños y
+fechas ya interpretadas):
+  - policía: reporte nacional sintético de N filas (mismas columnas que el original)
+  - benchmarks/datos/robos_medellin_limpio_legado.csv ampliado a N filas (filas tomadas al azar)
+  - el archivo de Kaggle tal cual
+Se mide tiempo de carga, memoria del DataFrame (memory_usage(deep=True)) y el
+pico de memoria durante la lectura (tracemalloc). Antes se verifica que ambas
+lecturas traen los mismos valores.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_esquemas.py --filas 1000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from bench_policia_streaming import generar_reporte  # noqa: E402
+from mapa_seguridad.esquemas import FUENTES, INTERMEDIOS, Lector, detectar_separador  # noqa: E402
+from mapa_seguridad.fechas import parsear_fechas  # noqa: E402
+
+ROBOS_LIMPIO = RAIZ / "benchmarks" / "datos" / "robos_medellin_limpio_legado.csv"
+KAGGLE = RAIZ / FUENTES["kaggle"].archivo
+
+
+def leer_inferido(ruta, tipos):
+    df = pd.read_csv(ruta, sep=detectar_separador(ruta), encoding="utf-8-sig", low_memory=False)
+    for columna in df.columns:
+        if tipos.get(columna.lower().strip()) == "fecha":
+            df[columna] = parsear_fechas(df[columna])
+    return df
+
+
+def leer_esquema(ruta, tipos):
+    return Lector(ruta, tipos, solo_declaradas=True).leer()
+
+
+def medir(funcion, repeticiones):
+    # ⏱️ Mejor tiempo de varias lecturas; la memoria y el pico, con una lectura aparte
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        df = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+        del df
+    tracemalloc.start()
+    df = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, min(tiempos), df.memory_usage(deep=True).sum() / 2**20, pico / 2**20
+
+
+def mismos_valores(inferido, tipado):
+    """True si cada columna declarada trae los mismos valores con ambas lecturas."""
+    inferido = inferido.rename(columns=lambda c: c.lower().strip())
+    for columna in tipado.columns:
+        a, b = inferido[columna], tipado[columna]
+        if pd.api.types.is_datetime64_any_dtype(b):
+            iguales = a.equals(b)
+        elif pd.api.types.is_numeric_dtype(b):
+            iguales = np.allclose(pd.to_numeric(a, errors="coerce").to_numpy("float64"),
+                                  b.to_numpy("float64", na_value=np.nan), rtol=1e-6, equal_nan=True)
+        else:
+            # Los enteros inferidos (CODIGO DANE) se comparan como texto
+            iguales = a.astype("string").equals(b.astype("string"))
+        if not iguales:
+            print(f"❌ {columna}: {a.dtype} vs {b.dtype}")
+            return False
+    return True
+
+
+def ampliar_csv(origen, destino, filas, semilla=0):
+    rng = np.random.default_rng(semilla)
+    df = pd.read_csv(origen, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    df.iloc[rng.integers(0, len(df), filas)].to_csv(destino, index=False, encoding="utf-8-sig")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        casos = []
+        policia = Path(tmp) / "policia.csv"
+        generar_reporte(policia, args.filas)
+        casos.append(("policía", policia, FUENTES["policia"].columnas))
+        if ROBOS_LIMPIO.exists():
+            robos = Path(tmp) / "robos_medellin_limpio.csv"
+            ampliar_csv(ROBOS_LIMPIO, robos, args.filas)
+            casos.append(("robos_medellin_limpio", robos, INTERMEDIOS["robos_medellin_limpio"]))
+        if KAGGLE.exists():
+            casos.append(("kaggle", KAGGLE, FUENTES["kaggle"].columnas))
+
+        print(f"{'archivo':>22}{'filas':>11}{'lectura':>10}{'tiempo (s)':>12}{'memoria (MB)':>14}{'pico (MB)':>11}")
+        for nombre, ruta, tipos in casos:
+            inferido, t_inf, m_inf, p_inf = medir(lambda: leer_inferido(ruta, tipos), args.repeticiones)
+            tipado, t_esq, m_esq, p_esq = medir(lambda: leer_esquema(ruta, tipos), args.repeticiones)
+            assert mismos_valores(inferido, tipado), nombre
+            for lectura, t, m, p in (("inferida", t_inf, m_inf, p_inf), ("esquema", t_esq, m_esq, p_esq)):
+                print(f"{nombre:>22}{len(tipado):>11,}{lectura:>10}{t:>12.2f}{m:>14.1f}{p:>11.1f}")
+            print(f"{'':>22}{'':>11}{'mejora':>10}{t_inf / t_esq:>11.1f}×{m_inf / m_esq:>13.1f}×{p_inf / p_esq:>10.1f}×")
+        print("\n✅ Mismos valores con tipos inferidos y con el esquema")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Paridad y benchmark de la lectura de fechas: inferencia de pandas vs. mapa_seguridad.fechas.
+
+Toma la columna de fecha del archivo de Kaggle ("01/01/2017 16:00", unas 17 mil
+filas), la repite varias veces (hasta 50× por defecto) y compara:
+  - pd.to_datetime(..., dayfirst=True), como lo hacía 03_cargar_kaggle.py
+  - parsear_fechas(): formato detectado una vez y solo los textos distintos interpretados
+exigiendo que ambos den exactamente las mismas fechas.
+
+Con --desplazar cada copia se corre un año, así que los textos distintos crecen con
+la escala (el peor caso para parsear_fechas, que interpreta cada texto distinto).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_fechas.py --escalas 1 10 50
+    python benchmarks/bench_fechas.py --escalas 1 10 50 --desplazar
+"""
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.fechas import detectar_formato, parsear_fechas  # noqa: E402
+
+
+def cargar_fechas():
+    ruta = RAIZ / "data" / "robbery of people in Medellin.csv"
+    with open(ruta, encoding="utf-8", errors="ignore") as f:
+        primera = f.readline()
+    sep = ";" if ";" in primera else "\t" if "\t" in primera else ","
+    df = pd.read_csv(ruta, sep=sep, encoding="utf-8", on_bad_lines="skip", dtype=str)
+    col_fecha = next(c for c in df.columns if "fecha" in c.lower())
+    return df[col_fecha]
+
+
+def escalar(fechas, escala, desplazar=False):
+    if not desplazar:
+        return pd.concat([fechas] * escala, ignore_index=True)
+    # Cada copia cambia el año del texto ("01/01/2017 16:00" → "01/01/2018 16:00"...)
+    partes = fechas.str.extract(r"^(\d{2}/\d{2}/)(\d{4})(.*)$")
+    anio = pd.to_numeric(partes[1], errors="coerce")
+    copias = []
+    for k in range(escala):
+        copia = partes[0] + (anio + k).astype("Int64").astype(str) + partes[2]
+        copias.append(copia.where(anio.notna(), fechas))
+    return pd.concat(copias, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--desplazar", action="store_true", help="correr un año cada copia")
+    args = parser.parse_args()
+
+    fechas = cargar_fechas()
+    print(f"📅 Formato detectado: {detectar_formato(fechas)}\n")
+    print(f"{'filas':>12}{'distintas':>12}{'pandas (s)':>13}{'fechas (s)':>13}{'aceleración':>14}   paridad")
+    for escala in args.escalas:
+        serie = escalar(fechas, escala, args.desplazar)
+
+        inicio = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            esperado = pd.to_datetime(serie, errors="coerce", dayfirst=True)
+        t_pandas = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtenido = parsear_fechas(serie, dayfirst=True)
+        t_fechas = time.perf_counter() - inicio
+
+        # ✅ Mismas fechas (y mismos vacíos) fila por fila
+        pd.testing.assert_series_equal(obtenido, esperado, check_exact=True)
+        print(f"{len(serie):>12,}{serie.nunique():>12,}{t_pandas:>13.3f}{t_fechas:>13.3f}"
+              f"{t_pandas / t_fechas:>13.1f}×   ✅ idéntico")
+
+
+if __name__ == "__main__":
+    main()
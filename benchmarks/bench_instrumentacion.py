@@ -0,0 +1,117 @@
+"""
+Benchmark del costo de la instrumentación (mapa_seguridad.instrumentacion).
+
+Se mide el costo por llamada de:
+  - una función pequeña sin decorar y decorada con @medir() (apagada, 1 y profundo)
+  - bloque() y filas() (lo que se agrega a cada BLOQUE de los scripts)
+  - Geografia.resolver_fuente (BLOQUE 2 de 05) sobre N filas, sin y con instrumentación
+Con MAPA_TRAZA apagada, @medir() devuelve la misma función (se verifica que es el
+mismo objeto) y bloque()/filas() solo revisan una variable.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_instrumentacion.py --llamadas 200000 --filas 200000
+"""
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad import instrumentacion  # noqa: E402
+from mapa_seguridad.geografia import Geografia  # noqa: E402
+
+
+# Columnas (código, nombre) por nivel, como UBICACION en mapa_seguridad.etapas.union
+COLUMNAS_GEO = {"departamento": (None, "departamento"), "municipio": (None, "municipio"),
+                "barrio": (None, "barrio")}
+
+
+def suma(a, b):
+    return a + b
+
+
+def ubicar(df):
+    # Dimensión nueva en cada corrida, como en una ejecución de 05
+    return Geografia().resolver_fuente(df, COLUMNAS_GEO)
+
+
+def configurar(modo):
+    # Simula MAPA_TRAZA=<modo> en el proceso actual (los decoradores se aplican después)
+    instrumentacion.MODO = modo
+    instrumentacion.ACTIVA = modo not in instrumentacion.APAGADA
+    instrumentacion.PROFUNDO = modo == "profundo"
+    if instrumentacion.PROFUNDO and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not instrumentacion.PROFUNDO and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    instrumentacion._registro.pila.clear()
+    instrumentacion._registro.eventos.clear()
+
+
+def medir_zonas(funcion, df, repeticiones=3):
+    # Mejor de varias corridas (la salida de consola se descarta)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            funcion(df)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def por_llamada(funcion, llamadas):
+    inicio = time.perf_counter()
+    for _ in range(llamadas):
+        funcion()
+    return (time.perf_counter() - inicio) / llamadas * 1e9
+
+
+def tabla_zonas(filas, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        "departamento": pd.Categorical(np.full(filas, "ANTIOQUIA")),
+        "municipio": pd.Categorical(rng.choice([f"MUNICIPIO {i}" for i in range(125)], filas)),
+        "barrio": pd.Categorical(rng.choice([f"BARRIO {i}" for i in range(2_000)], filas)),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llamadas", type=int, default=200_000)
+    parser.add_argument("--filas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = tabla_zonas(args.filas)
+    base_suma = por_llamada(lambda: suma(1, 2), args.llamadas)
+    base_zonas = medir_zonas(ubicar, df)
+
+    print(f"\n{'modo':>10}{'@medir (ns)':>13}{'bloque+filas (ns)':>19}{'ubicar (s)':>16}{'sobrecosto':>12}")
+    print(f"{'sin':>10}{base_suma:>13.0f}{'':>19}{base_zonas:>16.3f}{'':>12}")
+    for modo in ["", "1", "profundo"]:
+        configurar(modo)
+        medida = instrumentacion.medir()(suma)
+        if not instrumentacion.ACTIVA:
+            assert medida is suma, "con la instrumentación apagada @medir() debe devolver la misma función"
+        t_medir = por_llamada(lambda: medida(1, 2), args.llamadas)
+
+        def marcar():
+            instrumentacion.bloque("BLOQUE")
+            instrumentacion.filas(entrada=1, salida=1)
+        t_bloque = por_llamada(marcar, args.llamadas)
+
+        t_zonas = medir_zonas(instrumentacion.medir()(ubicar), df)
+        print(f"{modo or 'apagada':>10}{t_medir:>13.0f}{t_bloque:>19.0f}{t_zonas:>16.3f}"
+              f"{(t_zonas / base_zonas - 1) * 100:>11.1f}%")
+    configurar("")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Tamaño y tiempo de lectura del JSON del mapa: registros con indent=2 vs. formato columnar.
+
+Parte de benchmarks/datos/data_final_legado.csv, lo repite varias veces (para simular las filas por
+barrio y por mes que vendrán) y compara, para cada escala:
+  - registros: to_json(orient="records", indent=2), como lo escribía el BLOQUE 8
+  - columnar: mapa_seguridad.paquete_web (y su variante .gz)
+El tiempo de lectura es json.loads + decodificar() (lo que haría el navegador) y se
+verifica que el formato columnar devuelva exactamente los mismos valores.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_paquete_web.py --escalas 1 10 100
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.paquete_web import codificar, decodificar  # noqa: E402
+
+DATA_FINAL = RAIZ / "benchmarks" / "datos" / "data_final_legado.csv"
+
+
+def medir_lectura(texto, decodificador=None, repeticiones=5):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        datos = json.loads(texto)
+        if decodificador:
+            datos = decodificador(datos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, datos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    base = pd.read_csv(DATA_FINAL, encoding="utf-8-sig", low_memory=False)
+    print(f"{'filas':>9}{'registros KB':>14}{'.gz KB':>9}{'columnar KB':>13}{'.gz KB':>9}"
+          f"{'reducción':>11}{'lectura reg. (ms)':>19}{'lectura col. (ms)':>19}   paridad")
+    for escala in args.escalas:
+        df = pd.concat([base] * escala, ignore_index=True)
+        registros = df.to_json(orient="records", force_ascii=False, indent=2)
+        columnar = json.dumps(codificar(df), ensure_ascii=False, separators=(",", ":"))
+        tam = [len(texto.encode("utf-8")) for texto in (registros, columnar)]
+        tam_gz = [len(gzip.compress(texto.encode("utf-8"), compresslevel=9)) for texto in (registros, columnar)]
+
+        t_registros, _ = medir_lectura(registros)
+        t_columnar, obtenido = medir_lectura(columnar, decodificar)
+
+        # ✅ Mismos valores: se comparan ambas tablas pasadas por el mismo JSON de registros
+        esperado = json.loads(df.to_json(orient="records", force_ascii=False))
+        assert json.loads(obtenido.to_json(orient="records", force_ascii=False)) == esperado
+
+        print(f"{len(df):>9,}{tam[0] / 1024:>14,.1f}{tam_gz[0] / 1024:>9,.1f}{tam[1] / 1024:>13,.1f}"
+              f"{tam_gz[1] / 1024:>9,.1f}{tam[0] / tam_gz[1]:>10.0f}×"
+              f"{t_registros * 1000:>19.1f}{t_columnar * 1000:>19.1f}   ✅ idéntico")
+
+
+if __name__ == "__main__":
+    main()
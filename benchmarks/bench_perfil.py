@@ -0,0 +1,87 @@
+"""
+Benchmark del perfil de columnas de 03_cargar_kaggle.py (mapa_seguridad.perfil).
+
+Con robos_medellin_limpio ampliado a N filas (filas tomadas al azar, columnas de
+texto como categorías, igual que las lee el esquema) se compara:
+  - antes: un value_counts() por columna de los BLOQUES 5 y 7 (y otro por cada
+    tendencia) más los conteos por año y mes, como hacía 03
+  - perfil: perfilar() con las mismas columnas, una pasada por columna sobre los códigos
+Antes de medir se verifica que los top-k, los vacíos y los histogramas coinciden.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_perfil.py --filas 100000 1000000 5000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.esquemas import INTERMEDIOS, Lector  # noqa: E402
+from mapa_seguridad.perfil import perfilar  # noqa: E402
+
+ROBOS_LIMPIO = RAIZ / "benchmarks" / "datos" / "robos_medellin_limpio_legado.csv"
+COLUMNAS = [f"seguridad.{c}" for c in [
+    "nombre_barrio", "sede_receptora", "medio_transporte", "sexo", "conducta", "modalidad", "bien", "arma_medio",
+]]
+TENDENCIAS = [f"seguridad.{c}" for c in ["sexo", "conducta", "modalidad", "arma_medio", "medio_transporte", "bien"]]
+COL_FECHA = "seguridad.fecha_hecho"
+
+
+def perfil_antes(df, top=10):
+    # 🐢 Como 03 antes: un value_counts por columna, otro por tendencia y los de año y mes
+    conteos = {c: df[c].value_counts().head(top) for c in COLUMNAS}
+    for c in TENDENCIAS:
+        df[c].value_counts()
+    fechas = df[COL_FECHA]
+    return conteos, fechas.dt.year.value_counts().sort_index(), fechas.dt.month.value_counts().sort_index()
+
+
+def iguales(df, perfil, antes, top=10):
+    conteos, por_anio, por_mes = antes
+    for c in COLUMNAS:
+        datos = perfil["columnas"][c]
+        # En empates el orden puede variar: se comparan los conteos y el conteo de cada valor
+        casos = [n for _, n in datos["top"]]
+        esperado = conteos[c][conteos[c] > 0]
+        if casos != esperado.tolist()[:top] or any(esperado.get(v, -1) != n for v, n in datos["top"] if n > esperado.min()):
+            return False
+        if datos["nulos"] != int(df[c].isna().sum()):
+            return False
+    hist = perfil["histogramas"]
+    return (hist["anio"]["valores"] == por_anio.index.tolist() and hist["anio"]["casos"] == por_anio.tolist()
+            and hist["mes"]["valores"] == por_mes.index.tolist() and hist["mes"]["casos"] == por_mes.tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    base = Lector(ROBOS_LIMPIO, INTERMEDIOS["robos_medellin_limpio"], usecols=COLUMNAS + [COL_FECHA]).leer()
+    rng = np.random.default_rng(0)
+
+    print(f"{'filas':>12}{'value_counts (s)':>18}{'perfil (s)':>12}{'aceleración':>13}   paridad")
+    for n in args.filas:
+        df = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+        tiempos = {"antes": [], "perfil": []}
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            antes = perfil_antes(df)
+            tiempos["antes"].append(time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            perfil = perfilar(df, COLUMNAS + TENDENCIAS, col_fecha=COL_FECHA)
+            tiempos["perfil"].append(time.perf_counter() - inicio)
+        t_antes, t_perfil = min(tiempos["antes"]), min(tiempos["perfil"])
+        paridad = "✅ idéntico" if iguales(df, perfil, antes) else "❌ distinto"
+        print(f"{n:>12,}{t_antes:>18.3f}{t_perfil:>12.3f}{t_antes / t_perfil:>12.1f}×   {paridad}")
+
+
+if __name__ == "__main__":
+    main()
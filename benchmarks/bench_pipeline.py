@@ -0,0 +1,165 @@
+"""
+Benchmark del pipeline completo (01 → 08) sobre datos sintéticos a varias escalas.
+
+Para cada escala genera las cuatro fuentes con benchmarks/datos_sinteticos.py en
+una carpeta temporal, ejecuta cada etapa en un proceso aparte (como lo hace
+ejecutar_pipeline.py) y mide su tiempo y su memoria máxima (RSS). Al final ejecuta
+todo otra vez con --en-memoria para medir el pipeline en un solo proceso.
+
+Los resultados se comparan con la línea base guardada en
+benchmarks/linea_base_pipeline.json: cada fila muestra la diferencia (Δ%) y se
+marca ⚠️ si el tiempo o la memoria crecen más que la tolerancia. Con --guardar
+los resultados medidos reemplazan la línea base de esas escalas (las demás se
+conservan), así que una regresión queda como un cambio en ese archivo.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_pipeline.py                          → 1× y 10×, comparado con la línea base
+    python benchmarks/bench_pipeline.py --escalas 100 1000       → volumen de producción (tarda)
+    python benchmarks/bench_pipeline.py --escalas 1 10 --guardar → actualizar la línea base
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+SCRIPTS = RAIZ / "scripts"
+LINEA_BASE = RAIZ / "benchmarks" / "linea_base_pipeline.json"
+EN_MEMORIA = "pipeline --en-memoria"
+
+# 🚦 Por debajo de estos valores una diferencia se considera ruido de la máquina
+RUIDO_SEGUNDOS = 0.5
+RUIDO_MB = 25.0
+
+
+def generar_datos(destino, escala, semilla):
+    # 🧪 El generador importa pandas: corre en un proceso aparte para que este quede
+    # liviano y no infle el RSS máximo que heredan los procesos medidos
+    sys.path.insert(0, str(RAIZ / "benchmarks"))
+    from datos_sinteticos import generar
+
+    generar(destino, escala, semilla)
+
+
+def ejecutar(comando, directorio, entorno):
+    # ⏱️ Un proceso hijo con su RSS máximo leído con wait4 (en Linux ru_maxrss viene en KB)
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([sys.executable, *comando], cwd=directorio, env=entorno,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, estado, uso = os.wait4(proceso.pid, 0)
+    segundos = time.perf_counter() - inicio
+    if estado != 0:
+        raise RuntimeError(f"❌ {' '.join(comando)} falló:\n{proceso.stderr.read().decode()}")
+    return segundos, uso.ru_maxrss / 1024
+
+
+def medir_escala(escala, semilla, repeticiones):
+    """Devuelve {etapa: {"segundos", "rss_mb"}} con el mejor tiempo y la mayor memoria de las repeticiones."""
+    # La validación solo avisa: un dato sintético fuera de regla no debe cortar la medición
+    entorno = dict(os.environ, MAPA_VALIDACION="aviso", MAPA_VERBOSIDAD="0")
+    entorno.pop("MAPA_TRAZA", None)
+    etapas = sorted(SCRIPTS.glob("0[0-9]_*.py"))
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inicio = time.perf_counter()
+        generador = multiprocessing.Process(target=generar_datos, args=(tmp, escala, semilla))
+        generador.start()
+        generador.join()
+        if generador.exitcode != 0:
+            raise RuntimeError(f"❌ No se pudieron generar los datos a {escala}×")
+        # Las etapas escriben también en web/, como en el proyecto
+        (Path(tmp) / "web").mkdir()
+        tamano = sum(f.stat().st_size for f in (Path(tmp) / "data").iterdir()) / 1e6
+        print(f"\n🧪 Escala {escala}×: {tamano:,.1f} MB de fuentes generados en {time.perf_counter() - inicio:.1f} s")
+
+        comandos = [(script.stem, [str(script)]) for script in etapas]
+        comandos.append((EN_MEMORIA, [str(SCRIPTS / "ejecutar_pipeline.py"), "--en-memoria", "--forzar", "-q"]))
+        for nombre, comando in comandos:
+            medidas = [ejecutar(comando, tmp, entorno) for _ in range(repeticiones)]
+            resultados[nombre] = {
+                "segundos": round(min(s for s, _ in medidas), 3),
+                "rss_mb": round(max(r for _, r in medidas), 1),
+            }
+    return resultados
+
+
+def cargar_linea_base():
+    if LINEA_BASE.exists():
+        return json.loads(LINEA_BASE.read_text(encoding="utf-8"))
+    return {"escalas": {}}
+
+
+def diferencia(actual, base, ruido, tolerancia):
+    # (texto Δ%, es regresión): solo cuenta si supera la tolerancia y el umbral de ruido
+    if base is None:
+        return "nuevo", False
+    cambio = (actual - base) / base if base else 0.0
+    return f"{cambio:+.0%}", cambio > tolerancia and actual - base > ruido
+
+
+def mostrar(escala, resultados, base, tolerancia):
+    print(f"{'etapa':<26}{'segundos':>10}{'Δ':>8}{'RSS máx (MB)':>15}{'Δ':>8}  estado")
+    regresiones = []
+    for nombre, medida in resultados.items():
+        anterior = base.get(nombre, {})
+        texto_t, lento = diferencia(medida["segundos"], anterior.get("segundos"), RUIDO_SEGUNDOS, tolerancia)
+        texto_m, pesado = diferencia(medida["rss_mb"], anterior.get("rss_mb"), RUIDO_MB, tolerancia)
+        estado = "⚠️ " + " y ".join(m for m, si in [("más lenta", lento), ("más memoria", pesado)] if si) \
+            if lento or pesado else "✅"
+        if lento or pesado:
+            regresiones.append(f"{escala}× {nombre}")
+        print(f"{nombre:<26}{medida['segundos']:>10.2f}{texto_t:>8}{medida['rss_mb']:>15,.1f}{texto_m:>8}  {estado}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10],
+                        help="múltiplos del tamaño de las muestras (1, 10, 100, 1000)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=1, help="se guarda el mejor tiempo de las repeticiones")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="crecimiento permitido frente a la línea base (0.25 = 25%%)")
+    parser.add_argument("--guardar", action="store_true", help="guardar los resultados como nueva línea base")
+    args = parser.parse_args()
+
+    linea_base = cargar_linea_base()
+    if linea_base.get("maquina") and linea_base["maquina"]["plataforma"] != platform.platform():
+        print(f"⚠️ La línea base se midió en otra máquina ({linea_base['maquina']['plataforma']}): "
+              "compara las diferencias con cuidado")
+
+    regresiones = []
+    for escala in args.escalas:
+        resultados = medir_escala(escala, args.semilla, args.repeticiones)
+        base = linea_base["escalas"].get(str(escala), {})
+        regresiones += mostrar(escala, resultados, base, args.tolerancia)
+        linea_base["escalas"][str(escala)] = resultados
+
+    if args.guardar:
+        linea_base["maquina"] = {
+            "plataforma": platform.platform(),
+            "python": platform.python_version(),
+            "procesadores": os.cpu_count(),
+        }
+        linea_base["semilla"] = args.semilla
+        linea_base["fecha"] = date.today().isoformat()
+        linea_base["escalas"] = dict(sorted(linea_base["escalas"].items(), key=lambda e: int(e[0])))
+        LINEA_BASE.write_text(json.dumps(linea_base, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Línea base guardada en {LINEA_BASE.relative_to(RAIZ)}")
+    elif regresiones:
+        print(f"\n❌ {len(regresiones)} regresiones frente a la línea base: {', '.join(regresiones)}")
+        raise SystemExit(1)
+    else:
+        print("\n✅ Sin regresiones frente a la línea base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark del BLOQUE 4 de 05 con el reporte nacional: un proceso vs. particiones por departamento.
+
+Genera un reporte de la Policía de todo el país (benchmarks/datos_sinteticos.py), lo
+lee y lo ubica en la dimensión geográfica como lo hacen 01 y 05 (sin el filtro de
+ANTIOQUIA) y ejecuta resumir_policia con 1, 2, 4… procesos (MAPA_PROCESOS_POLICIA,
+ver mapa_seguridad.particiones). Verifica que policia_final y riesgo_ventanas son
+idénticos al cálculo de siempre en un solo proceso y muestra el tiempo y la
+aceleración frente a ese cálculo.
+
+La aceleración depende de los núcleos libres: con más procesos que núcleos
+(os.cpu_count()) solo se mide el costo de repartir.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_policia_particiones.py --filas 5000000 --procesos 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+from datos_sinteticos import generar_policia  # noqa: E402
+from mapa_seguridad.consola import fijar_verbosidad  # noqa: E402
+from mapa_seguridad.esquemas import FUENTES, Lector  # noqa: E402
+from mapa_seguridad.etapas.carga import normalizar_municipio  # noqa: E402
+from mapa_seguridad.etapas.union import UBICACION, resumir_policia  # noqa: E402
+from mapa_seguridad.geografia import Geografia  # noqa: E402
+
+
+def reporte_nacional(carpeta, filas, semilla):
+    # 🧪 Reporte de todos los departamentos, leído con el esquema de 01 y ubicado como en 05
+    ruta = Path(carpeta) / "policia.csv"
+    generar_policia(ruta, filas, np.random.default_rng(semilla))
+    esquema = FUENTES["policia"]
+    df = normalizar_municipio(Lector(ruta, esquema.columnas, solo_declaradas=True, separador=esquema.separador).leer())
+    columnas, fijos = UBICACION["policia"]
+    Geografia().resolver_fuente(df, columnas, fijos)
+    return df
+
+
+def mejor(policia, carpeta, procesos, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        # resumir_policia agrega la columna del mes: cada corrida recibe su propia copia superficial
+        entrada = policia.copy(deep=False)
+        inicio = time.perf_counter()
+        resultado = resumir_policia(entrada, ruta_serie=Path(carpeta) / f"serie_{procesos}.npz", procesos=procesos)
+        tiempos.append(time.perf_counter() - inicio)
+    return resultado, min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=2_000_000)
+    parser.add_argument("--procesos", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--repeticiones", type=int, default=2)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    fijar_verbosidad(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inicio = time.perf_counter()
+        policia = reporte_nacional(tmp, args.filas, args.semilla)
+        print(f"🧪 Reporte nacional: {len(policia):,} filas, {policia['departamento_id'].nunique()} departamentos, "
+              f"{policia['municipio_id'].nunique()} municipios ({time.perf_counter() - inicio:.1f} s)")
+        print(f"🖥️ Núcleos disponibles: {os.cpu_count()}\n")
+
+        (final_base, ventanas_base), t_base = mejor(policia, tmp, 1, args.repeticiones)
+        print(f"{'procesos':>9}{'segundos':>11}{'aceleración':>13}{'filas/s':>14}   paridad")
+        print(f"{'1':>9}{t_base:>11.2f}{1:>12.2f}×{len(policia) / t_base:>14,.0f}   (referencia)")
+        for procesos in [p for p in args.procesos if p > 1]:
+            (final, ventanas), segundos = mejor(policia, tmp, procesos, args.repeticiones)
+            # ✅ Mismos promedios, totales y ventanas, con los mismos tipos
+            try:
+                pd.testing.assert_frame_equal(final, final_base)
+                pd.testing.assert_frame_equal(ventanas, ventanas_base)
+                paridad = "✅ idéntico"
+            except AssertionError as error:
+                paridad = f"❌ {str(error).splitlines()[0]}"
+            if procesos > (os.cpu_count() or 1):
+                paridad += " (más procesos que núcleos)"
+            print(f"{procesos:>9}{segundos:>11.2f}{t_base / segundos:>12.2f}×{len(policia) / segundos:>14,.0f}   {paridad}")
+
+
+if __name__ == "__main__":
+    main()
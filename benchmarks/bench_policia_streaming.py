@@ -0,0 +1,115 @@
+"""
+Benchmark de 01_cargar_policia.py: carga completa vs. modo streaming.
+
+Genera un reporte nacional sintético (mismas columnas que el de la Policía),
+ejecuta el script en un proceso aparte con cada modo y compara el tiempo,
+las filas por segundo y la memoria máxima (RSS) de cada ejecución.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_policia_streaming.py --filas 2000000
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+SCRIPT = RAIZ / "scripts" / "01_cargar_policia.py"
+NOMBRE_REPORTE = "Reporte_Hurto_por_Modalidades_Policía_Nacional.csv"
+
+
+def generar_reporte(ruta, filas, semilla=0):
+    # 🧪 Reporte sintético: ~20% de los registros son de Antioquia, como en el extracto nacional
+    # (pandas se importa aquí: el proceso padre debe quedar liviano para no inflar
+    # el RSS máximo que heredan los procesos hijos medidos)
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(semilla)
+    deptos = ["ANTIOQUIA", "CUNDINAMARCA", "VALLE", "SANTANDER", "ATLÁNTICO", "BOLÍVAR", "NARIÑO", "META"]
+    munis = ["Medellín", "BELLO", "Envigado ", "ITAGÜÍ", "Sabaneta", "BOGOTÁ D.C.", "CALI", "PASTO"]
+    fechas = pd.date_range("2010-01-01", "2023-12-31", freq="D").strftime("%d/%m/%Y").to_numpy()
+    bloque = 500_000
+    for inicio in range(0, filas, bloque):
+        n = min(bloque, filas - inicio)
+        muni = rng.integers(0, len(munis), n)
+        df = pd.DataFrame({
+            "DEPARTAMENTO": rng.choice(deptos, n, p=[0.2, 0.25, 0.15, 0.1, 0.1, 0.1, 0.05, 0.05]),
+            "MUNICIPIO": np.asarray(munis)[muni],
+            # Un código DANE por municipio, como en el reporte real
+            "CODIGO DANE": 5001000 + 1000 * muni,
+            "ARMAS MEDIOS": rng.choice(["ARMA BLANCA / CORTOPUNZANTE", "SIN EMPLEO DE ARMAS", "ARMA DE FUEGO"], n),
+            "FECHA HECHO": rng.choice(fechas, n),
+            "GENERO": rng.choice(["MASCULINO", "FEMENINO", "NO REPORTA"], n),
+            "GRUPO ETARIO": rng.choice(["ADULTOS", "ADOLESCENTES", "MENORES"], n),
+            "TIPO DE HURTO": rng.choice(["HURTO PERSONAS", "HURTO RESIDENCIAS", "HURTO COMERCIO"], n),
+            "CANTIDAD": rng.integers(1, 4, n),
+        })
+        df.to_csv(ruta, mode="w" if inicio == 0 else "a", header=(inicio == 0), index=False, encoding="utf-8")
+
+
+def contar_filas(data_dir):
+    # 🔢 Filas del intermedio escrito (CSV o Parquet), contadas sin cargar pandas en este proceso
+    csv = data_dir / "hurto_policia_limpio.csv"
+    if csv.exists():
+        return sum(1 for _ in open(csv, encoding="utf-8-sig")) - 1
+    codigo = "import sys, pyarrow.parquet as pq; print(pq.ParquetFile(sys.argv[1]).metadata.num_rows)"
+    salida = subprocess.run([sys.executable, "-c", codigo, str(data_dir / "hurto_policia_limpio.parquet")],
+                            capture_output=True, text=True, check=True)
+    return int(salida.stdout)
+
+
+def ejecutar(directorio, chunksize, formato):
+    # ⏱️ Ejecuta el script en un proceso hijo y lee su RSS máximo con wait4
+    entorno = dict(os.environ, MAPA_CHUNKSIZE=str(chunksize), MAPA_FORMATO=formato)
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([sys.executable, str(SCRIPT)], cwd=directorio, env=entorno,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, estado, uso = os.wait4(proceso.pid, 0)
+    segundos = time.perf_counter() - inicio
+    if estado != 0:
+        raise RuntimeError(f"❌ El script falló con chunksize={chunksize}:\n{proceso.stderr.read().decode()}")
+    # En Linux ru_maxrss viene en KB
+    return segundos, uso.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, nargs="+", default=[50_000, 200_000, 1_000_000])
+    parser.add_argument("--formato", choices=["csv", "parquet"], default="csv",
+                        help="formato del intermedio de salida (MAPA_FORMATO)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        data_dir.mkdir()
+        reporte = data_dir / NOMBRE_REPORTE
+        print(f"🧪 Generando reporte sintético de {args.filas:,} filas...")
+        generador = multiprocessing.Process(target=generar_reporte, args=(reporte, args.filas))
+        generador.start()
+        generador.join()
+        print(f"📦 Tamaño del archivo: {reporte.stat().st_size / 1e6:,.1f} MB\n")
+
+        print(f"{'modo':<28}{'segundos':>10}{'filas/s':>14}{'RSS máx (MB)':>15}")
+        filas_salida = {}
+        for chunksize in [0] + args.chunksize:
+            for viejo in data_dir.glob("hurto_policia_limpio.*"):
+                viejo.unlink()
+            segundos, rss = ejecutar(tmp, chunksize, args.formato)
+            modo = "completo (en memoria)" if chunksize == 0 else f"streaming {chunksize:,}"
+            print(f"{modo:<28}{segundos:>10.2f}{args.filas / segundos:>14,.0f}{rss:>15,.1f}")
+            filas_salida[modo] = contar_filas(data_dir)
+
+        # ✅ Todos los modos deben producir el mismo número de registros de Antioquia
+        if len(set(filas_salida.values())) != 1:
+            raise AssertionError(f"❌ Los modos no coinciden: {filas_salida}")
+        print(f"\n✅ Todos los modos escribieron {next(iter(filas_salida.values())):,} registros de Antioquia")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Paridad y benchmark de la asignación punto-en-polígono: ciclo por punto vs. índice de malla.
+
+Genera una ciudad sintética: una malla de barrios (cuadriláteros deformados cuyos
+lados tienen muchos vértices, compartidos entre vecinos para que no haya huecos
+ni solapes), la guarda como GeoJSON y la lee con mapa_seguridad.poligonos. Luego:
+  - ciclo por punto: para cada punto, recorrer los polígonos (caja y rayo en Python)
+  - asignar_poligonos(): índice de malla + prueba vectorizada por polígono
+El ciclo solo corre sobre una muestra (--muestra); ambos deben asignar lo mismo.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_poligonos.py --puntos 100000 500000 --barrios 20
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.coordenadas import LAT_MAX, LAT_MIN, LON_MAX, LON_MIN  # noqa: E402
+from mapa_seguridad.poligonos import SIN_POLIGONO, asignar_poligonos, cargar_limites  # noqa: E402
+
+
+def ciudad_sintetica(n, vertices_por_lado=25, semilla=0):
+    """GeoJSON con n × n barrios que cubren el Valle de Aburrá sin huecos."""
+    rng = np.random.default_rng(semilla)
+    xs = np.linspace(LON_MIN, LON_MAX, n + 1)
+    ys = np.linspace(LAT_MIN, LAT_MAX, n + 1)
+    paso = min(xs[1] - xs[0], ys[1] - ys[0])
+    esquinas = np.stack(np.meshgrid(xs, ys, indexing="ij"), axis=-1)
+    esquinas[1:-1, 1:-1] += rng.uniform(-0.2, 0.2, (n - 1, n - 1, 2)) * paso
+
+    def lado(a, b):
+        # Puntos intermedios desplazados en perpendicular (el lado es el mismo para ambos vecinos)
+        t = np.linspace(0, 1, vertices_por_lado + 1)[:-1, None]
+        normal = np.array([-(b - a)[1], (b - a)[0]])
+        return a + t * (b - a) + np.sin(t * np.pi) * rng.uniform(-0.1, 0.1) * normal
+
+    horizontales = {(i, j): lado(esquinas[i, j], esquinas[i + 1, j]) for i in range(n) for j in range(n + 1)}
+    verticales = {(i, j): lado(esquinas[i, j], esquinas[i, j + 1]) for i in range(n + 1) for j in range(n)}
+
+    features = []
+    for i in range(n):
+        for j in range(n):
+            anillo = np.vstack([
+                horizontales[i, j],
+                verticales[i + 1, j],
+                np.vstack([horizontales[i, j + 1][1:], [esquinas[i + 1, j + 1]]])[::-1],
+                np.vstack([verticales[i, j][1:], [esquinas[i, j + 1]]])[::-1],
+            ])
+            anillo = np.vstack([anillo, anillo[:1]])
+            features.append({
+                "type": "Feature",
+                "properties": {"CODIGO": f"{i:02d}{j:02d}", "NOMBRE": f"Barrio {i}-{j}"},
+                "geometry": {"type": "Polygon", "coordinates": [anillo.tolist()]},
+            })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def dentro_por_rayo(x, y, anillo):
+    dentro = False
+    for (x1, y1), (x2, y2) in zip(anillo[:-1], anillo[1:]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            dentro = not dentro
+    return dentro
+
+
+def asignar_por_punto(lon, lat, geojson):
+    # 🐢 Referencia: cada punto contra cada polígono, en Python
+    poligonos = [np.asarray(f["geometry"]["coordinates"][0]).tolist() for f in geojson["features"]]
+    cajas = [(min(p[0] for p in a), min(p[1] for p in a), max(p[0] for p in a), max(p[1] for p in a))
+             for a in poligonos]
+    resultado = np.full(len(lon), SIN_POLIGONO, dtype=np.int32)
+    for k, (x, y) in enumerate(zip(lon, lat)):
+        for i, (anillo, (x0, y0, x1, y1)) in enumerate(zip(poligonos, cajas)):
+            if x0 <= x <= x1 and y0 <= y <= y1 and dentro_por_rayo(x, y, anillo):
+                resultado[k] = i
+                break
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--puntos", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--barrios", type=int, default=20, help="barrios por lado de la malla (n × n)")
+    parser.add_argument("--muestra", type=int, default=5_000, help="puntos para el ciclo por punto")
+    args = parser.parse_args()
+
+    geojson = ciudad_sintetica(args.barrios)
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = Path(carpeta) / "barrios.geojson"
+        ruta.write_text(json.dumps(geojson), encoding="utf-8")
+        limites = cargar_limites(ruta)
+    lados = sum(len(l) for l in limites.lados)
+    print(f"🗺️ {len(limites)} barrios sintéticos, {lados:,} lados en total\n")
+
+    rng = np.random.default_rng(1)
+    print(f"{'puntos':>10}{'por punto (s)':>15}{'malla (s)':>11}{'aceleración':>14}{'asignados':>12}   paridad")
+    for n in args.puntos:
+        lon = rng.uniform(LON_MIN - 0.02, LON_MAX + 0.02, n)
+        lat = rng.uniform(LAT_MIN - 0.02, LAT_MAX + 0.02, n)
+
+        inicio = time.perf_counter()
+        obtenido = asignar_poligonos(lon, lat, limites)
+        t_malla = time.perf_counter() - inicio
+
+        muestra = min(args.muestra, n)
+        inicio = time.perf_counter()
+        esperado = asignar_por_punto(lon[:muestra], lat[:muestra], geojson)
+        t_punto = (time.perf_counter() - inicio) * n / muestra  # estimado para todos los puntos
+
+        # ✅ Misma asignación en la muestra
+        np.testing.assert_array_equal(obtenido[:muestra], esperado)
+        asignados = int((obtenido != SIN_POLIGONO).sum())
+        print(f"{n:>10,}{t_punto:>14.1f}*{t_malla:>11.3f}{t_punto / t_malla:>13.0f}×{asignados:>12,}   ✅ idéntico")
+
+    print(f"\n* estimado a partir de {args.muestra:,} puntos")
+
+
+if __name__ == "__main__":
+    main()
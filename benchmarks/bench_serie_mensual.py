@@ -0,0 +1,80 @@
+"""
+Paridad y benchmark del riesgo por ventanas de tiempo (mapa_seguridad.serie_mensual).
+
+Con registros sintéticos (zona, mes, cantidad) de varios años:
+  - reconstrucción: SerieMensual.desde_registros() con todos los registros cada
+    vez que llega un mes (lo que haría el pipeline sin estado)
+  - incremental: agregar_mes() con solo los casos del mes nuevo
+Ambas deben dar las mismas sumas y los mismos niveles en cada ventana. El tiempo
+incremental debe depender del número de zonas, no del de registros.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_serie_mensual.py --registros 100000 1000000 --zonas 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.serie_mensual import SerieMensual  # noqa: E402
+
+
+def registros_sinteticos(n, zonas, meses, semilla=0):
+    rng = np.random.default_rng(semilla)
+    periodos = pd.period_range("2010-01", periods=meses, freq="M")
+    return pd.DataFrame({
+        "zona": pd.Categorical.from_codes(rng.integers(0, zonas, n), [f"Z{i:05d}" for i in range(zonas)]),
+        "mes": periodos[rng.integers(0, meses, n)],
+        "cantidad": rng.integers(1, 4, n),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--zonas", type=int, default=500)
+    parser.add_argument("--meses", type=int, default=120, help="meses de historia")
+    parser.add_argument("--nuevos", type=int, default=6, help="meses que se agregan uno a uno")
+    args = parser.parse_args()
+
+    print(f"{'registros':>12}{'reconstruir (s/mes)':>21}{'incremental (ms/mes)':>22}{'aceleración':>14}   paridad")
+    for n in args.registros:
+        df = registros_sinteticos(n, args.zonas, args.meses + args.nuevos)
+        ultimo_historico = df["mes"].min() + (args.meses - 1)
+        serie = SerieMensual.desde_registros(df[df["mes"] <= ultimo_historico], "zona", col_peso="cantidad")
+
+        t_completo = t_incremental = 0.0
+        for k in range(1, args.nuevos + 1):
+            mes = ultimo_historico + k
+            del_mes = df[df["mes"] == mes]
+            casos = del_mes.groupby("zona", observed=True)["cantidad"].sum()
+
+            inicio = time.perf_counter()
+            serie.agregar_mes(casos, mes)
+            t_incremental += time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            completa = SerieMensual.desde_registros(df[df["mes"] <= mes], "zona", col_peso="cantidad")
+            t_completo += time.perf_counter() - inicio
+
+            # ✅ Mismas sumas por ventana y mismos niveles
+            orden = [serie.posicion[z] for z in completa.zonas]
+            for w in serie.ventanas:
+                np.testing.assert_array_equal(serie.sumas[w][orden], completa.sumas[w])
+            incremental = serie.resumen().set_index("zona").loc[completa.zonas].reset_index()
+            pd.testing.assert_frame_equal(incremental, completa.resumen())
+
+        t_completo /= args.nuevos
+        t_incremental /= args.nuevos
+        print(f"{n:>12,}{t_completo:>21.3f}{t_incremental * 1000:>22.2f}{t_completo / t_incremental:>13.0f}×"
+              "   ✅ idéntico")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Prueba de carga de la API de consultas (mapa_seguridad.servidor).
+
+Levanta el servidor en un puerto libre con data/data_final (o con N filas
+sintéticas, --filas) y lanza varios clientes a la vez, cada uno con su conexión
+persistente, pidiendo /api/resumen y /api/zonas con filtros al azar tomados de
+/api/opciones. Se mide latencia (p50, p99) y peticiones por segundo:
+  - sin caché: cada respuesta se calcula con los índices
+  - con caché LRU: las consultas repetidas salen de memoria
+Antes de medir, algunas respuestas se comparan con el mismo filtro hecho en pandas.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_servidor_api.py --clientes 8 --peticiones 500
+    python benchmarks/bench_servidor_api.py --filas 500000
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.almacen import cargar_intermedio  # noqa: E402
+from mapa_seguridad.consultas import IndiceConsultas  # noqa: E402
+from mapa_seguridad.servidor import ServicioConsultas, crear_servidor  # noqa: E402
+
+
+def ampliar(df, filas, semilla=0):
+    """Tabla de `filas` filas tomadas al azar de `df` (mismas columnas y valores)."""
+    rng = np.random.default_rng(semilla)
+    return df.iloc[rng.integers(0, len(df), filas)].reset_index(drop=True)
+
+
+def consultas_al_azar(opciones, cuantas, distintas, semilla=1):
+    # Un conjunto fijo de `distintas` consultas que se repite (como varios usuarios del mapa)
+    rng = np.random.default_rng(semilla)
+    base = []
+    for _ in range(distintas):
+        filtros = {}
+        for dimension in rng.choice(list(opciones), rng.integers(1, 3), replace=False):
+            filtros[str(dimension)] = str(rng.choice(opciones[dimension]))
+        ruta = "/api/resumen" if rng.random() < 0.7 else "/api/zonas"
+        if ruta == "/api/zonas":
+            filtros["limite"] = 20
+        base.append(f"{ruta}?{urlencode(filtros)}")
+    return [base[i] for i in rng.integers(0, len(base), cuantas)]
+
+
+def obtener(conexion, url):
+    conexion.request("GET", url)
+    respuesta = conexion.getresponse()
+    return respuesta.status, respuesta.read()
+
+
+def verificar(puerto, df, opciones):
+    # ✅ El conteo de filas de la API es el mismo que con máscaras de pandas
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto)
+    municipio = df["municipio"].astype(object)
+    for nivel in opciones["nivel_riesgo"]:
+        for alerta in opciones["alerta"]:
+            url = f"/api/resumen?{urlencode({'nivel_riesgo': nivel, 'alerta': alerta})}"
+            _, cuerpo = obtener(conexion, url)
+            esperado = int(((df["nivel_riesgo"] == nivel) & (df["alerta"] == alerta)).sum())
+            assert json.loads(cuerpo)["filas"] == esperado, url
+    for valor in opciones["municipio"][:20]:
+        _, cuerpo = obtener(conexion, f"/api/resumen?{urlencode({'municipio': valor})}")
+        assert json.loads(cuerpo)["filas"] == int((municipio == valor).sum()), valor
+    conexion.close()
+
+
+def carga(puerto, urls, clientes):
+    latencias = [[] for _ in range(clientes)]
+    errores = []
+
+    def cliente(i):
+        conexion = http.client.HTTPConnection("127.0.0.1", puerto)
+        for url in urls[i::clientes]:
+            inicio = time.perf_counter()
+            estado, _ = obtener(conexion, url)
+            latencias[i].append(time.perf_counter() - inicio)
+            if estado != 200:
+                errores.append((url, estado))
+        conexion.close()
+
+    hilos = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - inicio
+    assert not errores, errores[:3]
+    todas = np.concatenate([np.asarray(l) for l in latencias]) * 1000
+    return len(urls) / total, np.percentile(todas, 50), np.percentile(todas, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--distintas", type=int, default=200, help="consultas distintas en la mezcla")
+    parser.add_argument("--filas", type=int, default=0, help="ampliar data_final a N filas (0 = tal cual)")
+    args = parser.parse_args()
+
+    df = cargar_intermedio("data_final")
+    if args.filas:
+        df = ampliar(df, args.filas)
+    inicio = time.perf_counter()
+    indice = IndiceConsultas(df, version="bench")
+    print(f"📥 {len(df):,} filas indexadas en {time.perf_counter() - inicio:.3f} s")
+    opciones = indice.opciones()
+    urls = consultas_al_azar(opciones, args.peticiones, args.distintas)
+
+    print(f"\n{'caché':>10}{'peticiones/s':>15}{'p50 (ms)':>11}{'p99 (ms)':>11}{'aciertos':>10}")
+    for nombre, capacidad in (("sin caché", 0), ("LRU", 1024)):
+        servicio = ServicioConsultas(None, capacidad_cache=capacidad, indice=indice)
+        servidor = crear_servidor(servicio, puerto=0)
+        hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+        hilo.start()
+        try:
+            if capacidad == 0:
+                verificar(servidor.server_port, df, opciones)
+            por_segundo, p50, p99 = carga(servidor.server_port, urls, args.clientes)
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+        aciertos = servicio.cache.aciertos / max(servicio.cache.aciertos + servicio.cache.fallos, 1)
+        print(f"{nombre:>10}{por_segundo:>15,.0f}{p50:>11.2f}{p99:>11.2f}{aciertos:>10.0%}")
+    print("\n✅ Conteos de la API idénticos a los filtros de pandas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark de la unión del BLOQUE 7 de 05_unir_y_riesgo.py: pandas vs. motor SQL local
+(mapa_seguridad.union_sql).
+
+Se generan tablas sintéticas con la forma de las de 05 (N filas de niveles con
+textos categóricos y promedios, municipios de la Policía con enteros nullable y
+arriendos con N/4 filas), con llaves repetidas a ambos lados y llaves que solo
+existen en una tabla, y se compara:
+  - pandas: merge externo + merge izquierdo + índice + quintiles, como 05
+  - sqlite (y duckdb si está instalado): unir_y_clasificar() en una base temporal en disco
+Antes de medir se verifica que ambos caminos dan el mismo DataFrame (filas,
+orden, columnas y tipos). El pico de memoria es el de Python (tracemalloc): la
+caché de sqlite es de tamaño fijo y lo que no cabe se ordena en archivos temporales.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_union_sql.py --filas 100000 1000000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.riesgo import clasificar_alerta, clasificar_nivel, umbrales  # noqa: E402
+from mapa_seguridad.union_sql import duckdb, unir_y_clasificar  # noqa: E402
+
+
+def generar_tablas(filas, semilla=0):
+    rng = np.random.default_rng(semilla)
+    # zona_id de la dimensión geográfica: los municipios primero y luego las zonas de los robos
+    municipios = filas // 20
+    zonas = np.arange(municipios, municipios + filas // 2, dtype=np.int32)
+    niveles = pd.DataFrame({
+        "zona_id": zonas[rng.integers(0, len(zonas), filas)],
+        "promedio_robos": np.round(rng.gamma(2.0, 3.0, filas), 4),
+        "casos_totales": rng.integers(1, 500, filas),
+        "tipo_delito": pd.Categorical(rng.choice(["Atraco", "Cosquilleo", "Descuido", "Raponazo"], filas)),
+    })
+    niveles.loc[rng.random(filas) < 0.05, "promedio_robos"] = np.nan
+
+    # La mitad de los municipios coincide con zonas de niveles; la otra mitad solo existe en la Policía
+    policia = pd.DataFrame({
+        "zona_id": np.where(np.arange(municipios) % 2 == 0, zonas[rng.integers(0, len(zonas), municipios)],
+                            np.arange(municipios)).astype(np.int32),
+        "promedio_robos_municipio": pd.array(np.round(rng.gamma(2.0, 10.0, municipios), 3), dtype="Float64"),
+        "casos_municipio": pd.array(rng.integers(1, 10_000, municipios), dtype="Int32"),
+    })
+
+    n_arr = filas // 4
+    arriendos = pd.DataFrame({
+        "zona_id": zonas[rng.integers(0, len(zonas), n_arr)],
+        "sector": pd.Categorical(rng.choice([f"SECTOR {i}" for i in range(50)], n_arr)),
+        "promedio_arriendo_apartamento": np.round(rng.normal(1.8e6, 4e5, n_arr), 0),
+        "rango_apartamento": rng.integers(0, 5, n_arr).astype("float64"),
+    })
+    return niveles, policia, arriendos
+
+
+def union_pandas(niveles, policia, arriendos):
+    # 🐼 Como el BLOQUE 7 de 05 con MAPA_MOTOR_UNION=pandas
+    df = niveles.merge(policia, on="zona_id", how="outer").merge(arriendos, on="zona_id", how="left")
+    col_ref = next((c for c in df.columns if "promedio_robos" in c), None)
+    df["indice_riesgo"] = df[col_ref] / df[col_ref].max()
+    cortes = umbrales(df["indice_riesgo"])
+    df["nivel_riesgo"] = clasificar_nivel(df["indice_riesgo"], cortes)
+    df["alerta"] = clasificar_alerta(df["indice_riesgo"], cortes)
+    return df
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+        del resultado
+    tracemalloc.start()
+    resultado = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, min(tiempos), pico / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeticiones", type=int, default=2)
+    args = parser.parse_args()
+
+    motores = ["sqlite"] + (["duckdb"] if duckdb else [])
+    print(f"{'filas':>12}{'resultado':>12}{'motor':>9}{'tiempo (s)':>12}{'pico (MB)':>11}   paridad")
+    for n in args.filas:
+        tablas = generar_tablas(n)
+        esperado, t_pandas, p_pandas = medir(lambda: union_pandas(*tablas), args.repeticiones)
+        print(f"{n:>12,}{len(esperado):>12,}{'pandas':>9}{t_pandas:>12.2f}{p_pandas:>11.1f}")
+        for motor in motores:
+            resultado, t, p = medir(lambda: unir_y_clasificar(*tablas, motor=motor), args.repeticiones)
+            try:
+                pd.testing.assert_frame_equal(resultado, esperado)
+                paridad = "✅ idéntico"
+            except AssertionError as error:
+                paridad = f"❌ {str(error).splitlines()[0]}"
+            print(f"{'':>12}{'':>12}{motor:>9}{t:>12.2f}{p:>11.1f}   {paridad}")
+
+
+if __name__ == "__main__":
+    main()
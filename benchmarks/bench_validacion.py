@@ -0,0 +1,133 @@
+"""
+Benchmark de la validación de data_final (mapa_seguridad.validacion, 06_validar_salida.py).
+
+benchmarks/datos/data_final_legado.csv se amplía a N filas (filas tomadas al azar,
+con un zona_id y una zona_clave distintos por fila) y se le inyectan fallas conocidas: llaves repetidas,
+índices fuera de 0–1, niveles no permitidos, alertas que no corresponden al nivel,
+sectores sin referencia y zonas que no están en la dimensión geográfica. Antes de medir se verifica que cada regla cuenta
+exactamente las fallas inyectadas (más las que ya tenía el archivo ampliado).
+Luego, con el archivo en Parquet, se mide:
+  - lectura completa (como hacía 06) vs. lectura con proyección (solo las columnas de las reglas)
+  - validar() con todas las reglas de REGLAS_DATA_FINAL (filas por segundo)
+
+Las referencias se toman de los valores del data_final ampliado antes de inyectar
+las fallas, que ya las cumple.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_validacion.py --filas 1000000 5000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.esquemas import INTERMEDIOS, Lector  # noqa: E402
+from mapa_seguridad.riesgo import ALERTAS, NIVELES  # noqa: E402
+from mapa_seguridad.validacion import REGLAS_DATA_FINAL, columnas_necesarias, validar  # noqa: E402
+
+DATA_FINAL = RAIZ / "benchmarks" / "datos" / "data_final_legado.csv"
+FALLAS = 1_000  # filas dañadas por cada tipo de falla
+
+
+def ampliar(base, filas, semilla=0):
+    rng = np.random.default_rng(semilla)
+    df = base.iloc[rng.integers(0, len(base), filas)].reset_index(drop=True)
+    df["zona_id"] = np.arange(filas, dtype=np.int32)
+    df["zona_clave"] = pd.Categorical([f"ZONA_{i}" for i in range(filas)])
+    return df
+
+
+def inyectar_fallas(df, k=FALLAS, semilla=1):
+    """Daña k filas distintas por cada tipo de falla. Devuelve {regla: fallas esperadas}."""
+    rng = np.random.default_rng(semilla)
+    # Las alertas cambiadas deben salir de filas con un nivel válido
+    con_nivel = np.flatnonzero(df["nivel_riesgo"].astype(object).eq(NIVELES[0]).to_numpy())
+    alertas = rng.choice(con_nivel, k, replace=False)
+    resto = rng.permutation(np.setdiff1d(np.arange(len(df)), alertas))
+    repetidas, copiadas, fuera, niveles, huerfanos, sin_zona = (resto[i * k:(i + 1) * k] for i in range(6))
+
+    zona = df["zona_clave"].astype(object).to_numpy()
+    zona[repetidas] = zona[copiadas]
+    df["zona_clave"] = pd.Categorical(zona)
+    df.loc[fuera, "indice_riesgo"] = 1.5
+    df["nivel_riesgo"] = df["nivel_riesgo"].cat.add_categories(["Extremo"])
+    df.loc[niveles, "nivel_riesgo"] = "Extremo"
+    df.loc[alertas, "alerta"] = ALERTAS[-1]
+    df["sector"] = df["sector"].cat.add_categories(["SECTOR FANTASMA"])
+    df.loc[huerfanos, "sector"] = "SECTOR FANTASMA"
+    # zona_id fuera de la dimensión (negativos: las ampliadas llegan hasta N - 1)
+    df.loc[sin_zona, "zona_id"] = -1 - np.arange(k, dtype=np.int32)
+    return {
+        "zona_clave única": k,
+        "indice_riesgo entre 0 y 1": k,
+        "nivel_riesgo con valores permitidos": k,
+        "alerta según nivel_riesgo": k,
+        "sector existe en arriendos_limpio": k,
+        "zona_id existe en geo_zonas": k,
+    }
+
+
+def contexto_de(base):
+    # {(intermedio, columna): valores} con los valores del data_final ampliado
+    contexto = {}
+    for regla in REGLAS_DATA_FINAL:
+        for intermedio, columnas in regla.intermedios.items():
+            for columna in columnas:
+                contexto[(intermedio, columna)] = pd.Index(base[regla.columnas[0]].dropna().unique())
+    return contexto
+
+
+def mejor(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return resultado, min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    base = Lector(DATA_FINAL, INTERMEDIOS["data_final"]).leer()
+    necesarias = columnas_necesarias(REGLAS_DATA_FINAL)
+
+    print(f"{'filas':>12}{'lectura completa (s)':>22}{'proyección (s)':>16}{'validar (s)':>13}"
+          f"{'filas/s':>14}   fallas detectadas")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.filas:
+            df = ampliar(base, n)
+            contexto = contexto_de(df)
+            previas = {r["regla"]: r["fallas"] for r in validar(df, REGLAS_DATA_FINAL, contexto)["reglas"]}
+            inyectadas = inyectar_fallas(df)
+            ruta = Path(tmp) / f"data_final_{n}.parquet"
+            df.to_parquet(ruta, index=False)
+            del df
+
+            _, t_completa = mejor(lambda: pd.read_parquet(ruta), args.repeticiones)
+            proyectado, t_proyeccion = mejor(lambda: pd.read_parquet(ruta, columns=necesarias), args.repeticiones)
+            reporte, t_validar = mejor(lambda: validar(proyectado, REGLAS_DATA_FINAL, contexto),
+                                       args.repeticiones)
+
+            # ✅ Cada regla cuenta exactamente las fallas inyectadas más las que ya había
+            contadas = {r["regla"]: r["fallas"] for r in reporte["reglas"]}
+            distintas = {regla: (fallas, previas[regla] + inyectadas.get(regla, 0))
+                         for regla, fallas in contadas.items()
+                         if fallas != previas[regla] + inyectadas.get(regla, 0) and not regla.startswith("cobertura")}
+            detectadas = "✅ exactas" if not distintas and not reporte["ok"] else f"❌ {distintas}"
+            print(f"{n:>12,}{t_completa:>22.3f}{t_proyeccion:>16.3f}{t_validar:>13.3f}"
+                  f"{n / t_validar:>14,.0f}   {detectadas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Paridad y benchmark de la llave de zona: apply fila por fila vs. versión vectorizada.
+
+1. Verifica que mapa_seguridad.zonas.construir_zona_clave produce exactamente las
+   mismas llaves que el antiguo crear_zona_clave (apply con axis=1) sobre
+   benchmarks/datos/data_final_legado.csv, benchmarks/datos/arriendos_limpio.csv
+   (municipio, comuna y sector a la vez) y sobre una muestra sintética que cubre todas las ramas.
+2. Mide ambas versiones con las filas de data_final_legado.csv repetidas 1×, 10× y 100×.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_zona_clave.py
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.zonas import construir_zona_clave  # noqa: E402
+
+DATA_FINAL = RAIZ / "benchmarks" / "datos" / "data_final_legado.csv"
+ARRIENDOS = RAIZ / "benchmarks" / "datos" / "arriendos_limpio.csv"
+COLUMNAS_LLAVE = ["departamento", "municipio", "comuna", "barrio", "sector"]
+
+
+def zona_clave_fila_a_fila(df):
+    # 🐢 Implementación original del BLOQUE 6 de 05_unir_y_riesgo.py (referencia)
+    def construir_llave(fila):
+        dept = str(fila.get("departamento", "")).strip()
+        muni = str(fila.get("municipio", "")).strip()
+        com = str(fila.get("comuna", "")).strip()
+        bar = str(fila.get("barrio", "")).strip()
+        sec = str(fila.get("sector", "")).strip()
+
+        valores = [dept, muni, com, bar, sec]
+        valores = ["" if v.lower() in ["nan", "<na>", "none"] else v for v in valores]
+        dept, muni, com, bar, sec = valores
+
+        if com:
+            return f"{dept}|{muni}|COM_{com}"
+        if bar:
+            return f"{dept}|{muni}|BAR_{bar}"
+        if sec:
+            return f"{dept}|{muni}|SEC_{sec}"
+        if muni:
+            return f"{dept}|{muni}"
+        return "SIN_INFO"
+
+    return df.apply(construir_llave, axis=1)
+
+
+def muestra_sintetica(filas=5000, semilla=0):
+    # 🧪 Mezcla de valores presentes, vacíos, NaN, "None" y números para recorrer todas las ramas
+    rng = np.random.default_rng(semilla)
+    opciones = {
+        "departamento": ["ANTIOQUIA", np.nan, " ANTIOQUIA ", "none"],
+        "municipio": ["MEDELLIN", "BELLO", np.nan, "", "NaN", " ENVIGADO"],
+        "comuna": [np.nan, "14", 14.0, "<NA>", "", "SIN DATO"],
+        "barrio": [np.nan, "LAURELES", "None", " "],
+        "sector": [np.nan, "EL POBLADO", "nan"],
+    }
+    df = pd.DataFrame({c: pd.Series(rng.choice(np.array(v, dtype=object), filas), dtype=object)
+                       for c, v in opciones.items()})
+    df["comuna_int"] = pd.array(rng.choice([1, 2, None], filas), dtype="Int64")
+    return df
+
+
+def verificar_paridad(nombre, df):
+    esperado = zona_clave_fila_a_fila(df)
+    obtenido = construir_zona_clave(df)
+    distintos = (esperado != obtenido).sum()
+    if distintos:
+        ejemplo = df[esperado != obtenido].head()
+        raise AssertionError(f"❌ {nombre}: {distintos} llaves distintas\n{ejemplo}")
+    if len(df) > 1 and obtenido.nunique() < 2:
+        # Una sola llave para todas las filas (columnas ausentes o renombradas): la paridad no prueba nada
+        raise AssertionError(f"❌ {nombre}: todas las filas dan la llave {obtenido.iloc[0]!r}")
+    print(f"✅ Paridad en {nombre}: {len(df):,} filas, {obtenido.nunique()} llaves únicas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    data_final = pd.read_csv(DATA_FINAL, encoding="utf-8-sig")
+    base = data_final[[c for c in data_final.columns if c in COLUMNAS_LLAVE]]
+    if "municipio_x" in data_final.columns:
+        # Exportación anterior a la dimensión geográfica: el municipio quedó repartido
+        # en municipio_x / municipio_y tras la unión del paso 05
+        base = base.assign(municipio=data_final["municipio_x"].fillna(data_final["municipio_y"]))
+    arriendos = pd.read_csv(ARRIENDOS, encoding="utf-8-sig")
+
+    # ✅ 1️⃣ Paridad exacta con la implementación fila por fila
+    verificar_paridad("data_final_legado.csv", base)
+    verificar_paridad("arriendos_limpio.csv", arriendos[[c for c in arriendos.columns if c in COLUMNAS_LLAVE]])
+    sintetica = muestra_sintetica()
+    verificar_paridad("muestra sintética", sintetica)
+    verificar_paridad("comuna Int64", sintetica.drop(columns="comuna").rename(columns={"comuna_int": "comuna"}))
+
+    # ⏱️ 2️⃣ Tiempos a 1×, 10× y 100× las filas actuales (se mezclan filas de ambas fuentes)
+    fuente = pd.concat([base, sintetica[COLUMNAS_LLAVE]], ignore_index=True)
+    print(f"\n{'filas':>12}{'apply (s)':>12}{'vectorizado (s)':>18}{'aceleración':>14}")
+    for escala in args.escalas:
+        df = pd.concat([fuente] * escala, ignore_index=True)
+        inicio = time.perf_counter()
+        zona_clave_fila_a_fila(df)
+        t_apply = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        construir_zona_clave(df)
+        t_vector = time.perf_counter() - inicio
+        print(f"{len(df):>12,}{t_apply:>12.3f}{t_vector:>18.3f}{t_apply / t_vector:>13.1f}×")
+
+
+if __name__ == "__main__":
+    main()
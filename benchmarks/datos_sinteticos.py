@@ -0,0 +1,271 @@
+"""
+Datos sintéticos con el esquema y las rarezas de cada fuente original.
+
+Escribe en <destino>/data los cuatro archivos que leen las etapas 01–04, con los
+mismos nombres, columnas, separadores y codificación que los originales:
+
+    policia    reporte nacional: ",", encabezados en mayúsculas, FECHA HECHO dd/mm/yyyy,
+               departamentos y municipios con mayúsculas mezcladas, tildes y espacios
+    medata     consolidado por comuna: ",", año, "SIN DATO" en Codigo_comuna
+    kaggle     robos de Medellín: ";", BOM UTF-8, fechas "dd/mm/yyyy H:MM",
+               coordenadas con puntos de miles, "Sin dato", barrios "#0410"
+    arriendos  precios por sector: BOM UTF-8, comuna "14.0" o vacía, municipios con tilde
+
+Las categorías (barrios, modalidades, conductas, sectores…) se toman de las muestras
+de data/ con sus mismas frecuencias; las fechas, coordenadas, cantidades y precios se
+generan de nuevo, así que a 1000× no se repiten los mismos textos. Con la misma
+semilla y escala los archivos salen idénticos.
+
+Escala 1× = el tamaño de las muestras (17,605 robos, 2,569 filas de comunas,
+25 sectores) más 100,000 filas de la Policía, cuyo reporte no viene en el repositorio.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/datos_sinteticos.py --escala 10 --destino /tmp/mapa_10x
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from mapa_seguridad.coordenadas import LAT_MAX, LAT_MIN, LON_MAX, LON_MIN, reparar_coordenada  # noqa: E402
+from mapa_seguridad.esquemas import FUENTES, detectar_separador  # noqa: E402
+
+MUESTRAS = RAIZ / "data"
+ESCALAS = (1, 10, 100, 1000)
+FILAS_BASE = {"policia": 100_000, "medata": 2_569, "kaggle": 17_605, "arriendos": 25}
+
+# 📦 Los archivos grandes se escriben por partes, sin tenerlos completos en memoria
+BLOQUE = 500_000
+
+# 🚓 Municipios del reporte de la Policía: (departamento, variantes del nombre, código DANE, peso)
+# Las variantes imitan el archivo real: mayúsculas mezcladas, con y sin tilde, espacios al final
+MUNICIPIOS_POLICIA = [
+    ("ANTIOQUIA", ["MEDELLÍN", "Medellín", "MEDELLIN "], 5001000, 0.09),
+    ("ANTIOQUIA", ["BELLO", "Bello"], 5088000, 0.02),
+    ("ANTIOQUIA", ["ENVIGADO", "Envigado "], 5266000, 0.015),
+    ("ANTIOQUIA", ["ITAGÜÍ", "Itagüí", "ITAGUI"], 5360000, 0.015),
+    ("ANTIOQUIA", ["SABANETA", "Sabaneta"], 5631000, 0.008),
+    ("ANTIOQUIA", ["LA ESTRELLA", "La Estrella "], 5380000, 0.006),
+    ("ANTIOQUIA", ["CALDAS", "Caldas"], 5129000, 0.005),
+    ("ANTIOQUIA", ["COPACABANA", "Copacabana"], 5212000, 0.005),
+    ("ANTIOQUIA", ["GIRARDOTA", "Girardota"], 5308000, 0.004),
+    ("ANTIOQUIA", ["BARBOSA", "Barbosa"], 5079000, 0.004),
+    ("ANTIOQUIA", ["RIONEGRO", "Rionegro"], 5615000, 0.008),
+    ("ANTIOQUIA", ["APARTADÓ", "Apartadó"], 5045000, 0.004),
+    ("ANTIOQUIA", ["ABEJORRAL"], 5002000, 0.002),
+    ("CUNDINAMARCA", ["BOGOTÁ D.C. (CT)", "Bogotá D.C."], 11001000, 0.35),
+    ("CUNDINAMARCA", ["SOACHA", "Soacha"], 25754000, 0.04),
+    ("VALLE", ["CALI (CT)", "Cali"], 76001000, 0.14),
+    ("ATLÁNTICO", ["BARRANQUILLA (CT)", "Barranquilla"], 8001000, 0.08),
+    ("SANTANDER", ["BUCARAMANGA (CT)", "Bucaramanga"], 68001000, 0.06),
+    ("BOLÍVAR", ["CARTAGENA (CT)", "Cartagena"], 13001000, 0.05),
+    ("NARIÑO", ["PASTO (CT)", "Pasto"], 52001000, 0.03),
+    ("META", ["VILLAVICENCIO (CT)", "Villavicencio"], 50001000, 0.023),
+]
+VARIANTES_DEPARTAMENTO = {
+    "ANTIOQUIA": ["ANTIOQUIA", "Antioquia", "ANTIOQUIA "],
+    "ATLÁNTICO": ["ATLÁNTICO", "ATLANTICO"],
+    "BOLÍVAR": ["BOLÍVAR", "Bolívar"],
+    "NARIÑO": ["NARIÑO", "Nariño"],
+}
+CATEGORIAS_POLICIA = {
+    "ARMAS MEDIOS": (["SIN EMPLEO DE ARMAS", "ARMA BLANCA / CORTOPUNZANTE", "ARMA DE FUEGO",
+                      "CONTUNDENTES", "ESCOPOLAMINA", "NO REPORTADO"], [0.45, 0.2, 0.15, 0.1, 0.03, 0.07]),
+    "GENERO": (["MASCULINO", "FEMENINO", "NO REPORTA"], [0.55, 0.42, 0.03]),
+    "GRUPO ETARIO": (["ADULTOS", "ADOLESCENTES", "MENORES", "NO REPORTA"], [0.85, 0.07, 0.03, 0.05]),
+    "TIPO DE HURTO": (["HURTO PERSONAS", "HURTO RESIDENCIAS", "HURTO COMERCIO", "HURTO AUTOMOTORES",
+                       "HURTO MOTOCICLETAS"], [0.6, 0.12, 0.13, 0.05, 0.1]),
+}
+FECHAS_POLICIA = ("2010-01-01", "2023-12-31")
+
+# 🛰️ Dispersión de las coordenadas nuevas alrededor de cada robo de la muestra (~300 m)
+DISPERSION_GRADOS = 0.003
+
+
+def filas_por_fuente(escala):
+    return {fuente: filas * escala for fuente, filas in FILAS_BASE.items()}
+
+
+def _leer_muestra(fuente):
+    # 📂 La muestra original como texto, con sus columnas en el orden del archivo
+    esquema = FUENTES[fuente]
+    ruta = MUESTRAS / esquema.archivo.name
+    return pd.read_csv(ruta, sep=esquema.separador or detectar_separador(ruta, "utf-8-sig"),
+                       encoding="utf-8-sig", dtype=str, keep_default_na=False)
+
+
+def _escribir(ruta, partes, separador=",", bom=False):
+    # 💾 Primer bloque con encabezado (y BOM si el original lo trae), los demás se agregan
+    total = 0
+    for i, df in enumerate(partes):
+        df.to_csv(ruta, sep=separador, index=False, header=(i == 0), mode="w" if i == 0 else "a",
+                  encoding="utf-8-sig" if bom and i == 0 else "utf-8")
+        total += len(df)
+    return total
+
+
+def _bloques(filas):
+    for inicio in range(0, filas, BLOQUE):
+        yield min(BLOQUE, filas - inicio)
+
+
+def _con_puntos_de_miles(enteros, negativo=False):
+    # "627623616" → "627.623.616": los puntos van cada tres cifras desde la derecha
+    signo = "-" if negativo else ""
+    return [f"{signo}{v:,}".replace(",", ".") for v in enteros.tolist()]
+
+
+def _cifras_de(textos):
+    # Cuántas cifras trae cada coordenada de la muestra (sin signo ni puntos)
+    return textos.str.count(r"\d")
+
+
+def generar_policia(ruta, filas, rng):
+    peso = np.array([p for *_, p in MUNICIPIOS_POLICIA])
+    peso = peso / peso.sum()
+    fechas = pd.date_range(*FECHAS_POLICIA, freq="D").strftime("%d/%m/%Y").to_numpy()
+
+    def partes():
+        for n in _bloques(filas):
+            municipio = rng.choice(len(MUNICIPIOS_POLICIA), n, p=peso)
+            departamento = np.empty(n, dtype=object)
+            nombre = np.empty(n, dtype=object)
+            dane = np.empty(n, dtype=np.int64)
+            # Cada fila toma una de las formas en que viene escrito su municipio (y su departamento)
+            for i, (depto, variantes, codigo, _) in enumerate(MUNICIPIOS_POLICIA):
+                fila = municipio == i
+                k = int(fila.sum())
+                departamento[fila] = rng.choice(VARIANTES_DEPARTAMENTO.get(depto, [depto]), k)
+                nombre[fila] = rng.choice(variantes, k)
+                dane[fila] = codigo
+            df = pd.DataFrame({"DEPARTAMENTO": departamento, "MUNICIPIO": nombre, "CODIGO DANE": dane})
+            for columna, (valores, p) in CATEGORIAS_POLICIA.items():
+                df[columna] = rng.choice(valores, n, p=p)
+            df.insert(4, "FECHA HECHO", fechas[rng.integers(0, len(fechas), n)])
+            df["CANTIDAD"] = 1 + rng.binomial(2, 0.08, n)
+            yield df
+
+    return _escribir(ruta, partes())
+
+
+def generar_medata(ruta, filas, rng):
+    muestra = _leer_muestra("medata")
+    casos = pd.to_numeric(muestra["Cantidad_casos"], errors="coerce").fillna(1).to_numpy()
+
+    def partes():
+        for n in _bloques(filas):
+            # Filas de la muestra con la cantidad de casos variada (Poisson alrededor del valor)
+            idx = rng.integers(0, len(muestra), n)
+            df = muestra.iloc[idx].reset_index(drop=True)
+            df["Cantidad_casos"] = np.maximum(rng.poisson(casos[idx]), 1)
+            yield df
+
+    return _escribir(ruta, partes())
+
+
+def generar_kaggle(ruta, filas, rng):
+    muestra = _leer_muestra("kaggle")
+    col_fecha, col_lat, col_lon = "seguridad.fecha_hecho", "seguridad.latitud", "seguridad.longitud"
+
+    # 🗺️ Coordenadas de la muestra ya recuperadas; las que no se pudieron leer se copian tal cual
+    latitud, motivo_lat = reparar_coordenada(muestra[col_lat].replace("", np.nan), LAT_MIN, LAT_MAX)
+    longitud, motivo_lon = reparar_coordenada(muestra[col_lon].replace("", np.nan), LON_MIN, LON_MAX)
+    valida = (motivo_lat.isna() & motivo_lon.isna()).to_numpy()
+    latitud, longitud = latitud.to_numpy(np.float64), longitud.to_numpy(np.float64)
+    cifras_lat = _cifras_de(muestra.loc[valida, col_lat]).to_numpy()
+    cifras_lon = _cifras_de(muestra.loc[valida, col_lon]).to_numpy()
+
+    # 📅 Día y hora por separado: el día se mueve hasta medio año, la hora se conserva ("7:30")
+    fecha = pd.to_datetime(muestra[col_fecha].str.split(" ").str[0], format="%d/%m/%Y")
+    hora = muestra[col_fecha].str.split(" ").str[1].to_numpy()
+    primer_dia = fecha.min()
+    dias = pd.date_range(primer_dia, fecha.max(), freq="D").strftime("%d/%m/%Y").to_numpy()
+    dia = (fecha - primer_dia).dt.days.to_numpy()
+
+    def partes():
+        for n in _bloques(filas):
+            idx = rng.integers(0, len(muestra), n)
+            df = muestra.iloc[idx].reset_index(drop=True)
+
+            nuevo_dia = np.clip(dia[idx] + rng.integers(-182, 183, n), 0, len(dias) - 1)
+            df[col_fecha] = pd.Series(dias[nuevo_dia], dtype=object) + " " + hora[idx]
+
+            ok = valida[idx]
+            m = int(ok.sum())
+            lat = np.clip(latitud[idx][ok] + rng.normal(0, DISPERSION_GRADOS, m), LAT_MIN, LAT_MAX)
+            lon = np.clip(longitud[idx][ok] + rng.normal(0, DISPERSION_GRADOS, m), LON_MIN, LON_MAX)
+            # Misma cantidad de cifras que en la muestra: 1 entera en la latitud, 2 en la longitud
+            n_lat = rng.choice(cifras_lat, m)
+            n_lon = rng.choice(cifras_lon, m)
+            enteros_lat = np.floor(lat * 10.0 ** (n_lat - 1)).astype(np.int64)
+            enteros_lon = np.floor(-lon * 10.0 ** (n_lon - 2)).astype(np.int64)
+            df.loc[ok, col_lat] = _con_puntos_de_miles(enteros_lat)
+            df.loc[ok, col_lon] = _con_puntos_de_miles(enteros_lon, negativo=True)
+            yield df
+
+    return _escribir(ruta, partes(), separador=";", bom=True)
+
+
+def generar_arriendos(ruta, filas, rng):
+    muestra = _leer_muestra("arriendos")
+    precios = [c for c in muestra.columns if c.startswith("promedio_arriendo_")]
+
+    # 🏠 Una copia de la muestra por cada 25 sectores; desde la segunda, los sectores se numeran
+    copias = []
+    for i in range(-(-filas // len(muestra))):
+        df = muestra.copy()
+        if i:
+            df["sector"] = df["sector"] + f" {i + 1}"
+        for c in precios:
+            valor = pd.to_numeric(df[c], errors="coerce").to_numpy()
+            df[c] = (np.round(valor * rng.uniform(0.85, 1.15, len(df)), -4)).astype(np.int64)
+        copias.append(df)
+    return _escribir(ruta, [pd.concat(copias, ignore_index=True).head(filas)], bom=True)
+
+
+GENERADORES = {
+    "policia": generar_policia,
+    "medata": generar_medata,
+    "kaggle": generar_kaggle,
+    "arriendos": generar_arriendos,
+}
+
+
+def generar(destino, escala=1, semilla=0, fuentes=None):
+    """
+    Escribe las fuentes en <destino>/data y devuelve {fuente: (ruta, filas)}.
+    Cada fuente usa su propio generador aleatorio, así que generar solo una da los
+    mismos datos que generarlas todas.
+    """
+    data_dir = Path(destino) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    resultado = {}
+    for i, (fuente, filas) in enumerate(filas_por_fuente(escala).items()):
+        if fuentes and fuente not in fuentes:
+            continue
+        ruta = data_dir / FUENTES[fuente].archivo.name
+        rng = np.random.default_rng([semilla, i])
+        resultado[fuente] = (ruta, GENERADORES[fuente](ruta, filas, rng))
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escala", type=int, default=1, help=f"múltiplo del tamaño base ({', '.join(f'{e}×' for e in ESCALAS)})")
+    parser.add_argument("--destino", type=Path, required=True, help="carpeta del proyecto sintético (se crea <destino>/data)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--fuentes", nargs="+", choices=list(GENERADORES), help="solo estas fuentes")
+    args = parser.parse_args()
+
+    print(f"🧪 Generando datos sintéticos a {args.escala}× en {args.destino / 'data'}...")
+    for fuente, (ruta, filas) in generar(args.destino, args.escala, args.semilla, args.fuentes).items():
+        print(f" - {fuente:<10}{filas:>14,} filas  {ruta.stat().st_size / 1e6:>10,.1f} MB  {ruta.name}")
+
+
+if __name__ == "__main__":
+    main()
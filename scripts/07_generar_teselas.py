@@ -0,0 +1,9 @@
+from mapa_seguridad.etapas.salidas import generar_teselas
+
+#-------------------------------------------------
+# Etapa 07 — Pirámide de teselas de los robos con coordenadas
+#-------------------------------------------------
+# Los BLOQUES 1 a 3 están en mapa_seguridad.etapas.salidas.generar_teselas(): lee solo
+# latitud y longitud de robos_medellin_limpio y escribe web/teselas/{z}/{x}/{y}.json
+# (zooms 10 a 16) más el índice.
+generar_teselas()
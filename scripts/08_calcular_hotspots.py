@@ -0,0 +1,9 @@
+from mapa_seguridad.etapas.salidas import calcular_hotspots
+
+#-------------------------------------------------
+# Etapa 08 — Zonas calientes de robos
+#-------------------------------------------------
+# Los BLOQUES 1 a 3 están en mapa_seguridad.etapas.salidas.calcular_hotspots(): conteo
+# en una malla de 100 m, suavizado con filtros de caja y niveles por quintiles de la
+# intensidad, exportados a web/hotspots.json.
+calcular_hotspots()
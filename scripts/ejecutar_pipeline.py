@@ -0,0 +1,60 @@
+import argparse
+import os
+
+#-------------------------------------------------
+# Ejecutar el pipeline completo (01 → 08) de forma incremental
+#-------------------------------------------------
+# Solo se repiten las etapas cuyas entradas (o su código) cambiaron.
+#
+# Uso, desde la raíz del proyecto:
+#   python scripts/ejecutar_pipeline.py              → todo lo que haya cambiado
+#   python scripts/ejecutar_pipeline.py 04 05        → solo esas etapas (si cambiaron)
+#   python scripts/ejecutar_pipeline.py --forzar     → todo, ignorando la caché
+#   python scripts/ejecutar_pipeline.py -j 4         → cargadores 01–04 en paralelo, luego 05
+#   python scripts/ejecutar_pipeline.py --grafo      → mostrar dependencias y salir
+#   python scripts/ejecutar_pipeline.py --traza 1    → tiempos y memoria por BLOQUE (data/trazas/)
+#   python scripts/ejecutar_pipeline.py --en-memoria → todas las etapas en este proceso, pasando
+#                                                      las tablas en memoria (-v volcados, -q silencio)
+
+parser = argparse.ArgumentParser(description="Ejecuta el pipeline de forma incremental.")
+parser.add_argument("etapas", nargs="*", help="prefijos de las etapas a ejecutar (por defecto todas)")
+parser.add_argument("--forzar", action="store_true", help="ejecutar aunque no haya cambios")
+parser.add_argument("--grafo", action="store_true", help="mostrar el grafo de dependencias")
+parser.add_argument("-j", "--procesos", type=int, default=1,
+                    help="etapas independientes que se ejecutan a la vez (por defecto 1)")
+parser.add_argument("--traza", choices=["1", "profundo"],
+                    help="instrumentar cada etapa (igual que MAPA_TRAZA): 1 = tiempos y memoria, "
+                         "profundo = además tracemalloc y cProfile")
+parser.add_argument("--en-memoria", action="store_true",
+                    help="ejecutar las etapas como funciones en un solo proceso, sin releer los intermedios")
+verbosidad = parser.add_mutually_exclusive_group()
+verbosidad.add_argument("-v", "--verboso", action="store_true",
+                        help="mostrar también los volcados de exploración (head(), columnas, tablas por nivel)")
+verbosidad.add_argument("-q", "--silencioso", action="store_true", help="mostrar solo avisos, errores y el resumen")
+args = parser.parse_args()
+
+if args.en_memoria and args.procesos > 1:
+    parser.error("--en-memoria ejecuta las etapas en orden dentro de un proceso: no se combina con -j")
+
+# Las etapas corren en procesos aparte y heredan las variables; la instrumentación se
+# configura al importar mapa_seguridad, por eso los imports van después
+if args.traza:
+    os.environ["MAPA_TRAZA"] = args.traza
+if args.verboso or args.silencioso:
+    os.environ["MAPA_VERBOSIDAD"] = "2" if args.verboso else "0"
+elif args.en_memoria:
+    os.environ["MAPA_VERBOSIDAD"] = "1"
+
+from mapa_seguridad.orquestador import ETAPAS, dependencias, ejecutar_en_proceso, ejecutar_pipeline  # noqa: E402
+
+if args.grafo:
+    print("🧭 Dependencias entre etapas:")
+    for nombre, deps in dependencias(ETAPAS).items():
+        print(f" - {nombre} ← {', '.join(deps) if deps else 'archivos originales'}")
+else:
+    if args.en_memoria:
+        resultados = ejecutar_en_proceso(args.etapas, forzar=args.forzar)
+    else:
+        resultados = ejecutar_pipeline(args.etapas, forzar=args.forzar, procesos=args.procesos)
+    if any(r["resultado"] == "❌ error" for r in resultados):
+        raise SystemExit(1)
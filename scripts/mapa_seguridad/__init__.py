@@ -0,0 +1,11 @@
+"""
+Utilidades compartidas por los scripts numerados del pipeline (01 a 06).
+
+Los scripts se ejecutan desde la raíz del proyecto (python scripts/05_unir_y_riesgo.py),
+así que la carpeta scripts/ queda en sys.path y este paquete se importa directamente:
+
+    from mapa_seguridad.almacen import cargar_intermedio
+
+Las etapas completas están en el subpaquete mapa_seguridad.etapas (funciones que
+reciben y devuelven DataFrames); los scripts numerados solo las llaman.
+"""
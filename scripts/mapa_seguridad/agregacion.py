@@ -0,0 +1,108 @@
+"""
+Agregación mensual de robos por nivel geográfico en una sola pasada.
+
+En vez de hacer tres groupby por nivel (barrio, código de barrio, comuna...), se
+cuenta una vez el cubo "combinación de niveles × mes" con np.bincount sobre los
+códigos categóricos, y después se suma ese cubo (que es pequeño) hacia cada nivel.
+
+Para cada valor del nivel:
+    promedio_robos = robos en meses con datos / número de meses con al menos un robo
+    casos_totales  = todos sus robos (incluidos los que no tienen fecha)
+que es exactamente lo que calculaban los groupby del BLOQUE 3 de 05_unir_y_riesgo.py.
+"""
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.consola import detallar
+from mapa_seguridad.instrumentacion import medir
+from mapa_seguridad.normalizacion import normalizar_texto
+from mapa_seguridad.zonas import combinar_codigos
+
+
+class CuboMensual:
+    """
+    Conteo de registros por combinación de `niveles` × mes.
+
+    La última columna del cubo guarda los registros sin mes (fecha vacía): cuentan
+    para los totales pero no para los promedios mensuales. Con `col_peso` cada
+    registro suma el valor de esa columna (por ejemplo la cantidad de casos) en vez de 1,
+    y las sumas quedan en float64 (sin pesos, los conteos son int64).
+    """
+
+    def __init__(self, df, niveles, col_mes="mes", col_peso=None):
+        self.niveles = list(niveles)
+        self.ponderado = col_peso is not None
+        self.codigos = {}
+        self.valores = {}
+        for nivel in self.niveles:
+            self.codigos[nivel], self.valores[nivel] = pd.factorize(df[nivel], sort=True)
+
+        codigos_mes, self.meses = pd.factorize(df[col_mes], sort=True)
+        n_meses = len(self.meses)
+        codigos_mes = np.where(codigos_mes >= 0, codigos_mes, n_meses)
+
+        # 🧊 Una sola pasada: código de combinación por fila y conteo combinación × mes
+        combinacion, self.representantes = combinar_codigos(
+            [self.codigos[n] for n in self.niveles], [len(self.valores[n]) for n in self.niveles])
+        n_combinaciones = len(self.representantes)
+        pesos = None if col_peso is None else pd.to_numeric(df[col_peso], errors="coerce").fillna(0).to_numpy("float64")
+        self.cubo = np.bincount(
+            combinacion * (n_meses + 1) + codigos_mes, weights=pesos, minlength=n_combinaciones * (n_meses + 1)
+        ).reshape(n_combinaciones, n_meses + 1)
+
+    def por_nivel(self, nivel):
+        """Matriz de conteos o sumas de pesos (valores del nivel × meses, más la columna de 'sin mes')."""
+        n_valores = len(self.valores[nivel])
+        n_columnas = self.cubo.shape[1]
+        codigo = self.codigos[nivel][self.representantes]
+        validos = codigo >= 0
+        indices = (codigo[validos, None] * n_columnas + np.arange(n_columnas)).ravel()
+        conteos = np.bincount(indices, weights=self.cubo[validos].ravel(), minlength=n_valores * n_columnas)
+        conteos = conteos.reshape(n_valores, n_columnas)
+        # Los pesos pueden tener decimales: solo los conteos simples vuelven a enteros
+        return conteos if self.ponderado else conteos.astype(np.int64)
+
+    def resumen(self, nivel):
+        """DataFrame [nivel, promedio_robos, casos_totales, nivel_geo] ordenado por el valor del nivel."""
+        matriz = self.por_nivel(nivel)
+        con_fecha = matriz[:, :-1]
+        meses_con_datos = (con_fecha > 0).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            promedio = np.where(meses_con_datos > 0, con_fecha.sum(axis=1) / meses_con_datos, np.nan)
+        return pd.DataFrame({
+            nivel: self.valores[nivel],
+            "promedio_robos": promedio,
+            "casos_totales": matriz.sum(axis=1),
+            "nivel_geo": nivel,
+        })
+
+
+@medir()
+def resumen_por_niveles(df, niveles, col_mes="mes"):
+    """Promedio mensual y total de casos para cada nivel, todos los niveles en un solo DataFrame."""
+    cubo = CuboMensual(df, niveles, col_mes)
+    resultados = []
+    for nivel in niveles:
+        detallar(f"📍 Procesando nivel: {nivel}")
+        resultados.append(cubo.resumen(nivel))
+        detallar(f"✅ Calculado correctamente para: {nivel}")
+    return pd.concat(resultados, ignore_index=True)
+
+
+def mas_frecuente(df, nivel, columna, ignorar=("SIN DATO",)):
+    """
+    Valor más frecuente de `columna` para cada valor de `nivel` (Series indexada
+    por el nivel). Los valores de `ignorar` (comparados ya normalizados) no cuentan;
+    en empate gana el primero en orden alfabético.
+    """
+    codigos_nivel, valores_nivel = pd.factorize(df[nivel], sort=True)
+    codigos, valores = pd.factorize(df[columna], sort=True)
+    descartados = np.isin([normalizar_texto(str(v)) for v in valores], list(ignorar))
+    validos = (codigos_nivel >= 0) & (codigos >= 0)
+    validos[validos] = ~descartados[codigos[validos]]
+    conteos = np.bincount(codigos_nivel[validos] * len(valores) + codigos[validos],
+                          minlength=len(valores_nivel) * len(valores)).reshape(len(valores_nivel), len(valores))
+    resultado = pd.Series(None, index=valores_nivel, dtype=object, name=columna)
+    con_datos = np.flatnonzero(conteos.sum(axis=1) > 0)
+    resultado.iloc[con_datos] = np.asarray(valores, dtype=object)[conteos[con_datos].argmax(axis=1)]
+    return resultado
@@ -0,0 +1,183 @@
+"""
+Almacén de los archivos intermedios (*_limpio) que se pasan las etapas del pipeline.
+
+Las etapas 01–04 guardan sus tablas limpias con guardar_intermedio() y las
+etapas 05–06 las leen con cargar_intermedio(). Por defecto se usa Parquet:
+conserva los tipos (fechas, Int64, categorías) y permite leer solo las columnas
+necesarias. El CSV de siempre queda como opción para Power BI / Excel; al leerlo,
+los tipos se toman del registro de esquemas (mapa_seguridad.esquemas.INTERMEDIOS).
+
+Variables de entorno:
+    MAPA_FORMATO       "parquet" (por defecto si pyarrow está instalado) o "csv"
+    MAPA_EXPORTAR_CSV  "1" para escribir también el CSV junto al Parquet
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from mapa_seguridad.consola import avisar
+from mapa_seguridad.esquemas import INTERMEDIOS, Lector, detectar_separador
+from mapa_seguridad.instrumentacion import medir
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional: sin él todo sigue en CSV
+    pa = None
+    pq = None
+
+DATA_DIR = Path("data")
+
+FORMATO = os.environ.get("MAPA_FORMATO", "parquet" if pq else "csv").lower()
+EXPORTAR_CSV = os.environ.get("MAPA_EXPORTAR_CSV", "0") == "1"
+
+if FORMATO == "parquet" and pq is None:
+    avisar("⚠️ MAPA_FORMATO=parquet pero pyarrow no está instalado. Se usará CSV.")
+    FORMATO = "csv"
+
+
+def ruta_intermedio(nombre, formato=None):
+    """Ruta del intermedio `nombre` (sin extensión) en el formato indicado."""
+    formato = formato or FORMATO
+    return DATA_DIR / f"{nombre}.{formato}"
+
+
+def formatos_salida():
+    """Formatos que se escriben en cada guardado (el configurado y, si se pide, CSV)."""
+    formatos = [FORMATO]
+    if EXPORTAR_CSV and "csv" not in formatos:
+        formatos.append("csv")
+    return formatos
+
+
+def _preparar_para_parquet(df):
+    # 🧹 Parquet exige un tipo por columna: las columnas de texto con valores
+    # mezclados (números y "SIN DATO", por ejemplo) se guardan como texto.
+    df = df.copy()
+    for c in df.columns[df.dtypes == "object"]:
+        tipo = pd.api.types.infer_dtype(df[c], skipna=True)
+        if tipo not in ("string", "empty"):
+            df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    return df
+
+
+@medir()
+def guardar_intermedio(df, nombre):
+    """Guarda `df` como intermedio y devuelve la lista de archivos escritos."""
+    rutas = []
+    for formato in formatos_salida():
+        ruta = ruta_intermedio(nombre, formato)
+        if formato == "parquet":
+            _preparar_para_parquet(df).to_parquet(ruta, index=False)
+        else:
+            df.to_csv(ruta, index=False, encoding="utf-8-sig")
+        rutas.append(ruta)
+    return rutas
+
+
+class EscritorIntermedio:
+    """
+    Escritura incremental de un intermedio, bloque por bloque (modo streaming).
+
+    En Parquet cada bloque es un row group; en CSV el encabezado y el BOM se
+    escriben una sola vez. Se usa como context manager:
+
+        with EscritorIntermedio("hurto_policia_limpio") as escritor:
+            for chunk in lector:
+                escritor.escribir(chunk)
+    """
+
+    def __init__(self, nombre):
+        self.rutas = [ruta_intermedio(nombre, f) for f in formatos_salida()]
+        self._csv = None
+        self._parquet = None
+        self._esquema = None
+
+    def __enter__(self):
+        return self
+
+    def escribir(self, df):
+        for ruta in self.rutas:
+            if ruta.suffix == ".parquet":
+                self._escribir_parquet(ruta, df)
+            else:
+                primero = self._csv is None
+                if primero:
+                    self._csv = open(ruta, "w", encoding="utf-8-sig", newline="")
+                df.to_csv(self._csv, index=False, header=primero)
+
+    def _escribir_parquet(self, ruta, df):
+        df = _preparar_para_parquet(df)
+        if self._esquema is None:
+            # Las columnas que vienen vacías en el primer bloque se declaran como texto,
+            # y las categóricas con índice int32 (cada bloque trae sus propias categorías)
+            esquema = pa.Schema.from_pandas(df, preserve_index=False)
+            for i, campo in enumerate(esquema):
+                if pa.types.is_null(campo.type):
+                    esquema = esquema.set(i, pa.field(campo.name, pa.string()))
+                elif pa.types.is_dictionary(campo.type):
+                    tipo = pa.dictionary(pa.int32(), campo.type.value_type)
+                    esquema = esquema.set(i, pa.field(campo.name, tipo))
+            self._esquema = esquema
+            self._parquet = pq.ParquetWriter(ruta, self._esquema)
+        tabla = pa.Table.from_pandas(df, schema=self._esquema, preserve_index=False)
+        self._parquet.write_table(tabla)
+
+    def __exit__(self, *exc):
+        if self._csv is not None:
+            self._csv.close()
+        if self._parquet is not None:
+            self._parquet.close()
+        return False
+
+
+def _columnas_disponibles(ruta):
+    if ruta.suffix == ".parquet":
+        return pq.read_schema(ruta).names
+    return pd.read_csv(ruta, sep=detectar_separador(ruta, "utf-8-sig"), encoding="utf-8-sig", nrows=0).columns.tolist()
+
+
+def _resolver_columnas(ruta, columnas):
+    # 🔍 `columnas` puede ser una lista de nombres o una función que decide por nombre
+    if columnas is None:
+        return None
+    if callable(columnas):
+        return [c for c in _columnas_disponibles(ruta) if columnas(c.lower().strip())]
+    return list(columnas)
+
+
+def buscar_intermedio(nombre):
+    """
+    Devuelve el archivo del intermedio, o None si no existe. Se prefiere siempre el
+    formato configurado (FORMATO): con MAPA_EXPORTAR_CSV=1 el CSV se escribe después
+    del Parquet y no debe leerse en su lugar (perdería los tipos). El otro formato
+    solo se usa si el configurado no está.
+    """
+    otros = [f for f in ("parquet", "csv") if f != FORMATO]
+    for formato in [FORMATO] + otros:
+        ruta = ruta_intermedio(nombre, formato)
+        if ruta.exists() and (formato == "csv" or pq is not None):
+            return ruta
+    return None
+
+
+@medir()
+def cargar_intermedio(nombre, columnas=None):
+    """
+    Carga el intermedio `nombre` desde el formato configurado (FORMATO) o, si no
+    está, desde el otro (ver buscar_intermedio).
+
+    `columnas` permite leer solo una parte de la tabla: una lista de nombres o una
+    función que recibe el nombre (en minúsculas) y devuelve True si se necesita.
+    """
+    ruta = buscar_intermedio(nombre)
+    if ruta is None:
+        raise FileNotFoundError(f"❌ No se encontró el intermedio '{nombre}' en {DATA_DIR.resolve()}")
+
+    usecols = _resolver_columnas(ruta, columnas)
+    if ruta.suffix == ".parquet":
+        return pd.read_parquet(ruta, columns=usecols)
+    lector = Lector(ruta, INTERMEDIOS.get(nombre, {}), usecols=usecols,
+                    separador=detectar_separador(ruta, "utf-8-sig"), encoding="utf-8-sig")
+    return lector.leer()
@@ -0,0 +1,39 @@
+"""
+Mensajes de consola de las etapas según la verbosidad.
+
+Las etapas (mapa_seguridad.etapas) no llaman print() directamente, sino:
+    avisar()    siempre: advertencias (⚠️) y errores
+    informar()  verbosidad ≥ 1: resumen de cada etapa (archivos cargados y guardados, conteos)
+    detallar()  verbosidad ≥ 2: volcados de exploración (head(), columnas detectadas, tablas por nivel)
+
+Los scripts 01–08 usan verbosidad 2 (la salida de siempre). ejecutar_pipeline.py --en-memoria
+usa 1; con -v pasa a 2 y con -q a 0. MAPA_VERBOSIDAD fija el nivel inicial.
+"""
+import os
+
+VERBOSIDAD = int(os.environ.get("MAPA_VERBOSIDAD", "2"))
+
+
+def fijar_verbosidad(nivel):
+    """Cambia la verbosidad de todo el proceso (0, 1 o 2)."""
+    global VERBOSIDAD
+    VERBOSIDAD = int(nivel)
+
+
+def detallado():
+    """True si se muestran los volcados (para no calcular tablas que nadie va a ver)."""
+    return VERBOSIDAD >= 2
+
+
+def avisar(*args, **kwargs):
+    print(*args, **kwargs)
+
+
+def informar(*args, **kwargs):
+    if VERBOSIDAD >= 1:
+        print(*args, **kwargs)
+
+
+def detallar(*args, **kwargs):
+    if VERBOSIDAD >= 2:
+        print(*args, **kwargs)
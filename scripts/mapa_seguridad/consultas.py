@@ -0,0 +1,217 @@
+"""
+Consultas en memoria sobre la tabla final (data_final) para la API local.
+
+La tabla se carga una sola vez y se indexa por municipio, comuna, barrio,
+nivel_riesgo, alerta y tipo de delito. Cada índice guarda, para cada valor, la
+lista de filas donde aparece (formato CSR: un arreglo de filas ordenado por valor
+y el inicio de cada valor), así que un filtro es una búsqueda en un diccionario y
+una intersección de listas ordenadas, sin recorrer la tabla.
+
+Las respuestas se guardan en una caché LRU cuya llave incluye la versión de los
+datos: si 05 vuelve a escribir data_final, las respuestas viejas dejan de usarse.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.almacen import buscar_intermedio, cargar_intermedio
+from mapa_seguridad.normalizacion import normalizar_texto
+
+# Dimensiones que se pueden filtrar y las columnas de donde salen (se toma la
+# primera que tenga valor en cada fila: la comuna se busca por nombre o por código)
+DIMENSIONES = {
+    "municipio": ["municipio"],
+    "comuna": ["comuna", "codigo_comuna"],
+    "barrio": ["barrio", "codigo_barrio"],
+    "nivel_riesgo": ["nivel_riesgo"],
+    "alerta": ["alerta"],
+    "delito": ["tipo_delito"],
+}
+# Dimensiones con texto geográfico normalizado (el filtro se normaliza igual)
+GEOGRAFICAS = {"municipio", "comuna", "barrio"}
+
+PREFIJO_ARRIENDO = "promedio_arriendo_"
+
+
+class ErrorConsulta(ValueError):
+    """Consulta inválida (dimensión desconocida, parámetro mal escrito...)."""
+
+
+def coalescer(df, columnas):
+    """Primera columna de `columnas` con valor en cada fila (None si no hay ninguna)."""
+    presentes = [c for c in columnas if c in df.columns]
+    if not presentes:
+        return None
+    serie = df[presentes[0]].astype(object)
+    for c in presentes[1:]:
+        serie = serie.where(serie.notna(), df[c].astype(object))
+    return serie
+
+
+def _numero(valor):
+    # JSON no tiene NaN: los vacíos se devuelven como null
+    return None if pd.isna(valor) else round(float(valor), 6)
+
+
+class Indice:
+    """Filas de la tabla agrupadas por los valores de una dimensión (CSR)."""
+
+    def __init__(self, serie):
+        self.codigos, self.valores = pd.factorize(serie, sort=True)
+        self.posicion = {v: i for i, v in enumerate(self.valores)}
+        orden = np.argsort(self.codigos, kind="stable")
+        vacios = int((self.codigos < 0).sum())
+        self.filas = orden[vacios:]
+        conteos = np.bincount(self.codigos[self.codigos >= 0], minlength=len(self.valores))
+        self.inicio = np.concatenate([[0], np.cumsum(conteos)])
+
+    def filas_de(self, valores):
+        """Filas (ordenadas) donde la dimensión toma alguno de `valores`."""
+        codigos = sorted({self.posicion[v] for v in valores if v in self.posicion})
+        partes = [self.filas[self.inicio[c]:self.inicio[c + 1]] for c in codigos]
+        if not partes:
+            return np.zeros(0, dtype=np.int64)
+        return partes[0] if len(partes) == 1 else np.sort(np.concatenate(partes))
+
+    def conteos(self, filas):
+        """{valor: filas} entre `filas` (sin los vacíos)."""
+        codigos = self.codigos[filas]
+        conteos = np.bincount(codigos[codigos >= 0], minlength=len(self.valores))
+        return {str(self.valores[i]): int(n) for i, n in enumerate(conteos) if n}
+
+
+class IndiceConsultas:
+    """Tabla final indexada por dimensión, con filtros y resúmenes."""
+
+    def __init__(self, df, version=""):
+        self.df = df.reset_index(drop=True)
+        self.version = version
+        self.indices = {}
+        for nombre, columnas in DIMENSIONES.items():
+            serie = coalescer(self.df, columnas)
+            if serie is not None:
+                self.indices[nombre] = Indice(serie)
+        self.col_arriendo = [c for c in self.df.columns if c.startswith(PREFIJO_ARRIENDO)]
+        self.riesgo = self._numerica(["indice_riesgo"])
+        # Casos de la fila: los de robos (casos_totales) o, en las filas de la Policía, casos_municipio
+        self.casos = self._numerica(["casos_totales", "casos_municipio"])
+
+    def _numerica(self, columnas):
+        serie = coalescer(self.df, columnas)
+        if serie is None:
+            return np.full(len(self.df), np.nan)
+        return pd.to_numeric(serie, errors="coerce").to_numpy("float64")
+
+    @classmethod
+    def desde_intermedio(cls, nombre="data_final"):
+        return cls(cargar_intermedio(nombre), version=version_intermedio(nombre))
+
+    def filas(self, filtros):
+        """
+        Filas que cumplen todos los filtros ({dimensión: [valores]}): dentro de una
+        dimensión basta uno de los valores, entre dimensiones se piden todas.
+        """
+        listas = []
+        for dimension, valores in filtros.items():
+            if dimension not in self.indices:
+                raise ErrorConsulta(f"Dimensión desconocida: {dimension}. "
+                                    f"Disponibles: {', '.join(self.indices)}")
+            if dimension in GEOGRAFICAS:
+                valores = [normalizar_texto(v) for v in valores]
+            listas.append(self.indices[dimension].filas_de(valores))
+        if not listas:
+            return np.arange(len(self.df))
+        # Intersección empezando por la lista más corta
+        listas.sort(key=len)
+        filas = listas[0]
+        for otra in listas[1:]:
+            filas = np.intersect1d(filas, otra, assume_unique=True)
+        return filas
+
+    def opciones(self):
+        """Valores de cada dimensión (para llenar los filtros del mapa)."""
+        return {nombre: [str(v) for v in indice.valores] for nombre, indice in self.indices.items()}
+
+    def top_municipios(self, filas, cuantos=5):
+        """Municipios con más casos entre `filas`, con su índice de riesgo promedio."""
+        if "municipio" not in self.indices:
+            return []
+        indice = self.indices["municipio"]
+        filas = filas[indice.codigos[filas] >= 0]
+        codigos, casos, riesgo = indice.codigos[filas], self.casos[filas], self.riesgo[filas]
+        n = len(indice.valores)
+        zonas = np.bincount(codigos, minlength=n)
+        total = np.bincount(codigos, weights=np.nan_to_num(casos), minlength=n)
+        con_riesgo = ~np.isnan(riesgo)
+        n_riesgo = np.bincount(codigos[con_riesgo], minlength=n)
+        suma_riesgo = np.bincount(codigos[con_riesgo], weights=riesgo[con_riesgo], minlength=n)
+        presentes = np.flatnonzero(zonas)
+        # Más casos primero; empates por nombre (el orden de los códigos)
+        mejores = presentes[np.lexsort((presentes, -total[presentes]))][:cuantos]
+        return [{"municipio": str(indice.valores[c]), "casos": _numero(total[c]), "zonas": int(zonas[c]),
+                 "indice_riesgo": _numero(suma_riesgo[c] / n_riesgo[c]) if n_riesgo[c] else None}
+                for c in mejores]
+
+    def resumen(self, filtros, top=5):
+        """Conteos por nivel y alerta, riesgo y arriendo promedio, y municipios con más casos."""
+        filas = self.filas(filtros)
+        resultado = {"filas": int(len(filas))}
+        for nombre in ("nivel_riesgo", "alerta"):
+            if nombre in self.indices:
+                resultado[f"por_{nombre}"] = self.indices[nombre].conteos(filas)
+        riesgo = self.riesgo[filas]
+        riesgo = riesgo[~np.isnan(riesgo)]
+        resultado["indice_riesgo_promedio"] = _numero(riesgo.mean()) if len(riesgo) else None
+        resultado["arriendo_promedio"] = {
+            c[len(PREFIJO_ARRIENDO):]: _numero(self.df[c].iloc[filas].mean()) for c in self.col_arriendo}
+        resultado["top_municipios"] = self.top_municipios(filas, top)
+        return resultado
+
+    def registros(self, filtros, limite=100, desde=0):
+        """Filas que cumplen los filtros, paginadas, como lista de registros."""
+        filas = self.filas(filtros)
+        pagina = self.df.iloc[filas[desde:desde + limite]]
+        pagina = pagina.astype(object).where(pagina.notna(), None)
+        return {"filas": int(len(filas)), "desde": desde, "registros": pagina.to_dict(orient="records")}
+
+
+def version_intermedio(nombre="data_final"):
+    """Versión de los datos: cambia cada vez que se reescribe el intermedio."""
+    ruta = buscar_intermedio(nombre)
+    if ruta is None:
+        return ""
+    estado = ruta.stat()
+    return f"{ruta.suffix[1:]}-{estado.st_mtime_ns:x}-{estado.st_size:x}"
+
+
+class CacheLRU:
+    """Caché de respuestas con capacidad fija; descarta la usada hace más tiempo."""
+
+    def __init__(self, capacidad=1024):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, calcular):
+        """Valor en caché para `clave`, o el resultado de `calcular()` (que se guarda)."""
+        with self._candado:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave], True
+            self.fallos += 1
+        valor = calcular()
+        if self.capacidad > 0:
+            with self._candado:
+                self._datos[clave] = valor
+                self._datos.move_to_end(clave)
+                while len(self._datos) > self.capacidad:
+                    self._datos.popitem(last=False)
+        return valor, False
+
+    def __len__(self):
+        return len(self._datos)
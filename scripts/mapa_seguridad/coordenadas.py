@@ -0,0 +1,95 @@
+"""
+Recuperación de latitud y longitud en el archivo de robos de Kaggle.
+
+Las coordenadas llegan con puntos de miles en lugares arbitrarios:
+
+    latitud   "627.623.616"     → 6.27623616
+    longitud  "-7.555.353.312"  → -75.55353312
+    latitud   "6.253.084"       → 6.253084
+
+Como los separadores no dicen dónde va la coma decimal, se quitan todos y el
+número se reescala según su cantidad de cifras: se prueba con 1, 2 y 3 cifras en
+la parte entera y se queda la primera lectura que cae dentro del rectángulo del
+Valle de Aburrá. Todo se hace sobre la columna completa, sin recorrer filas.
+
+Las filas que no se pueden recuperar quedan vacías (NaN) con su motivo:
+"vacía", "no numérica" o "fuera del Valle de Aburrá".
+"""
+import numpy as np
+import pandas as pd
+
+# 🗺️ Rectángulo del Valle de Aburrá (grados decimales)
+LAT_MIN, LAT_MAX = 5.95, 6.55
+LON_MIN, LON_MAX = -75.75, -75.20
+
+# Cifras posibles en la parte entera de un grado (6.2… → 1, -75.5… → 2)
+CIFRAS_ENTERAS = (1, 2, 3)
+
+VACIA = "vacía"
+NO_NUMERICA = "no numérica"
+FUERA_DE_RANGO = "fuera del Valle de Aburrá"
+
+
+# Códigos Unicode que se ignoran al leer el número (relleno, espacios, separadores y signo)
+IGNORADOS = [0, ord("\t"), ord(" "), ord("."), ord(","), ord("+"), ord("-")]
+
+
+def reparar_coordenada(serie, minimo, maximo):
+    """
+    Reconstruye los grados decimales de una columna de texto.
+    Devuelve (valores float32, motivo) — motivo es None en las filas recuperadas.
+
+    Los textos se pasan a una matriz de códigos Unicode (una fila por valor, una
+    columna por carácter), así que cifras, signo y separadores se leen con
+    operaciones de numpy sobre toda la columna.
+    """
+    textos = serie.where(serie.notna(), "").astype(str).to_numpy(dtype=str)
+    ancho = max(textos.dtype.itemsize // 4, 1)
+    codigos = np.ascontiguousarray(textos, dtype=f"U{ancho}").view(np.uint32).reshape(len(textos), ancho)
+
+    es_cifra = (codigos >= ord("0")) & (codigos <= ord("9"))
+    es_blanco = np.isin(codigos, IGNORADOS[:3])
+    vacia = es_blanco.all(axis=1)
+    es_numero = (es_cifra | np.isin(codigos, IGNORADOS)).all(axis=1) & es_cifra.any(axis=1)
+    primero = np.argmax(~es_blanco, axis=1)
+    negativo = codigos[np.arange(len(textos)), primero] == ord("-")
+
+    # El número entero que forman todas las cifras, leído columna por columna
+    enteros = np.zeros(len(textos))
+    cifras = np.zeros(len(textos))
+    for j in range(ancho):
+        cifra = es_cifra[:, j]
+        enteros = np.where(cifra, enteros * 10 + (codigos[:, j].astype(np.float64) - ord("0")), enteros)
+        cifras += cifra
+    enteros[~es_numero] = np.nan
+    signo = np.where(negativo, -1.0, 1.0)
+
+    valores = np.full(len(textos), np.nan)
+    for enteras in CIFRAS_ENTERAS:
+        candidato = signo * enteros / 10.0 ** (cifras - enteras)
+        encaja = np.isnan(valores) & (candidato >= minimo) & (candidato <= maximo)
+        valores[encaja] = candidato[encaja]
+
+    motivo = np.select([vacia, ~es_numero, np.isnan(valores)], [VACIA, NO_NUMERICA, FUERA_DE_RANGO], None)
+    return pd.Series(valores.astype(np.float32), index=serie.index), pd.Series(motivo, index=serie.index)
+
+
+def reparar_coordenadas(df, col_lat, col_lon):
+    """
+    Agrega a `df` las columnas float32 `latitud` y `longitud` a partir de las
+    columnas de texto `col_lat` y `col_lon`. Un punto solo se conserva si las dos
+    coordenadas se recuperan; si no, ambas quedan vacías.
+
+    Devuelve las filas no recuperadas con su motivo (DataFrame [col_lat, col_lon, motivo]).
+    """
+    latitud, motivo_lat = reparar_coordenada(df[col_lat], LAT_MIN, LAT_MAX)
+    longitud, motivo_lon = reparar_coordenada(df[col_lon], LON_MIN, LON_MAX)
+    motivo = motivo_lat.where(motivo_lat.notna(), motivo_lon)
+    fallidas = motivo.notna()
+
+    df["latitud"] = latitud.mask(fallidas)
+    df["longitud"] = longitud.mask(fallidas)
+
+    rechazadas = df.loc[fallidas, [col_lat, col_lon]].copy()
+    rechazadas["motivo"] = motivo[fallidas]
+    return rechazadas
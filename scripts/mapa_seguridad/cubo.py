@@ -0,0 +1,160 @@
+"""
+Cubo de estadísticas precalculadas para el panel lateral del mapa (web/estadisticas.json).
+
+El panel muestra, para la selección de filtros (nivel_riesgo × alerta × municipio
+× delito, cada uno con la opción "todos"), cuántas zonas hay, el promedio de
+casos, el municipio con más casos, el arriendo promedio y la gráfica por alerta.
+En vez de recorrer todas las filas en el navegador con cada cambio de filtro, se
+calcula aquí una celda por cada combinación que tenga datos:
+
+    llave de la celda = ((c_nivel · (n_alerta + 1) + c_alerta) · (n_municipio + 1) + c_municipio) · (n_delito + 1) + c_delito
+
+donde c = 0 significa "todos" y c = i + 1 es el valor i de la dimensión. Cada fila
+cae en 2⁴ = 16 celdas (cada dimensión con su valor o con "todos"). Para no
+repetir eso por fila, primero se suman las filas por combinación completa de los
+cuatro filtros (una pasada) y las 16 celdas se arman sobre esas combinaciones,
+que son pocas. En el navegador cualquier selección es una sola búsqueda en un Map.
+
+Cada celda guarda conteos y sumas (que se pueden combinar) y, como el máximo no
+se puede armar a partir de otras celdas, el municipio con más casos ya resuelto.
+"""
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.consultas import DIMENSIONES, PREFIJO_ARRIENDO, coalescer
+from mapa_seguridad.instrumentacion import medir
+from mapa_seguridad.paquete_web import codificar, guardar_json
+
+FORMATO = "cubo-estadisticas"
+VERSION = 1
+
+DIMENSIONES_CUBO = ["nivel_riesgo", "alerta", "municipio", "delito"]
+SIN_MUNICIPIO = -1
+
+
+def _numerica(df, columnas):
+    serie = coalescer(df, columnas)
+    if serie is None:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(serie, errors="coerce").to_numpy("float64")
+
+
+def medidas_por_fila(df):
+    """Promedio de casos, casos y arriendo promedio (de los tipos de inmueble con dato) de cada fila."""
+    arriendo = [c for c in df.columns if c.startswith(PREFIJO_ARRIENDO)]
+    return {
+        "promedio": _numerica(df, ["promedio_robos", "promedio_robos_municipio"]),
+        "casos": _numerica(df, ["casos_totales", "casos_municipio"]),
+        "arriendo": df[arriendo].mean(axis=1).to_numpy("float64") if arriendo else np.full(len(df), np.nan),
+    }
+
+
+def _suma(celdas, valores, n_celdas):
+    presentes = ~np.isnan(valores)
+    suma = np.bincount(celdas[presentes], weights=valores[presentes], minlength=n_celdas)
+    cuantos = np.bincount(celdas[presentes], minlength=n_celdas)
+    return suma, cuantos
+
+
+def construir_cubo(df, dimensiones=DIMENSIONES_CUBO):
+    """
+    Devuelve (valores de cada dimensión, DataFrame de celdas). Las columnas de las
+    celdas son: celda, zonas, suma_promedio, n_promedio, suma_arriendo,
+    n_arriendo, suma_casos y municipio_top (índice en los valores de municipio).
+    """
+    valores, radios = {}, []
+    llave = np.zeros(len(df), dtype=np.int64)
+    for nombre in dimensiones:
+        serie = coalescer(df, DIMENSIONES[nombre])
+        if serie is None:
+            serie = pd.Series(None, index=df.index, dtype=object)
+        codigos, v = pd.factorize(serie.astype(object), sort=True)
+        valores[nombre] = [str(x) for x in v]
+        radios.append(len(v) + 1)
+        # Código i + 1 para el valor i; 0 para las filas vacías (que solo cuentan en "todos")
+        llave = llave * radios[-1] + (codigos + 1)
+
+    # 1️⃣ Una pasada sobre las filas: sumas por combinación completa de los cuatro filtros
+    grupo, combinaciones = pd.factorize(llave)
+    n_base = len(combinaciones)
+    medidas = medidas_por_fila(df)
+    base = {"zonas": np.bincount(grupo, minlength=n_base)}
+    for nombre in ("promedio", "arriendo", "casos"):
+        base[f"suma_{nombre}"], base[f"n_{nombre}"] = _suma(grupo, medidas[nombre], n_base)
+    codigos_base, resto = [], np.asarray(combinaciones, dtype=np.int64)
+    for radio in reversed(radios):
+        resto, codigo = np.divmod(resto, radio)
+        codigos_base.insert(0, codigo)
+
+    # 2️⃣ Las 16 celdas de cada combinación: para cada dimensión, su valor o "todos"
+    llaves, origen = [], []
+    for usar in product([False, True], repeat=len(dimensiones)):
+        llave = np.zeros(n_base, dtype=np.int64)
+        validas = np.ones(n_base, dtype=bool)
+        for codigo, radio, usa in zip(codigos_base, radios, usar):
+            llave = llave * radio + (codigo if usa else 0)
+            if usa:
+                validas &= codigo > 0
+        llaves.append(llave[validas])
+        origen.append(np.flatnonzero(validas))
+    llaves, origen = np.concatenate(llaves), np.concatenate(origen)
+    celdas, celda_de = np.unique(llaves, return_inverse=True)
+    n = len(celdas)
+
+    resultado = pd.DataFrame({"celda": celdas})
+    for columna in ("zonas", "suma_promedio", "n_promedio", "suma_arriendo", "n_arriendo", "suma_casos"):
+        suma = np.bincount(celda_de, weights=base[columna][origen], minlength=n)
+        resultado[columna] = suma if columna.startswith("suma_") else suma.round().astype(np.int64)
+    municipio = codigos_base[dimensiones.index("municipio")][origen] if "municipio" in dimensiones else None
+    resultado["municipio_top"] = _municipio_top(celda_de, municipio, base["suma_casos"][origen], n)
+    return valores, resultado
+
+
+def _municipio_top(celda_de, municipio, casos, n_celdas):
+    # Casos por (celda, municipio) y, en cada celda, el municipio con más casos
+    # (empates: el primero en orden alfabético)
+    top = np.full(n_celdas, SIN_MUNICIPIO, dtype=np.int64)
+    if municipio is None:
+        return top
+    validos = municipio > 0
+    radio = municipio.max(initial=0) + 1
+    pares, inverso = np.unique(celda_de[validos] * radio + municipio[validos], return_inverse=True)
+    suma = np.bincount(inverso, weights=casos[validos])
+    celda, muni = np.divmod(pares, radio)
+    orden = np.lexsort((muni, -suma, celda))
+    primeros = orden[np.r_[True, np.diff(celda[orden]) > 0]] if len(orden) else orden
+    top[celda[primeros]] = muni[primeros] - 1
+    return top
+
+
+def llave_celda(valores, seleccion, dimensiones=DIMENSIONES_CUBO):
+    """Llave de la celda para {dimensión: valor} (las dimensiones que faltan = "todos")."""
+    llave = 0
+    for nombre in dimensiones:
+        elegido = seleccion.get(nombre)
+        codigo = valores[nombre].index(elegido) + 1 if elegido in valores[nombre] else 0
+        if elegido is not None and codigo == 0:
+            return None  # valor que no existe: ninguna celda
+        llave = llave * (len(valores[nombre]) + 1) + codigo
+    return llave
+
+
+def codificar_cubo(valores, celdas, dimensiones=DIMENSIONES_CUBO):
+    """Cubo → diccionario JSON: dimensiones y celdas en formato columnar (mapa_seguridad.paquete_web)."""
+    celdas = celdas.assign(municipio_top=celdas["municipio_top"].where(celdas["municipio_top"] >= 0))
+    return {
+        "formato": FORMATO,
+        "version": VERSION,
+        "dimensiones": [{"nombre": n, "valores": valores[n]} for n in dimensiones],
+        "celdas": codificar(celdas),
+    }
+
+
+@medir()
+def guardar_cubo(df, ruta, dimensiones=DIMENSIONES_CUBO):
+    """Calcula el cubo de `df` y lo escribe en `ruta` (+ .gz). Devuelve las rutas escritas y el número de celdas."""
+    valores, celdas = construir_cubo(df, dimensiones)
+    contenido = codificar_cubo(valores, celdas, dimensiones)
+    return guardar_json(contenido, ruta), len(celdas)
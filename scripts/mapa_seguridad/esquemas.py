@@ -0,0 +1,239 @@
+"""
+Registro de esquemas: columnas y tipos declarados para cada archivo que lee el pipeline.
+
+En vez de dejar que pandas adivine los tipos (low_memory=False, todo como texto
+de Python), cada fuente declara qué columnas se leen (usecols) y de qué tipo:
+
+    "categoria"   texto repetido (barrio, modalidad, sede…): un código entero por fila
+                  y cada valor distinto guardado una sola vez
+    "texto"       texto que se procesa carácter a carácter (coordenadas de Kaggle)
+    "Int8"…"Int64" enteros con vacíos; se leen como categoría y se convierten solo los
+                  valores distintos (un "N/A" en medio del archivo queda vacío, no rompe la lectura)
+    "float32"…    números con decimales, leídos directamente
+    "fecha"       se lee como categoría y se interpreta con mapa_seguridad.fechas
+                  (formato detectado una vez, también entre bloques del modo streaming)
+
+Los nombres se comparan ya normalizados (minúsculas, sin espacios a los lados) y
+el DataFrame sale con esos nombres. En los archivos originales las columnas que no
+están declaradas no se leen; en los intermedios CSV se leen con el tipo inferido.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.consola import avisar, detallar
+from mapa_seguridad.fechas import detectar_formato, parsear_fechas
+
+DATA_DIR = Path("data")
+
+ENTEROS = {"Int8", "Int16", "Int32", "Int64"}
+
+
+@dataclass
+class Esquema:
+    """Columnas declaradas de un archivo: {nombre normalizado: tipo}."""
+    columnas: dict
+    archivo: Path = None
+    separador: str = None  # None = se detecta con la primera línea
+
+
+_SEGURIDAD = {f"seguridad.{c}": "categoria" for c in [
+    "sexo", "estado_civil", "medio_transporte", "nivel_academico", "testigo", "conducta",
+    "modalidad", "conducta_especial", "arma_medio", "nombre_barrio", "codigo_barrio",
+    "codigo_comuna", "lugar", "sede_receptora", "bien", "categoria_bien", "color",
+]}
+
+_POLICIA = {
+    "departamento": "categoria",
+    "municipio": "categoria",
+    "codigo dane": "categoria",
+    "armas medios": "categoria",
+    "fecha hecho": "fecha",
+    "genero": "categoria",
+    "grupo etario": "categoria",
+    "tipo de hurto": "categoria",
+    "cantidad": "Int32",
+}
+
+_ARRIENDOS = {
+    "sector": "categoria",
+    "comuna": "categoria",
+    "municipio": "categoria",
+    **{f"{medida}_{tipo}": "categoria"
+       for tipo in ("apartamento", "casa", "local") for medida in ("promedio_arriendo", "rango")},
+}
+
+# 📄 Archivos originales (etapas 01–04)
+FUENTES = {
+    "policia": Esquema(_POLICIA, DATA_DIR / "Reporte_Hurto_por_Modalidades_Policía_Nacional.csv", ","),
+    "medata": Esquema({
+        "fecha_hecho": "categoria",  # año o fecha completa: 02 decide cómo leerlo
+        "conducta": "categoria",
+        "codigo_comuna": "categoria",
+        "cantidad_casos": "Int32",
+    }, DATA_DIR / "consolidado_cantidad_casos_criminalidad_en_comunas_por_año.csv"),
+    "kaggle": Esquema({
+        "seguridad.fecha_hecho": "fecha",
+        "seguridad.latitud": "texto",
+        "seguridad.longitud": "texto",
+        "seguridad.edad": "Int16",
+        **_SEGURIDAD,
+    }, DATA_DIR / "robbery of people in Medellin.csv"),
+    "arriendos": Esquema(_ARRIENDOS, DATA_DIR / "arriendos_valle_aburra_2025.csv"),
+}
+
+# 🧊 Intermedios *_limpio (solo se usan al leerlos desde CSV: el Parquet ya trae sus tipos)
+# Columnas que geografia.etiquetar agrega a cada tabla con zona_id
+_ETIQUETAS_ZONA = ["zona_clave", "nivel_geo", "departamento", "municipio", "codigo_comuna", "comuna",
+                   "codigo_barrio", "barrio"]
+
+INTERMEDIOS = {
+    "hurto_policia_limpio": _POLICIA,
+    "robos_medellin_limpio": {
+        "seguridad.fecha_hecho": "fecha",
+        "seguridad.latitud": "texto",
+        "seguridad.longitud": "texto",
+        "seguridad.edad": "Int16",
+        **_SEGURIDAD,
+        "latitud": "float32",
+        "longitud": "float32",
+        "anio": "Int16",
+        "mes": "Int8",
+    },
+    "criminalidad_comunas_limpio": {"comuna": "categoria", "anio": "Int16", "casos": "Int32"},
+    "arriendos_limpio": {
+        "sector": "categoria",
+        "comuna": "categoria",
+        "municipio": "categoria",
+        **{f"{medida}_{tipo}": "float64"
+           for tipo in ("apartamento", "casa", "local") for medida in ("promedio_arriendo", "rango")},
+    },
+    # 🧭 Dimensión geográfica (mapa_seguridad.geografia): los códigos como texto ("0410")
+    "geo_zonas": {
+        "zona_id": "int32", "nivel": "categoria", "nombre": "texto", "codigo": "texto",
+        "padre_id": "int32", "departamento_id": "int32", "municipio_id": "int32", "comuna_id": "int32",
+        "zona_clave": "texto",
+    },
+    "geo_alias": {"nivel": "categoria", "ambito_id": "int32", "alias": "texto", "zona_id": "int32"},
+    "riesgo_ventanas": {"zona_id": "int32", **{c: "categoria" for c in _ETIQUETAS_ZONA}},
+    # Las columnas geográficas como texto: los códigos ("4", "0410") no se vuelven números
+    "data_final": {"zona_id": "int32", **{c: "categoria" for c in [
+        *_ETIQUETAS_ZONA, "tipo_delito", "sector", "nivel_riesgo", "alerta",
+    ]}},
+}
+
+
+def normalizar_nombre(columna):
+    return str(columna).lower().strip()
+
+
+def detectar_separador(ruta, encoding="utf-8"):
+    """',' salvo que la primera línea tenga ';' o tabuladores."""
+    with open(ruta, "r", encoding=encoding, errors="ignore") as f:
+        primera = f.readline()
+    return ";" if ";" in primera else "\t" if "\t" in primera else ","
+
+
+def detectar_encoding(ruta, muestra=1 << 20):
+    """utf-8-sig si el inicio del archivo es UTF-8 válido; si no, latin-1."""
+    with open(ruta, "rb") as f:
+        inicio = f.read(muestra)
+    try:
+        # Un carácter de varios bytes puede quedar cortado al final de la muestra
+        inicio.decode("utf-8")
+    except UnicodeDecodeError as error:
+        if error.start < len(inicio) - 3:
+            return "latin-1"
+    return "utf-8-sig"
+
+
+def tipo_lectura(tipo):
+    """dtype que se le pasa a read_csv para un tipo declarado."""
+    if tipo in ("categoria", "fecha") or tipo in ENTEROS:
+        return "category"
+    if tipo == "texto":
+        return str
+    return tipo
+
+
+def a_entero(serie, tipo="Int64"):
+    """Categoría (o texto) → entero con vacíos, convirtiendo solo los valores distintos."""
+    codigos, unicos = pd.factorize(serie)
+    numeros = pd.to_numeric(pd.Series(unicos, dtype=object), errors="coerce")
+    # Los decimales que no son enteros ("2.5") quedan vacíos en vez de truncarse
+    numeros = numeros.where(numeros == numeros.round()).to_numpy("float64")
+    # El código -1 (vacío) toma el último elemento, que es NaN
+    valores = np.append(numeros, np.nan)[codigos]
+    vacios = np.isnan(valores)
+    enteros = np.where(vacios, 0, valores).astype(tipo.lower())
+    return pd.Series(pd.arrays.IntegerArray(enteros, vacios), index=serie.index, name=serie.name)
+
+
+class Lector:
+    """
+    Lectura de un CSV con tipos declarados. Guarda el formato de cada columna de
+    fecha detectado en el primer bloque para reutilizarlo en los siguientes.
+    """
+
+    def __init__(self, ruta, tipos, solo_declaradas=False, usecols=None, separador=None, encoding=None):
+        self.ruta = Path(ruta)
+        self.encoding = encoding or detectar_encoding(self.ruta)
+        self.separador = separador or detectar_separador(self.ruta, self.encoding)
+        encabezado = pd.read_csv(self.ruta, sep=self.separador, encoding=self.encoding, nrows=0).columns
+        reales = {normalizar_nombre(c): c for c in encabezado}
+        self.tipos = {c: t for c, t in tipos.items() if c in reales}
+        self.faltantes = [c for c in tipos if c not in reales]
+
+        if usecols is not None:
+            elegidas = [normalizar_nombre(c) for c in usecols]
+        elif solo_declaradas:
+            elegidas = list(self.tipos)
+        else:
+            elegidas = list(reales)
+        self.ignoradas = [c for c in reales if c not in elegidas]
+        self.usecols = [reales[c] for c in elegidas if c in reales]
+        self.dtype = {reales[c]: tipo_lectura(t) for c, t in self.tipos.items() if c in elegidas}
+        self.formatos = {}
+
+    def leer(self, chunksize=None, **opciones):
+        """DataFrame con los tipos declarados (o un iterador de bloques si hay chunksize)."""
+        # Sin bloques, el parser arma cada categoría de una vez (low_memory=False) en vez
+        # de unir las categorías de cada tramo interno del archivo
+        opciones.setdefault("low_memory", chunksize is not None)
+        lector = pd.read_csv(self.ruta, sep=self.separador, encoding=self.encoding, usecols=self.usecols,
+                             dtype=self.dtype, chunksize=chunksize, **opciones)
+        if chunksize:
+            return (self.tipar(bloque) for bloque in lector)
+        return self.tipar(lector)
+
+    def tipar(self, df):
+        df.columns = [normalizar_nombre(c) for c in df.columns]
+        for columna, tipo in self.tipos.items():
+            if columna not in df.columns:
+                continue
+            if tipo in ENTEROS:
+                df[columna] = a_entero(df[columna], tipo)
+            elif tipo == "fecha":
+                if self.formatos.get(columna) is None:
+                    self.formatos[columna] = detectar_formato(df[columna])
+                df[columna] = parsear_fechas(df[columna], self.formatos[columna])
+        return df
+
+
+def leer_fuente(nombre, chunksize=None, **opciones):
+    """
+    Lee el archivo original de la fuente `nombre` (ver FUENTES) con sus columnas y
+    tipos declarados. Con chunksize devuelve un iterador de bloques ya tipados.
+    """
+    esquema = FUENTES[nombre]
+    if not esquema.archivo.exists():
+        raise FileNotFoundError(f"❌ No se encontró el archivo: {esquema.archivo.resolve()}")
+    lector = Lector(esquema.archivo, esquema.columnas, solo_declaradas=True, separador=esquema.separador)
+    detallar(f"📐 Esquema '{nombre}': {len(lector.usecols)} columnas declaradas ({lector.encoding}, separador '{lector.separador}')")
+    if lector.faltantes:
+        avisar(f"⚠️ Columnas declaradas que no están en el archivo: {lector.faltantes}")
+    if lector.ignoradas:
+        detallar(f"ℹ️ Columnas no declaradas (no se leen): {lector.ignoradas}")
+    return lector.leer(chunksize=chunksize, **opciones)
@@ -0,0 +1,52 @@
+"""
+Las etapas del pipeline como funciones importables.
+
+Cada etapa recibe y devuelve DataFrames, y además escribe sus salidas (intermedios
+*_limpio, data_final, archivos web) igual que antes:
+
+    from mapa_seguridad.etapas import cargar_kaggle, unir_y_riesgo, validar_salida
+
+    robos = cargar_kaggle()                          # 03: carga → limpieza
+    salida = unir_y_riesgo({"robos": robos})         # 05: agregación → unión → clasificación → exportación
+    reporte = validar_salida(salida["data_final"])   # 06
+
+Lo que no se pase se lee del disco, así que cualquier etapa se puede llamar sola
+(desde un proceso de larga duración, un notebook o un benchmark). Los scripts
+01–08 son envoltorios de estas funciones y ejecutar_pipeline.py --en-memoria las
+encadena en un solo proceso con PASOS, pasando las tablas en memoria.
+"""
+from mapa_seguridad.etapas.carga import cargar_arriendos, cargar_kaggle, cargar_medata, cargar_policia
+from mapa_seguridad.etapas.salidas import ESTRICTA, calcular_hotspots, generar_teselas, validar_salida
+from mapa_seguridad.etapas.union import FILES, unir_y_riesgo
+
+
+def _validar(memoria):
+    reporte = validar_salida(memoria.get("data_final"), memoria)
+    if not reporte["ok"] and ESTRICTA:
+        raise RuntimeError(f"data_final no pasó la validación ({reporte['errores']} errores)")
+    return {}
+
+
+def _teselas(memoria):
+    generar_teselas(memoria.get("robos_medellin_limpio"))
+    return {}
+
+
+def _hotspots(memoria):
+    calcular_hotspots(memoria.get("robos_medellin_limpio"))
+    return {}
+
+
+# Cada paso recibe las tablas ya producidas en el proceso ({intermedio: DataFrame}) y
+# devuelve las suyas; lo que no esté en memoria (etapas tomadas de la caché) se lee del disco
+PASOS = {
+    "01_cargar_policia": lambda memoria: {"hurto_policia_limpio": cargar_policia()},
+    "02_cargar_medata": lambda memoria: {"criminalidad_comunas_limpio": cargar_medata()},
+    "03_cargar_kaggle": lambda memoria: {"robos_medellin_limpio": cargar_kaggle()},
+    "04_cargar_arriendos": lambda memoria: {"arriendos_limpio": cargar_arriendos()},
+    "05_unir_y_riesgo": lambda memoria: unir_y_riesgo(
+        {clave: memoria.get(nombre) for clave, (nombre, _) in FILES.items()}),
+    "06_validar_salida": _validar,
+    "07_generar_teselas": _teselas,
+    "08_calcular_hotspots": _hotspots,
+}
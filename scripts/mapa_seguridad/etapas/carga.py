@@ -0,0 +1,730 @@
+"""
+Etapas 01–04: cargar y limpiar cada fuente original.
+
+Cada función lee su archivo original (columnas y tipos del registro de esquemas),
+lo limpia, guarda el intermedio *_limpio (mapa_seguridad.almacen) y devuelve el
+DataFrame limpio, para que la unión (mapa_seguridad.etapas.union) lo use sin
+volver a leerlo del disco:
+
+    policia = cargar_policia()
+    comunas = cargar_medata()
+    robos = cargar_kaggle()
+    arriendos = cargar_arriendos()
+
+Los scripts 01_cargar_policia.py … 04_cargar_arriendos.py solo llaman a estas funciones.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from mapa_seguridad.almacen import EscritorIntermedio, guardar_intermedio
+from mapa_seguridad.consola import avisar, detallado, detallar, informar
+from mapa_seguridad.coordenadas import reparar_coordenadas
+from mapa_seguridad.esquemas import a_entero, leer_fuente
+from mapa_seguridad.fechas import detectar_formato, parsear_fechas
+from mapa_seguridad.instrumentacion import bloque, filas, medir
+from mapa_seguridad.normalizacion import normalizar_columnas, normalizar_geo
+from mapa_seguridad.perfil import guardar_perfil, mas_frecuentes, perfilar
+from mapa_seguridad.poligonos import asignar_poligonos, cargar_limites, codigos_asignados
+
+DATA_DIR = Path("data")
+
+# 🧮 Tamaño de cada bloque de lectura del reporte de la Policía (modo streaming)
+# El reporte nacional pesa varios GB: se lee por partes de CHUNK_SIZE filas,
+# se filtra y se escribe al archivo limpio sin tener todo el país en memoria.
+# Con MAPA_CHUNKSIZE=0 se vuelve al modo clásico (todo el archivo en memoria).
+CHUNK_SIZE = int(os.environ.get("MAPA_CHUNKSIZE", "200000"))
+
+# 🗺️ Límites de comunas y barrios (GeoJSON, opcionales): si existen, cada robo se
+# ubica en su polígono para revisar y completar los códigos escritos a mano
+LIMITES = {
+    "codigo_comuna": DATA_DIR / "limites_comunas.geojson",
+    "codigo_barrio": DATA_DIR / "limites_barrios.geojson",
+}
+CODIGOS_VACIOS = ["", "SIN DATO", "SIN INFORMACION", "NAN"]
+
+# 📊 Perfil de columnas de los robos para el mapa web y 06_validar_salida.py
+OUT_PERFIL = Path("web") / "perfil_robos.json"
+
+
+# ✨ Limpieza de la Policía que se aplica igual a todo el archivo o a cada bloque
+def filtrar_antioquia(df):
+    # Algunos registros pueden tener letras minúsculas o espacios, por eso usamos .str.contains
+    filtro_antioquia = df["departamento"].str.contains("ANTIOQUIA", case=False, na=False)
+    return df[filtro_antioquia].copy()
+
+
+def normalizar_municipio(df):
+    # Mayúsculas, sin tildes ni espacios extras: la misma regla de todas las etapas
+    normalizar_columnas(df, ["departamento", "municipio"])
+    return df
+
+
+def _concatenar(partes, columnas):
+    # Cada bloque trae sus propias categorías: al unirlos se vuelven a declarar
+    if not partes:
+        return pd.DataFrame(columns=columnas)
+    df = pd.concat(partes, ignore_index=True)
+    for c in partes[0].columns:
+        if isinstance(partes[0][c].dtype, pd.CategoricalDtype) and df[c].dtype == object:
+            df[c] = df[c].astype("category")
+    return df
+
+
+@medir()
+def cargar_policia(chunksize=None, devolver=True):
+    """
+    Etapa 01: hurtos de la Policía Nacional filtrados a Antioquia → hurto_policia_limpio.
+
+    Con `chunksize` > 0 (por defecto MAPA_CHUNKSIZE) el archivo se lee por bloques y el
+    intermedio se escribe bloque a bloque. Devuelve el DataFrame limpio, o None con
+    `devolver=False` (así el modo streaming no guarda las filas en memoria).
+    """
+    #-------------------------------------------------
+    #BLOQUE 1 — Cargar el archivo original y revisar su tamaño
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar el archivo original y revisar su tamaño")
+
+    # 📂 1️⃣ El archivo original, sus columnas y sus tipos están declarados en el
+    # registro de esquemas (fuente "policia", ver mapa_seguridad.esquemas): los textos
+    # se leen como categorías, "cantidad" como entero y "fecha hecho" ya como fecha
+    # (el formato se detecta con el primer bloque y se reutiliza en los demás)
+    salida_nombre = "hurto_policia_limpio"
+    chunksize = CHUNK_SIZE if chunksize is None else chunksize
+
+    if chunksize > 0:
+        #-------------------------------------------------
+        # MODO STREAMING — BLOQUES 1 a 5 aplicados a cada parte del archivo
+        #-------------------------------------------------
+        bloque("MODO STREAMING — BLOQUES 1 a 5 aplicados a cada parte del archivo")
+
+        # 📥 2️⃣ Abrir el archivo como un lector por partes
+        # Los tipos vienen del esquema: no cambian de un bloque a otro y los nombres
+        # de las columnas ya llegan en minúsculas y sin espacios.
+        lector = leer_fuente("policia", chunksize=chunksize)
+        informar(f"✅ Archivo abierto en modo streaming (bloques de {chunksize:,} filas)")
+
+        total_original = 0
+        total_antioquia = 0
+        nulos = None
+        primeras = []
+        partes = []
+        columnas = []
+
+        # 💾 3️⃣ Un solo archivo de salida que crece bloque a bloque
+        with EscritorIntermedio(salida_nombre) as salida:
+            for i, chunk in enumerate(lector):
+                total_original += len(chunk)
+
+                if i == 0:
+                    detallar("\n🧹 Nombres de columnas normalizados:")
+                    detallar(chunk.columns.tolist())
+                    columnas = chunk.columns.tolist()
+
+                chunk = normalizar_municipio(filtrar_antioquia(chunk))
+                salida.escribir(chunk)
+                if devolver:
+                    partes.append(chunk)
+
+                # 📋 Acumular los resúmenes sin guardar las filas
+                total_antioquia += len(chunk)
+                conteo = chunk[["departamento", "municipio", "fecha hecho"]].isna().sum()
+                nulos = conteo if nulos is None else nulos + conteo
+                if sum(len(p) for p in primeras) < 10:
+                    primeras.append(chunk.head(10))
+
+                detallar(f"   🔄 Bloque {i + 1}: {total_original:,} filas leídas, {total_antioquia:,} de Antioquia")
+
+        informar("\n📊 Filtrado por departamento: ANTIOQUIA")
+        informar("Registros originales:", total_original)
+        informar("Registros después del filtro:", total_antioquia)
+        informar("Registros eliminados:", total_original - total_antioquia)
+        filas(entrada=total_original, salida=total_antioquia)
+
+        detallar("\n📋 Revisión de valores nulos:")
+        detallar(nulos)
+
+        informar(f"\n✅ Archivo limpio guardado como: {', '.join(map(str, salida.rutas))}")
+        informar("Número total de registros en el archivo limpio:", total_antioquia)
+
+        detallar("\nPrimeras 10 filas del dataset limpio:")
+        if primeras:
+            detallar(pd.concat(primeras).head(10))
+        return _concatenar(partes, columnas) if devolver else None
+
+    # 📥 2️⃣ Cargar el archivo en memoria con las columnas y tipos del esquema
+    df = leer_fuente("policia")
+
+    # 🧾 3️⃣ Mostrar cuántas filas (registros) y columnas tiene el archivo original
+    informar("✅ Archivo cargado correctamente")
+    informar("Número de filas (registros):", len(df))
+    informar("Número de columnas:", len(df.columns))
+
+    # 👀 4️⃣ Ver los primeros registros para conocer cómo vienen los nombres de las columnas
+    detallar("\nPrimeras 5 filas del dataset original:")
+    detallar(df.head())
+
+    #-------------------------------------------------
+    #BLOQUE 2 — Revisar los nombres de columnas
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Revisar los nombres de columnas")
+
+    # ✨ 5️⃣ El esquema ya dejó los nombres en minúsculas y sin espacios
+    detallar("\n🧹 Nombres de columnas normalizados:")
+    detallar(df.columns.tolist())
+    detallar("Número de filas (registros):", len(df.columns))
+
+    #-------------------------------------------------
+    #BLOQUE 3 — Filtrar solo registros de Antioquia
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Filtrar solo registros de Antioquia")
+
+    # 🏙️ 6️⃣ Filtrar los registros donde el departamento sea ANTIOQUIA
+    df_antioquia = filtrar_antioquia(df)
+
+    informar("\n📊 Filtrado por departamento: ANTIOQUIA")
+    informar("Registros originales:", len(df))
+    informar("Registros después del filtro:", len(df_antioquia))
+    informar("Registros eliminados:", len(df) - len(df_antioquia))
+    filas(entrada=len(df), salida=len(df_antioquia))
+
+    #-------------------------------------------------
+    #BLOQUE 4 — Normalizar el nombre del municipio y revisar datos faltantes
+    #-------------------------------------------------
+    bloque("BLOQUE 4 — Normalizar el nombre del municipio y revisar datos faltantes")
+
+    # 🧩 7️⃣ Normalizar los nombres de municipios (mayúsculas, sin tildes ni espacios extras)
+    df_antioquia = normalizar_municipio(df_antioquia)
+
+    # 📉 8️⃣ Revisar si hay datos faltantes en campos importantes
+    if detallado():
+        detallar("\n📋 Revisión de valores nulos:")
+        detallar(df_antioquia[["departamento", "municipio", "fecha hecho"]].isna().sum())
+        detallar("Número de filas (registros):", len(df_antioquia))
+
+    #-------------------------------------------------
+    #BLOQUE 5 — Guardar el archivo limpio y mostrar los primeros resultados
+    #-------------------------------------------------
+    bloque("BLOQUE 5 — Guardar el archivo limpio y mostrar los primeros resultados")
+
+    # 💾 10️⃣ Guardar el resultado limpio (Parquet y/o CSV, ver mapa_seguridad.almacen)
+    rutas = guardar_intermedio(df_antioquia, salida_nombre)
+    filas(salida=len(df_antioquia))
+
+    # 📤 11️⃣ Confirmar que se guardó correctamente
+    informar(f"\n✅ Archivo limpio guardado como: {', '.join(map(str, rutas))}")
+    informar("Número total de registros en el archivo limpio:", len(df_antioquia))
+
+    # 👀 12️⃣ Ver las primeras filas del archivo limpio
+    detallar("\nPrimeras 10 filas del dataset limpio:")
+    detallar(df_antioquia.head(10))
+    return df_antioquia if devolver else None
+
+
+@medir()
+def cargar_medata():
+    """Etapa 02: casos de criminalidad por comuna y año (MEData) → criminalidad_comunas_limpio."""
+    #-------------------------------------------------
+    #BLOQUE 1 — Cargar el archivo original y revisar contenido
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar el archivo original y revisar contenido")
+
+    # 📥 1️⃣ Cargar el archivo con las columnas y tipos del registro de esquemas (fuente
+    # "medata", ver mapa_seguridad.esquemas): el encoding (utf-8 o latin-1) se detecta
+    # solo, la comuna y la conducta llegan como categorías y los casos como entero
+    df = leer_fuente("medata")
+
+    # 📊 3️⃣ Mostrar tamaño del archivo original
+    informar("✅ Archivo cargado correctamente")
+    informar("Número de filas (registros):", len(df))
+    informar("Número de columnas:", len(df.columns))
+
+    #-------------------------------------------------
+    #BLOQUE 2 — Revisar los nombres de columnas
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Revisar los nombres de columnas")
+
+    # 📋 6️⃣ Ver cómo quedaron las columnas (el esquema ya las dejó en minúsculas y sin espacios)
+    detallar("\n🧹 Nombres de columnas normalizados:")
+    detallar(df.columns.tolist())
+
+    #-------------------------------------------------
+    #BLOQUE 3 — Detectar columnas clave automáticamente
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Detectar columnas clave automáticamente")
+    # 🧩 7️⃣ Buscar las columnas más importantes automáticamente
+    col_comuna = next((c for c in df.columns if "comuna" in c), None)
+    col_casos = next((c for c in df.columns if "caso" in c or "cantidad" in c), None)
+    col_anio = next((c for c in df.columns if "año" in c or "anio" in c or "fecha" in c), None)
+
+    # ⚠️ 8️⃣ Validar detección
+    if not col_comuna or not col_casos or not col_anio:
+        raise ValueError("❌ No se encontraron las columnas necesarias (comuna, casos, año o fecha).")
+
+    detallar("\n🧭 Columnas detectadas automáticamente:")
+    detallar(f"- Comuna: {col_comuna}")
+    detallar(f"- Casos: {col_casos}")
+    detallar(f"- Año o Fecha: {col_anio}")
+
+    #-------------------------------------------------
+    #BLOQUE 4 — Detectar correctamente los años sin eliminar registros válidos
+    #-------------------------------------------------
+    bloque("BLOQUE 4 — Detectar correctamente los años sin eliminar registros válidos")
+
+    # 📆 9️⃣ Revisar si la columna de año tiene formato de fecha o número
+    # (el formato se detecta una vez con una muestra, ver mapa_seguridad.fechas)
+    if not pd.api.types.is_numeric_dtype(df[col_anio]):
+        formato_anio = detectar_formato(df[col_anio])
+        if formato_anio and formato_anio != "%Y":
+            # Si es una fecha completa (día, mes y año) → convertir a año
+            df[col_anio] = parsear_fechas(df[col_anio], formato_anio).dt.year
+            detallar("\n📅 Se detectó formato de fecha completa. Se extrajo solo el año.")
+        else:
+            # Si ya son números, solo convertir a tipo numérico
+            df[col_anio] = a_entero(df[col_anio], "Int16")
+            detallar("\n📆 Se detectó formato numérico de año (no fecha).")
+
+    # ✅ Validar si hay registros sin año (solo informativo, no se borra nada)
+    faltantes = df[col_anio].isna().sum()
+    if faltantes > 0:
+        avisar(f"⚠️ Hay {faltantes} registros sin año. Serán ignorados en los cálculos.")
+    else:
+        detallar("✅ Todos los registros tienen año válido.")
+
+    #-------------------------------------------------
+    #BLOQUE 5 — Agrupar por comuna y año
+    #-------------------------------------------------
+    bloque("BLOQUE 5 — Agrupar por comuna y año")
+
+    # 🧩 Normalizar la comuna con la misma regla de las demás etapas ("Sin dato" = "SIN DATO")
+    normalizar_columnas(df, [col_comuna])
+
+    # 📊 🔟 Agrupar los casos por comuna y año
+    df_agrupado = (
+        df.groupby([col_comuna, col_anio], observed=True)[col_casos]
+        .sum()
+        .reset_index()
+        .rename(columns={col_comuna: "comuna", col_anio: "anio", col_casos: "casos"})
+    )
+
+    detallar("\n📊 Dataset agrupado por comuna y año (primeras filas):")
+    detallar(df_agrupado.head(10))
+
+    #-------------------------------------------------
+    #BLOQUE 6 — Determinar rango de años disponibles
+    #-------------------------------------------------
+    bloque("BLOQUE 6 — Determinar rango de años disponibles")
+
+    # 📅 11️⃣ Calcular el rango de años del dataset
+    anio_min = int(df_agrupado["anio"].min())
+    anio_max = int(df_agrupado["anio"].max())
+
+    informar(f"\n📆 Los datos cubren desde el año {anio_min} hasta el año {anio_max}")
+    informar(f"Total de años analizados: {anio_max - anio_min + 1}")
+
+    #-------------------------------------------------
+    #BLOQUE 7 — Mostrar cantidad de casos totales por año
+    #-------------------------------------------------
+    bloque("BLOQUE 7 — Mostrar cantidad de casos totales por año")
+
+    # 📈 12️⃣ Agrupar solo por año para ver la tendencia general
+    if detallado():
+        resumen_anual = (
+            df_agrupado.groupby("anio")["casos"]
+            .sum()
+            .reset_index()
+            .sort_values("anio")
+        )
+
+        detallar("\n📈 Casos totales por año:")
+        detallar(resumen_anual)
+
+        detallar("\nResumen simplificado:")
+        for _, row in resumen_anual.iterrows():
+            detallar(f" - {int(row['anio'])}: {int(row['casos']):,} casos")
+
+    #-------------------------------------------------
+    #BLOQUE 8 — Guardar el archivo limpio
+    #-------------------------------------------------
+    bloque("BLOQUE 8 — Guardar el archivo limpio")
+
+    # 💾 13️⃣ Guardar el dataset limpio con todos los años (sin eliminar nada)
+    rutas = guardar_intermedio(df_agrupado, "criminalidad_comunas_limpio")
+    filas(salida=len(df_agrupado))
+
+    informar(f"\n✅ Archivo limpio guardado como: {', '.join(map(str, rutas))}")
+    informar("Número total de registros:", len(df_agrupado))
+    return df_agrupado
+
+
+@medir()
+def cargar_kaggle():
+    """
+    Etapa 03: robos a personas en Medellín (Kaggle) → robos_medellin_limpio y el perfil
+    de columnas web/perfil_robos.json. Devuelve los robos limpios, con latitud/longitud.
+    """
+    #-------------------------------------------------
+    # BLOQUE 1 — Cargar el archivo de Kaggle correctamente
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar el archivo de Kaggle correctamente")
+
+    # 📥 2️⃣ Cargar el archivo con las columnas y tipos del registro de esquemas (fuente
+    # "kaggle", ver mapa_seguridad.esquemas): el separador y el encoding se detectan solos,
+    # los textos repetidos (barrio, sede, modalidad…) llegan como categorías, la edad como
+    # entero y la fecha ya interpretada; las coordenadas siguen como texto para repararlas
+    df = leer_fuente("kaggle", on_bad_lines="skip")
+    informar(f"✅ Archivo cargado correctamente ({len(df)} filas, {len(df.columns)} columnas)")
+
+    #-------------------------------------------------
+    #BLOQUE 2 — Revisar los nombres de columnas
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Revisar los nombres de columnas")
+
+    # ✨ El esquema ya dejó los nombres en minúsculas y sin espacios
+    detallar("\n🧹 Nombres de columnas normalizados:")
+    detallar(df.columns.tolist())
+
+    #-------------------------------------------------
+    #BLOQUE 3 — Detección automática de columnas clave
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Detección automática de columnas clave")
+
+    # 🔍 Buscar columnas que coincidan con palabras comunes
+    col_fecha = next((c for c in df.columns if "fecha" in c), None)
+    col_barrio = next((c for c in df.columns if "barrio" in c), None)
+    col_sede = next((c for c in df.columns if "sede" in c), None)
+    col_conducta = next((c for c in df.columns if "conducta" in c), None)
+    col_modalidad = next((c for c in df.columns if "modalidad" in c), None)
+    col_bien = next((c for c in df.columns if "bien" in c and "categoria" not in c), None)
+    col_arma = next((c for c in df.columns if "arma" in c or "medio" in c), None)
+    col_transporte = next((c for c in df.columns if "transporte" in c), None)
+    col_sexo = next((c for c in df.columns if "sexo" in c), None)
+
+    # 📋 Mostrar resultados
+    detallar("\n📋 Columnas detectadas automáticamente:")
+    detallar(f"- Fecha: {col_fecha}")
+    detallar(f"- Barrio: {col_barrio}")
+    detallar(f"- Sede: {col_sede}")
+    detallar(f"- Conducta: {col_conducta}")
+    detallar(f"- Modalidad: {col_modalidad}")
+    detallar(f"- Bien: {col_bien}")
+    detallar(f"- Arma o Medio: {col_arma}")
+    detallar(f"- Medio de transporte: {col_transporte}")
+    detallar(f"- Sexo: {col_sexo}")
+
+    # 🧩 Normalizar las columnas geográficas (barrio y códigos) con la regla común del pipeline
+    cols_geo = [c for c in df.columns if any(k in c for k in ["barrio", "comuna"])]
+    normalizar_columnas(df, cols_geo)
+    detallar(f"\n📍 Columnas geográficas normalizadas: {cols_geo}")
+
+    #-------------------------------------------------
+    # BLOQUE 3.1 — Recuperar latitud y longitud
+    #-------------------------------------------------
+    bloque("BLOQUE 3.1 — Recuperar latitud y longitud")
+
+    # 🗺️ Las coordenadas vienen como texto con puntos de miles ("627.623.616", "-7.555.353.312").
+    # Se reconstruyen los grados decimales en bloque y se validan contra el Valle de Aburrá
+    # (ver mapa_seguridad.coordenadas); las columnas de texto se reemplazan por latitud/longitud float32.
+    col_lat = next((c for c in df.columns if "latitud" in c), None)
+    col_lon = next((c for c in df.columns if "longitud" in c), None)
+
+    if col_lat and col_lon:
+        rechazadas = reparar_coordenadas(df, col_lat, col_lon)
+        df = df.drop(columns=[col_lat, col_lon])
+
+        informar(f"\n🗺️ Coordenadas recuperadas: {df['latitud'].notna().sum():,} de {len(df):,} filas")
+        if len(rechazadas):
+            informar(f"⚠️ Filas sin coordenadas válidas: {len(rechazadas):,}")
+            for motivo, total in rechazadas["motivo"].value_counts().items():
+                detallar(f" - {motivo}: {total:,}")
+            detallar("Ejemplos:")
+            detallar(rechazadas.head(5).to_string())
+    else:
+        avisar("\n⚠️ No se encontraron columnas de latitud y longitud.")
+
+    #-------------------------------------------------
+    # BLOQUE 3.2 — Ubicar cada robo en su comuna y barrio (polígonos)
+    #-------------------------------------------------
+    bloque("BLOQUE 3.2 — Ubicar cada robo en su comuna y barrio (polígonos)")
+
+    # 🧭 Los códigos de comuna y barrio vienen escritos a mano ("SIN DATO", errores...).
+    # Con los límites oficiales se asigna el polígono que contiene cada punto (ver
+    # mapa_seguridad.poligonos): sirve para revisar los códigos y completar los que faltan.
+    for clave, ruta in LIMITES.items():
+        col_codigo = next((c for c in df.columns if clave in c), None)
+        if not ruta.exists() or not col_codigo or "latitud" not in df.columns:
+            continue
+
+        limites = cargar_limites(ruta)
+        asignado = pd.Series(
+            codigos_asignados(asignar_poligonos(df["longitud"], df["latitud"], limites), limites), index=df.index)
+        texto = df[col_codigo].astype(object)
+
+        sin_codigo = texto.isna() | texto.isin(CODIGOS_VACIOS)
+        con_poligono = asignado.notna()
+        difieren = ~sin_codigo & con_poligono & (texto != asignado)
+        completar = sin_codigo & con_poligono
+
+        informar(f"\n🗺️ {col_codigo} vs. polígonos de {ruta.name} ({len(limites)} polígonos):")
+        informar(f" - Puntos dentro de algún polígono: {con_poligono.sum():,} de {len(df):,}")
+        informar(f" - Coinciden con el código escrito: {(~sin_codigo & con_poligono & ~difieren).sum():,}")
+        informar(f" - No coinciden (se conserva el código escrito): {difieren.sum():,}")
+        informar(f" - Sin código, completados con el polígono: {completar.sum():,}")
+        if difieren.any() and detallado():
+            detallar("Ejemplos de diferencias (escrito → polígono):")
+            ejemplos = pd.DataFrame({"escrito": texto[difieren], "poligono": asignado[difieren]})
+            detallar(ejemplos.value_counts().head(5).to_string())
+
+        df[col_codigo] = normalizar_geo(texto.where(~completar, asignado))
+
+    #-------------------------------------------------
+    # BLOQUE 4 — Convertir fechas y extraer año/mes
+    #-------------------------------------------------
+    bloque("BLOQUE 4 — Convertir fechas y extraer año/mes")
+
+    if col_fecha:
+        # Detectar el formato una vez (día/mes/año, p. ej. "01/01/2017 16:00") e interpretar
+        # solo las fechas distintas: las horas se repiten mucho entre robos
+        df[col_fecha] = parsear_fechas(df[col_fecha], dayfirst=True)
+
+        # Mostrar rango temporal
+        if df[col_fecha].notna().any():
+            fecha_min = df[col_fecha].min()
+            fecha_max = df[col_fecha].max()
+            detallar(f"\n📅 Fechas convertidas correctamente.")
+            informar(f"📆 Los datos van desde {fecha_min.date()} hasta {fecha_max.date()}")
+        else:
+            avisar("⚠️ No se pudieron convertir las fechas. Revisa el formato del CSV.")
+
+        # Extraer columnas auxiliares
+        df["anio"] = df[col_fecha].dt.year
+        df["mes"] = df[col_fecha].dt.month
+    else:
+        avisar("⚠️ No se encontró una columna de fecha para procesar.")
+
+    #-------------------------------------------------
+    # BLOQUE 5 — Estadísticas generales y tendencias
+    #-------------------------------------------------
+    bloque("BLOQUE 5 — Estadísticas generales y tendencias")
+
+    # 🧠 Distinguir arma de transporte (para las tendencias del BLOQUE 7)
+    col_arma_pura = next((c for c in df.columns if "arma" in c or ("medio" in c and "transporte" not in c)), None)
+    col_transporte_puro = next((c for c in df.columns if "transporte" in c), None)
+
+    # 🧮 Un solo perfil para todos los resúmenes (ver mapa_seguridad.perfil): vacíos,
+    # distintos y valores más frecuentes de cada columna con una pasada sobre los
+    # códigos de las categorías, más los casos por año y por mes
+    perfil = perfilar(
+        df,
+        [col_barrio, col_sede, col_arma, col_transporte, col_sexo, col_conducta, col_modalidad, col_bien,
+         col_arma_pura, col_transporte_puro],
+        col_fecha=col_fecha,
+    )
+
+    def mostrar(col, titulo, k):
+        if col:
+            detallar(f"\n{titulo}")
+            for valor, casos in mas_frecuentes(perfil, col, k):
+                detallar(f" - {valor}: {casos:,}")
+
+    if detallado():
+        mostrar(col_barrio, "🏘️ Barrios con más casos registrados:", 10)
+        mostrar(col_sede, "🏢 Sedes con más registros:", 10)
+        mostrar(col_arma, "🔫 Tipo de arma o medio más frecuente:", 5)
+        mostrar(col_transporte, "🚗 Medio de transporte más frecuente:", 5)
+        mostrar(col_sexo, "🧍‍♀️ Distribución por sexo:", 10)
+        mostrar(col_conducta, "⚙️ Conductas más frecuentes:", 5)
+        mostrar(col_modalidad, "📦 Modalidades más frecuentes:", 5)
+        mostrar(col_bien, "💰 Bienes más afectados:", 5)
+
+    #-------------------------------------------------
+    # BLOQUE 6 — Promedios mensuales y anuales de casos
+    #-------------------------------------------------
+    bloque("BLOQUE 6 — Promedios mensuales y anuales de casos")
+
+    # 📊 1️⃣ Verificar que tengamos columna de fecha (histogramas del perfil)
+    if "anio" in perfil["histogramas"]:
+
+        # 🔢 Casos por año y mes, ya contados en el perfil
+        casos_por_anio = perfil["histogramas"]["anio"]
+        casos_por_mes = perfil["histogramas"]["mes"]
+
+        detallar("\n📅 Casos registrados por año:")
+        for anio, total in zip(casos_por_anio["valores"], casos_por_anio["casos"]):
+            detallar(f" - {int(anio)}: {int(total):,} casos")
+
+        detallar("\n🗓️ Casos registrados por mes (promedio global):")
+        for mes, total in zip(casos_por_mes["valores"], casos_por_mes["casos"]):
+            detallar(f" - Mes {int(mes)}: {int(total):,} casos")
+
+        # 📉 Calcular promedio mensual y anual
+        if casos_por_anio["casos"]:
+            promedio_anual = sum(casos_por_anio["casos"]) / len(casos_por_anio["casos"])
+            promedio_mensual = sum(casos_por_mes["casos"]) / len(casos_por_mes["casos"])
+
+            informar(f"\n📊 Promedio de casos por año: {promedio_anual:,.0f}")
+            informar(f"📆 Promedio de casos por mes: {promedio_mensual:,.0f}")
+
+    else:
+        avisar("⚠️ No hay columnas de año o mes disponibles para calcular promedios.")
+
+    #-------------------------------------------------
+    # BLOQUE 7 — Tendencias más frecuentes (modo resumen)
+    #-------------------------------------------------
+    bloque("BLOQUE 7 — Tendencias más frecuentes (modo resumen)")
+    tendencias = {}
+
+    def tendencia(col, nombre):
+        """
+        Guarda en el diccionario la tendencia más común de una columna (del perfil).
+        Si la más común es "No", "Sin dato" o similar, muestra también la siguiente.
+        """
+        if col and col in perfil["columnas"]:
+            conteo = mas_frecuentes(perfil, col, 2)
+            if len(conteo) > 0:
+                valor_principal = conteo[0][0]
+                # Si la tendencia principal es "No" o similar, renombramos
+                if str(valor_principal).strip().lower() in ["no", "ninguna", "nan", "sin dato"]:
+                    valor_principal = "No especificadas"
+                    # Tomar la siguiente más frecuente (si existe)
+                    if len(conteo) > 1:
+                        segundo = conteo[1][0]
+                        tendencias[nombre] = f"{valor_principal} (más frecuente siguiente: {segundo})"
+                        return
+                tendencias[nombre] = valor_principal
+            else:
+                tendencias[nombre] = "Sin datos"
+        else:
+            tendencias[nombre] = "No encontrada"
+
+    # Calcular tendencias clave
+    tendencia(col_sexo, "Sexo más afectado")
+    tendencia(col_conducta, "Conducta más frecuente")
+    tendencia(col_modalidad, "Modalidad más común")
+    tendencia(col_arma_pura, "Arma o medio de agresión más usado")
+    tendencia(col_transporte_puro, "Medio de transporte más usado")
+    tendencia(col_bien, "Bien más afectado")
+
+    # Mostrar resultados
+    informar("\n📊 Tendencias generales observadas (finales):")
+    for clave, valor in tendencias.items():
+        informar(f" - {clave}: {valor}")
+
+    #-------------------------------------------------
+    # BLOQUE 8 — Guardar archivo limpio para análisis posteriores
+    #-------------------------------------------------
+    bloque("BLOQUE 8 — Guardar archivo limpio para análisis posteriores")
+    # La fecha viaja como datetime en Parquet: el paso 05 no tiene que volver a interpretarla
+    rutas = guardar_intermedio(df, "robos_medellin_limpio")
+    filas(salida=len(df))
+
+    informar(f"\n✅ Archivo final guardado correctamente como: {', '.join(map(str, rutas))}")
+    informar(f"📦 Total de registros: {len(df)} filas y {len(df.columns)} columnas")
+
+    # 🧮 El perfil (top-k, vacíos, distintos, casos por año y mes) queda para el mapa web y para 06
+    rutas_perfil = guardar_perfil(perfil, OUT_PERFIL)
+    informar(f"🧮 Perfil de columnas guardado en: {', '.join(map(str, rutas_perfil))}")
+    return df
+
+
+@medir()
+def cargar_arriendos():
+    """Etapa 04: precios de arriendo del Valle de Aburrá → arriendos_limpio."""
+    #-------------------------------------------------
+    #BLOQUE 1 — Cargar archivo y explorar datos básicos
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar archivo y explorar datos básicos")
+
+    # Cargar el archivo con las columnas y tipos del registro de esquemas (fuente "arriendos",
+    # ver mapa_seguridad.esquemas): separador detectado y nombres ya en minúsculas.
+    # Los precios se leen como texto (categorías) porque el BLOQUE 3 los limpia.
+    df = leer_fuente("arriendos")
+    informar(f"✅ Archivo cargado correctamente: {df.shape[0]} filas y {df.shape[1]} columnas")
+
+    #-------------------------------------------------
+    #BLOQUE 2 — Detectar columnas de ubicación y precios automáticamente
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Detectar columnas de ubicación y precios automáticamente")
+
+    # Detectar ubicación
+    col_sector = next((c for c in df.columns if "sector" in c), None)
+    col_comuna = next((c for c in df.columns if "comuna" in c), None)
+    col_municipio = next((c for c in df.columns if "municipio" in c), None)
+
+    # Detectar precios y rangos
+    cols_precios = [c for c in df.columns if "promedio" in c or "rango" in c or "precio" in c]
+
+    # Mostrar detección
+    detallar("\n🔍 Columnas detectadas automáticamente:")
+    detallar(f"- Sector: {col_sector}")
+    detallar(f"- Comuna: {col_comuna}")
+    detallar(f"- Municipio: {col_municipio}")
+    detallar(f"- Columnas de precios o rangos: {cols_precios}")
+
+    # Limpiar texto en columnas de ubicación (misma regla de todas las etapas)
+    normalizar_columnas(df, [col_sector, col_comuna, col_municipio])
+
+    #-------------------------------------------------
+    #BLOQUE 3 — Normalizar y convertir valores numéricos
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Normalizar y convertir valores numéricos")
+
+    # Convertir todas las columnas de precios a formato numérico
+    for col in cols_precios:
+        if col in df.columns:
+            df[col] = (
+                df[col]
+                .astype(str)
+                .str.replace("[^0-9,.-]", "", regex=True)
+                .str.replace(",", ".", regex=False)
+            )
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    detallar("\n💰 Conversión numérica completada.")
+
+    #-------------------------------------------------
+    #BLOQUE 4 — Calcular promedios por nivel geográfico y tipo de arriendo
+    #-------------------------------------------------
+    bloque("BLOQUE 4 — Calcular promedios por nivel geográfico y tipo de arriendo")
+    # Detección automática de tipos de arriendo (solo se muestran: no se guardan)
+    tipos_arriendo = ["apartamento", "casa", "local"]
+
+    niveles = {
+        "sector": col_sector,
+        "comuna": col_comuna,
+        "municipio": col_municipio
+    }
+
+    # Para cada nivel geográfico (sector, comuna, municipio)
+    for nombre, col in niveles.items():
+        if col and detallado():
+            detallar(f"\n📈 Promedios de arriendo por {nombre.upper()}:")
+
+            # Buscar dinámicamente las columnas asociadas a cada tipo
+            for tipo in tipos_arriendo:
+                cols_tipo = [c for c in cols_precios if tipo in c]
+                if not cols_tipo:
+                    continue
+
+                # Agrupar y calcular promedios
+                promedio = df.groupby(col, observed=True)[cols_tipo].mean().round(2)
+
+                detallar(f"\n🏠 {tipo.capitalize()}:")
+                detallar(promedio.head(10))
+
+    #-------------------------------------------------
+    #BLOQUE 5 — Guardar el archivo limpio
+    #-------------------------------------------------
+    bloque("BLOQUE 5 — Guardar el archivo limpio")
+    # Seleccionar solo las columnas válidas detectadas
+    cols_finales = [c for c in [col_sector, col_comuna, col_municipio] if c] + cols_precios
+    df_final = df[cols_finales].copy()
+
+    # Guardar (Parquet y/o CSV, ver mapa_seguridad.almacen)
+    rutas = guardar_intermedio(df_final, "arriendos_limpio")
+    filas(entrada=len(df), salida=len(df_final))
+
+    informar(f"\n✅ Archivo limpio guardado correctamente en: {', '.join(map(str, rutas))}")
+    informar(f"📊 Total de registros: {df_final.shape[0]} filas y {df_final.shape[1]} columnas")
+    return df_final
@@ -0,0 +1,255 @@
+"""
+Etapas 06–08: validar data_final y generar las capas del mapa a partir de los robos.
+
+    reporte = validar_salida(df_union, referencias)   # 06 (sin argumentos lee data_final del disco)
+    generar_teselas(robos)                            # 07
+    calcular_hotspots(robos)                          # 08
+
+Los DataFrames son opcionales: si no se pasan, cada función lee solo las columnas que
+usa del intermedio correspondiente (es lo que hacen los scripts 06, 07 y 08).
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from mapa_seguridad.almacen import DATA_DIR, buscar_intermedio, cargar_intermedio
+from mapa_seguridad.consola import avisar, detallar, informar
+from mapa_seguridad.coordenadas import LAT_MAX, LAT_MIN, LON_MAX, LON_MIN
+from mapa_seguridad.densidad import (ANCHO_BANDA_M, PASADAS, TAM_CELDA_M, contar_en_malla, densidad,
+                                     malla_valle, radio_por_pasada)
+from mapa_seguridad.instrumentacion import bloque, medir
+from mapa_seguridad.paquete_web import guardar_paquete
+from mapa_seguridad.perfil import cargar_perfil, mas_frecuentes
+from mapa_seguridad.riesgo import clasificar_alerta, clasificar_nivel, umbrales
+from mapa_seguridad.teselas import CELDA_PX, construir_piramide, guardar_piramide
+from mapa_seguridad.validacion import (REGLAS_DATA_FINAL, cargar_referencias, columnas_necesarias, guardar_reporte,
+                                       validar)
+
+ROBOS = "robos_medellin_limpio"
+
+# 06 — data_final, su reporte de validación y el perfil de robos escrito por 03
+OUT_NAME = "data_final"
+OUT_REPORTE = DATA_DIR / "validacion_data_final.json"
+PERFIL_ROBOS = Path("web") / "perfil_robos.json"
+
+# 🚦 MAPA_VALIDACION=aviso: los errores se reportan pero el script termina con código 0
+ESTRICTA = os.environ.get("MAPA_VALIDACION", "estricta").lower() != "aviso"
+
+# 07 — zooms de la pirámide: 10 ve todo el Valle de Aburrá, 16 una cuadra
+OUT_TESELAS = Path("web") / "teselas"
+ZOOM_MIN = 10
+ZOOM_MAX = 16
+
+# 08 — solo se exportan las celdas con al menos esta fracción de la intensidad máxima
+OUT_HOTSPOTS = Path("web") / "hotspots.json"
+UMBRAL_RELATIVO = 0.05
+
+
+def _coordenadas(robos):
+    # Robos con solo latitud y longitud, del DataFrame recibido o leídos de robos_medellin_limpio
+    elegir = lambda c: "latitud" in c.lower() or "longitud" in c.lower()
+    if robos is None:
+        robos = cargar_intermedio(ROBOS, columnas=elegir)
+    else:
+        robos = robos[[c for c in robos.columns if elegir(c)]]
+    robos.columns = robos.columns.str.lower().str.strip()
+    faltantes = [c for c in ("latitud", "longitud") if c not in robos.columns]
+    if faltantes:
+        # Un robos_medellin_limpio anterior a la reparación de coordenadas de 03 solo trae seguridad.latitud/longitud
+        raise ValueError(f"❌ {ROBOS} no tiene las columnas {faltantes}: ejecuta primero 03_cargar_kaggle.py, "
+                         "que repara las coordenadas del archivo de Kaggle.")
+    return robos
+
+
+@medir()
+def validar_salida(df=None, referencias=None, reglas=REGLAS_DATA_FINAL):
+    """
+    Etapa 06: revisa `reglas` sobre data_final y guarda el reporte. Devuelve el reporte
+    (reporte["ok"] es False si falló alguna regla de nivel "error").
+
+    `df` es data_final (por defecto se lee del disco con solo las columnas de las reglas) y
+    `referencias` los intermedios {nombre: DataFrame} contra los que se revisan las llaves;
+    los que falten se leen del disco.
+    """
+    #-------------------------------------------------
+    #BLOQUE 1 — Reglas que debe cumplir data_final
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Reglas que debe cumplir data_final")
+
+    # 📋 Reglas de data_final (mapa_seguridad.validacion.REGLAS_DATA_FINAL): llave única, índice
+    # entre 0 y 1, niveles y alertas permitidos, cobertura y referencias a geo_zonas y a los arriendos.
+    # Cada regla declara sus columnas: solo esas se leen de data_final.
+    necesarias = set(columnas_necesarias(reglas, ["casos_totales", "nivel_geo"]))
+
+    #-------------------------------------------------
+    #BLOQUE 2 — Validar (una lectura con proyección) y guardar el reporte
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Validar (una lectura con proyección) y guardar el reporte")
+
+    # ✅ 1️⃣ Leer solo las columnas de las reglas (más las del cruce con el perfil) y revisar
+    if df is None:
+        df = cargar_intermedio(OUT_NAME, columnas=lambda c: c in necesarias)
+        informar(f"✅ Archivo validado: {buscar_intermedio(OUT_NAME).name}")
+    else:
+        df = df[[c for c in df.columns if c in necesarias]]
+        informar(f"✅ Archivo validado: {OUT_NAME} (en memoria)")
+    reporte = validar(df, reglas, cargar_referencias(reglas, referencias), OUT_NAME)
+    informar(f"📏 {reporte['filas']:,} filas, {len(df.columns)} columnas leídas")
+
+    # ✅ 2️⃣ Resultado de cada regla
+    informar("\n🚦 Reglas:")
+    for r in reporte["reglas"]:
+        marca = "✅" if r["ok"] else ("❌" if r["nivel"] == "error" else "⚠️")
+        if r.get("faltantes"):
+            detalle = f"faltan columnas: {r['faltantes']}"
+        elif "cobertura" in r:
+            detalle = f"cobertura {r['cobertura']:.1%}"
+        else:
+            detalle = f"{r['fallas']:,} filas con problemas" if r["fallas"] else ""
+        if r["fallas"] and r.get("ejemplos"):
+            detalle += f" (ej.: {', '.join(map(str, r['ejemplos']))})"
+        (informar if r["ok"] else avisar)(f" {marca} {r['regla']}{': ' + detalle if detalle else ''}")
+
+    # 💾 3️⃣ Reporte en JSON para otras herramientas (CI, tablero del pipeline)
+    ruta = guardar_reporte(reporte, OUT_REPORTE)
+    informar(f"\n💾 Reporte guardado en: {ruta}")
+    informar(f"📋 {reporte['errores']} errores, {reporte['avisos']} avisos")
+
+    #-------------------------------------------------
+    #BLOQUE 3 — Cruce con el perfil de robos (escrito por 03, sin volver a leer los robos)
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Cruce con el perfil de robos (escrito por 03, sin volver a leer los robos)")
+
+    perfil = cargar_perfil(PERFIL_ROBOS)
+    if perfil is None:
+        avisar(f"\n⚠️ No se encontró el perfil de robos ({PERFIL_ROBOS}). Ejecuta 03_cargar_kaggle.py.")
+    else:
+        informar(f"\n🧮 Perfil de robos: {perfil['filas']:,} registros")
+        anios = perfil["histogramas"].get("anio", {}).get("valores", [])
+        if anios:
+            informar(f"📆 Años cubiertos: {anios[0]}–{anios[-1]}")
+        for columna, datos in perfil["columnas"].items():
+            principal = mas_frecuentes(perfil, columna, 1)
+            principal = f"{principal[0][0]} ({principal[0][1]:,})" if principal else "sin datos"
+            detallar(f" - {columna}: {datos['distintos']:,} distintos, {datos['nulos']:,} vacíos, más frecuente: {principal}")
+
+        # 🔗 En cada nivel geográfico (barrio, comuna…) las zonas deberían sumar todos los robos perfilados
+        # (las filas de municipio son de la Policía y no tienen casos_totales)
+        if "casos_totales" in df.columns and "nivel_geo" in df.columns:
+            informar("\n🔗 casos_totales por nivel frente a los robos perfilados:")
+            robos = df[df["casos_totales"].notna()]
+            for nivel, casos in robos.groupby("nivel_geo", observed=True)["casos_totales"].sum().items():
+                marca = "✅" if casos == perfil["filas"] else "⚠️"
+                informar(f" {marca} {nivel}: {casos:,.0f} de {perfil['filas']:,}")
+
+    if not reporte["ok"]:
+        avisar(f"\n❌ {OUT_NAME} no pasó la validación ({reporte['errores']} errores).")
+    else:
+        informar(f"\n✅ {OUT_NAME} pasó todas las reglas.")
+    return reporte
+
+
+@medir()
+def generar_teselas(robos=None):
+    """Etapa 07: pirámide de teselas z/x/y de los robos con coordenadas. Devuelve la ruta del índice."""
+    #-------------------------------------------------
+    # BLOQUE 1 — Cargar los robos con coordenadas
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar los robos con coordenadas")
+
+    robos = _coordenadas(robos)
+    informar(f"✅ {ROBOS} cargado correctamente: {robos.shape[0]} filas")
+
+    col_lat = next((c for c in robos.columns if "latitud" in c), None)
+    col_lon = next((c for c in robos.columns if "longitud" in c), None)
+    if not col_lat or not col_lon:
+        raise ValueError("❌ No se encontraron las columnas de latitud y longitud.")
+
+    #-------------------------------------------------
+    # BLOQUE 2 — Validar coordenadas
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Validar coordenadas")
+
+    # 🗺️ 03_cargar_kaggle.py ya las deja en grados decimales; se descarta lo que quede
+    # por fuera del rectángulo del Valle de Aburrá
+    lat = pd.to_numeric(robos[col_lat], errors="coerce")
+    lon = pd.to_numeric(robos[col_lon], errors="coerce")
+    dentro = lat.between(LAT_MIN, LAT_MAX) & lon.between(LON_MIN, LON_MAX)
+
+    informar(f"\n📍 Puntos con coordenadas dentro del Valle de Aburrá: {int(dentro.sum()):,} de {len(robos):,}")
+    if not dentro.any():
+        # Sin puntos no se escribe la pirámide: una vacía quedaría en la caché del pipeline como válida
+        raise ValueError(f"❌ Ningún robo de {ROBOS} tiene coordenadas dentro del Valle de Aburrá: "
+                         "no se generan las teselas.")
+
+    #-------------------------------------------------
+    # BLOQUE 3 — Construir y guardar la pirámide de teselas
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Construir y guardar la pirámide de teselas")
+
+    informar(f"\n🧱 Agrupando en celdas de {CELDA_PX} px para los zooms {ZOOM_MIN}–{ZOOM_MAX}...")
+    piramide = construir_piramide(lat[dentro], lon[dentro], ZOOM_MIN, ZOOM_MAX)
+    for zoom, teselas in piramide.items():
+        celdas = sum(len(t["n"]) for t in teselas.values())
+        detallar(f" - Zoom {zoom}: {len(teselas):,} teselas, {celdas:,} celdas")
+
+    ruta_indice = guardar_piramide(piramide, OUT_TESELAS, total_puntos=int(dentro.sum()))
+    informar(f"\n✅ Teselas guardadas en: {OUT_TESELAS} (índice: {ruta_indice})")
+    return ruta_indice
+
+
+@medir()
+def calcular_hotspots(robos=None):
+    """Etapa 08: zonas calientes (densidad en una malla de 100 m) → web/hotspots.json. Devuelve las celdas."""
+    #-------------------------------------------------
+    # BLOQUE 1 — Cargar los robos con coordenadas
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar los robos con coordenadas")
+
+    robos = _coordenadas(robos)
+    puntos = robos.dropna(subset=["latitud", "longitud"])
+    informar(f"✅ {ROBOS} cargado correctamente: {len(robos):,} filas, {len(puntos):,} con coordenadas")
+
+    #-------------------------------------------------
+    # BLOQUE 2 — Contar robos por celda y suavizar (densidad tipo kernel)
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Contar robos por celda y suavizar (densidad tipo kernel)")
+
+    malla = malla_valle(TAM_CELDA_M)
+    radio = radio_por_pasada(ANCHO_BANDA_M, TAM_CELDA_M, PASADAS)
+    detallar(f"\n🧮 Malla de {malla.filas} × {malla.columnas} celdas de {TAM_CELDA_M} m")
+    detallar(f"🌫️ Suavizado: {PASADAS} filtros de caja de radio {radio} celdas (≈ {ANCHO_BANDA_M} m de ancho de banda)")
+
+    conteos = contar_en_malla(puntos["latitud"], puntos["longitud"], malla)
+    intensidad = densidad(conteos, radio, PASADAS) / malla.area_celda_km2
+    informar(f"📍 Robos dentro de la malla: {int(conteos.sum()):,} en {int((conteos > 0).sum()):,} celdas")
+
+    #-------------------------------------------------
+    # BLOQUE 3 — Clasificar las celdas calientes y exportar para el mapa
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Clasificar las celdas calientes y exportar para el mapa")
+
+    lat, lon = malla.centros()
+    calientes = intensidad >= UMBRAL_RELATIVO * intensidad.max() if intensidad.max() > 0 else intensidad > 0
+
+    df_celdas = pd.DataFrame({
+        "latitud": lat[calientes].astype("float32"),
+        "longitud": lon[calientes].astype("float32"),
+        "intensidad": intensidad[calientes].round(2),
+        "robos": conteos[calientes],
+    })
+
+    # Niveles por quintiles de la intensidad, con la misma regla del índice de riesgo
+    cortes = umbrales(df_celdas["intensidad"])
+    df_celdas["nivel_riesgo"] = clasificar_nivel(df_celdas["intensidad"], cortes)
+    df_celdas["alerta"] = clasificar_alerta(df_celdas["intensidad"], cortes)
+
+    informar(f"\n🔥 Celdas calientes (≥ {UMBRAL_RELATIVO:.0%} del máximo): {len(df_celdas):,}")
+    detallar(df_celdas.sort_values("intensidad", ascending=False).head(10).to_string(index=False))
+
+    rutas = guardar_paquete(df_celdas, OUT_HOTSPOTS)
+    informar("\n✅ Zonas calientes guardadas en:")
+    for ruta in rutas:
+        informar(f"   🌐 {ruta} ({ruta.stat().st_size / 1024:,.1f} KB)")
+    return df_celdas
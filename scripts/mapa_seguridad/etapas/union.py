@@ -0,0 +1,443 @@
+"""
+Etapa 05: unir las fuentes limpias, calcular el índice de riesgo y exportar.
+
+Cada BLOQUE de la etapa es una función que recibe y devuelve DataFrames:
+
+    tablas = cargar_tablas()                       # BLOQUE 1 (del disco o de `tablas` en memoria)
+    geografia = Geografia()                        # dimensión geográfica, desde cero
+    normalizar_tablas(tablas, geografia)           # BLOQUE 2
+    df_niveles = resumir_robos(tablas["robos"])    # BLOQUE 3
+    policia_final, ventanas = resumir_policia(tablas["policia"])   # BLOQUE 4
+    arriendos_final = preparar_arriendos(tablas["arriendos"], geografia)          # BLOQUE 5
+    arriendos_final, ventanas = asignar_zonas(geografia, df_niveles, policia_final,
+                                              ventanas, arriendos_final)          # BLOQUE 6
+    df_union = clasificar_riesgo(df_niveles, policia_final, arriendos_final, geografia)  # BLOQUE 7
+    exportar_resultados(df_union, ventanas)        # BLOQUE 8
+
+unir_y_riesgo() las encadena (es lo que ejecuta 05_unir_y_riesgo.py). Si recibe las
+tablas de las etapas 01–04 ya cargadas, no vuelve a leer los intermedios.
+
+Cada tabla se ubica una sola vez en la dimensión geográfica (mapa_seguridad.geografia)
+y desde ahí las agrupaciones y uniones usan el zona_id entero; los nombres y la
+zona_clave se agregan a data_final al final del BLOQUE 7.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.agregacion import mas_frecuente, resumen_por_niveles
+from mapa_seguridad.almacen import DATA_DIR, cargar_intermedio, guardar_intermedio
+from mapa_seguridad.consola import avisar, detallar, informar
+from mapa_seguridad.cubo import guardar_cubo
+from mapa_seguridad.fechas import parsear_fechas
+from mapa_seguridad.geografia import Geografia
+from mapa_seguridad.instrumentacion import bloque, filas, medir
+from mapa_seguridad.normalizacion import normalizar_columnas
+from mapa_seguridad.paquete_web import guardar_paquete
+from mapa_seguridad.particiones import PROCESOS, casos_por_zona_y_mes
+from mapa_seguridad.riesgo import clasificar_alerta, clasificar_nivel, umbrales
+from mapa_seguridad.serie_mensual import SerieMensual
+from mapa_seguridad.union_sql import resolver_motor, unir_y_clasificar
+
+# 📂 Salidas de la etapa
+OUT_NAME = "data_final"
+OUT_JSON = Path("web") / "data_final.json"
+OUT_ESTADISTICAS = Path("web") / "estadisticas.json"
+OUT_VENTANAS = "riesgo_ventanas"
+OUT_VENTANAS_JSON = Path("web") / "riesgo_ventanas.json"
+OUT_SERIE = DATA_DIR / "serie_policia.npz"
+
+# Palabras con las que se reconocen las columnas geográficas
+CLAVES_GEO = ["departamento", "municipio", "comuna", "sector", "barrio", "codigo"]
+
+# 🧭 Cómo se ubica cada tabla en la dimensión geográfica:
+# ({nivel: (columna del código, columna del nombre)}, {nivel: valor fijo})
+MEDELLIN = {"departamento": "ANTIOQUIA", "municipio": "MEDELLIN"}
+UBICACION = {
+    "policia": ({"departamento": (None, "departamento"), "municipio": ("codigo dane", "municipio")}, {}),
+    "robos": ({"comuna": ("seguridad.codigo_comuna", None),
+               "barrio": ("seguridad.codigo_barrio", "seguridad.nombre_barrio")}, MEDELLIN),
+    "comunas": ({"comuna": ("comuna", None)}, MEDELLIN),
+    "arriendos": ({"municipio": (None, "municipio"), "comuna": ("comuna", None), "sector": (None, "sector")},
+                  {"departamento": "ANTIOQUIA"}),
+}
+
+
+def usa_columnas(*claves):
+    """Proyección de columnas: solo se leen las que contienen alguna de las claves."""
+    return lambda c: any(k in c for k in claves)
+
+
+# Intermedios que vamos a usar (Parquet o CSV, ver mapa_seguridad.almacen)
+# y las columnas que realmente se necesitan de cada uno
+FILES = {
+    "policia": ("hurto_policia_limpio", usa_columnas(*CLAVES_GEO, "fecha", "cantidad")),
+    "robos": ("robos_medellin_limpio", usa_columnas(*CLAVES_GEO, "fecha", "modalidad")),
+    "comunas": ("criminalidad_comunas_limpio", None),
+    "arriendos": ("arriendos_limpio", None),
+}
+
+
+def cargar_tabla(nombre, columnas=None, df=None):
+    """
+    Intermedio `nombre` con solo las columnas pedidas. Si `df` viene de una etapa
+    anterior del mismo proceso se proyecta ese DataFrame en vez de leer el archivo.
+    """
+    if df is None:
+        df = cargar_intermedio(nombre, columnas=columnas)
+        origen = ""
+    else:
+        # Las etapas 01–04 devuelven la misma tabla que escriben: se toma sin releerla
+        # (la copia es superficial: 05 reemplaza columnas, no modifica las de la etapa anterior)
+        if columnas is not None:
+            df = df[[c for c in df.columns if columnas(c.lower().strip())]]
+        df = df.copy(deep=False)
+        origen = " (en memoria)"
+    df.columns = df.columns.str.lower().str.strip()
+    informar(f"✅ {nombre} cargado correctamente{origen}: {df.shape[0]} filas, {df.shape[1]} columnas")
+    return df
+
+
+def cargar_tablas(tablas=None):
+    """BLOQUE 1: {"policia", "robos", "comunas", "arriendos"} → DataFrame, de `tablas` o del disco."""
+    #-------------------------------------------------
+    # BLOQUE 1 — Cargar archivos y preparar entorno
+    #-------------------------------------------------
+    bloque("BLOQUE 1 — Cargar archivos y preparar entorno")
+
+    tablas = tablas or {}
+    return {clave: cargar_tabla(nombre, columnas, tablas.get(clave)) for clave, (nombre, columnas) in FILES.items()}
+
+
+# 🔍 Detectar columnas relacionadas con ubicación (municipio, comuna, etc.)
+def detectar_columnas_geo(df):
+    columnas = [c for c in df.columns if any(k in c for k in CLAVES_GEO)]
+    detallar(f"📍 Columnas geográficas detectadas: {columnas}")
+    return columnas
+
+
+def normalizar_tablas(tablas, geografia):
+    """
+    BLOQUE 2: normaliza (en el mismo DataFrame) las columnas geográficas de cada tabla
+    y agrega sus columnas <nivel>_id de la dimensión geográfica.
+    """
+    #-------------------------------------------------
+    # BLOQUE 2 — Normalizar texto y ubicar cada tabla en la dimensión geográfica
+    #-------------------------------------------------
+    bloque("BLOQUE 2 — Normalizar texto y ubicar cada tabla en la dimensión geográfica")
+
+    # ✨ Aplicar la normalización común (mapa_seguridad.normalizacion) a las columnas geográficas
+    # Cada valor distinto se limpia una sola vez y la columna queda como categórica
+    for df in tablas.values():
+        normalizar_columnas(df, detectar_columnas_geo(df))
+
+    # 🧭 Código y nombre → zona_id, una vez por combinación distinta (ver mapa_seguridad.geografia)
+    for clave, df in tablas.items():
+        columnas, fijos = UBICACION[clave]
+        sin_dato = geografia.resolver_fuente(df, columnas, fijos)
+        detalle = ", ".join(f"{nivel} {n:,}" for nivel, n in sin_dato.items() if n)
+        if detalle:
+            avisar(f"⚠️ {clave}: filas sin zona conocida (quedan en SIN DATO) → {detalle} de {len(df):,}")
+        else:
+            detallar(f"🧭 {clave}: todas las filas ubicadas en {', '.join(sin_dato)}")
+    informar(f"🧭 Dimensión geográfica: {geografia.n_zonas:,} zonas")
+    return tablas
+
+
+def resumir_robos(robos):
+    """BLOQUE 3: promedio mensual, total y delito más común de los robos en cada nivel geográfico."""
+    #-------------------------------------------------
+    # BLOQUE 3 — Calcular promedios y totales de robos por nivel
+    #-------------------------------------------------
+    bloque("BLOQUE 3 — Calcular promedios y totales de robos por nivel")
+
+    informar("\n📊 Calculando promedios y totales por nivel geográfico...")
+
+    # Buscar columna de fecha
+    col_fecha = next((c for c in robos.columns if "fecha" in c), None)
+    if not col_fecha:
+        raise ValueError("❌ No se encontró la columna de fecha de los robos.")
+    # Desde Parquet ya llega como fecha; desde CSV se interpreta con formato explícito
+    robos[col_fecha] = parsear_fechas(robos[col_fecha])
+    robos["mes"] = robos[col_fecha].dt.to_period("M")
+
+    # Niveles geográficos de los robos (ubicados en el BLOQUE 2)
+    niveles = [c for c in ["comuna_id", "barrio_id"] if c in robos.columns]
+
+    # 🧊 Contar una sola vez el cubo niveles × mes y resumirlo para cada nivel
+    # (promedio mensual y total de casos, ver mapa_seguridad.agregacion)
+    df_niveles = resumen_por_niveles(robos, niveles, col_mes="mes")
+    # Cada fila es una zona de la dimensión: su zona_id es el del nivel que la resume
+    df_niveles.insert(0, "zona_id", df_niveles[niveles].max(axis=1).astype(np.int32))
+
+    # 🚨 Tipo de delito (modalidad) más común en cada zona: lo usan el popup y el filtro del mapa
+    col_delito = next((c for c in robos.columns if "modalidad" in c), None)
+    if col_delito:
+        df_niveles["tipo_delito"] = pd.concat([
+            df_niveles.loc[df_niveles["nivel_geo"] == nivel, "zona_id"].map(mas_frecuente(robos, nivel, col_delito))
+            for nivel in niveles
+        ])
+    # El nivel y los nombres salen de la dimensión al etiquetar data_final
+    df_niveles = df_niveles.drop(columns=niveles + ["nivel_geo"])
+
+    informar(f"\n✅ Consolidado de niveles generado: {df_niveles.shape[0]} filas, {df_niveles.shape[1]} columnas")
+    filas(entrada=len(robos), salida=len(df_niveles))
+    return df_niveles
+
+
+def resumir_policia(policia, ruta_serie=OUT_SERIE, procesos=None):
+    """
+    BLOQUE 4: promedio mensual y total de casos por municipio de la Policía, y el riesgo
+    de los últimos 3, 6 y 12 meses (la serie mensual se guarda en `ruta_serie`). Con
+    `procesos` > 1 (por defecto MAPA_PROCESOS_POLICIA) las sumas por municipio y mes se
+    reparten por departamento en varios procesos (ver mapa_seguridad.particiones).
+    Devuelve (policia_final, riesgo_ventanas).
+    """
+    #-------------------------------------------------
+    # BLOQUE 4 — Promedios de la Policía Nacional
+    #-------------------------------------------------
+    bloque("BLOQUE 4 — Promedios de la Policía Nacional")
+
+    informar("\n🚓 Calculando promedios y totales de la Policía Nacional...")
+
+    # Buscar columnas principales
+    col_fecha_pol = next((c for c in policia.columns if "fecha" in c), None)
+    col_cant_pol = next((c for c in policia.columns if "cantidad" in c), None)
+    # El municipio es el zona_id entero que le asignó la dimensión geográfica en el BLOQUE 2
+    col_muni_pol = "municipio_id" if "municipio_id" in policia.columns else None
+
+    # Validar columnas encontradas
+    if not all([col_fecha_pol, col_cant_pol, col_muni_pol]):
+        raise ValueError("⚠️ No se encontraron todas las columnas necesarias en el dataset de Policía.")
+
+    # Convertir fecha a formato datetime (el paso 01 ya la guarda convertida en Parquet)
+    policia[col_fecha_pol] = parsear_fechas(policia[col_fecha_pol])
+    policia["mes"] = policia[col_fecha_pol].dt.to_period("M")
+
+    # 🧩 Reporte nacional: los casos por municipio y mes se suman en varios procesos, cada uno
+    # con los departamentos de su partición. Lo que sigue se calcula igual sobre esa tabla
+    # pequeña (una fila por municipio y mes) en vez de sobre todos los registros.
+    procesos = procesos or PROCESOS
+    if procesos > 1:
+        registros = casos_por_zona_y_mes(policia, col_muni_pol, "departamento_id", "mes", col_cant_pol, procesos)
+        registros[col_cant_pol] = registros.pop("casos_mes").astype(policia[col_cant_pol].dtype)
+        informar(f"🧩 Sumas por municipio y mes en {procesos} procesos: {len(policia):,} registros → {len(registros):,}")
+    else:
+        registros = policia
+
+    # Agrupar por municipio y mes para calcular total de casos por mes
+    resumen_mes = (
+        registros.groupby([col_muni_pol, "mes"], observed=True)[col_cant_pol]
+        .sum()
+        .reset_index(name="casos_mes")
+    )
+
+    # Calcular promedio mensual por municipio
+    promedio_mensual = (
+        resumen_mes.groupby(col_muni_pol, observed=True)["casos_mes"]
+        .mean()
+        .reset_index(name="promedio_robos_municipio")
+    )
+
+    # Calcular total de casos en todo el periodo
+    totales_muni = (
+        registros.groupby(col_muni_pol, observed=True)[col_cant_pol]
+        .sum()
+        .reset_index(name="casos_municipio")
+    )
+
+    # Unir ambos resultados (el departamento de cada municipio sale de la dimensión)
+    policia_final = (promedio_mensual.merge(totales_muni, on=col_muni_pol, how="outer")
+                     .rename(columns={col_muni_pol: "zona_id"}))
+
+    # 📈 Casos por municipio y mes calendario → riesgo de los últimos 3, 6 y 12 meses
+    # (la serie se guarda para agregar el mes siguiente sin releer la historia)
+    serie_policia = SerieMensual.desde_registros(registros, col_muni_pol, "mes", col_peso=col_cant_pol)
+    serie_policia.guardar(ruta_serie)
+    riesgo_ventanas = serie_policia.resumen("zona_id").astype({"zona_id": np.int32})
+
+    informar(f"✅ Policía procesada correctamente: {policia_final.shape[0]} municipios.")
+    filas(entrada=len(policia), salida=len(policia_final))
+    informar(f"📈 Serie mensual: {serie_policia.n_meses} meses ({serie_policia.primer_mes} a {serie_policia.ultimo_mes}), "
+             f"ventanas {', '.join(f'{w}m' for w in serie_policia.ventanas)}")
+    return policia_final, riesgo_ventanas
+
+
+def preparar_arriendos(arriendos, geografia):
+    """BLOQUE 5: valores de arriendo por zona (la comuna o el municipio que contiene cada sector)."""
+    #-------------------------------------------------
+    # BLOQUE 5 — Integrar información de arriendos
+    #-------------------------------------------------
+    bloque("BLOQUE 5 — Integrar información de arriendos")
+
+    informar("\n🏘️ Integrando información de arriendos...")
+
+    # 🔍 1️⃣ Ubicación: cada sector quedó en la dimensión geográfica en el BLOQUE 2
+    if "sector_id" not in arriendos.columns:
+        raise ValueError("⚠️ Los arriendos no tienen sector: no se pueden ubicar en una zona.")
+
+    # 💰 2️⃣ Detectar columnas de valores de arriendo (promedios y rangos)
+    cols_valores = [c for c in arriendos.columns if any(x in c for x in ["promedio", "rango"])]
+    detallar(f"💰 Columnas de valores de arriendo: {cols_valores}")
+
+    # 🧾 3️⃣ Una fila por zona: el arriendo de un sector vale para la zona que lo contiene
+    # (los promedios de varios sectores de la misma comuna se promedian)
+    arriendos = arriendos.assign(zona_id=geografia.padres(arriendos["sector_id"]))
+    agregaciones = {"sector": "first"} if "sector" in arriendos.columns else {}
+    agregaciones.update({c: "mean" if "promedio" in c else "first" for c in cols_valores})
+    arriendos_final = arriendos.groupby("zona_id", sort=True, observed=True).agg(agregaciones).reset_index()
+
+    informar(f"✅ Arriendos listos: {arriendos_final.shape[0]} registros y {arriendos_final.shape[1]} columnas.")
+    return arriendos_final
+
+
+def asignar_zonas(geografia, df_niveles, policia_final, riesgo_ventanas, arriendos_final):
+    """
+    BLOQUE 6: lleva los arriendos a cada zona con robos o Policía (la propia o la del
+    ancestro más cercano), etiqueta riesgo_ventanas y guarda la dimensión geográfica.
+    Devuelve (arriendos_final, riesgo_ventanas).
+    """
+    #-------------------------------------------------
+    # BLOQUE 6 — Llaves enteras de zona y dimensión geográfica
+    #-------------------------------------------------
+    bloque("BLOQUE 6 — Llaves enteras de zona y dimensión geográfica")
+
+    informar("\n🧭 Asignando los arriendos a las zonas con datos...")
+
+    zonas_con_datos = np.union1d(df_niveles["zona_id"], policia_final["zona_id"])
+    arriendos_zona, sin_destino = geografia.heredar(arriendos_final, zonas_con_datos)
+    informar(f"🏘️ {len(arriendos_zona):,} de {len(zonas_con_datos):,} zonas con datos tienen arriendo")
+    if len(sin_destino):
+        claves = geografia.tabla()["zona_clave"].to_numpy()[sin_destino]
+        avisar(f"⚠️ Arriendos sin ninguna zona con datos ({len(sin_destino)}): {', '.join(claves[:5])}")
+
+    riesgo_ventanas = geografia.etiquetar(riesgo_ventanas)
+    for ruta in geografia.guardar():
+        detallar(f"   📄 Dimensión: {ruta}")
+    filas(entrada=len(arriendos_final), salida=len(arriendos_zona))
+    return arriendos_zona, riesgo_ventanas
+
+
+def clasificar_riesgo(df_niveles, policia_final, arriendos_final, geografia, motor=None):
+    """
+    BLOQUE 7: une niveles, Policía y arriendos por zona_id, calcula el índice de riesgo,
+    lo clasifica por quintiles y agrega los nombres de cada zona. `motor` es pandas,
+    sqlite, duckdb o sql (por defecto MAPA_MOTOR_UNION, ver mapa_seguridad.union_sql).
+    """
+    #-------------------------------------------------
+    # BLOQUE 7 — Unificación y cálculo del índice de riesgo
+    #-------------------------------------------------
+    bloque("BLOQUE 7 — Unificación y cálculo del índice de riesgo")
+
+    # 🗄️ Motor de la unión: pandas (en memoria) o sqlite/duckdb (base de datos
+    # temporal en disco, para uniones que no caben en memoria)
+    motor = resolver_motor(motor or os.environ.get("MAPA_MOTOR_UNION", "pandas"))
+
+    informar("\n🔗 Unificando información y calculando índice de riesgo...")
+
+    if motor == "pandas":
+        # Unir por zona_id (enteros: sin columnas repetidas _x / _y)
+        df_union = df_niveles.merge(policia_final, on="zona_id", how="outer").merge(arriendos_final, on="zona_id", how="left")
+
+        # Calcular índice de riesgo
+        col_ref = next((c for c in df_union.columns if "promedio_robos" in c), None)
+        if col_ref:
+            df_union["indice_riesgo"] = df_union[col_ref] / df_union[col_ref].max()
+        else:
+            df_union["indice_riesgo"] = 0
+
+        # Clasificar niveles de riesgo por quintiles del índice (ver mapa_seguridad.riesgo)
+        cortes = umbrales(df_union["indice_riesgo"])
+        df_union["nivel_riesgo"] = clasificar_nivel(df_union["indice_riesgo"], cortes)
+        df_union["alerta"] = clasificar_alerta(df_union["indice_riesgo"], cortes)
+    else:
+        # 🗄️ Las mismas uniones, el índice y los quintiles dentro de una base de datos en disco
+        informar(f"🗄️ Motor de unión: {motor}")
+        df_union = unir_y_clasificar(df_niveles, policia_final, arriendos_final, motor=motor)
+
+    # 🏷️ zona_clave, nivel y nombres de cada zona (y de sus ancestros) desde la dimensión
+    df_union = geografia.etiquetar(df_union.astype({"zona_id": np.int32}))
+
+    informar("✅ Índice de riesgo calculado correctamente.")
+    filas(entrada=len(df_niveles) + len(policia_final) + len(arriendos_final), salida=len(df_union))
+    return df_union
+
+
+def exportar_resultados(df_union, riesgo_ventanas):
+    """BLOQUE 8: data_final y riesgo_ventanas (tablas y paquetes web) y el cubo de estadísticas."""
+    #-------------------------------------------------
+    # BLOQUE 8 — Exportar archivos finales
+    #-------------------------------------------------
+    bloque("BLOQUE 8 — Exportar archivos finales")
+
+    informar("\n💾 Exportando resultados...")
+
+    rutas = guardar_intermedio(df_union, OUT_NAME)
+    # 🌐 JSON columnar compacto para el mapa (+ variante .gz), ver mapa_seguridad.paquete_web
+    rutas_web = guardar_paquete(df_union, OUT_JSON)
+    # 📊 Cubo de estadísticas para el panel lateral (una celda por combinación de filtros)
+    rutas_cubo, n_celdas = guardar_cubo(df_union, OUT_ESTADISTICAS)
+    rutas_web += rutas_cubo
+    # 📈 Riesgo por ventanas de tiempo (una fila por municipio de la Policía)
+    rutas += guardar_intermedio(riesgo_ventanas, OUT_VENTANAS)
+    rutas_web += guardar_paquete(riesgo_ventanas, OUT_VENTANAS_JSON)
+
+    informar(f"✅ Archivos generados correctamente:")
+    for ruta in rutas:
+        informar(f"   📄 Tabla: {ruta}")
+    for ruta in rutas_web:
+        informar(f"   🌐 Web: {ruta} ({ruta.stat().st_size / 1024:,.1f} KB)")
+    informar(f"   📊 Cubo de estadísticas: {n_celdas:,} celdas")
+    return rutas + rutas_web
+
+
+def formato_dinero(valor):
+    if pd.isna(valor):
+        return "Sin datos"
+    return f"${int(valor):,}".replace(",", ".")
+
+
+def mostrar_resumen(fila):
+    return f"""
+📍 Zona: {fila.get('zona_clave', 'Sin info')}
+⚠️ Nivel de riesgo: {fila.get('nivel_riesgo', 'Sin datos')} — {fila.get('alerta', 'Sin alerta')}
+📊 Promedio mensual: {round(fila.get('indice_riesgo', 0)*100, 2)}%
+💰 Arriendo promedio:
+   🏢 Apartamento: {formato_dinero(fila.get('promedio_arriendo_apartamento'))}
+   🏠 Casa: {formato_dinero(fila.get('promedio_arriendo_casa'))}
+   🏪 Local: {formato_dinero(fila.get('promedio_arriendo_local'))}
+"""
+
+
+@medir()
+def unir_y_riesgo(tablas=None, motor=None):
+    """
+    Etapa 05 completa (BLOQUES 1 a 9). `tablas` puede traer los DataFrames de las
+    etapas 01–04 ({"policia", "robos", "comunas", "arriendos"}); los que falten se
+    leen del disco. Devuelve {"data_final", "riesgo_ventanas", "geo_zonas", "geo_alias"}.
+    """
+    # La dimensión se arma desde cero: no depende de la corrida anterior
+    geografia = Geografia()
+    tablas = normalizar_tablas(cargar_tablas(tablas), geografia)
+    df_niveles = resumir_robos(tablas["robos"])
+    policia_final, riesgo_ventanas = resumir_policia(tablas["policia"])
+    arriendos_final = preparar_arriendos(tablas["arriendos"], geografia)
+    arriendos_final, riesgo_ventanas = asignar_zonas(
+        geografia, df_niveles, policia_final, riesgo_ventanas, arriendos_final)
+    df_union = clasificar_riesgo(df_niveles, policia_final, arriendos_final, geografia, motor)
+    exportar_resultados(df_union, riesgo_ventanas)
+
+    #-------------------------------------------------
+    # BLOQUE 9 — Mostrar ejemplo de salida
+    #-------------------------------------------------
+    bloque("BLOQUE 9 — Mostrar ejemplo de salida")
+
+    if not df_union.empty:
+        detallar("\n🧾 Ejemplo de salida:")
+        detallar(mostrar_resumen(df_union.iloc[0]))
+    else:
+        avisar("⚠️ No hay registros para mostrar.")
+    return {"data_final": df_union, "riesgo_ventanas": riesgo_ventanas,
+            "geo_zonas": geografia.tabla(), "geo_alias": geografia.tabla_alias()}
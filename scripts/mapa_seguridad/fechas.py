@@ -0,0 +1,75 @@
+"""
+Lectura rápida de fechas para todas las etapas.
+
+1. El formato se detecta una sola vez, con una muestra de valores distintos
+   (por ejemplo "01/01/2017 16:00" → "%d/%m/%Y %H:%M").
+2. Se interpretan solo los textos distintos con ese formato explícito y el
+   resultado se reparte a todas las filas: las horas de los robos se repiten
+   mucho, así que hay muchos menos valores distintos que filas.
+3. Si la columna ya viene como fecha (Parquet), no se vuelve a interpretar.
+"""
+import numpy as np
+import pandas as pd
+
+# Formatos que se prueban, en orden. En Colombia las fechas van día/mes/año,
+# por eso los formatos con el día primero se prueban antes que mes/día.
+FORMATOS = [
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+    "%Y",
+]
+
+# Proporción mínima de la muestra que debe encajar con un formato para aceptarlo
+MINIMO_VALIDOS = 0.95
+
+
+def detectar_formato(valores, muestra=500):
+    """
+    Devuelve el primer formato de FORMATOS que interpreta (casi) toda la muestra,
+    o None si ninguno sirve. `valores` puede ser una serie o un arreglo de textos.
+    """
+    # Primero los valores distintos (pocos, sobre todo en categorías) y después el texto
+    distintos = pd.Series(pd.unique(pd.Series(valores).dropna()), dtype=object).astype(str).str.strip()
+    distintos = distintos[distintos != ""].drop_duplicates().reset_index(drop=True)
+    if distintos.empty:
+        return None
+    ejemplo = distintos.sample(min(muestra, len(distintos)), random_state=0)
+    for formato in FORMATOS:
+        validos = pd.to_datetime(ejemplo, format=formato, errors="coerce").notna().mean()
+        if validos >= MINIMO_VALIDOS:
+            return formato
+    return None
+
+
+def parsear_fechas(serie, formato=None, dayfirst=True):
+    """
+    Convierte `serie` a datetime64 interpretando cada texto distinto una sola vez.
+
+    Si no se da `formato`, se detecta con detectar_formato(). Si tampoco se detecta,
+    se usa la inferencia de pandas (con `dayfirst`). Lo que no se entiende queda NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    codigos, unicos = pd.factorize(serie)
+    textos = pd.Series(unicos, dtype=object).astype(str).str.strip()
+    formato = formato or detectar_formato(textos)
+    if formato:
+        fechas = pd.to_datetime(textos, format=formato, errors="coerce")
+    else:
+        fechas = pd.to_datetime(textos, errors="coerce", dayfirst=dayfirst)
+
+    # El código -1 (vacío) toma el último elemento, que es NaT
+    valores = np.append(fechas.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    return pd.Series(valores[codigos], index=serie.index, name=serie.name)
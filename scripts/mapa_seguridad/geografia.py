@@ -0,0 +1,311 @@
+"""
+Dimensión geográfica: departamento → municipio → comuna → barrio / sector.
+
+Cada zona tiene un zona_id entero (int32). 05 arma la dimensión desde cero en cada
+corrida: los números se asignan en el orden en que se ubican las fuentes (y dentro
+de cada una, de la combinación más frecuente a la menos), así que con las mismas
+entradas salen los mismos zona_id. La tabla se guarda como intermedio (geo_zonas)
+junto con sus alias (geo_alias) para 06 y para quien consulte data_final, pero 05
+no la vuelve a leer. Las etapas unen y agrupan por esos enteros; los nombres y la
+zona_clave ("ANTIOQUIA|MEDELLIN|COM_14") se agregan al final con etiquetar().
+
+Un alias es cualquier forma en que una fuente escribe una zona dentro de su padre:
+el código ("14", "1401", "5001000") o el nombre normalizado ("EL POBLADO"). Las
+variantes que normalizar_texto no unifica se resuelven aquí:
+
+    "MEDELLIN (CT)" → "MEDELLIN"      (la Policía marca las capitales con "(CT)")
+    "04" / "4.0"    → "4"             (códigos de comuna)
+    "SIN DATO", "", "NO REPORTA"...   → la zona SIN DATO de ese padre
+
+El catálogo de comunas de Medellín relaciona el código con el nombre, así que
+codigo_comuna "14" y comuna "EL POBLADO" llegan a la misma zona. Cada tabla se
+resuelve una vez, sobre sus combinaciones distintas de valores (pocas frente al
+número de filas), y las filas que quedan en SIN DATO se informan.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.almacen import buscar_intermedio, cargar_intermedio, guardar_intermedio
+from mapa_seguridad.instrumentacion import medir
+from mapa_seguridad.normalizacion import normalizar_texto
+from mapa_seguridad.zonas import combinaciones_distintas, construir_zona_clave
+
+# 📂 Intermedios de la dimensión
+OUT_ZONAS = "geo_zonas"
+OUT_ALIAS = "geo_alias"
+
+NIVELES_GEO = ("departamento", "municipio", "comuna", "barrio", "sector")
+# Ancestros que guarda cada zona (los barrios y sectores no tienen hijos)
+ANCESTROS = ("departamento", "municipio", "comuna")
+NINGUNA = -1
+SIN_DATO = "SIN DATO"
+
+# Textos (ya normalizados) que no identifican ninguna zona
+VACIOS = {"", "NAN", "NA", "NONE", "NULL", "SIN DATO", "SIN DATOS", "SIN INFORMACION", "SIN INFO",
+          "SIN DEFINIR", "NO REPORTA", "NO REPORTADO", "NO APLICA"}
+_CAPITAL = re.compile(r"\s+CT$")
+
+# 🗺️ Comunas y corregimientos de Medellín: código → nombre
+MUNICIPIO_COMUNAS = "MEDELLIN"
+COMUNAS_MEDELLIN = {
+    "1": "POPULAR", "2": "SANTA CRUZ", "3": "MANRIQUE", "4": "ARANJUEZ", "5": "CASTILLA",
+    "6": "DOCE DE OCTUBRE", "7": "ROBLEDO", "8": "VILLA HERMOSA", "9": "BUENOS AIRES",
+    "10": "LA CANDELARIA", "11": "LAURELES ESTADIO", "12": "LA AMERICA", "13": "SAN JAVIER",
+    "14": "EL POBLADO", "15": "GUAYABAL", "16": "BELEN", "50": "PALMITAS", "60": "SAN CRISTOBAL",
+    "70": "ALTAVISTA", "80": "SAN ANTONIO DE PRADO", "90": "SANTA ELENA",
+}
+CODIGOS_COMUNAS_MEDELLIN = {nombre: codigo for codigo, nombre in COMUNAS_MEDELLIN.items()}
+
+
+def canonico(valor, nivel):
+    """Forma con la que se busca un texto geográfico: 'Medellín (CT)' → 'MEDELLIN', comuna '04' → '4'."""
+    texto = _CAPITAL.sub("", normalizar_texto(str(valor)))
+    if texto in VACIOS:
+        return ""
+    if nivel == "comuna" and texto.isdigit():
+        return str(int(texto))
+    return texto
+
+
+def _canonicos(serie, nivel):
+    # Cada valor distinto se lleva a su forma canónica una sola vez (NaN → "")
+    codigos, unicos = pd.factorize(serie)
+    textos = np.array([canonico(v, nivel) for v in unicos] + [""], dtype=object)
+    return textos[codigos]
+
+
+class Geografia:
+    """Zonas (una por zona_id, en orden) y alias (nivel, ámbito, texto) → zona_id."""
+
+    def __init__(self, zonas=None, alias=None):
+        self._nivel, self._nombre, self._codigo, self._padre = [], [], [], []
+        self._ancestros = {nivel: [] for nivel in ANCESTROS}
+        self._alias = {}
+        if zonas is not None:
+            zonas = zonas.sort_values("zona_id")
+            if not np.array_equal(zonas["zona_id"].to_numpy(), np.arange(len(zonas))):
+                raise ValueError(f"❌ {OUT_ZONAS}: los zona_id deben ser 0..{len(zonas) - 1} sin huecos.")
+            self._nivel = zonas["nivel"].astype(str).tolist()
+            self._nombre = zonas["nombre"].astype(str).tolist()
+            self._codigo = zonas["codigo"].fillna("").astype(str).tolist()
+            self._padre = zonas["padre_id"].astype(int).tolist()
+            self._ancestros = {nivel: zonas[f"{nivel}_id"].astype(int).tolist() for nivel in ANCESTROS}
+        if alias is not None:
+            for nivel, ambito, texto, zona in alias[["nivel", "ambito_id", "alias", "zona_id"]].itertuples(index=False):
+                self._alias[(str(nivel), int(ambito), str(texto))] = int(zona)
+
+    @classmethod
+    def cargar(cls):
+        """La dimensión que guardó la última corrida de 05 (vacía si todavía no existe)."""
+        if buscar_intermedio(OUT_ZONAS) is None or buscar_intermedio(OUT_ALIAS) is None:
+            return cls()
+        return cls(cargar_intermedio(OUT_ZONAS), cargar_intermedio(OUT_ALIAS))
+
+    def guardar(self):
+        return guardar_intermedio(self.tabla(), OUT_ZONAS) + guardar_intermedio(self.tabla_alias(), OUT_ALIAS)
+
+    @property
+    def n_zonas(self):
+        return len(self._nivel)
+
+    def sin_dato(self, zonas):
+        """Máscara de las zonas (arreglo de zona_id) que son el SIN DATO de su padre."""
+        es_sin_dato = np.array([nombre == SIN_DATO and not codigo for nombre, codigo in zip(self._nombre, self._codigo)]
+                               + [False])
+        return es_sin_dato[np.asarray(zonas)]
+
+    def _ambito(self, nivel, padre):
+        # Los departamentos son únicos en el país, los municipios dentro de su departamento
+        # y las comunas, barrios y sectores dentro de su municipio
+        if nivel == "departamento":
+            return NINGUNA
+        if nivel == "municipio":
+            return self._ancestros["departamento"][padre]
+        return self._ancestros["municipio"][padre]
+
+    def _crear(self, nivel, nombre, codigo, padre):
+        zona = self.n_zonas
+        self._nivel.append(nivel)
+        self._nombre.append(nombre)
+        self._codigo.append(codigo)
+        self._padre.append(padre)
+        for ancestro in ANCESTROS:
+            valor = self._ancestros[ancestro][padre] if padre != NINGUNA else NINGUNA
+            self._ancestros[ancestro].append(zona if ancestro == nivel else valor)
+        return zona
+
+    def zona(self, nivel, padre=NINGUNA, codigo="", nombre=""):
+        """zona_id de (código, nombre) dentro de `padre` (textos canónicos); la crea si no existe."""
+        if nivel not in NIVELES_GEO:
+            raise ValueError(f"❌ Nivel geográfico desconocido: {nivel}")
+        if not codigo and not nombre:
+            nombre = SIN_DATO
+        ambito = self._ambito(nivel, padre)
+        if nivel == "comuna" and self._nombre[ambito] == MUNICIPIO_COMUNAS:
+            codigo = codigo or CODIGOS_COMUNAS_MEDELLIN.get(nombre, "")
+            nombre = nombre or COMUNAS_MEDELLIN.get(codigo, "")
+
+        textos = [t for t in (codigo, nombre) if t]
+        zona = next((self._alias[(nivel, ambito, t)] for t in textos if (nivel, ambito, t) in self._alias), None)
+        if zona is None:
+            zona = self._crear(nivel, nombre or codigo, codigo, padre)
+        elif codigo and not self._codigo[zona]:
+            # Conocida solo por el nombre: ahora también tiene código
+            self._codigo[zona] = codigo
+        for texto in textos:
+            self._alias.setdefault((nivel, ambito, texto), zona)
+        return zona
+
+    def resolver(self, nivel, padres, codigos=None, nombres=None):
+        """
+        zona_id (int32) de cada fila a partir de su padre y de su código y/o nombre
+        (arreglos de textos canónicos). Se resuelve una vez por combinación distinta.
+        """
+        vacios = np.full(len(padres), "", dtype=object)
+        combos = pd.DataFrame({
+            "padre": padres,
+            "codigo": vacios if codigos is None else codigos,
+            "nombre": vacios if nombres is None else nombres,
+        })
+        fila_combo, representantes = combinaciones_distintas(combos, list(combos.columns))
+        distintos = combos.iloc[representantes]
+        # Un barrio que aparece bajo varias comunas se crea bajo la más frecuente
+        # (y nunca bajo un SIN DATO si tiene una conocida)
+        frecuencia = np.bincount(fila_combo, minlength=len(distintos))
+        padre_sin_dato = self.sin_dato(distintos["padre"].to_numpy())
+        zona_combo = np.empty(len(distintos), dtype=np.int32)
+        for k in np.lexsort((-frecuencia, padre_sin_dato)):
+            padre, codigo, nombre = distintos.iloc[k]
+            if codigo and not any(c.isdigit() for c in codigo):
+                # Un "código" sin cifras es en realidad el nombre ("EL POBLADO" en la columna comuna)
+                codigo, nombre = "", nombre or codigo
+            zona_combo[k] = self.zona(nivel, int(padre), codigo, nombre)
+        return zona_combo[fila_combo]
+
+    def _padres(self, nivel, ids, n):
+        if nivel == "departamento":
+            return np.full(n, NINGUNA, dtype=np.int32)
+        anterior = "departamento" if nivel == "municipio" else "municipio"
+        if anterior not in ids:
+            raise ValueError(f"❌ Para ubicar el nivel {nivel} hace falta el {anterior} (columna o valor fijo).")
+        if nivel in ("barrio", "sector") and "comuna" in ids:
+            # Los barrios y sectores cuelgan de su comuna; si no se conoce, del municipio
+            return np.where(self.sin_dato(ids["comuna"]), ids["municipio"], ids["comuna"]).astype(np.int32)
+        return ids[anterior]
+
+    @medir()
+    def resolver_fuente(self, df, columnas, fijos=None):
+        """
+        Agrega a `df` (en el mismo DataFrame) una columna int32 <nivel>_id por cada nivel
+        ubicado y devuelve {nivel: filas que quedaron en SIN DATO}.
+
+        `columnas` = {nivel: (columna del código, columna del nombre)}, cualquiera puede
+        ser None o no existir en `df`; `fijos` = {nivel: texto} para lo que la fuente no
+        trae escrito (todos los robos de Kaggle son de MEDELLIN, ANTIOQUIA).
+        """
+        fijos = fijos or {}
+        n = len(df)
+        ids, sin_dato = {}, {}
+        for nivel in NIVELES_GEO:
+            if nivel in fijos:
+                codigos, nombres = None, np.full(n, canonico(fijos[nivel], nivel), dtype=object)
+            elif nivel in columnas:
+                codigos, nombres = [_canonicos(df[c], nivel) if c in df.columns else None for c in columnas[nivel]]
+                if codigos is None and nombres is None:
+                    continue
+            else:
+                continue
+            ids[nivel] = self.resolver(nivel, self._padres(nivel, ids, n), codigos, nombres)
+            df[f"{nivel}_id"] = ids[nivel]
+            sin_dato[nivel] = int(self.sin_dato(ids[nivel]).sum())
+        return sin_dato
+
+    def padres(self, zonas):
+        """zona_id del padre de cada zona."""
+        return np.asarray(self._padre, dtype=np.int32)[np.asarray(zonas)]
+
+    def tabla(self):
+        """geo_zonas: una fila por zona con su padre, sus ancestros y su zona_clave."""
+        zonas = pd.DataFrame({
+            "zona_id": np.arange(self.n_zonas, dtype=np.int32),
+            "nivel": pd.Categorical(self._nivel, categories=NIVELES_GEO),
+            "nombre": pd.Series(self._nombre, dtype=object),
+            "codigo": pd.Series(self._codigo, dtype=object),
+            "padre_id": np.asarray(self._padre, dtype=np.int32),
+            **{f"{nivel}_id": np.asarray(self._ancestros[nivel], dtype=np.int32) for nivel in ANCESTROS},
+        })
+        zonas["zona_clave"] = self._claves(zonas)
+        return zonas
+
+    def tabla_alias(self):
+        """geo_alias: cada texto conocido (código o nombre) de cada zona dentro de su ámbito."""
+        alias = pd.DataFrame(list(self._alias), columns=["nivel", "ambito_id", "alias"])
+        alias["nivel"] = pd.Categorical(alias["nivel"], categories=NIVELES_GEO)
+        alias["ambito_id"] = alias["ambito_id"].astype(np.int32)
+        alias["zona_id"] = np.fromiter(self._alias.values(), dtype=np.int32, count=len(self._alias))
+        return alias
+
+    def _claves(self, zonas):
+        # 🔑 Cada zona aporta a la llave solo su propio nivel (la regla de mapa_seguridad.zonas);
+        # el índice -1 toma el "" agregado al final
+        nombre = np.append(zonas["nombre"].to_numpy(dtype=object), "")
+        nivel = zonas["nivel"].to_numpy(dtype=object)
+        etiqueta = np.where(zonas["codigo"] != "", zonas["codigo"], zonas["nombre"])
+        partes = pd.DataFrame({
+            "departamento": nombre[zonas["departamento_id"]],
+            "municipio": nombre[zonas["municipio_id"]],
+            **{n: np.where(nivel == n, etiqueta, "") for n in ("comuna", "barrio", "sector")},
+        })
+        claves = construir_zona_clave(partes)
+        return claves.where(nivel != "departamento", partes["departamento"])
+
+    def heredar(self, df, destino, col="zona_id"):
+        """
+        Asigna a cada zona de `destino` la fila de `df` (una por zona en `col`) de la propia
+        zona o, si no tiene, del ancestro más cercano que la tenga: un barrio sin arriendo
+        propio toma el de su comuna. Devuelve (filas con `col` = zona de destino,
+        zonas de `df` que no llegaron a ningún destino).
+        """
+        destino = np.unique(np.asarray(destino, dtype=np.int32))
+        con_fila = df[col].to_numpy()
+        origen = np.full(len(destino), NINGUNA, dtype=np.int32)
+        # Del ancestro más lejano al más cercano: el último que tenga fila gana
+        for candidatos in [self._ancestros[nivel] for nivel in ANCESTROS] + [range(self.n_zonas)]:
+            candidato = np.asarray(candidatos, dtype=np.int32)[destino]
+            tiene = np.isin(candidato, con_fila)
+            origen[tiene] = candidato[tiene]
+        asignado = origen != NINGUNA
+        filas = df.set_index(col).loc[origen[asignado]].reset_index(drop=True)
+        filas.insert(0, col, destino[asignado])
+        return filas, np.setdiff1d(con_fila, origen[asignado])
+
+    def etiquetar(self, df, col="zona_id"):
+        """
+        Agrega a `df`, después de `col`, la zona_clave, el nivel y los nombres y códigos
+        de la zona y sus ancestros (departamento, municipio, comuna, barrio).
+        """
+        zonas = self.tabla()
+        z = df[col].to_numpy()
+        # El índice -1 (sin ancestro en ese nivel) toma el None agregado al final
+        nombre = np.append(zonas["nombre"].to_numpy(dtype=object), None)
+        codigo = np.append(zonas["codigo"].replace("", None).to_numpy(dtype=object), None)
+        nivel = zonas["nivel"].to_numpy(dtype=object)[z]
+        es_barrio = nivel == "barrio"
+        comuna = zonas["comuna_id"].to_numpy()[z]
+        etiquetas = {
+            "zona_clave": zonas["zona_clave"].to_numpy(dtype=object)[z],
+            "nivel_geo": nivel,
+            "departamento": nombre[zonas["departamento_id"].to_numpy()[z]],
+            "municipio": nombre[zonas["municipio_id"].to_numpy()[z]],
+            "codigo_comuna": codigo[comuna],
+            "comuna": nombre[comuna],
+            "codigo_barrio": np.where(es_barrio, codigo[z], None),
+            "barrio": np.where(es_barrio, nombre[z], None),
+        }
+        df = df.copy(deep=False)
+        posicion = df.columns.get_loc(col) + 1
+        for k, (columna, valores) in enumerate(etiquetas.items()):
+            df.insert(posicion + k, columna, pd.Categorical(valores))
+        return df
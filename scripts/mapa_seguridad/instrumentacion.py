@@ -0,0 +1,266 @@
+"""
+Instrumentación del pipeline: tiempos, CPU, memoria y filas por BLOQUE.
+
+Los scripts marcan el inicio de cada BLOQUE con una línea, sin cambiar su
+estructura; el bloque anterior se cierra solo al empezar el siguiente (o al
+terminar el script):
+
+    bloque("BLOQUE 7 — Unificación y cálculo del índice de riesgo")
+    ...
+    filas(entrada=len(df_niveles), salida=len(df_union))
+
+Dentro de un bloque, las funciones decoradas con @medir() (normalizar_columnas,
+Geografia.resolver_fuente, las uniones…) y los `with tramo("…"):` quedan como tramos
+anidados. Cada tramo registra tiempo real, tiempo de CPU, cuánto creció el pico de
+memoria del proceso y, si se indican, las filas de entrada y de salida.
+
+Se activa con la variable de entorno MAPA_TRAZA:
+    (vacía o 0)  apagada: bloque() y filas() retornan de inmediato, tramo() es un
+                 contexto vacío y @medir() deja la función original sin envolver
+    1            tramos con tiempos y memoria (pico de RSS del proceso)
+    profundo     además tracemalloc (pico de memoria de Python por tramo) y cProfile
+                 de todo el script (data/trazas/<script>.prof, se abre con snakeviz)
+
+Al terminar el script se imprime una tabla por bloque y se escribe
+data/trazas/<script>.json en formato "trace event" (se abre en chrome://tracing
+o en https://ui.perfetto.dev). combinar_trazas() une las de varias etapas.
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: sin pico de RSS, el resto funciona igual
+    resource = None
+
+MODO = os.environ.get("MAPA_TRAZA", "").strip().lower()
+APAGADA = ("", "0", "no")
+ACTIVA = MODO not in APAGADA
+PROFUNDO = MODO == "profundo"
+TRAZAS_DIR = Path(os.environ.get("MAPA_TRAZA_DIR", Path("data") / "trazas"))
+
+_NULO = nullcontext()
+
+
+def _pico_rss():
+    # Pico de memoria residente del proceso en bytes (ru_maxrss viene en KB en Linux)
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+class Tramo:
+    """Un intervalo medido: se abre con abrir() y se cierra con cerrar()."""
+
+    def __init__(self, nombre, es_bloque=False):
+        self.nombre = nombre
+        self.es_bloque = es_bloque
+        self.args = {}
+        self.pico_hijos = 0
+
+    def abrir(self):
+        self.rss = _pico_rss()
+        if PROFUNDO:
+            # El pico que llevaba el tramo de afuera se le guarda antes de reiniciarlo
+            self.memoria, pico = tracemalloc.get_traced_memory()
+            if _registro.pila:
+                _registro.pila[-1].pico_hijos = max(_registro.pila[-1].pico_hijos, pico)
+            tracemalloc.reset_peak()
+        self.cpu = time.process_time_ns()
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def cerrar(self):
+        fin = time.perf_counter_ns()
+        self.args["cpu_ms"] = round((time.process_time_ns() - self.cpu) / 1e6, 3)
+        rss = _pico_rss()
+        if rss is not None:
+            self.args["pico_rss_mb"] = round((rss - self.rss) / 2**20, 3)
+        if PROFUNDO:
+            # El pico de este tramo incluye el de sus tramos hijos (que reinician el de tracemalloc)
+            pico = max(tracemalloc.get_traced_memory()[1], self.pico_hijos)
+            self.args["pico_python_mb"] = round((pico - self.memoria) / 2**20, 3)
+            tracemalloc.reset_peak()
+            if _registro.pila:
+                _registro.pila[-1].pico_hijos = max(_registro.pila[-1].pico_hijos, pico)
+        _registro.eventos.append({
+            "name": self.nombre, "cat": "bloque" if self.es_bloque else "tramo", "ph": "X",
+            "ts": _registro.a_microsegundos(self.inicio), "dur": (fin - self.inicio) / 1000,
+            "pid": os.getpid(), "tid": 0, "args": self.args,
+        })
+
+    def __enter__(self):
+        _registro.pila.append(self.abrir())
+        return self
+
+    def __exit__(self, *exc):
+        _registro.cerrar_hasta(self)
+        return False
+
+
+class _Registro:
+    """Tramos abiertos (pila) y eventos terminados del proceso."""
+
+    def __init__(self):
+        self.pila = []
+        self.eventos = []
+        # Reloj de pared en microsegundos para que las trazas de varias etapas se puedan unir
+        self.base_epoca = time.time_ns() / 1000
+        self.base_contador = time.perf_counter_ns()
+        self.perfilador = None
+
+    def a_microsegundos(self, contador):
+        return self.base_epoca + (contador - self.base_contador) / 1000
+
+    def cerrar_hasta(self, tramo):
+        # Cierra `tramo` y los bloques que quedaron abiertos dentro de él
+        while self.pila:
+            abierto = self.pila.pop()
+            abierto.cerrar()
+            if abierto is tramo:
+                return
+
+
+_registro = _Registro()
+
+
+def bloque(nombre, **args):
+    """Cierra el bloque anterior del mismo nivel y abre uno nuevo llamado `nombre`."""
+    if not ACTIVA:
+        return
+    if _registro.pila and _registro.pila[-1].es_bloque:
+        _registro.cerrar_hasta(_registro.pila[-1])
+    nuevo = Tramo(nombre, es_bloque=True)
+    nuevo.args.update(args)
+    _registro.pila.append(nuevo.abrir())
+
+
+def filas(entrada=None, salida=None):
+    """Anota las filas de entrada y/o salida del tramo o bloque abierto."""
+    if not ACTIVA or not _registro.pila:
+        return
+    args = _registro.pila[-1].args
+    if entrada is not None:
+        args["filas_entrada"] = int(entrada)
+    if salida is not None:
+        args["filas_salida"] = int(salida)
+
+
+def tramo(nombre):
+    """Contexto que mide lo que ocurre dentro (`with tramo("unión pandas"):`)."""
+    return Tramo(nombre) if ACTIVA else _NULO
+
+
+def _contar(valor):
+    return len(valor) if hasattr(valor, "shape") and hasattr(valor, "__len__") else None
+
+
+def medir(nombre=None):
+    """
+    Decorador: cada llamada queda como un tramo con el nombre de la función (y el
+    primer argumento si es texto, como el nombre del intermedio). Si el primer
+    argumento o el resultado son DataFrames/arreglos, anota sus filas.
+    Con la instrumentación apagada devuelve la función sin cambios.
+    """
+    def decorador(funcion):
+        if not ACTIVA:
+            return funcion
+        etiqueta = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envuelta(*args, **kwargs):
+            texto = args and isinstance(args[0], str)
+            with Tramo(f"{etiqueta}({args[0]})" if texto else etiqueta) as actual:
+                if args and (n := _contar(args[0])) is not None:
+                    actual.args["filas_entrada"] = n
+                resultado = funcion(*args, **kwargs)
+                if (n := _contar(resultado)) is not None:
+                    actual.args["filas_salida"] = n
+                return resultado
+        return envuelta
+    return decorador
+
+
+def nombre_script():
+    return Path(sys.argv[0]).stem or "interactivo"
+
+
+def imprimir_resumen(eventos):
+    """Tabla de los bloques (y sus tramos anidados, con sangría) ordenados por inicio."""
+    print("\n⏱️ Instrumentación por bloque:")
+    print(f"   {'tramo':<66}{'segundos':>10}{'cpu (s)':>9}{'Δ pico (MB)':>13}  filas")
+    pila_fin = []
+    for evento in sorted(eventos, key=lambda e: (e["ts"], -e["dur"])):
+        while pila_fin and evento["ts"] >= pila_fin[-1]:
+            pila_fin.pop()
+        args = evento["args"]
+        memoria = args.get("pico_python_mb", args.get("pico_rss_mb"))
+        filas_txt = ""
+        if "filas_entrada" in args or "filas_salida" in args:
+            filas_txt = f"{args.get('filas_entrada', '')} → {args.get('filas_salida', '')}".strip()
+        nombre = ("  " * len(pila_fin) + evento["name"])[:65]
+        print(f"   {nombre:<66}{evento['dur'] / 1e6:>10.3f}{args['cpu_ms'] / 1000:>9.3f}"
+              f"{'' if memoria is None else f'{memoria:+.1f}':>13}  {filas_txt}")
+        pila_fin.append(evento["ts"] + evento["dur"])
+
+
+def guardar_traza(ruta=None):
+    """Cierra los tramos abiertos y escribe la traza (y el perfil de cProfile). Devuelve la ruta."""
+    while _registro.pila:
+        _registro.cerrar_hasta(_registro.pila[0])
+    if not _registro.eventos:
+        return None
+    ruta = Path(ruta or TRAZAS_DIR / f"{nombre_script()}.json")
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    metadatos = {"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0, "args": {"name": ruta.stem}}
+    traza = {"traceEvents": [metadatos] + _registro.eventos, "displayTimeUnit": "ms",
+             "otherData": {"script": nombre_script(), "modo": MODO}}
+    ruta.write_text(json.dumps(traza, ensure_ascii=False), encoding="utf-8")
+    if _registro.perfilador is not None:
+        _registro.perfilador.disable()
+        _registro.perfilador.dump_stats(ruta.with_suffix(".prof"))
+    return ruta
+
+
+def pedida():
+    """True si MAPA_TRAZA pide instrumentación (se relee, por si se cambió después de importar)."""
+    return os.environ.get("MAPA_TRAZA", "").strip().lower() not in APAGADA
+
+
+def combinar_trazas(rutas, destino):
+    """Une las trazas de varias etapas (cada una es un proceso en el visor). Devuelve `destino`."""
+    eventos = []
+    for ruta in rutas:
+        ruta = Path(ruta)
+        if ruta.exists():
+            eventos += json.loads(ruta.read_text(encoding="utf-8"))["traceEvents"]
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    destino.write_text(json.dumps({"traceEvents": eventos, "displayTimeUnit": "ms"}, ensure_ascii=False),
+                       encoding="utf-8")
+    return destino
+
+
+def _al_terminar():
+    ruta = guardar_traza()
+    if ruta is None:
+        return
+    imprimir_resumen(_registro.eventos)
+    print(f"   🧭 Traza: {ruta}" + (f" (+ {ruta.with_suffix('.prof')})" if PROFUNDO else ""))
+
+
+if ACTIVA:
+    if PROFUNDO:
+        tracemalloc.start()
+        _registro.perfilador = cProfile.Profile()
+        _registro.perfilador.enable()
+    atexit.register(_al_terminar)
@@ -0,0 +1,63 @@
+"""
+Normalización única de los textos geográficos (departamento, municipio, comuna, barrio...).
+
+Todas las etapas usan la misma regla, así las llaves de unión coinciden:
+mayúsculas → sin tildes (NFKD + ASCII) → solo letras, números y espacios → sin
+espacios en los extremos. "Medellín " y "MEDELLIN" quedan iguales. Los códigos
+que llegan como decimales ("14.0", de columnas leídas como float) quedan como
+enteros ("14"); si no, al quitar el punto la comuna 1.0 se confundiría con la 10.
+
+Las columnas geográficas tienen pocos valores distintos (cientos de barrios frente
+a decenas de miles de filas), así que se normaliza cada valor distinto una sola vez
+(con caché) y el resultado se devuelve como columna categórica.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.instrumentacion import medir
+
+_NO_PERMITIDOS = re.compile(r"[^A-Z0-9 ]")
+_ENTERO_DECIMAL = re.compile(r"^\s*(-?\d+)\.0+\s*$")
+
+
+@lru_cache(maxsize=100_000)
+def normalizar_texto(valor):
+    """Normaliza un texto: 'Itagüí ' → 'ITAGUI', '14.0' → '14'."""
+    entero = _ENTERO_DECIMAL.match(valor)
+    if entero:
+        valor = entero.group(1)
+    texto = unicodedata.normalize("NFKD", valor.upper())
+    texto = texto.encode("ascii", errors="ignore").decode("utf-8")
+    return _NO_PERMITIDOS.sub("", texto).strip()
+
+
+def normalizar_geo(serie):
+    """
+    Normaliza una columna completa y la devuelve como categórica.
+
+    Solo se procesan los valores distintos; los vacíos (NaN) se conservan como vacíos.
+    Las categorías quedan en orden alfabético para que los groupby ordenen igual que con texto.
+    """
+    codigos, unicos = pd.factorize(serie)
+    normalizados = [normalizar_texto(str(v)) for v in unicos]
+    categorias, remapeo = np.unique(np.array(normalizados, dtype=object), return_inverse=True)
+    # El código -1 (vacío) toma el último elemento, que también es -1
+    codigos = np.append(remapeo.ravel(), -1)[codigos]
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=pd.Index(categorias, dtype=object)),
+        index=serie.index,
+        name=serie.name,
+    )
+
+
+@medir()
+def normalizar_columnas(df, columnas):
+    """Aplica normalizar_geo a cada columna de `columnas` que exista en `df`."""
+    for c in columnas:
+        if c and c in df.columns:
+            df[c] = normalizar_geo(df[c])
+    return df
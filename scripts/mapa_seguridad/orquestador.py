@@ -0,0 +1,356 @@
+"""
+Orquestador incremental del pipeline 01 → 08.
+
+Cada etapa declara los archivos que lee y los que escribe. Antes de ejecutarla se
+calcula la huella (SHA-256 del contenido) de sus entradas y de su propio script;
+si nada cambió desde la última ejecución y sus salidas siguen intactas, la etapa
+se salta (acierto de caché). Como las huellas son de contenido, si una etapa se
+vuelve a ejecutar pero produce exactamente los mismos archivos, las siguientes
+tampoco se repiten.
+
+El estado se guarda en data/.estado_pipeline.json. Para no releer archivos
+grandes en cada corrida, la huella de un archivo se reutiliza mientras su tamaño
+y su fecha de modificación no cambien.
+
+La lógica de cada etapa vive en mapa_seguridad.etapas y su script solo la llama.
+Como mapa_seguridad.etapas importa todas las etapas y estas usan el resto del
+paquete, la huella de "código" de una etapa incluye su script y todos los módulos
+de mapa_seguridad: un cambio en, por ejemplo, riesgo.py o geografia.py invalida la caché.
+
+Con procesos > 1 las etapas independientes (los cargadores 01–04) corren al mismo
+tiempo, cada una en su propio proceso, y la unión 05 arranca cuando terminan
+todas (las teselas 07 y las zonas calientes 08 solo esperan a 03). La salida de cada etapa se captura y
+se imprime completa al terminar, para que no se mezcle. Si un cargador falla, las
+etapas que dependen de él no se ejecutan.
+
+ejecutar_en_proceso() recorre las mismas etapas en orden dentro del proceso actual,
+con las funciones de mapa_seguridad.etapas.PASOS: un solo intérprete, y las tablas
+que produce una etapa le llegan a las siguientes sin volver a leerlas del disco.
+"""
+import hashlib
+import json
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mapa_seguridad.almacen import DATA_DIR, buscar_intermedio, ruta_intermedio
+from mapa_seguridad.consola import avisar
+from mapa_seguridad.etapas import PASOS
+from mapa_seguridad.instrumentacion import TRAZAS_DIR, combinar_trazas, pedida
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+PAQUETE_DIR = SCRIPTS_DIR / "mapa_seguridad"
+ESTADO = DATA_DIR / ".estado_pipeline.json"
+
+
+@dataclass
+class Etapa:
+    """
+    Una etapa del pipeline.
+
+    En `entradas` y `salidas`, un Path es un archivo fijo y un str es el nombre de
+    un intermedio de mapa_seguridad.almacen (Parquet o CSV según la configuración).
+    Las `opcionales` se usan si existen: cuentan para la huella, pero si faltan la
+    etapa se ejecuta igual.
+    """
+    nombre: str
+    entradas: list = field(default_factory=list)
+    salidas: list = field(default_factory=list)
+    opcionales: list = field(default_factory=list)
+
+    @property
+    def script(self):
+        return SCRIPTS_DIR / f"{self.nombre}.py"
+
+    @property
+    def codigo(self):
+        """Archivos de código de la etapa: su script y todos los módulos de mapa_seguridad."""
+        return [self.script] + sorted(PAQUETE_DIR.rglob("*.py"))
+
+
+ETAPAS = [
+    Etapa("01_cargar_policia",
+          entradas=[DATA_DIR / "Reporte_Hurto_por_Modalidades_Policía_Nacional.csv"],
+          salidas=["hurto_policia_limpio"]),
+    Etapa("02_cargar_medata",
+          entradas=[DATA_DIR / "consolidado_cantidad_casos_criminalidad_en_comunas_por_año.csv"],
+          salidas=["criminalidad_comunas_limpio"]),
+    Etapa("03_cargar_kaggle",
+          entradas=[DATA_DIR / "robbery of people in Medellin.csv"],
+          salidas=["robos_medellin_limpio", Path("web") / "perfil_robos.json", Path("web") / "perfil_robos.json.gz"],
+          opcionales=[DATA_DIR / "limites_comunas.geojson", DATA_DIR / "limites_barrios.geojson"]),
+    Etapa("04_cargar_arriendos",
+          entradas=[DATA_DIR / "arriendos_valle_aburra_2025.csv"],
+          salidas=["arriendos_limpio"]),
+    Etapa("05_unir_y_riesgo",
+          entradas=["hurto_policia_limpio", "robos_medellin_limpio",
+                    "criminalidad_comunas_limpio", "arriendos_limpio"],
+          salidas=["data_final", Path("web") / "data_final.json", Path("web") / "data_final.json.gz",
+                   Path("web") / "estadisticas.json", Path("web") / "estadisticas.json.gz",
+                   "riesgo_ventanas", Path("web") / "riesgo_ventanas.json", Path("web") / "riesgo_ventanas.json.gz",
+                   DATA_DIR / "serie_policia.npz", "geo_zonas", "geo_alias"]),
+    Etapa("06_validar_salida",
+          entradas=["data_final", "geo_zonas", "arriendos_limpio"],
+          salidas=[DATA_DIR / "validacion_data_final.json"],
+          opcionales=[Path("web") / "perfil_robos.json"]),
+    Etapa("07_generar_teselas",
+          entradas=["robos_medellin_limpio"],
+          salidas=[Path("web") / "teselas" / "indice.json"]),
+    Etapa("08_calcular_hotspots",
+          entradas=["robos_medellin_limpio"],
+          salidas=[Path("web") / "hotspots.json", Path("web") / "hotspots.json.gz"]),
+]
+
+
+def resolver_entrada(entrada):
+    if isinstance(entrada, Path):
+        return entrada
+    return buscar_intermedio(entrada) or ruta_intermedio(entrada)
+
+
+def resolver_salida(salida):
+    if isinstance(salida, Path):
+        return salida
+    return ruta_intermedio(salida)
+
+
+def dependencias(etapas):
+    """Para cada etapa, los nombres de las etapas que producen alguna de sus entradas."""
+    productor = {s: e.nombre for e in etapas for s in e.salidas}
+    return {e.nombre: sorted({productor[x] for x in e.entradas if x in productor}) for e in etapas}
+
+
+class Huellas:
+    """SHA-256 de archivos, con caché por (tamaño, fecha de modificación)."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or {}
+
+    def de(self, ruta):
+        ruta = Path(ruta)
+        if not ruta.exists():
+            return None
+        info = ruta.stat()
+        clave = str(ruta)
+        guardada = self.cache.get(clave)
+        if guardada and guardada["tamano"] == info.st_size and guardada["mtime_ns"] == info.st_mtime_ns:
+            return guardada["sha256"]
+        h = hashlib.sha256()
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+        self.cache[clave] = {"tamano": info.st_size, "mtime_ns": info.st_mtime_ns, "sha256": h.hexdigest()}
+        return h.hexdigest()
+
+
+def cargar_estado():
+    if ESTADO.exists():
+        return json.loads(ESTADO.read_text(encoding="utf-8"))
+    return {"etapas": {}, "huellas": {}}
+
+
+def guardar_estado(estado):
+    ESTADO.write_text(json.dumps(estado, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def huella_etapa(etapa, huellas):
+    """Huellas de las entradas y del código (script y paquete) de una etapa: lo que decide si hay que repetirla."""
+    codigo = hashlib.sha256()
+    for ruta in etapa.codigo:
+        codigo.update(f"{ruta.relative_to(SCRIPTS_DIR).as_posix()}:{huellas.de(ruta)}\n".encode())
+    return {
+        "script": codigo.hexdigest(),
+        "entradas": {str(resolver_entrada(e)): huellas.de(resolver_entrada(e))
+                     for e in etapa.entradas + etapa.opcionales},
+    }
+
+
+def motivo_para_ejecutar(etapa, estado, huellas):
+    """Devuelve por qué hay que ejecutar la etapa, o None si su caché sigue vigente."""
+    anterior = estado["etapas"].get(etapa.nombre)
+    if anterior is None:
+        return "sin ejecuciones previas"
+    actual = huella_etapa(etapa, huellas)
+    if actual["script"] != anterior["script"]:
+        return "cambió el código"
+    if actual["entradas"] != anterior["entradas"]:
+        cambiadas = [Path(r).name for r, h in actual["entradas"].items() if anterior["entradas"].get(r) != h]
+        return f"cambiaron las entradas: {', '.join(cambiadas)}"
+    for salida in etapa.salidas:
+        ruta = resolver_salida(salida)
+        if huellas.de(ruta) is None:
+            return f"falta la salida {ruta.name}"
+        if huellas.de(ruta) != anterior["salidas"].get(str(ruta)):
+            return f"la salida {ruta.name} se modificó por fuera del pipeline"
+    return None
+
+
+def ejecutar_etapa(etapa, capturar=False):
+    """
+    Ejecuta el script de la etapa en un proceso aparte, desde la raíz del proyecto.
+    Devuelve (exito, segundos, salida_capturada).
+    """
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, str(etapa.script)], cwd=SCRIPTS_DIR.parent,
+                             capture_output=capturar, text=True)
+    segundos = time.perf_counter() - inicio
+    salida = (proceso.stdout or "") + (proceso.stderr or "") if capturar else ""
+    return proceso.returncode == 0, segundos, salida
+
+
+def registrar_ejecucion(etapa, estado, huellas):
+    registro = huella_etapa(etapa, huellas)
+    registro["salidas"] = {str(resolver_salida(s)): huellas.de(resolver_salida(s)) for s in etapa.salidas}
+    estado["etapas"][etapa.nombre] = registro
+
+
+def imprimir_resumen(resultados, segundos_totales):
+    print("\n📋 Resumen del pipeline:")
+    print(f"   {'etapa':<22}{'resultado':<14}{'segundos':>10}  detalle")
+    for r in resultados:
+        print(f"   {r['etapa']:<22}{r['resultado']:<14}{r['segundos']:>10.2f}  {r['detalle']}")
+    aciertos = sum(r["resultado"] == "💾 caché" for r in resultados)
+    suma = sum(r["segundos"] for r in resultados)
+    print(f"\n   Aciertos de caché: {aciertos}/{len(resultados)} — tiempo de etapas: {suma:.2f} s"
+          f" — tiempo real: {segundos_totales:.2f} s")
+
+
+def seleccionar(nombres):
+    """Etapas pedidas (por prefijo) y sus dependencias dentro de la selección."""
+    etapas = [e for e in ETAPAS if not nombres or any(e.nombre.startswith(n) for n in nombres)]
+    seleccionadas = {e.nombre for e in etapas}
+    deps = {n: [d for d in ds if d in seleccionadas] for n, ds in dependencias(ETAPAS).items()}
+    return etapas, deps
+
+
+def preparar(etapa, deps, fallidas, estado, huellas, forzar):
+    """
+    Decide si la etapa se omite, se toma de la caché o hay que ejecutarla.
+    Devuelve (resultado, motivo); motivo es None si no hay que ejecutarla.
+    """
+    resultado = {"etapa": etapa.nombre, "segundos": 0.0}
+    bloqueada = [d for d in deps[etapa.nombre] if d in fallidas]
+    if bloqueada:
+        return dict(resultado, resultado="⏭️ omitida", detalle=f"falló {', '.join(bloqueada)}"), None
+    motivo = "forzada" if forzar else motivo_para_ejecutar(etapa, estado, huellas)
+    if motivo is None:
+        return dict(resultado, resultado="💾 caché", detalle="sin cambios"), None
+    faltantes = [resolver_entrada(e) for e in etapa.entradas if not resolver_entrada(e).exists()]
+    if faltantes:
+        return dict(resultado, resultado="❌ error", detalle=f"falta {', '.join(map(str, faltantes))}"), None
+    return dict(resultado, detalle=motivo), motivo
+
+
+def ejecutar_pipeline(nombres=None, forzar=False, procesos=1):
+    """
+    Ejecuta las etapas respetando sus dependencias y saltando las que no cambiaron.
+
+    `nombres` limita la corrida a algunas etapas (por prefijo: "03", "05_unir"...).
+    Con `forzar=True` se ignoran las huellas guardadas. Con `procesos` > 1 se ejecutan
+    a la vez hasta ese número de etapas independientes. Devuelve la lista de resultados.
+    """
+    inicio_total = time.perf_counter()
+    etapas, deps = seleccionar(nombres)
+    estado = cargar_estado()
+    huellas = Huellas(estado.get("huellas"))
+    paralelo = procesos > 1
+    pendientes = list(etapas)
+    terminadas, fallidas = set(), set()
+    resultados = {}
+    en_curso = {}
+
+    with ThreadPoolExecutor(max_workers=procesos) as pool:
+        while pendientes or en_curso:
+            # ▶️ Lanzar todas las etapas cuyas dependencias ya terminaron
+            for etapa in list(pendientes):
+                if any(d not in terminadas for d in deps[etapa.nombre]):
+                    continue
+                pendientes.remove(etapa)
+                resultado, motivo = preparar(etapa, deps, fallidas, estado, huellas, forzar)
+                if motivo is None:
+                    resultados[etapa.nombre] = resultado
+                    terminadas.add(etapa.nombre)
+                    if resultado["resultado"] != "💾 caché":
+                        fallidas.add(etapa.nombre)
+                    continue
+                if not paralelo:
+                    print(f"\n▶️ {etapa.nombre} ({motivo})")
+                en_curso[pool.submit(ejecutar_etapa, etapa, paralelo)] = (etapa, resultado)
+
+            if not en_curso:
+                continue
+
+            # ⏳ Esperar a que termine alguna etapa y registrar su resultado
+            listas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in listas:
+                etapa, resultado = en_curso.pop(futuro)
+                exito, segundos, salida = futuro.result()
+                if paralelo:
+                    print(f"\n▶️ {etapa.nombre} ({resultado['detalle']}) — {segundos:.2f} s")
+                    print(salida, end="" if salida.endswith("\n") else "\n")
+                resultado.update(segundos=segundos, resultado="✅ ejecutada" if exito else "❌ error")
+                if exito:
+                    registrar_ejecucion(etapa, estado, huellas)
+                    estado["huellas"] = huellas.cache
+                    guardar_estado(estado)
+                else:
+                    fallidas.add(etapa.nombre)
+                resultados[etapa.nombre] = resultado
+                terminadas.add(etapa.nombre)
+
+    estado["huellas"] = huellas.cache
+    guardar_estado(estado)
+    ordenados = [resultados[e.nombre] for e in etapas]
+    imprimir_resumen(ordenados, time.perf_counter() - inicio_total)
+    if pedida():
+        # 🧭 Una sola traza con las etapas que corrieron (cada una es un proceso en el visor)
+        corridas = [TRAZAS_DIR / f"{r['etapa']}.json" for r in ordenados if r["resultado"] != "💾 caché"]
+        print(f"   🧭 Traza del pipeline: {combinar_trazas(corridas, TRAZAS_DIR / 'pipeline.json')}")
+    return ordenados
+
+
+def ejecutar_en_proceso(nombres=None, forzar=False):
+    """
+    Como ejecutar_pipeline(), pero en el proceso actual: las etapas se llaman en orden
+    como funciones (mapa_seguridad.etapas.PASOS) y cada una recibe en memoria las tablas
+    de las anteriores. Las etapas sin cambios se toman de la caché (las siguientes leen
+    del disco lo que no esté en memoria) y el estado queda igual que con los scripts.
+    """
+    inicio_total = time.perf_counter()
+    etapas, deps = seleccionar(nombres)
+    estado = cargar_estado()
+    huellas = Huellas(estado.get("huellas"))
+    fallidas = set()
+    memoria = {}
+    resultados = []
+
+    for etapa in etapas:
+        resultado, motivo = preparar(etapa, deps, fallidas, estado, huellas, forzar)
+        if motivo is not None:
+            print(f"\n▶️ {etapa.nombre} ({motivo})")
+            inicio = time.perf_counter()
+            try:
+                memoria.update(PASOS[etapa.nombre](memoria))
+                exito = True
+            except Exception:
+                # Igual que un script que termina con error: se reporta y sus dependientes no corren
+                avisar(traceback.format_exc())
+                exito = False
+            resultado.update(segundos=time.perf_counter() - inicio,
+                             resultado="✅ ejecutada" if exito else "❌ error")
+            if exito:
+                registrar_ejecucion(etapa, estado, huellas)
+                estado["huellas"] = huellas.cache
+                guardar_estado(estado)
+        if resultado["resultado"] not in ("✅ ejecutada", "💾 caché"):
+            fallidas.add(etapa.nombre)
+        resultados.append(resultado)
+
+    estado["huellas"] = huellas.cache
+    guardar_estado(estado)
+    imprimir_resumen(resultados, time.perf_counter() - inicio_total)
+    return resultados
@@ -0,0 +1,148 @@
+"""
+Formato columnar compacto para el JSON del mapa web (web/data_final.json).
+
+En vez de una lista de registros con los 23 nombres de columna repetidos en cada
+fila (y casi todo en null), se guarda:
+
+    {
+      "formato": "mapa-columnar", "version": 1, "etag": "…", "filas": 732,
+      "columnas": [
+        {"nombre": "casos_totales", "tipo": "i32", "validos": "<bitmap>", "datos": "<base64>"},
+        {"nombre": "alerta", "tipo": "dic", "ancho": "u8",
+         "diccionario": ["🚨 Alerta Roja", …], "datos": "<base64>"},
+        …
+      ]
+    }
+
+- Los valores se guardan en arreglos tipados (little endian) codificados en base64:
+  en el navegador se leen directamente como Float64Array / Int32Array / Uint8Array.
+- Los vacíos no se guardan: `validos` es un mapa de bits (bit i = fila i tiene valor)
+  y `datos` solo trae los valores presentes. Si la columna no tiene vacíos, no hay
+  mapa de bits; si está toda vacía, tampoco hay datos.
+- Los textos van con diccionario (nivel_riesgo, alerta, municipio…): cada fila
+  guarda solo el código del valor.
+- `etag` es la huella SHA-256 del contenido: cambia solo cuando cambian los datos,
+  así el navegador (o un CDN) puede reutilizar la copia que ya tiene.
+
+Junto al JSON se escribe una variante precomprimida .gz (y .br si está instalado
+el paquete brotli) para servidores estáticos que la entreguen tal cual.
+web/app.js decodifica este formato y sigue aceptando el formato de registros anterior.
+"""
+import base64
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.instrumentacion import medir
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FORMATO = "mapa-columnar"
+VERSION = 1
+
+# Ancho de los códigos de diccionario según el número de valores distintos
+ANCHOS = [("u8", np.uint8), ("u16", np.uint16), ("u32", np.uint32)]
+
+# Enteros que caben en Int32Array
+LIMITE_I32 = 2 ** 31 - 1
+
+
+def _b64(arreglo):
+    return base64.b64encode(np.ascontiguousarray(arreglo).tobytes()).decode("ascii")
+
+
+def _desde_b64(texto, dtype):
+    return np.frombuffer(base64.b64decode(texto), dtype=dtype)
+
+
+def codificar_columna(serie):
+    """Describe una columna: tipo, mapa de bits de válidos (si hace falta) y datos presentes."""
+    columna = {"nombre": str(serie.name)}
+    presentes = serie.notna().to_numpy()
+    if not presentes.all():
+        columna["validos"] = _b64(np.packbits(presentes, bitorder="little"))
+    valores = serie[presentes]
+
+    if pd.api.types.is_bool_dtype(serie.dtype):
+        columna.update(tipo="i32", datos=_b64(valores.to_numpy(dtype="<i4")))
+    elif pd.api.types.is_numeric_dtype(serie.dtype):
+        numeros = valores.to_numpy(dtype="float64")
+        enteros = np.all(np.isfinite(numeros)) and np.all(numeros == np.round(numeros)) \
+            and (len(numeros) == 0 or np.abs(numeros).max() <= LIMITE_I32)
+        if enteros:
+            columna.update(tipo="i32", datos=_b64(numeros.astype("<i4")))
+        else:
+            columna.update(tipo="f64", datos=_b64(numeros.astype("<f8")))
+    else:
+        codigos, diccionario = pd.factorize(valores.astype(str))
+        ancho, dtype = next((a, t) for a, t in ANCHOS if len(diccionario) <= np.iinfo(t).max + 1)
+        columna.update(tipo="dic", ancho=ancho, diccionario=diccionario.tolist(),
+                       datos=_b64(codigos.astype(np.dtype(dtype).newbyteorder("<"))))
+    return columna
+
+
+def codificar(df):
+    """DataFrame → diccionario en formato columnar (con etag calculado sobre el contenido)."""
+    columnas = [codificar_columna(df[c]) for c in df.columns]
+    contenido = json.dumps(columnas, ensure_ascii=False, separators=(",", ":"))
+    etag = hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:16]
+    return {"formato": FORMATO, "version": VERSION, "etag": etag, "filas": len(df), "columnas": columnas}
+
+
+def decodificar(paquete):
+    """Formato columnar → DataFrame (lo mismo que hace web/app.js, útil para verificar)."""
+    n = paquete["filas"]
+    datos = {}
+    for columna in paquete["columnas"]:
+        if "validos" in columna:
+            bits = _desde_b64(columna["validos"], np.uint8)
+            presentes = np.unpackbits(bits, count=n, bitorder="little").astype(bool)
+        else:
+            presentes = np.ones(n, dtype=bool)
+        tipo = columna["tipo"]
+        if tipo == "dic":
+            dtype = dict(ANCHOS)[columna["ancho"]]
+            codigos = _desde_b64(columna.get("datos", ""), np.dtype(dtype).newbyteorder("<"))
+            valores = np.full(n, None, dtype=object)
+            valores[presentes] = np.asarray(columna["diccionario"], dtype=object)[codigos]
+        else:
+            dtype = "<i4" if tipo == "i32" else "<f8"
+            valores = np.full(n, np.nan)
+            valores[presentes] = _desde_b64(columna.get("datos", ""), dtype)
+        datos[columna["nombre"]] = valores
+    return pd.DataFrame(datos)
+
+
+@medir()
+def guardar_paquete(df, ruta):
+    """
+    Escribe el JSON columnar en `ruta` y sus variantes precomprimidas.
+    Devuelve la lista de rutas escritas.
+    """
+    return guardar_json(codificar(df), ruta)
+
+
+def guardar_json(datos, ruta):
+    """Escribe `datos` como JSON compacto en `ruta` más sus variantes .gz (y .br)."""
+    ruta = Path(ruta)
+    contenido = json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    ruta.write_bytes(contenido)
+    rutas = [ruta]
+
+    # mtime=0: el .gz no cambia si los datos no cambian (útil para la caché del pipeline)
+    ruta_gz = ruta.with_name(ruta.name + ".gz")
+    ruta_gz.write_bytes(gzip.compress(contenido, compresslevel=9, mtime=0))
+    rutas.append(ruta_gz)
+
+    if brotli is not None:
+        ruta_br = ruta.with_name(ruta.name + ".br")
+        ruta_br.write_bytes(brotli.compress(contenido, quality=11))
+        rutas.append(ruta_br)
+    return rutas
@@ -0,0 +1,132 @@
+"""
+Casos de la Policía por municipio y mes repartidos en varios procesos.
+
+Con el reporte nacional (todos los departamentos) el BLOQUE 4 de 05 agrupa
+decenas de millones de filas en un solo núcleo. Aquí las filas se reparten por
+un hash del departamento_id (todas las filas de un departamento caen en la misma
+partición), se copian una vez a memoria compartida (multiprocessing.shared_memory)
+y cada proceso suma su tramo sin recibir una copia de los datos:
+
+    casos y registros por (municipio, mes)      (el mes NaT reúne las filas sin fecha)
+
+Las sumas parciales se unen sumando por (municipio, mes), así que el resultado no
+depende del número de procesos ni de cómo quedan repartidos los departamentos. Los
+promedios mensuales, los totales y la serie por ventanas salen después de esa tabla
+pequeña con las mismas operaciones de pandas que el cálculo en un solo proceso.
+
+Las cantidades se suman como float64 (np.bincount): es exacto para enteros de hasta 2**53.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.consola import avisar
+from mapa_seguridad.instrumentacion import medir
+
+# Procesos del BLOQUE 4 de 05 (1 = el cálculo de siempre, en este proceso)
+try:
+    PROCESOS = max(int(os.environ.get("MAPA_PROCESOS_POLICIA", "1") or 1), 1)
+except ValueError:
+    avisar(f"⚠️ MAPA_PROCESOS_POLICIA={os.environ['MAPA_PROCESOS_POLICIA']!r} no es un número entero. Se usará 1 proceso.")
+    PROCESOS = 1
+
+# Hash multiplicativo de Knuth: reparte ids consecutivos entre todas las particiones
+_HASH = np.uint64(2654435761)
+
+
+def particion(grupos, n):
+    """
+    Partición (0..n-1) de cada fila según un hash de su grupo (el departamento_id).
+    Los grupos vacíos o negativos (sin departamento) van todos a la partición 0.
+    """
+    valores = pd.to_numeric(pd.Series(grupos), errors="coerce").to_numpy("float64", na_value=np.nan)
+    validos = valores >= 0
+    # Solo se pasan a uint64 los ids válidos: un NaN o un -1 darían un número arbitrario
+    h = (np.where(validos, valores, 0).astype(np.uint64) * _HASH) & np.uint64(0xFFFFFFFF)
+    return np.where(validos, h % np.uint64(n), 0).astype(np.int16)
+
+
+def sumar_por_zona_y_mes(zona, mes, peso):
+    """
+    Suma de `peso` y número de registros por (zona, mes) en un tramo de filas.
+    `mes` son ordinales de Period (NaT = el mínimo int64). Devuelve (zonas, meses, sumas, registros)
+    solo de las combinaciones que tienen al menos un registro.
+    """
+    codigos_zona, zonas = pd.factorize(zona)
+    codigos_mes, meses = pd.factorize(mes)
+    celda = codigos_zona.astype(np.int64) * len(meses) + codigos_mes
+    n_celdas = len(zonas) * len(meses)
+    registros = np.bincount(celda, minlength=n_celdas)
+    sumas = np.bincount(celda, weights=peso, minlength=n_celdas)
+    ocupadas = np.flatnonzero(registros)
+    return zonas[ocupadas // len(meses)], meses[ocupadas % len(meses)], sumas[ocupadas], registros[ocupadas]
+
+
+def _vistas(buffer, n):
+    # mes (int64), peso (float64) y zona (int32), uno detrás de otro: así cada arreglo queda alineado
+    mes = np.ndarray(n, dtype=np.int64, buffer=buffer)
+    peso = np.ndarray(n, dtype=np.float64, buffer=buffer, offset=8 * n)
+    zona = np.ndarray(n, dtype=np.int32, buffer=buffer, offset=16 * n)
+    return mes, peso, zona
+
+
+def _sumar_tramo(nombre, n, inicio, fin):
+    # 🧩 En el proceso hijo: se lee el tramo directamente de la memoria compartida
+    memoria = shared_memory.SharedMemory(name=nombre)
+    try:
+        mes, peso, zona = _vistas(memoria.buf, n)
+        resultado = sumar_por_zona_y_mes(zona[inicio:fin], mes[inicio:fin], peso[inicio:fin])
+        # Las vistas se sueltan antes de cerrar: el resultado son arreglos nuevos
+        del mes, peso, zona
+        return resultado
+    finally:
+        memoria.close()
+
+
+def unir_parciales(parciales, col_zona, col_mes):
+    """DataFrame [col_zona, col_mes, casos_mes, registros] con las sumas parciales sumadas por (zona, mes)."""
+    zonas, meses, sumas, registros = (np.concatenate(c) for c in zip(*parciales))
+    tabla = (pd.DataFrame({col_zona: zonas.astype(np.int32), "_ordinal": meses, "casos_mes": sumas,
+                           "registros": registros})
+             .groupby([col_zona, "_ordinal"], sort=True).sum().reset_index())
+    ordinales = tabla.pop("_ordinal").to_numpy()
+    tabla.insert(1, col_mes, pd.arrays.PeriodArray(ordinales, dtype=pd.PeriodDtype("M")))
+    return tabla
+
+
+@medir()
+def casos_por_zona_y_mes(df, col_zona, col_grupo, col_mes, col_peso, procesos=PROCESOS):
+    """
+    Suma de `col_peso` por `col_zona` (entero) y `col_mes` (Period mensual) calculada en
+    `procesos` particiones por hash de `col_grupo`. Devuelve el DataFrame de unir_parciales.
+    """
+    n = len(df)
+    zona = df[col_zona].to_numpy(dtype=np.int32)
+    mes = pd.PeriodIndex(df[col_mes], freq="M").asi8
+    peso = pd.to_numeric(df[col_peso], errors="coerce").fillna(0).to_numpy("float64")
+    if procesos <= 1 or n == 0:
+        return unir_parciales([sumar_por_zona_y_mes(zona, mes, peso)], col_zona, col_mes)
+
+    # 🔀 Filas ordenadas por partición (orden estable): cada proceso recibe un tramo contiguo
+    parte = particion(df[col_grupo], procesos)
+    orden = np.argsort(parte, kind="stable")
+    limites = np.searchsorted(parte[orden], np.arange(procesos + 1))
+
+    memoria = shared_memory.SharedMemory(create=True, size=20 * n)
+    try:
+        v_mes, v_peso, v_zona = _vistas(memoria.buf, n)
+        np.take(mes, orden, out=v_mes)
+        np.take(peso, orden, out=v_peso)
+        np.take(zona, orden, out=v_zona)
+        del v_mes, v_peso, v_zona, orden
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            parciales = list(ejecutor.map(_sumar_tramo, repeat(memoria.name), repeat(n),
+                                          limites[:-1], limites[1:]))
+    finally:
+        memoria.close()
+        memoria.unlink()
+    return unir_parciales(parciales, col_zona, col_mes)
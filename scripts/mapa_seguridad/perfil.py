@@ -0,0 +1,119 @@
+"""
+Perfil de columnas en una sola pasada: valores más frecuentes, vacíos, valores
+distintos e histogramas por año y mes (web/perfil_robos.json).
+
+En vez de un value_counts() por columna (y otro más para cada tendencia), cada
+columna se lleva a códigos enteros (los de la categoría si ya es categórica, o
+pd.factorize) y un solo np.bincount da todos los conteos: el código -1 (vacío)
+cae en la posición 0 y el valor i en la posición i + 1. De ahí salen los vacíos,
+los distintos y el top-k sin volver a recorrer las filas.
+
+El perfil se guarda como JSON para que el mapa web y 06_validar_salida.py lo
+usen sin volver a leer el archivo de robos:
+
+    {
+      "formato": "perfil", "version": 1, "filas": 17605,
+      "columnas": {"seguridad.modalidad": {"nulos": 0, "distintos": 12,
+                                           "top": [["Atraco", 6012], …]}, …},
+      "histogramas": {"anio": {"valores": [2017, …], "casos": [5290, …]},
+                      "mes": {"valores": [1, …, 12], "casos": […]}}
+    }
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.instrumentacion import medir
+from mapa_seguridad.paquete_web import guardar_json
+
+FORMATO = "perfil"
+VERSION = 1
+TOP = 10
+
+
+def _codigos(serie):
+    # Códigos enteros (-1 = vacío) y el valor de cada código
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    return pd.factorize(serie)
+
+
+def perfil_columna(serie, top=TOP):
+    """Vacíos, distintos y los `top` valores más frecuentes de una columna."""
+    codigos, valores = _codigos(serie)
+    conteo = np.bincount(codigos.astype(np.intp) + 1, minlength=len(valores) + 1)
+    casos = conteo[1:]
+    # Más frecuentes primero; en empate, el orden de los valores (alfabético en las categorías)
+    orden = np.argsort(-casos, kind="stable")[:top]
+    orden = orden[casos[orden] > 0]
+    return {
+        "nulos": int(conteo[0]),
+        "distintos": int(np.count_nonzero(casos)),
+        "top": [[_a_json(valores[i]), int(casos[i])] for i in orden],
+    }
+
+
+def histograma(primero, casos):
+    """{"valores", "casos"} con solo los valores que tienen casos (casos[i] es del valor primero + i)."""
+    presentes = np.flatnonzero(casos)
+    return {"valores": (presentes + primero).tolist(), "casos": casos[presentes].tolist()}
+
+
+def histogramas_fecha(fechas):
+    """
+    Casos por año y por mes con una sola pasada: cada fecha se lleva a su número de
+    mes desde 1970 (datetime64[M]), un bincount cuenta cada mes y de ahí se suman
+    los años (filas de 12) y los meses del año (columnas).
+    """
+    meses = pd.to_datetime(fechas, errors="coerce").to_numpy("datetime64[M]")
+    meses = meses[~np.isnat(meses)].astype(np.int64)
+    if len(meses) == 0:
+        return {"anio": {"valores": [], "casos": []}, "mes": {"valores": [], "casos": []}}
+    primero = meses.min() // 12 * 12
+    conteo = np.bincount(meses - primero)
+    conteo = np.pad(conteo, (0, -len(conteo) % 12)).reshape(-1, 12)
+    return {
+        "anio": histograma(1970 + primero // 12, conteo.sum(axis=1)),
+        "mes": histograma(1, conteo.sum(axis=0)),
+    }
+
+
+@medir()
+def perfilar(df, columnas, col_fecha=None, top=TOP):
+    """
+    Perfil de las `columnas` de `df` (las que existan, sin repetir) y, si se da
+    `col_fecha`, histogramas de casos por año y por mes.
+    """
+    perfil = {"formato": FORMATO, "version": VERSION, "filas": len(df), "columnas": {}, "histogramas": {}}
+    for columna in dict.fromkeys(c for c in columnas if c and c in df.columns):
+        perfil["columnas"][columna] = perfil_columna(df[columna], top)
+    if col_fecha and col_fecha in df.columns:
+        perfil["histogramas"] = histogramas_fecha(df[col_fecha])
+    return perfil
+
+
+def mas_frecuentes(perfil, columna, k=TOP):
+    """[(valor, casos), …] de `columna` en el perfil (vacío si no se perfiló)."""
+    return [tuple(par) for par in perfil["columnas"].get(columna, {}).get("top", [])[:k]]
+
+
+def _a_json(valor):
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+def guardar_perfil(perfil, ruta):
+    """Escribe el perfil en `ruta` (+ .gz). Devuelve las rutas escritas."""
+    return guardar_json(perfil, ruta)
+
+
+def cargar_perfil(ruta):
+    """Lee un perfil guardado con guardar_perfil(); None si el archivo no existe."""
+    ruta = Path(ruta)
+    if not ruta.exists():
+        return None
+    perfil = json.loads(ruta.read_text(encoding="utf-8"))
+    if perfil.get("formato") != FORMATO:
+        raise ValueError(f"❌ {ruta} no es un perfil (formato {perfil.get('formato')!r}).")
+    return perfil
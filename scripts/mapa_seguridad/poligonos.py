@@ -0,0 +1,173 @@
+"""
+Asignación de puntos (robos) a polígonos (comunas, barrios) con un índice de malla.
+
+Los límites se leen de un GeoJSON local (Polygon o MultiPolygon, con huecos). Para
+no comparar cada punto con todos los polígonos:
+
+1. Índice de malla: el rectángulo que cubre todos los polígonos se parte en una
+   malla regular y cada celda guarda los polígonos cuya caja toca la celda
+   (la misma idea de un STRtree / R-tree, pero con arreglos de numpy).
+2. Cada punto toma solo los candidatos de su celda.
+3. Para cada polígono, la prueba de punto-en-polígono (rayo horizontal, regla
+   par-impar) se hace a la vez para todos sus puntos candidatos y todos sus lados.
+
+Si un punto cae en dos polígonos (límites solapados) gana el primero del archivo.
+Las coordenadas se tratan como planas (lon, lat): a la escala de una ciudad el
+error es despreciable.
+"""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from mapa_seguridad.normalizacion import normalizar_texto
+
+SIN_POLIGONO = -1
+
+# Máximo de comparaciones punto × lado por bloque (controla la memoria)
+BLOQUE_COMPARACIONES = 4_000_000
+
+
+@dataclass
+class Limites:
+    """Polígonos de un GeoJSON: código, nombre, lados y caja de cada uno."""
+    codigos: list
+    nombres: list
+    lados: list      # por polígono, arreglo (m, 4): x1, y1, x2, y2 de todos sus anillos
+    cajas: np.ndarray  # (n, 4): lon_min, lat_min, lon_max, lat_max
+
+    def __len__(self):
+        return len(self.codigos)
+
+
+def _propiedad(propiedades, clave):
+    # Primera propiedad cuyo nombre contiene la clave ("codigo" → CODIGO, cod_codigo...)
+    return next((v for k, v in propiedades.items() if clave in k.lower()), None)
+
+
+def _texto(valor):
+    return None if valor is None else normalizar_texto(str(valor))
+
+
+def _anillos(geometria):
+    # Las features sin geometría (null en el GeoJSON) no aportan anillos
+    tipo = geometria.get("type")
+    if tipo == "Polygon":
+        return geometria["coordinates"]
+    if tipo == "MultiPolygon":
+        return [anillo for poligono in geometria["coordinates"] for anillo in poligono]
+    return []
+
+
+def cargar_limites(ruta, campo_codigo="codigo", campo_nombre="nombre"):
+    """Lee un GeoJSON de límites. El código y el nombre se normalizan como el resto del pipeline."""
+    datos = json.loads(Path(ruta).read_text(encoding="utf-8"))
+    codigos, nombres, lados, cajas = [], [], [], []
+    for feature in datos.get("features", []):
+        anillos = [np.asarray(a, dtype="float64")[:, :2] for a in _anillos(feature.get("geometry") or {})]
+        anillos = [a for a in anillos if len(a) >= 3]
+        if not anillos:
+            continue
+        # Cerrar los anillos que no repiten el primer vértice al final
+        anillos = [a if np.array_equal(a[0], a[-1]) else np.vstack([a, a[:1]]) for a in anillos]
+        lados.append(np.vstack([np.hstack([a[:-1], a[1:]]) for a in anillos]))
+        vertices = np.vstack(anillos)
+        cajas.append([*vertices.min(axis=0), *vertices.max(axis=0)])
+        propiedades = feature.get("properties") or {}
+        codigos.append(_texto(_propiedad(propiedades, campo_codigo)))
+        nombres.append(_texto(_propiedad(propiedades, campo_nombre)))
+    return Limites(codigos, nombres, lados, np.asarray(cajas, dtype="float64").reshape(-1, 4))
+
+
+class IndiceMalla:
+    """Malla regular sobre los límites: para cada celda, los polígonos que la tocan."""
+
+    def __init__(self, limites, celdas=64):
+        self.limites = limites
+        self.celdas = celdas
+        cajas = limites.cajas
+        self.origen = cajas[:, :2].min(axis=0) if len(cajas) else np.zeros(2)
+        extension = (cajas[:, 2:].max(axis=0) - self.origen) if len(cajas) else np.ones(2)
+        self.tam = np.maximum(extension, 1e-12) / celdas
+
+        # Pares (celda, polígono) para todas las celdas que toca la caja de cada polígono
+        pares_celda, pares_poligono = [], []
+        for i, (x0, y0, x1, y1) in enumerate(cajas):
+            (cx0, cy0), (cx1, cy1) = self._celda_xy(np.array([[x0, y0], [x1, y1]]))
+            cx, cy = np.meshgrid(np.arange(cx0, cx1 + 1), np.arange(cy0, cy1 + 1))
+            pares_celda.append((cy * celdas + cx).ravel())
+            pares_poligono.append(np.full(cx.size, i))
+        celda = np.concatenate(pares_celda) if pares_celda else np.zeros(0, dtype=np.int64)
+        poligono = np.concatenate(pares_poligono) if pares_poligono else np.zeros(0, dtype=np.int64)
+
+        # Formato CSR: los polígonos de la celda c están en poligonos[inicio[c]:inicio[c + 1]]
+        orden = np.argsort(celda, kind="stable")
+        self.poligonos = poligono[orden]
+        self.inicio = np.concatenate([[0], np.cumsum(np.bincount(celda, minlength=celdas * celdas))])
+
+    def _celda_xy(self, puntos):
+        return np.clip(np.floor((puntos - self.origen) / self.tam), 0, self.celdas - 1).astype(np.int64)
+
+    def candidatos(self, lon, lat):
+        """Pares (índice del punto, índice del polígono) a revisar con la prueba exacta."""
+        puntos = np.column_stack([lon, lat])
+        dentro_malla = np.all((puntos >= self.origen) & (puntos <= self.origen + self.tam * self.celdas), axis=1)
+        cx, cy = self._celda_xy(puntos).T
+        celda = np.where(dentro_malla, cy * self.celdas + cx, 0)
+        cuantos = np.where(dentro_malla, self.inicio[celda + 1] - self.inicio[celda], 0)
+
+        idx_punto = np.repeat(np.arange(len(puntos)), cuantos)
+        # Posición de cada par dentro de la lista de su celda
+        desplazamiento = np.arange(len(idx_punto)) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        idx_poligono = self.poligonos[self.inicio[celda[idx_punto]] + desplazamiento]
+        return idx_punto, idx_poligono
+
+
+def puntos_en_poligono(x, y, lados):
+    """Para cada punto (x, y), True si está dentro del polígono descrito por `lados` (regla par-impar)."""
+    x1, y1, x2, y2 = lados.T
+    dentro = np.zeros(len(x), dtype=bool)
+    paso = max(BLOQUE_COMPARACIONES // max(len(lados), 1), 1)
+    for i in range(0, len(x), paso):
+        px, py = x[i:i + paso, None], y[i:i + paso, None]
+        cruza = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corte = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        dentro[i:i + paso] = (cruza & (px < corte)).sum(axis=1) % 2 == 1
+    return dentro
+
+
+def asignar_poligonos(lon, lat, limites, indice=None):
+    """
+    Índice del polígono que contiene cada punto (SIN_POLIGONO si ninguno o si el
+    punto no tiene coordenadas).
+    """
+    lon = np.asarray(lon, dtype="float64")
+    lat = np.asarray(lat, dtype="float64")
+    resultado = np.full(len(lon), SIN_POLIGONO, dtype=np.int32)
+    validos = np.flatnonzero(~(np.isnan(lon) | np.isnan(lat)))
+    if len(limites) == 0 or len(validos) == 0:
+        return resultado
+
+    indice = indice or IndiceMalla(limites)
+    idx_punto, idx_poligono = indice.candidatos(lon[validos], lat[validos])
+    idx_punto = validos[idx_punto]
+
+    # Agrupar los pares por polígono y probar cada grupo de una vez
+    orden = np.argsort(idx_poligono, kind="stable")
+    idx_punto, idx_poligono = idx_punto[orden], idx_poligono[orden]
+    cortes = np.flatnonzero(np.diff(idx_poligono)) + 1
+    for puntos, poligonos in zip(np.split(idx_punto, cortes), np.split(idx_poligono, cortes)):
+        if len(puntos) == 0:
+            continue
+        pendientes = puntos[resultado[puntos] == SIN_POLIGONO]
+        dentro = puntos_en_poligono(lon[pendientes], lat[pendientes], limites.lados[poligonos[0]])
+        resultado[pendientes[dentro]] = poligonos[0]
+    return resultado
+
+
+def codigos_asignados(asignacion, limites):
+    """Código del polígono asignado a cada punto (None donde no hay polígono)."""
+    tabla = np.array(limites.codigos + [None], dtype=object)
+    return tabla[asignacion]
@@ -0,0 +1,69 @@
+"""
+Clasificación de riesgo compartida: niveles por quintiles y alerta según el nivel.
+
+Es la misma regla del BLOQUE 7 de 05_unir_y_riesgo.py, pero vectorizada para
+poder usarla también en otras salidas (por ejemplo las teselas del mapa):
+
+    valor <= q20 → 💎 Diamante     q40 → 🥇 Oro     q60 → 🥈 Plata
+    valor <= q80 → 🥉 Bronce       mayor → 🧱 Cobre      vacío → Sin datos
+"""
+import numpy as np
+import pandas as pd
+
+NIVELES = ["💎 Diamante", "🥇 Oro", "🥈 Plata", "🥉 Bronce", "🧱 Cobre"]
+ALERTAS = ["🟢 Segura", "🟢 Segura", "🟠 Alerta Media", "🚨 Alerta Roja", "🚨 Alerta Roja"]
+SIN_DATOS = "Sin datos"
+
+# Cuantiles que separan los cinco niveles
+CORTES = [0.2, 0.4, 0.6, 0.8]
+
+
+def umbrales(valores):
+    """Los cuantiles q20, q40, q60 y q80 de `valores` (ignorando vacíos)."""
+    return pd.Series(valores, dtype="float64").quantile(CORTES).to_numpy()
+
+
+def umbrales_ordenados(n, valores_en):
+    """
+    Los mismos cuantiles de umbrales() cuando los valores no están en memoria (por
+    ejemplo, ordenados dentro de una base de datos): `n` es el número de valores no
+    vacíos y `valores_en(posiciones)` devuelve {posición: valor} del arreglo ordenado
+    (0 = el menor). Interpola igual que numpy (método lineal) para dar el mismo resultado.
+    """
+    if n == 0:
+        return np.full(len(CORTES), np.nan)
+    # pandas pasa los cuantiles a numpy en porcentaje (q * 100 / 100 no siempre es q)
+    virtual = (n - 1) * (np.asarray(CORTES) * 100.0 / 100)
+    anterior = np.minimum(np.floor(virtual), n - 1).astype(np.int64)
+    siguiente = np.minimum(anterior + 1, n - 1)
+    peso = virtual - np.floor(virtual)
+    valores = valores_en(sorted(set(anterior.tolist()) | set(siguiente.tolist())))
+    a = np.array([valores[i] for i in anterior], dtype="float64")
+    b = np.array([valores[i] for i in siguiente], dtype="float64")
+    diferencia = b - a
+    return np.where(peso >= 0.5, b - diferencia * (1 - peso), a + diferencia * peso)
+
+
+def codigos_nivel(valores, cortes=None):
+    """Posición de cada valor en NIVELES (0 = Diamante … 4 = Cobre), o -1 si está vacío."""
+    valores = np.asarray(valores, dtype="float64")
+    cortes = umbrales(valores) if cortes is None else np.asarray(cortes)
+    # side="left": un valor igual al umbral queda en el nivel de abajo (valor <= q)
+    codigos = np.searchsorted(cortes, valores, side="left").astype(np.int8)
+    codigos[np.isnan(valores)] = -1
+    return codigos
+
+
+def _etiquetas(codigos, nombres, index):
+    tabla = np.array(nombres + [SIN_DATOS], dtype=object)
+    return pd.Series(tabla[codigos], index=index)
+
+
+def clasificar_nivel(indice, cortes=None):
+    """Serie de niveles de riesgo para la serie `indice`."""
+    return _etiquetas(codigos_nivel(indice, cortes), NIVELES, indice.index)
+
+
+def clasificar_alerta(indice, cortes=None):
+    """Serie de alertas (roja, media, segura) para la serie `indice`."""
+    return _etiquetas(codigos_nivel(indice, cortes), ALERTAS, indice.index)
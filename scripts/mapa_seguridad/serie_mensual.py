@@ -0,0 +1,135 @@
+"""
+Riesgo por ventanas de tiempo (últimos 3, 6 y 12 meses) con actualización mes a mes.
+
+Se guarda, para cada zona, el arreglo de casos por mes calendario (los meses sin
+casos cuentan como cero) y, para cada ventana, la suma de sus últimos meses:
+
+    promedio_3m = casos de los últimos 3 meses / 3
+
+Cuando llega un mes nuevo no se recalcula la historia: a cada suma se le agrega
+el mes que entra y se le resta el que sale de la ventana, así que el costo es
+proporcional al número de zonas, no al de registros. El arreglo de meses crece
+con capacidad de sobra (se duplica al llenarse), de modo que agregar un mes no
+copia toda la matriz.
+
+El nivel de riesgo de cada ventana usa la misma regla que el índice general
+(mapa_seguridad.riesgo): índice = promedio / máximo, niveles por quintiles.
+"""
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.agregacion import CuboMensual
+from mapa_seguridad.riesgo import clasificar_alerta, clasificar_nivel, umbrales
+
+VENTANAS = (3, 6, 12)
+
+
+class SerieMensual:
+    """Casos por zona × mes calendario, con sumas móviles para cada ventana."""
+
+    def __init__(self, zonas, primer_mes, conteos, ventanas=VENTANAS):
+        conteos = np.asarray(conteos, dtype=np.int64).reshape(len(zonas), -1)
+        self.zonas = list(zonas)
+        self.posicion = {z: i for i, z in enumerate(self.zonas)}
+        self.primer_mes = pd.Period(primer_mes, freq="M")
+        self.ventanas = tuple(ventanas)
+        self.n_meses = conteos.shape[1]
+        self._datos = np.zeros((len(self.zonas), max(self.n_meses, 1) * 2), dtype=np.int64)
+        self._datos[:, :self.n_meses] = conteos
+        self.sumas = {w: conteos[:, -w:].sum(axis=1) if self.n_meses else np.zeros(len(self.zonas), np.int64)
+                      for w in self.ventanas}
+
+    @classmethod
+    def desde_registros(cls, df, col_zona, col_mes="mes", col_peso=None, ventanas=VENTANAS):
+        """Construye la serie a partir de registros con zona y mes (Period mensual)."""
+        cubo = CuboMensual(df, [col_zona], col_mes, col_peso=col_peso)
+        matriz = cubo.por_nivel(col_zona)[:, :-1]  # sin la columna de registros sin mes
+        if len(cubo.meses) == 0:
+            return cls(cubo.valores[col_zona], pd.Period.now("M"), np.zeros((len(matriz), 0)), ventanas)
+        ordinales = pd.PeriodIndex(cubo.meses, freq="M").asi8
+        conteos = np.zeros((len(matriz), ordinales.max() - ordinales.min() + 1), dtype=np.int64)
+        # Los casos son enteros: las sumas de pesos se redondean como en agregar_mes
+        conteos[:, ordinales - ordinales.min()] = np.round(matriz).astype(np.int64)
+        return cls(cubo.valores[col_zona], cubo.meses.min(), conteos, ventanas)
+
+    @property
+    def conteos(self):
+        """Matriz zonas × meses (vista, sin la capacidad sobrante)."""
+        return self._datos[:, :self.n_meses]
+
+    @property
+    def meses(self):
+        return pd.period_range(self.primer_mes, periods=self.n_meses, freq="M")
+
+    @property
+    def ultimo_mes(self):
+        return self.primer_mes + (self.n_meses - 1)
+
+    def _agregar_zonas(self, nuevas):
+        for zona in nuevas:
+            self.posicion[zona] = len(self.zonas)
+            self.zonas.append(zona)
+        self._datos = np.vstack([self._datos, np.zeros((len(nuevas), self._datos.shape[1]), dtype=np.int64)])
+        for w in self.ventanas:
+            self.sumas[w] = np.concatenate([self.sumas[w], np.zeros(len(nuevas), dtype=np.int64)])
+
+    def agregar_mes(self, casos, mes=None):
+        """
+        Agrega el mes siguiente al último (o `mes`, que no puede ser anterior).
+        `casos` es un dict o Series zona → casos del mes; las zonas que no aparecen
+        quedan en cero y las zonas nuevas se agregan. Si `mes` deja meses vacíos
+        en medio, se rellenan con ceros.
+        """
+        siguiente = self.primer_mes + self.n_meses
+        mes = siguiente if mes is None else pd.Period(mes, freq="M")
+        if mes < siguiente:
+            raise ValueError(f"❌ El mes {mes} ya está en la serie (último: {self.ultimo_mes}).")
+        while siguiente < mes:
+            self._empujar(np.zeros(len(self.zonas), dtype=np.int64))
+            siguiente += 1
+
+        casos = pd.Series(casos, dtype="float64").fillna(0)
+        nuevas = [z for z in casos.index if z not in self.posicion]
+        if nuevas:
+            self._agregar_zonas(nuevas)
+        columna = np.zeros(len(self.zonas), dtype=np.int64)
+        columna[[self.posicion[z] for z in casos.index]] = casos.to_numpy().round().astype(np.int64)
+        self._empujar(columna)
+
+    def _empujar(self, columna):
+        # 📈 Duplicar la capacidad solo cuando se llena (costo amortizado por zona)
+        if self.n_meses == self._datos.shape[1]:
+            self._datos = np.hstack([self._datos, np.zeros_like(self._datos)])
+        for w in self.ventanas:
+            saliente = self._datos[:, self.n_meses - w] if self.n_meses >= w else 0
+            self.sumas[w] = self.sumas[w] + columna - saliente
+        self._datos[:, self.n_meses] = columna
+        self.n_meses += 1
+
+    def resumen(self, col_zona="zona"):
+        """
+        DataFrame con una fila por zona y, para cada ventana w: promedio_{w}m,
+        indice_riesgo_{w}m, nivel_riesgo_{w}m y alerta_{w}m.
+        """
+        resultado = pd.DataFrame({col_zona: self.zonas})
+        for w in self.ventanas:
+            promedio = pd.Series(self.sumas[w] / max(min(w, self.n_meses), 1))
+            maximo = promedio.max()
+            indice = promedio / maximo if maximo > 0 else promedio * 0.0
+            cortes = umbrales(indice)
+            resultado[f"promedio_{w}m"] = promedio
+            resultado[f"indice_riesgo_{w}m"] = indice
+            resultado[f"nivel_riesgo_{w}m"] = clasificar_nivel(indice, cortes)
+            resultado[f"alerta_{w}m"] = clasificar_alerta(indice, cortes)
+        return resultado
+
+    def guardar(self, ruta):
+        """Guarda la serie (.npz) para seguir agregando meses en otra corrida."""
+        np.savez_compressed(ruta, zonas=np.array(self.zonas), primer_mes=str(self.primer_mes),
+                            conteos=self.conteos, ventanas=np.array(self.ventanas))
+
+    @classmethod
+    def cargar(cls, ruta):
+        datos = np.load(ruta)
+        return cls(datos["zonas"].tolist(), str(datos["primer_mes"]), datos["conteos"],
+                   tuple(int(w) for w in datos["ventanas"]))
@@ -0,0 +1,138 @@
+"""
+Servidor HTTP local: API de consultas sobre data_final + archivos de web/.
+
+Rutas de la API (todas con GET, respuesta JSON):
+    /api/version                    versión de los datos y número de filas
+    /api/opciones                   valores de cada filtro (municipio, nivel_riesgo…)
+    /api/resumen?municipio=…        conteos por nivel y alerta, arriendo promedio,
+                                    municipios con más casos (&top=5)
+    /api/zonas?alerta=…             filas que cumplen el filtro (&limite=100&desde=0)
+
+Los filtros se repiten para pedir varios valores (?nivel_riesgo=🥇 Oro&nivel_riesgo=🥈 Plata).
+Cualquier otra ruta se sirve desde la carpeta web, así el mapa y la API comparten
+origen. Cada petición se atiende en su propio hilo (ThreadingHTTPServer); el
+índice se comparte y solo se reconstruye si cambia la versión de data_final.
+"""
+import json
+import threading
+import zlib
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from mapa_seguridad.consultas import CacheLRU, ErrorConsulta, IndiceConsultas, version_intermedio
+
+WEB_DIR = Path("web")
+LIMITE_MAXIMO = 1000
+
+
+class ServicioConsultas:
+    """Índice en memoria + caché de respuestas, con recarga cuando cambian los datos."""
+
+    def __init__(self, nombre="data_final", capacidad_cache=1024, indice=None):
+        """Con `indice` (y nombre=None) se usan esos datos fijos, sin leer el intermedio."""
+        self.nombre = nombre
+        self.cache = CacheLRU(capacidad_cache)
+        self._candado = threading.Lock()
+        self._indice = indice
+
+    def indice(self):
+        if self.nombre is None:
+            return self._indice
+        # Un stat por petición: si 05 reescribió data_final, se vuelve a indexar
+        version = version_intermedio(self.nombre)
+        if self._indice is None or self._indice.version != version:
+            with self._candado:
+                if self._indice is None or self._indice.version != version:
+                    self._indice = IndiceConsultas.desde_intermedio(self.nombre)
+                    print(f"📥 Datos cargados: {len(self._indice.df)} filas (versión {self._indice.version})")
+        return self._indice
+
+    def responder(self, ruta, parametros):
+        """(estado HTTP, cuerpo JSON en bytes, si vino de la caché)."""
+        indice = self.indice()
+        clave = (indice.version, ruta, tuple(sorted((k, tuple(sorted(v))) for k, v in parametros.items())))
+        try:
+            cuerpo, en_cache = self.cache.obtener(clave, lambda: self._calcular(indice, ruta, parametros))
+        except ErrorConsulta as error:
+            return HTTPStatus.BAD_REQUEST, _json({"error": str(error)}), False
+        if cuerpo is None:
+            return HTTPStatus.NOT_FOUND, _json({"error": f"Ruta desconocida: {ruta}"}), False
+        return HTTPStatus.OK, cuerpo, en_cache
+
+    def _calcular(self, indice, ruta, parametros):
+        parametros = dict(parametros)
+        if ruta == "/api/version":
+            return _json({"version": indice.version, "filas": len(indice.df)})
+        if ruta == "/api/opciones":
+            return _json(indice.opciones())
+        if ruta == "/api/resumen":
+            top = _entero(parametros.pop("top", ["5"]), "top")
+            return _json(indice.resumen(parametros, top=top))
+        if ruta == "/api/zonas":
+            limite = min(_entero(parametros.pop("limite", ["100"]), "limite"), LIMITE_MAXIMO)
+            desde = _entero(parametros.pop("desde", ["0"]), "desde")
+            return _json(indice.registros(parametros, limite=limite, desde=desde))
+        return None
+
+
+def _entero(valores, nombre):
+    try:
+        valor = int(valores[-1])
+    except ValueError:
+        raise ErrorConsulta(f"El parámetro {nombre} debe ser un entero.") from None
+    if valor < 0:
+        raise ErrorConsulta(f"El parámetro {nombre} no puede ser negativo.")
+    return valor
+
+
+def _json(datos):
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ManejadorConsultas(SimpleHTTPRequestHandler):
+    """/api/… responde con el servicio; lo demás, archivos estáticos de web/."""
+
+    protocol_version = "HTTP/1.1"  # conexiones persistentes (keep-alive)
+    # Encabezados y cuerpo salen en escrituras separadas: sin TCP_NODELAY, Nagle +
+    # ACK retardado agregan ~40 ms a cada respuesta en una conexión persistente
+    disable_nagle_algorithm = True
+    servicio = None
+    silencioso = True
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        if not partes.path.startswith("/api/"):
+            return super().do_GET()
+
+        estado, cuerpo, en_cache = self.servicio.responder(partes.path, parse_qs(partes.query))
+        etag = f'"{zlib.crc32(cuerpo):08x}"'
+        if estado == HTTPStatus.OK and self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("X-Cache", "HIT" if en_cache else "MISS")
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        if not self.silencioso:
+            super().log_message(formato, *args)
+
+
+def crear_servidor(servicio, host="127.0.0.1", puerto=8000, carpeta_web=WEB_DIR, silencioso=True):
+    """ThreadingHTTPServer listo para serve_forever() (puerto 0 = uno libre)."""
+    manejador = type("Manejador", (ManejadorConsultas,), {"servicio": servicio, "silencioso": silencioso})
+    servidor = ThreadingHTTPServer((host, puerto), partial(manejador, directory=str(carpeta_web)))
+    servidor.daemon_threads = True
+    return servidor
@@ -0,0 +1,135 @@
+"""
+Pirámide de teselas (slippy map, como las de OpenStreetMap) con los puntos de robos.
+
+Para cada zoom z, el mundo en proyección Web Mercator mide 256·2^z píxeles y se
+parte en teselas de 256×256 (z/x/y). Dentro de cada tesela los puntos se agrupan
+en celdas de CELDA_PX píxeles y cada celda guarda:
+
+    lat, lon   centro de sus puntos (promedio)
+    n          número de robos
+    nivel      nivel de riesgo de la celda (0 = 💎 Diamante … 4 = 🧱 Cobre),
+               por quintiles de los conteos de todas las celdas de ese zoom
+
+Así cada archivo tiene como máximo (256 / CELDA_PX)² celdas, sin importar cuántos
+puntos haya debajo, y el navegador solo descarga las teselas que se ven.
+
+Salida (carpeta web/teselas):
+    indice.json        zooms, rango de teselas por zoom, niveles y etag
+    {z}/{x}/{y}.json   {"lat": [...], "lon": [...], "n": [...], "nivel": [...]}
+"""
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from mapa_seguridad.riesgo import ALERTAS, NIVELES, codigos_nivel
+
+TAM_TESELA = 256
+CELDA_PX = 32
+LAT_MAX = 85.05112878  # límite de la proyección Web Mercator
+
+
+def a_pixeles(lat, lon, zoom):
+    """Coordenadas (x, y) en píxeles globales de Web Mercator para el zoom dado."""
+    lado = TAM_TESELA * 2.0 ** zoom
+    lat_rad = np.radians(np.clip(lat, -LAT_MAX, LAT_MAX))
+    x = (np.asarray(lon, dtype="float64") + 180.0) / 360.0 * lado
+    y = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * lado
+    return x, y
+
+
+def celdas_del_zoom(lat, lon, zoom, celda_px=CELDA_PX):
+    """
+    Agrupa los puntos en celdas de `celda_px` píxeles para un zoom.
+    Devuelve un dict de arreglos (una posición por celda no vacía).
+    """
+    x, y = a_pixeles(lat, lon, zoom)
+    cx = np.floor(x / celda_px).astype(np.int64)
+    cy = np.floor(y / celda_px).astype(np.int64)
+
+    # Una sola llave entera por celda (cy < 2^32 para cualquier zoom razonable)
+    llaves, inverso = np.unique((cx << 32) | cy, return_inverse=True)
+    conteo = np.bincount(inverso)
+    celdas_por_tesela = TAM_TESELA // celda_px
+    return {
+        "tx": (llaves >> 32) // celdas_por_tesela,
+        "ty": (llaves & 0xFFFFFFFF) // celdas_por_tesela,
+        "lat": np.bincount(inverso, weights=lat) / conteo,
+        "lon": np.bincount(inverso, weights=lon) / conteo,
+        "n": conteo,
+        "nivel": codigos_nivel(conteo),
+    }
+
+
+def construir_piramide(lat, lon, zoom_min, zoom_max, celda_px=CELDA_PX):
+    """
+    {zoom: {(x, y): contenido de la tesela}} para todos los zooms pedidos.
+    Los puntos sin coordenadas (NaN) se ignoran.
+    """
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+    validos = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon = lat[validos], lon[validos]
+
+    piramide = {}
+    for zoom in range(zoom_min, zoom_max + 1):
+        celdas = celdas_del_zoom(lat, lon, zoom, celda_px)
+        teselas = {}
+        if len(celdas["n"]):
+            # Ordenar las celdas por tesela y partirlas en grupos contiguos
+            orden = np.lexsort((celdas["ty"], celdas["tx"]))
+            tx, ty = celdas["tx"][orden], celdas["ty"][orden]
+            cortes = np.flatnonzero((np.diff(tx) != 0) | (np.diff(ty) != 0)) + 1
+            for grupo in np.split(orden, cortes):
+                teselas[(int(celdas["tx"][grupo[0]]), int(celdas["ty"][grupo[0]]))] = {
+                    "lat": np.round(celdas["lat"][grupo], 5).tolist(),
+                    "lon": np.round(celdas["lon"][grupo], 5).tolist(),
+                    "n": celdas["n"][grupo].tolist(),
+                    "nivel": celdas["nivel"][grupo].tolist(),
+                }
+        piramide[zoom] = teselas
+    return piramide
+
+
+def guardar_piramide(piramide, carpeta, total_puntos):
+    """
+    Escribe las teselas y el índice en `carpeta` (se reemplaza completa).
+    Devuelve la ruta del índice.
+    """
+    carpeta = Path(carpeta)
+    if carpeta.exists():
+        shutil.rmtree(carpeta)
+
+    huella = hashlib.sha256()
+    rangos = {}
+    for zoom, teselas in piramide.items():
+        for (x, y), contenido in sorted(teselas.items()):
+            texto = json.dumps(contenido, separators=(",", ":"))
+            ruta = carpeta / str(zoom) / str(x) / f"{y}.json"
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            ruta.write_text(texto, encoding="utf-8")
+            huella.update(f"{zoom}/{x}/{y}:{texto}".encode("utf-8"))
+        if teselas:
+            xs = [x for x, _ in teselas]
+            ys = [y for _, y in teselas]
+            rangos[str(zoom)] = {"x": [min(xs), max(xs)], "y": [min(ys), max(ys)], "teselas": len(teselas)}
+
+    # El índice tiene tamaño fijo (un rango por zoom), no la lista de teselas:
+    # el navegador pide las que caen en la vista y trata las que faltan como vacías
+    zooms = list(piramide) or [0]
+    indice = {
+        "version": 1,
+        "etag": huella.hexdigest()[:16],
+        "zoom_min": min(zooms),
+        "zoom_max": max(zooms),
+        "puntos": int(total_puntos),
+        "niveles": NIVELES,
+        "alertas": ALERTAS,
+        "rangos": rangos,
+    }
+    carpeta.mkdir(parents=True, exist_ok=True)
+    ruta_indice = carpeta / "indice.json"
+    ruta_indice.write_text(json.dumps(indice, ensure_ascii=False, indent=2), encoding="utf-8")
+    return ruta_indice
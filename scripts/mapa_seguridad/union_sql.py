@@ -0,0 +1,269 @@
+"""
+Unión y clasificación de riesgo del BLOQUE 7 de 05_unir_y_riesgo.py en un motor SQL local.
+
+Hace lo mismo que las dos uniones de pandas
+
+    df_niveles.merge(policia_final, on="zona_id", how="outer")
+              .merge(arriendos_final, on="zona_id", how="left")
+
+más el índice de riesgo y su nivel por quintiles, pero dentro de una base de
+datos en disco: las tablas se cargan por bloques, las uniones y los
+ordenamientos usan archivos temporales cuando no caben en memoria y los
+cuantiles salen de una función de ventana (ROW_NUMBER) en vez de ordenar en
+pandas. El resultado es idéntico al de pandas: mismas filas en el mismo orden
+(llaves ordenadas en la unión externa, orden de la izquierda en la otra),
+mismos nombres de columnas (sufijos _x/_y) y mismos tipos.
+
+Motores (MAPA_MOTOR_UNION):
+    pandas   las uniones de siempre, en memoria (por defecto)
+    sqlite   sqlite3 de la biblioteca estándar
+    duckdb   DuckDB, si está instalado (pip install duckdb); si no, se usa sqlite
+    sql      DuckDB si está instalado, si no sqlite
+"""
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.consola import avisar
+from mapa_seguridad.instrumentacion import medir
+from mapa_seguridad.riesgo import ALERTAS, NIVELES, SIN_DATOS, umbrales_ordenados
+
+try:
+    import duckdb
+except ImportError:  # duckdb es opcional: sin él se usa sqlite3
+    duckdb = None
+
+CLAVE = "zona_id"  # llave entera de la dimensión geográfica (mapa_seguridad.geografia)
+SUFIJOS = ("_x", "_y")
+BLOQUE = 20_000  # filas por bloque al cargar las tablas y al leer el resultado
+MOTORES = ("pandas", "sqlite", "duckdb")
+
+# Columna interna con la posición original de cada fila (para reproducir el orden de pandas)
+_FILA = "__fila"
+
+
+def resolver_motor(nombre):
+    """Motor que se va a usar para `nombre` (avisa si se pide duckdb y no está instalado)."""
+    nombre = (nombre or "pandas").lower()
+    if nombre == "sql":
+        return "duckdb" if duckdb else "sqlite"
+    if nombre == "duckdb" and duckdb is None:
+        avisar("⚠️ MAPA_MOTOR_UNION=duckdb pero duckdb no está instalado. Se usará sqlite.")
+        return "sqlite"
+    if nombre not in MOTORES:
+        raise ValueError(f"❌ Motor de unión desconocido: {nombre!r} (opciones: {', '.join(MOTORES)}, sql)")
+    return nombre
+
+
+def _q(nombre):
+    # Identificador entre comillas (hay columnas como "seguridad.nombre_barrio")
+    return '"' + str(nombre).replace('"', '""') + '"'
+
+
+def nombres_union(izquierda, derecha, clave=CLAVE, sufijos=SUFIJOS):
+    """
+    Nombres de las columnas de `izquierda` y `derecha` en el resultado de la unión,
+    con la misma regla de pandas: las columnas repetidas (salvo la llave) llevan
+    sufijo y la llave de la derecha no se repite. Devuelve (izq, der) como {original: nuevo}.
+    """
+    repetidas = (set(izquierda) & set(derecha)) - {clave}
+    izq = {c: c + sufijos[0] if c in repetidas else c for c in izquierda}
+    der = {c: c + sufijos[1] if c in repetidas else c for c in derecha if c != clave}
+    nombres = list(izq.values()) + list(der.values())
+    if len(set(nombres)) != len(nombres):
+        raise ValueError(f"❌ La unión deja columnas repetidas: {sorted(n for n in nombres if nombres.count(n) > 1)}")
+    return izq, der
+
+
+class _Conexion:
+    """Base de datos temporal en disco con sqlite3 o DuckDB y las pocas operaciones que se usan."""
+
+    def __init__(self, motor, carpeta):
+        self.motor = motor
+        ruta = Path(carpeta) / f"union.{motor}"
+        if motor == "duckdb":
+            self.con = duckdb.connect(str(ruta))
+            self.con.execute(f"SET temp_directory = '{Path(carpeta) / 'temporal'}'")
+        else:
+            self.con = sqlite3.connect(ruta)
+            # Los ordenamientos y uniones grandes van a archivos temporales, no a memoria
+            self.con.execute("PRAGMA temp_store = FILE")
+            self.con.execute("PRAGMA journal_mode = OFF")
+            self.con.execute("PRAGMA synchronous = OFF")
+
+    def cargar(self, nombre, df, bloque=BLOQUE):
+        """Crea la tabla `nombre` con las columnas de `df` más su posición (__fila)."""
+        df = df.reset_index(drop=True)
+        if self.motor == "duckdb":
+            tabla = df.assign(**{_FILA: np.arange(len(df), dtype=np.int64)})
+            tabla = tabla.astype({c: object for c in tabla.columns if isinstance(tabla[c].dtype, pd.CategoricalDtype)})
+            self.con.register("_entrada", tabla)
+            self.con.execute(f"CREATE TABLE {_q(nombre)} AS SELECT * FROM _entrada")
+            self.con.unregister("_entrada")
+            return
+        # sqlite: columnas sin tipo declarado, cada valor se guarda tal cual
+        columnas = [_q(c) for c in df.columns] + [_q(_FILA)]
+        self.con.execute(f"CREATE TABLE {_q(nombre)} ({', '.join(columnas)})")
+        insertar = f"INSERT INTO {_q(nombre)} VALUES ({', '.join('?' * len(columnas))})"
+        for inicio in range(0, len(df), bloque):
+            parte = df.iloc[inicio:inicio + bloque].astype(object)
+            parte = parte.where(parte.notna(), None)
+            parte[_FILA] = range(inicio, inicio + len(parte))
+            self.con.executemany(insertar, parte.itertuples(index=False, name=None))
+        self.con.execute(f"CREATE INDEX {_q('idx_' + nombre)} ON {_q(nombre)} ({_q(CLAVE)})")
+        self.con.commit()
+
+    def ejecutar(self, sql, parametros=()):
+        self.con.execute(sql, parametros)
+
+    def valores(self, sql, parametros=()):
+        return self.con.execute(sql, parametros).fetchall()
+
+    def bloques(self, sql, parametros=(), bloque=BLOQUE):
+        """DataFrames de hasta `bloque` filas con el resultado de `sql` (sin tenerlo todo como tuplas)."""
+        cursor = self.con.execute(sql, parametros)
+        columnas = [d[0] for d in cursor.description]
+        if self.motor == "duckdb":
+            while len(parte := cursor.fetch_df_chunk()):
+                yield parte
+            return
+        while filas := cursor.fetchmany(bloque):
+            yield pd.DataFrame.from_records(filas, columns=columnas, coerce_float=False)
+
+    def cerrar(self):
+        self.con.close()
+
+
+def _restaurar(serie, tipo, textos=None):
+    """
+    Devuelve la columna leída de SQL al tipo que tenía en pandas (como lo dejaría merge).
+    `textos` ({texto: texto}) hace que los textos repetidos compartan un solo objeto entre
+    bloques, como en el resultado de merge, en vez de uno por fila.
+    """
+    if isinstance(tipo, pd.CategoricalDtype):
+        return pd.Series(pd.Categorical(serie.astype(object), dtype=tipo), index=serie.index)
+    if isinstance(tipo, pd.api.extensions.ExtensionDtype):
+        return serie.astype(object).astype(tipo)
+    con_vacios = serie.isna().any()
+    if tipo.kind in "iu" and con_vacios:
+        return serie.astype("float64")
+    if tipo.kind == "b" and con_vacios:
+        return serie.astype(object).where(serie.notna(), np.nan)
+    if tipo.kind == "O":
+        codigos, unicos = pd.factorize(serie.astype(object))
+        if textos is not None:
+            unicos = [textos.setdefault(v, v) for v in unicos]
+        valores = np.array(list(unicos) + [np.nan], dtype=object)
+        return pd.Series(valores[codigos], index=serie.index)
+    return serie.astype(tipo)
+
+
+def _seleccion(alias, nombres):
+    return [f"{alias}.{_q(original)} AS {_q(nuevo)}" for original, nuevo in nombres.items()]
+
+
+@medir()
+def unir_y_clasificar(niveles, policia, arriendos, motor="sqlite", col_ref=None, carpeta=None):
+    """
+    Une `niveles` (externa) con `policia` y luego (izquierda) con `arriendos` por
+    zona_id, calcula indice_riesgo = col_ref / máximo y clasifica nivel_riesgo y
+    alerta por quintiles, todo dentro de una base de datos temporal en `carpeta`.
+
+    `col_ref` es la columna del promedio de robos (por defecto, la primera que
+    contiene "promedio_robos", como en 05). Devuelve el DataFrame de la unión.
+    """
+    motor = resolver_motor(motor)
+    if motor == "pandas":
+        raise ValueError("❌ unir_y_clasificar es el camino SQL: use motor='sqlite' o 'duckdb'.")
+
+    # 🏷️ Nombres de salida con la regla de sufijos de pandas, unión por unión
+    n_izq, n_der = nombres_union(niveles.columns, policia.columns)
+    externa = list(n_izq.values()) + list(n_der.values())
+    u_izq, u_der = nombres_union(externa, arriendos.columns)
+    tipos = {n_izq[c]: niveles[c].dtype for c in niveles.columns}
+    tipos.update({n_der[c]: policia[c].dtype for c in n_der})
+    tipos = {u_izq[c]: t for c, t in tipos.items()}
+    tipos.update({u_der[c]: arriendos[c].dtype for c in u_der})
+    columnas = list(u_izq.values()) + list(u_der.values())
+
+    col_ref = col_ref or next((c for c in columnas if "promedio_robos" in c), None)
+
+    with tempfile.TemporaryDirectory(dir=carpeta) as tmp:
+        con = _Conexion(motor, tmp)
+        try:
+            con.cargar("niveles", niveles)
+            con.cargar("policia", policia)
+            con.cargar("arriendos", arriendos)
+
+            # 🔗 1️⃣ Unión externa niveles ⟗ policía (izquierda + filas de policía sin pareja)
+            llave = f"n.{_q(CLAVE)} = p.{_q(CLAVE)}"
+            # La llave (de cualquiera de los dos lados) queda en la posición que tenía en niveles
+            campos = [f"COALESCE(n.{_q(CLAVE)}, p.{_q(CLAVE)}) AS {_q(CLAVE)}" if c == CLAVE
+                      else f"n.{_q(c)} AS {_q(n_izq[c])}" for c in niveles.columns]
+            campos += _seleccion("p", n_der) + [f"n.{_q(_FILA)} AS _fn", f"p.{_q(_FILA)} AS _fp"]
+            select = ", ".join(campos)
+            union_externa = (f"SELECT {select} FROM niveles n LEFT JOIN policia p ON {llave} "
+                             f"UNION ALL SELECT {select} FROM policia p LEFT JOIN niveles n ON {llave} "
+                             f"WHERE n.{_q(_FILA)} IS NULL")
+
+            # 🏘️ 2️⃣ Unión izquierda con arriendos e índice de riesgo (máximo con función de ventana)
+            # (* 1.0 para que sqlite no haga división entera si la referencia es un entero)
+            indice = f"u.{_q(col_ref)} * 1.0 / MAX(u.{_q(col_ref)}) OVER ()" if col_ref else "0"
+            campos = (_seleccion("u", u_izq) + _seleccion("a", u_der)
+                      + [f"{indice} AS indice_riesgo", "u._fn", "u._fp", f"a.{_q(_FILA)} AS _fa"])
+            con.ejecutar(f"CREATE TABLE union_final AS SELECT {', '.join(campos)} "
+                         f"FROM ({union_externa}) u LEFT JOIN arriendos a ON u.{_q(CLAVE)} = a.{_q(CLAVE)}")
+
+            # 📈 3️⃣ Quintiles del índice: posición de cada valor con ROW_NUMBER
+            n = con.valores("SELECT COUNT(indice_riesgo) FROM union_final")[0][0]
+
+            def valores_en(posiciones):
+                marcas = ", ".join("?" * len(posiciones))
+                filas = con.valores(
+                    "SELECT pos, v FROM (SELECT indice_riesgo AS v, "
+                    "ROW_NUMBER() OVER (ORDER BY indice_riesgo) - 1 AS pos "
+                    f"FROM union_final WHERE indice_riesgo IS NOT NULL) o WHERE pos IN ({marcas})",
+                    [int(p) for p in posiciones])
+                return {int(pos): v for pos, v in filas}
+
+            cortes = umbrales_ordenados(n, valores_en)
+            # Mismo criterio que riesgo.codigos_nivel: un valor igual al umbral queda en el nivel de abajo
+            casos = " ".join(f"WHEN indice_riesgo <= ? THEN {i}" for i in range(len(cortes)))
+            nivel = f"CASE WHEN indice_riesgo IS NULL THEN -1 {casos} ELSE {len(cortes)} END" if n else "-1"
+            parametros = [float(c) for c in cortes] if n else []
+
+            # 🧾 4️⃣ Resultado en el orden de pandas: llave ordenada y luego el orden de cada tabla,
+            # leído por bloques que se pasan enseguida a los tipos de pandas
+            partes, textos = [], {}
+            for parte in con.bloques(f"SELECT {', '.join(_q(c) for c in columnas)}, indice_riesgo, {nivel} AS _nivel "
+                                     f"FROM union_final ORDER BY {_q(CLAVE)}, _fn, _fp, _fa", parametros):
+                for columna in columnas:
+                    parte[columna] = _restaurar(parte[columna], tipos[columna], textos)
+                partes.append(parte)
+        finally:
+            con.cerrar()
+
+    if partes:
+        resultado = pd.concat(partes, ignore_index=True)
+    else:
+        resultado = pd.DataFrame(columns=columnas + ["indice_riesgo", "_nivel"])
+    codigos = resultado.pop("_nivel").to_numpy(dtype=np.int64)
+    for columna in columnas:
+        # Un bloque sin vacíos deja los enteros como int64 y otro con vacíos como float64: se iguala al final
+        if resultado[columna].dtype != tipos[columna]:
+            resultado[columna] = _restaurar(resultado[columna], tipos[columna], textos)
+    # El índice queda como en pandas: Float64 si la referencia es nullable, float64 si no (0 si no hay referencia)
+    if col_ref is None:
+        tipo_indice = np.int64
+    elif isinstance(tipos[col_ref], pd.api.extensions.ExtensionDtype):
+        tipo_indice = "Float64"
+    else:
+        tipo_indice = "float64"
+    resultado["indice_riesgo"] = resultado["indice_riesgo"].astype(object).astype(tipo_indice)
+    resultado["nivel_riesgo"] = pd.Series(np.array(NIVELES + [SIN_DATOS], dtype=object)[codigos],
+                                          index=resultado.index)
+    resultado["alerta"] = pd.Series(np.array(ALERTAS + [SIN_DATOS], dtype=object)[codigos], index=resultado.index)
+    return resultado
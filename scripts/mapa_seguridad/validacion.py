@@ -0,0 +1,233 @@
+"""
+Validación declarativa y vectorizada de las salidas del pipeline (06_validar_salida.py).
+
+Cada regla se declara con una función (unica, rango, valores, correspondencia,
+cobertura, referencia) y sabe qué columnas necesita. validar():
+  1. lee del intermedio solo las columnas de las reglas (proyección),
+  2. revisa cada regla con operaciones sobre columnas completas, sin recorrer filas
+     (los textos repetidos se revisan sobre sus valores distintos),
+  3. devuelve un reporte JSON con el resultado de cada regla y ejemplos de fallas.
+
+Las reglas de nivel "error" deciden el resultado (reporte["ok"]); las de nivel
+"aviso" se informan pero no lo cambian. Las referencias comparan los valores de
+una columna con los de un intermedio de entrada (*_limpio), leyendo solo esa columna.
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.almacen import buscar_intermedio, cargar_intermedio
+from mapa_seguridad.instrumentacion import medir
+from mapa_seguridad.riesgo import ALERTAS, NIVELES, SIN_DATOS
+
+FORMATO = "validacion"
+VERSION = 1
+EJEMPLOS = 5
+
+ERROR = "error"
+AVISO = "aviso"
+
+
+@dataclass
+class Regla:
+    """Una revisión: `revisar(df, contexto)` devuelve un diccionario con "fallas" y detalles."""
+    nombre: str
+    columnas: list
+    revisar: object
+    nivel: str = ERROR
+    intermedios: dict = field(default_factory=dict)  # {intermedio: [columnas]} que necesita
+    alternativas: bool = False  # True: basta con que exista una de las columnas
+
+
+def _ejemplos(valores):
+    return [_a_json(v) for v in pd.unique(pd.Series(valores).dropna())[:EJEMPLOS]]
+
+
+def _a_json(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, pd.Timestamp):
+        return valor.isoformat()
+    return valor
+
+
+def _distintos(serie):
+    """Valores distintos no vacíos (en las categóricas, solo las categorías que se usan)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        usados = np.unique(serie.cat.codes.to_numpy())
+        return pd.Index(serie.cat.categories[usados[usados >= 0]])
+    return pd.Index(pd.unique(serie.dropna()))
+
+
+def unica(columna, nivel=ERROR):
+    """Sin vacíos y sin valores repetidos en `columna` (llave)."""
+    def revisar(df, contexto):
+        serie = df[columna]
+        repetidas = serie.duplicated(keep=False) & serie.notna()
+        return {
+            "fallas": int(serie.isna().sum() + serie[repetidas].duplicated().sum()),
+            "vacios": int(serie.isna().sum()),
+            "repetidos": int(repetidas.sum()),
+            # En una columna categórica value_counts también lista las categorías sin filas
+            "ejemplos": _ejemplos(serie[repetidas].value_counts(sort=True).loc[lambda n: n > 0].index),
+        }
+    return Regla(f"{columna} única", [columna], revisar, nivel)
+
+
+def rango(columna, minimo, maximo, nivel=ERROR):
+    """Los valores no vacíos de `columna` están entre `minimo` y `maximo` (incluidos)."""
+    def revisar(df, contexto):
+        valores = pd.to_numeric(df[columna], errors="coerce").to_numpy("float64", na_value=np.nan)
+        fuera = ~np.isnan(valores) & ((valores < minimo) | (valores > maximo))
+        return {"fallas": int(fuera.sum()), "ejemplos": _ejemplos(valores[fuera])}
+    return Regla(f"{columna} entre {minimo} y {maximo}", [columna], revisar, nivel)
+
+
+def valores(columna, permitidos, vacios=False, nivel=ERROR):
+    """`columna` solo toma valores de `permitidos` (y vacíos solo si `vacios`)."""
+    permitidos = list(dict.fromkeys(permitidos))
+
+    def revisar(df, contexto):
+        serie = df[columna]
+        extranos = _distintos(serie).difference(permitidos)
+        fallas = int(serie.isin(extranos).sum()) if len(extranos) else 0
+        if not vacios:
+            fallas += int(serie.isna().sum())
+        return {"fallas": fallas, "ejemplos": _ejemplos(extranos)}
+    return Regla(f"{columna} con valores permitidos", [columna], revisar, nivel)
+
+
+def correspondencia(origen, destino, tabla, nivel=ERROR):
+    """Cada valor de `origen` va con el valor de `destino` que indica `tabla` ({origen: destino})."""
+    def revisar(df, contexto):
+        esperado = df[origen].astype(object).map(tabla)
+        distinto = esperado.notna() & (df[destino].astype(object) != esperado)
+        pares = df.loc[distinto, [origen, destino]].drop_duplicates().head(EJEMPLOS)
+        return {"fallas": int(distinto.sum()), "ejemplos": [f"{a} → {b}" for a, b in pares.itertuples(index=False)]}
+    return Regla(f"{destino} según {origen}", [origen, destino], revisar, nivel)
+
+
+def cobertura(columnas, minimo, nivel=ERROR, nombre=None):
+    """Al menos `minimo` (proporción) de las filas tienen valor en alguna de `columnas`."""
+    columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+
+    def revisar(df, contexto):
+        presentes = [c for c in columnas if c in df.columns]
+        con_valor = df[presentes].notna().any(axis=1) if presentes else pd.Series(False, index=df.index)
+        proporcion = float(con_valor.mean()) if len(df) else 1.0
+        return {
+            "fallas": int((~con_valor).sum()) if proporcion < minimo else 0,
+            "cobertura": round(proporcion, 4),
+            "minimo": minimo,
+        }
+    return Regla(nombre or f"cobertura de {'/'.join(columnas)} ≥ {minimo:.0%}", columnas, revisar, nivel,
+                 alternativas=True)
+
+
+def referencia(columna, intermedio, columna_ref=None, nivel=ERROR):
+    """Cada valor de `columna` existe en `columna_ref` del intermedio de entrada `intermedio`."""
+    columna_ref = columna_ref or columna
+
+    def revisar(df, contexto):
+        ref = contexto.get((intermedio, columna_ref))
+        if ref is None:
+            return {"fallas": 0, "omitida": f"sin {intermedio}.{columna_ref}"}
+        huerfanos = _distintos(df[columna]).difference(ref)
+        return {
+            "fallas": int(df[columna].isin(huerfanos).sum()) if len(huerfanos) else 0,
+            "valores_sin_referencia": len(huerfanos),
+            "ejemplos": _ejemplos(huerfanos),
+        }
+    return Regla(f"{columna} existe en {intermedio}", [columna], revisar, nivel, {intermedio: [columna_ref]})
+
+
+def columnas_necesarias(reglas, extra=()):
+    """Columnas del intermedio validado que usan las reglas (para la proyección)."""
+    return list(dict.fromkeys([c for r in reglas for c in r.columnas] + list(extra)))
+
+
+def cargar_referencias(reglas, tablas=None):
+    """
+    {(intermedio, columna): valores distintos} leyendo solo las columnas referenciadas.
+    Los intermedios que vengan en `tablas` ({nombre: DataFrame}) se toman de ahí.
+    """
+    tablas = tablas or {}
+    pedidas = {}
+    for regla in reglas:
+        for nombre, columnas in regla.intermedios.items():
+            pedidas.setdefault(nombre, set()).update(columnas)
+    contexto = {}
+    for nombre, columnas in pedidas.items():
+        if nombre in tablas:
+            df = tablas[nombre]
+        elif buscar_intermedio(nombre) is None:
+            continue
+        else:
+            df = cargar_intermedio(nombre, columnas=lambda c, columnas=columnas: c in columnas)
+        for columna in columnas & set(df.columns):
+            contexto[(nombre, columna)] = _distintos(df[columna])
+    return contexto
+
+
+@medir()
+def validar(df, reglas, contexto=None, nombre="data_final"):
+    """Revisa `reglas` sobre `df` y devuelve el reporte (diccionario listo para JSON)."""
+    contexto = contexto or {}
+    resultados = []
+    for regla in reglas:
+        faltantes = [c for c in regla.columnas if c not in df.columns]
+        if faltantes and (len(faltantes) == len(regla.columnas) or not regla.alternativas):
+            resultado = {"fallas": None, "faltantes": faltantes}
+        else:
+            resultado = regla.revisar(df, contexto)
+        ok = resultado["fallas"] == 0
+        resultados.append({"regla": regla.nombre, "nivel": regla.nivel, "ok": ok, **resultado})
+    errores = [r for r in resultados if not r["ok"] and r["nivel"] == ERROR]
+    avisos = [r for r in resultados if not r["ok"] and r["nivel"] == AVISO]
+    return {
+        "formato": FORMATO,
+        "version": VERSION,
+        "intermedio": nombre,
+        "filas": len(df),
+        "ok": not errores,
+        "errores": len(errores),
+        "avisos": len(avisos),
+        "reglas": resultados,
+    }
+
+
+def validar_intermedio(nombre, reglas, extra=()):
+    """Lee de `nombre` solo las columnas de las reglas (más `extra`) y lo valida. Devuelve (df, reporte)."""
+    necesarias = set(columnas_necesarias(reglas, extra))
+    df = cargar_intermedio(nombre, columnas=lambda c: c in necesarias)
+    return df, validar(df, reglas, cargar_referencias(reglas), nombre)
+
+
+def guardar_reporte(reporte, ruta):
+    """Escribe el reporte en `ruta` (JSON legible). Devuelve la ruta."""
+    ruta = Path(ruta)
+    ruta.write_text(json.dumps(reporte, ensure_ascii=False, indent=2), encoding="utf-8")
+    return ruta
+
+
+# 📋 Reglas de data_final (las usa 06_validar_salida.py)
+REGLAS_DATA_FINAL = [
+    # 🔑 Una fila por zona: si la llave se repite, la unión del BLOQUE 7 de 05 mezcló zonas
+    unica("zona_id"),
+    unica("zona_clave"),
+    # 📈 Índice normalizado y clasificación por quintiles (mapa_seguridad.riesgo)
+    rango("indice_riesgo", 0, 1),
+    valores("nivel_riesgo", NIVELES + [SIN_DATOS]),
+    valores("alerta", ALERTAS + [SIN_DATOS]),
+    correspondencia("nivel_riesgo", "alerta", dict(zip(NIVELES + [SIN_DATOS], ALERTAS + [SIN_DATOS]))),
+    # 📊 Cobertura: filas con índice de riesgo y filas con algún arriendo
+    cobertura("indice_riesgo", 0.95),
+    cobertura(["promedio_arriendo_apartamento", "promedio_arriendo_casa", "promedio_arriendo_local"], 0.5,
+              nivel=AVISO, nombre="cobertura de arriendos ≥ 50%"),
+    # 🔗 Cada zona existe en la dimensión geográfica y cada sector en los arriendos
+    referencia("zona_id", "geo_zonas"),
+    referencia("sector", "arriendos_limpio"),
+]
@@ -0,0 +1,97 @@
+"""
+Construcción de la llave de zona (zona_clave) con la que se unen los datasets.
+
+Formato de la llave, en orden de prioridad:
+    DEPARTAMENTO|MUNICIPIO|COM_<comuna>
+    DEPARTAMENTO|MUNICIPIO|BAR_<barrio>
+    DEPARTAMENTO|MUNICIPIO|SEC_<sector>
+    DEPARTAMENTO|MUNICIPIO
+    SIN_INFO                                (si no hay ningún dato)
+
+Se construye por columnas completas (operaciones de texto y máscaras) en vez de
+recorrer el DataFrame fila por fila con apply, y solo sobre las combinaciones
+distintas de las columnas geográficas, que son pocas frente al número de filas.
+"""
+import numpy as np
+import pandas as pd
+
+# Columnas que forman la llave y valores que cuentan como vacíos
+COLUMNAS_LLAVE = ["departamento", "municipio", "comuna", "barrio", "sector"]
+VALORES_VACIOS = ["nan", "<na>", "none"]
+
+
+def componente_llave(df, columna):
+    """Texto limpio de una columna de la llave ("" si la columna no existe o el valor es vacío)."""
+    if columna not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    valores = df[columna].astype(object)
+    texto = valores.where(valores.notna(), "").astype(str).str.strip()
+    return texto.where(~texto.str.lower().isin(VALORES_VACIOS), "")
+
+
+def combinar_codigos(codigos_por_columna, cardinalidades):
+    """
+    Combina códigos enteros de varias columnas (-1 = vacío) en un solo código por
+    combinación distinta. Devuelve (codigos_por_fila, filas_representantes), donde
+    filas_representantes[k] es la primera fila de la combinación k.
+    """
+    codigo = np.zeros(len(codigos_por_columna[0]) if codigos_por_columna else 0, dtype=np.int64)
+    for codigos_col, n in zip(codigos_por_columna, cardinalidades):
+        codigo = codigo * (n + 1) + (codigos_col + 1)
+        # Se re-numera en cada paso para que el código no crezca sin límite
+        codigo, _ = pd.factorize(codigo)
+    n_combinaciones = codigo.max() + 1 if len(codigo) else 0
+    # Primera aparición de cada combinación: se asigna de atrás hacia adelante
+    representantes = np.empty(n_combinaciones, dtype=np.int64)
+    representantes[codigo[::-1]] = np.arange(len(codigo) - 1, -1, -1)
+    return codigo, representantes
+
+
+def factorizar_texto(serie):
+    """
+    Códigos enteros (-1 = NaN) y número de valores distintos de `serie` según su
+    texto (str), que es como los lee la llave: 1 y 1.0 quedan separados aunque
+    sean iguales como números.
+    """
+    if serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) != "string":
+        # En una columna de objetos mezclados pd.factorize uniría 1, 1.0 y True
+        serie = serie.where(serie.isna(), serie.astype(str))
+    codigos, unicos = pd.factorize(serie)
+    return codigos, len(unicos)
+
+
+def combinaciones_distintas(df, columnas):
+    """
+    Código entero por combinación de valores de `columnas` (comparados como texto)
+    y la posición de la primera fila de cada combinación: (codigos_por_fila, filas_representantes).
+    """
+    factorizadas = [factorizar_texto(df[c]) for c in columnas]
+    return combinar_codigos([f[0] for f in factorizadas], [f[1] for f in factorizadas])
+
+
+def _llaves(df):
+    dept = componente_llave(df, "departamento")
+    muni = componente_llave(df, "municipio")
+    com = componente_llave(df, "comuna")
+    bar = componente_llave(df, "barrio")
+    sec = componente_llave(df, "sector")
+
+    base = dept + "|" + muni
+    condiciones = [com != "", bar != "", sec != "", muni != ""]
+    opciones = [base + "|COM_" + com, base + "|BAR_" + bar, base + "|SEC_" + sec, base]
+    llaves = np.select([c.to_numpy() for c in condiciones],
+                       [o.to_numpy(dtype=object) for o in opciones],
+                       default="SIN_INFO")
+    return llaves
+
+
+def construir_zona_clave(df):
+    """Devuelve la serie zona_clave de `df` usando las columnas departamento, municipio, comuna, barrio y sector."""
+    columnas = [c for c in COLUMNAS_LLAVE if c in df.columns]
+    if not columnas or df.empty:
+        return pd.Series("SIN_INFO", index=df.index, dtype=object)
+
+    # 🔑 La llave solo depende de estas columnas: se arma una vez por combinación distinta
+    codigos, representantes = combinaciones_distintas(df, columnas)
+    llaves_unicas = _llaves(df[columnas].iloc[representantes])
+    return pd.Series(llaves_unicas[codigos], index=df.index, dtype=object)
@@ -0,0 +1,39 @@
+import argparse
+from mapa_seguridad.almacen import buscar_intermedio
+from mapa_seguridad.servidor import ServicioConsultas, crear_servidor
+
+#-------------------------------------------------
+# Servidor local: mapa web + API de consultas sobre data_final
+#-------------------------------------------------
+# Carga la salida de 05_unir_y_riesgo.py una sola vez, la indexa en memoria y
+# responde filtros y resúmenes (ver mapa_seguridad/servidor.py para las rutas).
+#
+# Uso, desde la raíz del proyecto:
+#   python scripts/servidor_api.py                   → http://127.0.0.1:8000
+#   python scripts/servidor_api.py --puerto 8080 -v  → otro puerto, mostrando cada petición
+#
+# Ejemplos:
+#   http://127.0.0.1:8000/api/resumen?municipio=medellin
+#   http://127.0.0.1:8000/api/zonas?alerta=🚨 Alerta Roja&limite=20
+
+parser = argparse.ArgumentParser(description="Sirve el mapa y la API de consultas.")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--puerto", type=int, default=8000)
+parser.add_argument("--cache", type=int, default=1024, help="respuestas guardadas en la caché LRU")
+parser.add_argument("-v", "--verbose", action="store_true", help="mostrar cada petición")
+args = parser.parse_args()
+
+if buscar_intermedio("data_final") is None:
+    raise SystemExit("❌ No existe data/data_final. Ejecuta primero 05_unir_y_riesgo.py.")
+
+servicio = ServicioConsultas("data_final", capacidad_cache=args.cache)
+servicio.indice()
+servidor = crear_servidor(servicio, args.host, args.puerto, silencioso=not args.verbose)
+
+print(f"🌐 Mapa y API en http://{args.host}:{servidor.server_port} (Ctrl+C para detener)")
+try:
+    servidor.serve_forever()
+except KeyboardInterrupt:
+    print("\n👋 Servidor detenido.")
+finally:
+    servidor.server_close()
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# Los módulos del pipeline se importan como en los scripts: scripts/ va en sys.path
+sys.path.insert(0, str(RAIZ / "scripts"))
+# benchmarks/ también, por el generador de datos sintéticos
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+# Filas de cada fuente en el proyecto sintético de las pruebas (la Policía, reducida)
+FILAS_PRUEBA = {"policia": 5_000, "medata": 2_569, "kaggle": 17_605, "arriendos": 25}
+
+
+@pytest.fixture
+def proyecto(tmp_path, monkeypatch):
+    # 🧪 Proyecto sintético (data/ y web/) como directorio de trabajo: las etapas usan rutas relativas
+    import datos_sinteticos
+
+    monkeypatch.setattr(datos_sinteticos, "FILAS_BASE", FILAS_PRUEBA)
+    datos_sinteticos.generar(tmp_path, escala=1, semilla=0)
+    (tmp_path / "web").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
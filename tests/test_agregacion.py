@@ -0,0 +1,42 @@
+"""
+mapa_seguridad.agregacion.CuboMensual frente a los groupby de siempre, con y sin pesos.
+"""
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.agregacion import CuboMensual
+
+
+def registros(filas=2000, semilla=0):
+    # 🧪 Zonas, meses (con algunos vacíos) y cantidades con decimales
+    rng = np.random.default_rng(semilla)
+    meses = pd.period_range("2023-01", periods=14, freq="M").to_numpy()
+    mes = pd.Series(rng.choice(meses, filas))
+    mes[rng.random(filas) < 0.05] = pd.NaT
+    return pd.DataFrame({
+        "zona": rng.choice(["A", "B", "C", "D"], filas),
+        "mes": pd.PeriodIndex(mes, freq="M"),
+        "peso": rng.choice([0.25, 0.5, 1.0, 2.75], filas),
+    })
+
+
+def esperado(df, col_peso=None):
+    valores = df[col_peso] if col_peso else pd.Series(1, index=df.index)
+    por_mes = valores.groupby([df["zona"], df["mes"]]).sum().unstack(fill_value=0)
+    sin_mes = valores[df["mes"].isna()].groupby(df["zona"]).sum()
+    return np.column_stack([por_mes.to_numpy(), sin_mes.reindex(por_mes.index, fill_value=0).to_numpy()])
+
+
+def test_conteos_enteros_sin_pesos():
+    df = registros()
+    matriz = CuboMensual(df, ["zona"]).por_nivel("zona")
+    assert matriz.dtype == np.int64
+    np.testing.assert_array_equal(matriz, esperado(df))
+
+
+def test_sumas_con_pesos_conservan_decimales():
+    df = registros()
+    matriz = CuboMensual(df, ["zona"], col_peso="peso").por_nivel("zona")
+    assert matriz.dtype == np.float64
+    np.testing.assert_allclose(matriz, esperado(df, "peso"))
+    assert (matriz % 1 != 0).any()
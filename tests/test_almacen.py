@@ -0,0 +1,64 @@
+"""
+mapa_seguridad.almacen: ida y vuelta de los intermedios en Parquet y CSV, elección
+del formato configurado y escritura por bloques.
+"""
+import pandas as pd
+import pytest
+
+from mapa_seguridad import almacen
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    # 🧪 Intermedios en una carpeta temporal, Parquet + CSV
+    monkeypatch.setattr(almacen, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(almacen, "FORMATO", "parquet")
+    monkeypatch.setattr(almacen, "EXPORTAR_CSV", True)
+    return tmp_path
+
+
+def robos():
+    return pd.DataFrame({
+        "seguridad.fecha_hecho": pd.to_datetime(["2019-01-05", None, "2019-03-02"]),
+        "seguridad.edad": pd.array([31, None, 45], dtype="Int16"),
+        "latitud": pd.array([6.25, 6.3, None], dtype="float32"),
+        "mes": pd.array([1, None, 3], dtype="Int8"),
+        "sector": ["A", 12, None],  # texto mezclado con números
+    })
+
+
+def test_parquet_conserva_los_tipos_y_se_prefiere_al_csv(carpeta):
+    rutas = almacen.guardar_intermedio(robos(), "robos_medellin_limpio")
+    assert [r.suffix for r in rutas] == [".parquet", ".csv"]
+    assert almacen.buscar_intermedio("robos_medellin_limpio").suffix == ".parquet"
+    df = almacen.cargar_intermedio("robos_medellin_limpio")
+    assert df["seguridad.edad"].dtype == "Int16" and df["mes"].dtype == "Int8"
+    assert df["sector"].tolist() == ["A", "12", None]
+    solo = almacen.cargar_intermedio("robos_medellin_limpio", columnas=lambda c: c.startswith("seguridad."))
+    assert list(solo.columns) == ["seguridad.fecha_hecho", "seguridad.edad"]
+
+
+def test_csv_se_tipa_con_el_registro_de_esquemas(carpeta, monkeypatch):
+    monkeypatch.setattr(almacen, "FORMATO", "csv")
+    monkeypatch.setattr(almacen, "EXPORTAR_CSV", False)
+    almacen.guardar_intermedio(robos(), "robos_medellin_limpio")
+    df = almacen.cargar_intermedio("robos_medellin_limpio", columnas=["latitud", "mes", "seguridad.fecha_hecho"])
+    assert df["mes"].dtype == "Int8" and df["latitud"].dtype == "float32"
+    assert pd.api.types.is_datetime64_any_dtype(df["seguridad.fecha_hecho"])
+    assert df["mes"].tolist() == [1, pd.NA, 3]
+
+
+def test_escritura_por_bloques_igual_a_una_sola(carpeta):
+    completo = pd.DataFrame({"zona": ["a", "b", "c", "d"], "casos": [1, 2, 3, 4],
+                             "nota": [None, None, "x", None]})
+    with almacen.EscritorIntermedio("bloques") as escritor:
+        escritor.escribir(completo.iloc[:2])
+        escritor.escribir(completo.iloc[2:])
+    pd.testing.assert_frame_equal(almacen.cargar_intermedio("bloques"), completo)
+    csv = pd.read_csv(carpeta / "bloques.csv", encoding="utf-8-sig")
+    assert csv["casos"].tolist() == [1, 2, 3, 4]
+
+
+def test_intermedio_faltante(carpeta):
+    with pytest.raises(FileNotFoundError):
+        almacen.cargar_intermedio("no_existe")
@@ -0,0 +1,27 @@
+"""
+Etapa 01 (mapa_seguridad.etapas.cargar_policia): el modo streaming, bloque por
+bloque, deja las mismas filas que leer el reporte completo en memoria.
+"""
+import pandas as pd
+
+from mapa_seguridad.almacen import cargar_intermedio
+from mapa_seguridad.etapas import cargar_policia
+
+
+def comparable(df):
+    # Las categorías de cada bloque se unen al concatenar: se comparan los valores
+    return df.reset_index(drop=True).astype({c: object for c in df.columns if df[c].dtype == "category"})
+
+
+def test_streaming_igual_a_en_memoria(proyecto):
+    completo = cargar_policia(chunksize=0)
+    guardado = cargar_intermedio("hurto_policia_limpio")
+    por_bloques = cargar_policia(chunksize=700)
+    assert len(completo) > 0 and set(completo["departamento"].astype(str)) == {"ANTIOQUIA"}
+    pd.testing.assert_frame_equal(comparable(por_bloques), comparable(completo))
+    pd.testing.assert_frame_equal(comparable(cargar_intermedio("hurto_policia_limpio")), comparable(guardado))
+
+
+def test_streaming_sin_devolver_las_filas(proyecto):
+    assert cargar_policia(chunksize=1000, devolver=False) is None
+    assert len(cargar_intermedio("hurto_policia_limpio")) == len(cargar_policia(chunksize=0))
@@ -0,0 +1,88 @@
+"""
+mapa_seguridad.consultas: filtros con el índice por dimensión frente a una máscara
+sobre toda la tabla, municipios con más casos y caché LRU.
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.consultas import CacheLRU, ErrorConsulta, IndiceConsultas
+
+
+def data_final(filas=500, semilla=0):
+    # 🧪 Comunas con código de respaldo, vacíos en los filtros y casos de la Policía
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({
+        "municipio": rng.choice(["BELLO", "ENVIGADO", "ITAGUI", "MEDELLIN", None], filas),
+        "comuna": rng.choice(["POPULAR", "LAURELES", None], filas),
+        "codigo_comuna": rng.choice(["01", "11"], filas),
+        "nivel_riesgo": rng.choice(["ALTO", "MEDIO", "BAJO", None], filas),
+        "alerta": rng.choice(["ROJA", "AMARILLA", "VERDE"], filas),
+        "tipo_delito": rng.choice(["Atraco", "Raponazo"], filas),
+        "indice_riesgo": np.where(rng.random(filas) < 0.1, np.nan, rng.random(filas)),
+        "casos_totales": np.where(rng.random(filas) < 0.3, np.nan, rng.integers(1, 40, filas)),
+        "casos_municipio": rng.integers(100, 900, filas),
+    })
+    return df
+
+
+def mascara(df, filtros):
+    # 🐢 Referencia: isin por dimensión sobre todas las filas
+    columnas = {"municipio": df["municipio"], "comuna": df["comuna"].fillna(df["codigo_comuna"]),
+                "nivel_riesgo": df["nivel_riesgo"], "alerta": df["alerta"], "delito": df["tipo_delito"]}
+    dentro = np.ones(len(df), dtype=bool)
+    for dimension, valores in filtros.items():
+        dentro &= columnas[dimension].isin(valores).to_numpy()
+    return np.flatnonzero(dentro)
+
+
+FILTROS = {
+    "municipio": ["MEDELLIN", "BELLO"],
+    "comuna": ["01", "LAURELES"],
+    "nivel_riesgo": ["ALTO"],
+    "alerta": ["ROJA", "VERDE"],
+    "delito": ["Atraco", "Hurto de motos"],
+}
+
+
+def test_filas_igual_a_la_mascara_en_todas_las_combinaciones():
+    df = data_final()
+    indice = IndiceConsultas(df)
+    assert np.array_equal(indice.filas({}), np.arange(len(df)))
+    for k in range(1, len(FILTROS) + 1):
+        for dimensiones in combinations(FILTROS, k):
+            filtros = {d: FILTROS[d] for d in dimensiones}
+            assert np.array_equal(indice.filas(filtros), mascara(df, filtros)), filtros
+
+
+def test_filtros_geograficos_se_normalizan():
+    indice = IndiceConsultas(data_final())
+    assert np.array_equal(indice.filas({"municipio": ["medellín", " Itagüí "]}),
+                          indice.filas({"municipio": ["MEDELLIN", "ITAGUI"]}))
+    assert len(indice.filas({"municipio": ["Rionegro"]})) == 0
+    with pytest.raises(ErrorConsulta):
+        indice.filas({"barrio": ["X"]})
+
+
+def test_top_municipios_como_un_groupby():
+    df = data_final()
+    indice = IndiceConsultas(df)
+    filas = indice.filas({"alerta": ["ROJA"]})
+    parte = df.iloc[filas].dropna(subset=["municipio"])
+    casos = parte["casos_totales"].fillna(parte["casos_municipio"])
+    esperado = casos.groupby(parte["municipio"]).sum().sort_index().sort_values(ascending=False, kind="stable")
+    top = indice.top_municipios(filas, cuantos=3)
+    assert [t["municipio"] for t in top] == esperado.index[:3].tolist()
+    assert [t["casos"] for t in top] == pytest.approx(esperado.iloc[:3].tolist())
+
+
+def test_cache_lru_descarta_la_menos_usada():
+    cache = CacheLRU(capacidad=2)
+    assert cache.obtener("a", lambda: 1) == (1, False)
+    cache.obtener("b", lambda: 2)
+    assert cache.obtener("a", lambda: 0) == (1, True)
+    cache.obtener("c", lambda: 3)
+    assert cache.obtener("b", lambda: 20) == (20, False)
+    assert (cache.aciertos, cache.fallos, len(cache)) == (1, 4, 2)
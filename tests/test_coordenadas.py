@@ -0,0 +1,71 @@
+"""
+mapa_seguridad.coordenadas frente a la misma regla aplicada valor por valor,
+sobre los textos mal formados del archivo de robos de Kaggle.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.coordenadas import (CIFRAS_ENTERAS, FUERA_DE_RANGO, LAT_MAX, LAT_MIN, LON_MAX, LON_MIN,
+                                        NO_NUMERICA, VACIA, reparar_coordenada, reparar_coordenadas)
+
+LATITUDES = ["627.623.616", "6.253.084", "621.907.115", " 6.2 ", "+62.345", "6,21", "", None, np.nan,
+             "   ", "seis", "6.2.a", "-", "12.345.678", "0", "6"]
+LONGITUDES = ["-7.555.353.312", "-75.6", "-7.560.299.601", "-7,558", " -755.601.234 ", "75.58", "", None,
+              np.nan, "x", "-7.555.353.312", "-7.555.353.312", "-1", "-7.555.353.312", "-7.555.353.312", "-75"]
+
+
+def reparar_fila(valor, minimo, maximo):
+    # 🐢 La misma regla, un valor a la vez (referencia)
+    if pd.isna(valor) or str(valor).strip() == "":
+        return np.nan, VACIA
+    texto = str(valor).strip()
+    digitos = re.sub(r"[\s.,+-]", "", texto)
+    if not digitos.isdigit():
+        return np.nan, NO_NUMERICA
+    signo = -1.0 if texto.startswith("-") else 1.0
+    for enteras in CIFRAS_ENTERAS:
+        candidato = signo * int(digitos) / 10.0 ** (len(digitos) - enteras)
+        if minimo <= candidato <= maximo:
+            return candidato, None
+    return np.nan, FUERA_DE_RANGO
+
+
+def verificar(textos, minimo, maximo):
+    serie = pd.Series(textos, dtype=object)
+    valores, motivo = reparar_coordenada(serie, minimo, maximo)
+    esperado = [reparar_fila(v, minimo, maximo) for v in serie]
+    np.testing.assert_array_equal(valores.to_numpy(), np.array([v for v, _ in esperado], dtype=np.float32))
+    assert motivo.tolist() == [m for _, m in esperado]
+    return valores, motivo
+
+
+def test_latitudes_con_puntos_de_miles():
+    valores, motivo = verificar(LATITUDES, LAT_MIN, LAT_MAX)
+    assert valores[0] == np.float32(6.27623616)
+    assert valores[1] == np.float32(6.253084)
+    assert motivo[7] == VACIA and motivo[10] == NO_NUMERICA and motivo[13] == FUERA_DE_RANGO
+
+
+def test_longitudes_con_puntos_de_miles():
+    valores, motivo = verificar(LONGITUDES, LON_MIN, LON_MAX)
+    assert valores[0] == np.float32(-75.55353312)
+    # Sin signo la longitud queda positiva: fuera del Valle de Aburrá
+    assert motivo[5] == FUERA_DE_RANGO
+
+
+def test_muestra_del_archivo_de_kaggle_ampliada():
+    rng = np.random.default_rng(0)
+    verificar(rng.choice(np.array(LATITUDES, dtype=object), 5000), LAT_MIN, LAT_MAX)
+    verificar(rng.choice(np.array(LONGITUDES, dtype=object), 5000), LON_MIN, LON_MAX)
+
+
+def test_un_punto_solo_se_conserva_con_las_dos_coordenadas():
+    df = pd.DataFrame({"lat": LATITUDES, "lon": LONGITUDES})
+    rechazadas = reparar_coordenadas(df, "lat", "lon")
+    completas = df["latitud"].notna()
+    assert completas.equals(df["longitud"].notna())
+    assert df["latitud"].dtype == np.float32
+    assert set(rechazadas.index) == set(df.index[~completas])
+    assert rechazadas["motivo"].notna().all()
@@ -0,0 +1,84 @@
+"""
+mapa_seguridad.cubo frente al cálculo directo del panel (máscara sobre todas las filas).
+"""
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.cubo import DIMENSIONES_CUBO, construir_cubo, llave_celda, medidas_por_fila
+
+
+def data_final(filas=600, semilla=0):
+    # 🧪 Filtros con vacíos, promedios y arriendos faltantes en algunas filas
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({
+        "nivel_riesgo": rng.choice(["ALTO", "BAJO", "MEDIO", None], filas),
+        "alerta": rng.choice(["ROJA", "VERDE", None], filas),
+        "municipio": rng.choice(["BELLO", "ENVIGADO", "ITAGUI", "MEDELLIN"], filas),
+        "tipo_delito": rng.choice(["Atraco", "Raponazo", "Descuido"], filas),
+        "promedio_robos": np.where(rng.random(filas) < 0.2, np.nan, rng.random(filas) * 10),
+        "casos_totales": rng.integers(0, 50, filas).astype(float),
+        "promedio_arriendo_casa": np.where(rng.random(filas) < 0.3, np.nan, rng.random(filas) * 2e6),
+        "promedio_arriendo_apartamento": np.where(rng.random(filas) < 0.3, np.nan, rng.random(filas) * 2e6),
+    })
+    df.loc[rng.random(filas) < 0.05, "municipio"] = None
+    return df
+
+
+def panel_directo(df, medidas, seleccion):
+    # 🐢 Referencia: máscara sobre todas las filas y cálculo del panel
+    columnas = {"nivel_riesgo": "nivel_riesgo", "alerta": "alerta", "municipio": "municipio", "delito": "tipo_delito"}
+    mascara = np.ones(len(df), dtype=bool)
+    for nombre, valor in seleccion.items():
+        mascara &= (df[columnas[nombre]] == valor).to_numpy()
+    casos = pd.Series(np.nan_to_num(medidas["casos"][mascara])).groupby(
+        df["municipio"].to_numpy()[mascara], sort=True).sum()
+    promedio, arriendo = medidas["promedio"][mascara], medidas["arriendo"][mascara]
+    return {
+        "zonas": int(mascara.sum()),
+        "promedio": np.nanmean(promedio) if np.isfinite(promedio).any() else None,
+        "arriendo": np.nanmean(arriendo) if np.isfinite(arriendo).any() else None,
+        "municipio_top": casos.idxmax() if len(casos) else None,
+    }
+
+
+def panel_cubo(valores, celdas, seleccion):
+    llave = llave_celda(valores, seleccion)
+    if llave not in celdas.index:
+        return {"zonas": 0, "promedio": None, "arriendo": None, "municipio_top": None}
+    celda = celdas.loc[llave]
+    return {
+        "zonas": int(celda["zonas"]),
+        "promedio": celda["suma_promedio"] / celda["n_promedio"] if celda["n_promedio"] else None,
+        "arriendo": celda["suma_arriendo"] / celda["n_arriendo"] if celda["n_arriendo"] else None,
+        "municipio_top": valores["municipio"][int(celda["municipio_top"])] if celda["municipio_top"] >= 0 else None,
+    }
+
+
+def test_todas_las_selecciones_coinciden_con_el_calculo_directo():
+    df = data_final()
+    valores, celdas = construir_cubo(df)
+    celdas = celdas.set_index("celda")
+    medidas = medidas_por_fila(df)
+
+    opciones = [[None] + valores[n] for n in DIMENSIONES_CUBO]
+    for combinacion in product(*opciones):
+        seleccion = {n: v for n, v in zip(DIMENSIONES_CUBO, combinacion) if v is not None}
+        esperado = panel_directo(df, medidas, seleccion)
+        obtenido = panel_cubo(valores, celdas, seleccion)
+        assert obtenido["zonas"] == esperado["zonas"], seleccion
+        assert obtenido["municipio_top"] == esperado["municipio_top"], seleccion
+        for clave in ("promedio", "arriendo"):
+            if esperado[clave] is None:
+                assert obtenido[clave] is None, (seleccion, clave)
+            else:
+                assert np.isclose(obtenido[clave], esperado[clave]), (seleccion, clave)
+
+
+def test_celda_todos_cuenta_todas_las_filas():
+    df = data_final()
+    valores, celdas = construir_cubo(df)
+    todos = celdas.set_index("celda").loc[llave_celda(valores, {})]
+    assert todos["zonas"] == len(df)
+    assert np.isclose(todos["suma_casos"], df["casos_totales"].sum())
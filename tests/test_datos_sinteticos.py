@@ -0,0 +1,36 @@
+"""
+benchmarks/datos_sinteticos.py: archivos reproducibles y legibles con los esquemas
+declarados de cada fuente (mapa_seguridad.esquemas.FUENTES).
+"""
+import datos_sinteticos
+import pytest
+
+from mapa_seguridad.esquemas import FUENTES, Lector
+
+
+@pytest.fixture
+def pequenas(monkeypatch):
+    monkeypatch.setattr(datos_sinteticos, "FILAS_BASE", {"policia": 800, "medata": 300, "kaggle": 500, "arriendos": 25})
+
+
+def test_misma_semilla_mismos_archivos(tmp_path, pequenas):
+    a = datos_sinteticos.generar(tmp_path / "a", semilla=3)
+    b = datos_sinteticos.generar(tmp_path / "b", semilla=3)
+    for fuente, (ruta, filas) in a.items():
+        assert ruta.read_bytes() == b[fuente][0].read_bytes(), fuente
+        assert filas == b[fuente][1]
+
+
+def test_una_fuente_sola_igual_que_todas(tmp_path, pequenas):
+    todas = datos_sinteticos.generar(tmp_path / "todas", semilla=1)
+    sola = datos_sinteticos.generar(tmp_path / "sola", semilla=1, fuentes=["kaggle"])
+    assert list(sola) == ["kaggle"]
+    assert sola["kaggle"][0].read_bytes() == todas["kaggle"][0].read_bytes()
+
+
+def test_fuentes_con_todas_las_columnas_declaradas(proyecto):
+    filas = datos_sinteticos.filas_por_fuente(1)
+    for fuente, esquema in FUENTES.items():
+        lector = Lector(esquema.archivo, esquema.columnas, solo_declaradas=True, separador=esquema.separador)
+        assert lector.faltantes == [], fuente
+        assert len(lector.leer()) == filas[fuente], fuente
@@ -0,0 +1,53 @@
+"""
+mapa_seguridad.densidad: filtro de caja con sumas acumuladas frente a la suma
+directa de la ventana, conteo en la malla y normalización del suavizado.
+"""
+import numpy as np
+import pytest
+
+from mapa_seguridad.densidad import contar_en_malla, densidad, filtro_caja, malla_valle, radio_por_pasada
+
+
+def filtro_caja_directo(matriz, radio):
+    # 🐢 Referencia: sumar la matriz desplazada para cada posición de la ventana
+    filas, columnas = matriz.shape
+    relleno = np.pad(matriz.astype("float64"), radio)
+    suma = np.zeros((filas, columnas))
+    for df in range(2 * radio + 1):
+        for dc in range(2 * radio + 1):
+            suma += relleno[df:df + filas, dc:dc + columnas]
+    return suma
+
+
+@pytest.mark.parametrize("radio", [1, 2, 5])
+def test_filtro_caja_igual_a_la_suma_directa(radio):
+    # 🧪 Matriz rectangular con conteos dispersos, como la malla real
+    rng = np.random.default_rng(radio)
+    matriz = rng.poisson(0.3, (37, 52))
+    np.testing.assert_allclose(filtro_caja(matriz, radio), filtro_caja_directo(matriz, radio), atol=1e-9)
+
+
+def test_filtro_caja_con_radio_mayor_que_la_matriz():
+    matriz = np.arange(12, dtype="float64").reshape(3, 4)
+    np.testing.assert_allclose(filtro_caja(matriz, 6), np.full((3, 4), matriz.sum()))
+
+
+def test_conteo_en_malla_ignora_los_puntos_por_fuera():
+    malla = malla_valle()
+    lat = np.array([malla.lat0 + 0.5 * malla.dlat, malla.lat0 + 0.6 * malla.dlat,
+                    malla.lat0 - 1.0, np.nan, malla.lat0 + (malla.filas - 0.5) * malla.dlat])
+    lon = np.array([malla.lon0 + 0.5 * malla.dlon, malla.lon0 + 0.6 * malla.dlon,
+                    malla.lon0, malla.lon0, malla.lon0 + (malla.columnas - 0.5) * malla.dlon])
+    conteos = contar_en_malla(lat, lon, malla)
+    assert conteos.shape == (malla.filas, malla.columnas)
+    assert conteos.sum() == 3
+    assert conteos[0, 0] == 2 and conteos[-1, -1] == 1
+
+
+def test_densidad_conserva_la_masa_lejos_del_borde():
+    conteos = np.zeros((60, 60))
+    conteos[30, 30] = 7
+    radio = radio_por_pasada()
+    suave = densidad(conteos, radio)
+    assert suave.sum() == pytest.approx(7)
+    assert suave.argmax() == np.ravel_multi_index((30, 30), conteos.shape)
@@ -0,0 +1,50 @@
+"""
+mapa_seguridad.esquemas: conversión a enteros con vacíos (a_entero) frente a la
+conversión valor por valor, y lectura tipada de un CSV con Lector.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.esquemas import Lector, a_entero, detectar_separador
+
+
+def a_entero_directo(valores, tipo):
+    # 🐢 Referencia: cada valor por separado; los no enteros ("2.5", "abc") quedan vacíos
+    salida = []
+    for v in valores:
+        numero = pd.to_numeric(pd.Series([v], dtype=object), errors="coerce").iloc[0]
+        salida.append(pd.NA if pd.isna(numero) or numero != round(numero) else int(numero))
+    return pd.array(salida, dtype=tipo)
+
+
+@pytest.mark.parametrize("tipo", ["Int8", "Int32", "Int64"])
+def test_a_entero_desde_categoria(tipo):
+    # 🧪 Textos repetidos como los deja read_csv con dtype="category"
+    valores = ["5", "05", "-3", "2.0", "2.5", "abc", None, "12", "5", "", "100"]
+    serie = pd.Series(valores, dtype="category", name="codigo")
+    obtenido = a_entero(serie, tipo)
+    assert obtenido.dtype == tipo and obtenido.name == "codigo"
+    pd.testing.assert_extension_array_equal(obtenido.array, a_entero_directo(valores, tipo))
+
+
+def test_a_entero_conserva_el_indice():
+    serie = pd.Series(["1", None, "3"], index=[10, 20, 30], dtype=object)
+    obtenido = a_entero(serie)
+    assert obtenido.index.tolist() == [10, 20, 30]
+    assert obtenido.tolist() == [1, pd.NA, 3]
+
+
+def test_lector_tipa_enteros_y_fechas(tmp_path):
+    ruta = tmp_path / "fuente.csv"
+    ruta.write_text("CODIGO;Fecha;Nombre;Extra\n5;2023-01-15;A;x\n;2023-02-01;B;y\n7;;C;z\n", encoding="utf-8")
+    assert detectar_separador(ruta) == ";"
+    lector = Lector(ruta, {"codigo": "Int16", "fecha": "fecha", "nombre": "texto", "falta": "Int64"},
+                    solo_declaradas=True)
+    assert lector.faltantes == ["falta"] and lector.ignoradas == ["extra"]
+    df = lector.leer()
+    assert list(df.columns) == ["codigo", "fecha", "nombre"]
+    assert df["codigo"].dtype == "Int16" and df["codigo"].tolist() == [5, pd.NA, 7]
+    assert pd.api.types.is_datetime64_any_dtype(df["fecha"])
+    assert df["fecha"].iloc[0] == pd.Timestamp("2023-01-15") and pd.isna(df["fecha"].iloc[2])
+    assert np.array_equal(df["nombre"].to_numpy(), ["A", "B", "C"])
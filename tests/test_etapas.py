@@ -0,0 +1,32 @@
+"""
+mapa_seguridad.etapas como biblioteca: las etapas encadenadas en memoria escriben
+las salidas que declara el orquestador, y pasar las tablas en memoria o leerlas
+del disco da el mismo data_final.
+"""
+import pandas as pd
+
+from mapa_seguridad.etapas import PASOS, unir_y_riesgo, validar_salida
+from mapa_seguridad.orquestador import ETAPAS, resolver_salida
+
+
+def test_pasos_en_memoria_escriben_las_salidas_declaradas(proyecto):
+    memoria = {}
+    for nombre, paso in PASOS.items():
+        memoria.update(paso(memoria))
+    assert list(PASOS) == [e.nombre for e in ETAPAS]
+    for etapa in ETAPAS:
+        for salida in etapa.salidas:
+            assert resolver_salida(salida).exists(), (etapa.nombre, salida)
+    assert {"data_final", "riesgo_ventanas", "geo_zonas", "geo_alias"} <= set(memoria)
+
+
+def test_tablas_en_memoria_o_del_disco_dan_lo_mismo(proyecto):
+    memoria = {}
+    for nombre in ["01_cargar_policia", "02_cargar_medata", "03_cargar_kaggle", "04_cargar_arriendos"]:
+        memoria.update(PASOS[nombre](memoria))
+    en_memoria = PASOS["05_unir_y_riesgo"](memoria)["data_final"]
+    del_disco = unir_y_riesgo()["data_final"]
+    pd.testing.assert_frame_equal(del_disco, en_memoria)
+    # El camino SQL de la unión da la misma tabla que pandas
+    pd.testing.assert_frame_equal(unir_y_riesgo(motor="sqlite")["data_final"], en_memoria)
+    assert validar_salida(en_memoria)["ok"]
@@ -0,0 +1,52 @@
+"""
+mapa_seguridad.fechas.parsear_fechas frente a pd.to_datetime, como lo hacían las etapas.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.fechas import detectar_formato, parsear_fechas
+
+
+def textos_kaggle(filas=3000, semilla=0):
+    # 🧪 Como el archivo de Kaggle: "dd/mm/yyyy H:MM" con horas muy repetidas, vacíos y basura
+    rng = np.random.default_rng(semilla)
+    fechas = pd.Timestamp("2017-01-01") + pd.to_timedelta(rng.integers(0, 365 * 3, filas), unit="D") \
+        + pd.to_timedelta(rng.integers(0, 24, filas), unit="h")
+    serie = pd.Series(fechas.strftime("%d/%m/%Y %H:%M"), dtype=object)
+    serie[rng.random(filas) < 0.03] = None
+    serie[rng.random(filas) < 0.01] = "sin fecha"
+    return serie
+
+
+def con_pandas(serie, **opciones):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pd.to_datetime(serie, errors="coerce", **opciones)
+
+
+def test_formato_detectado_dia_primero():
+    assert detectar_formato(textos_kaggle()) == "%d/%m/%Y %H:%M"
+    assert detectar_formato(pd.Series(["2020-03-04", "2021-12-31"])) == "%Y-%m-%d"
+    assert detectar_formato(pd.Series([None, " "])) is None
+
+
+def test_paridad_con_pd_to_datetime():
+    serie = textos_kaggle()
+    pd.testing.assert_series_equal(parsear_fechas(serie), con_pandas(serie, dayfirst=True), check_exact=True)
+
+
+@pytest.mark.parametrize("tipo", [object, "category"])
+def test_paridad_con_formato_explicito(tipo):
+    serie = textos_kaggle(filas=500, semilla=1).astype(tipo)
+    obtenido = parsear_fechas(serie, formato="%d/%m/%Y %H:%M")
+    esperado = con_pandas(serie.astype(object), format="%d/%m/%Y %H:%M")
+    np.testing.assert_array_equal(obtenido.to_numpy(), esperado.to_numpy())
+    assert obtenido.index.equals(serie.index)
+
+
+def test_columna_ya_en_fecha_no_se_vuelve_a_interpretar():
+    serie = pd.Series(pd.to_datetime(["2020-01-02", None]))
+    assert parsear_fechas(serie) is serie
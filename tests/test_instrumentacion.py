@@ -0,0 +1,69 @@
+"""
+mapa_seguridad.instrumentacion: apagada no envuelve nada; encendida registra los
+bloques, los tramos anidados y sus filas, y escribe trazas que se pueden unir.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from mapa_seguridad import instrumentacion
+
+
+def sumar(df):
+    return df.assign(total=df["a"] + df["b"])
+
+
+@pytest.fixture
+def encendida(monkeypatch):
+    # 🧪 Como MAPA_TRAZA=1, con un registro limpio para cada prueba
+    monkeypatch.setattr(instrumentacion, "ACTIVA", True)
+    monkeypatch.setattr(instrumentacion, "PROFUNDO", False)
+    monkeypatch.setattr(instrumentacion, "_registro", instrumentacion._Registro())
+    return instrumentacion._registro
+
+
+def test_apagada_no_cambia_nada(monkeypatch):
+    monkeypatch.setattr(instrumentacion, "ACTIVA", False)
+    monkeypatch.setattr(instrumentacion, "_registro", instrumentacion._Registro())
+    assert instrumentacion.medir()(sumar) is sumar
+    with instrumentacion.tramo("nada"):
+        instrumentacion.bloque("BLOQUE 1")
+        instrumentacion.filas(entrada=3)
+    assert instrumentacion._registro.eventos == [] and instrumentacion._registro.pila == []
+
+
+def test_bloques_tramos_y_filas(encendida):
+    df = pd.DataFrame({"a": range(5), "b": range(5)})
+    medida = instrumentacion.medir()(sumar)
+    instrumentacion.bloque("BLOQUE 1")
+    medida(df)
+    with instrumentacion.tramo("unión"):
+        instrumentacion.filas(entrada=5, salida=2)
+    instrumentacion.bloque("BLOQUE 2")  # cierra el BLOQUE 1
+    assert [e["name"] for e in encendida.eventos] == ["sumar", "unión", "BLOQUE 1"]
+    eventos = {e["name"]: e for e in encendida.eventos}
+    assert eventos["sumar"]["args"]["filas_entrada"] == 5 and eventos["sumar"]["args"]["filas_salida"] == 5
+    assert eventos["unión"]["args"]["filas_salida"] == 2
+    assert eventos["BLOQUE 1"]["cat"] == "bloque" and eventos["sumar"]["cat"] == "tramo"
+    # Los tramos quedan dentro de su bloque
+    padre = eventos["BLOQUE 1"]
+    for hijo in ("sumar", "unión"):
+        assert padre["ts"] <= eventos[hijo]["ts"]
+        assert eventos[hijo]["ts"] + eventos[hijo]["dur"] <= padre["ts"] + padre["dur"] + 1
+    assert [t.nombre for t in encendida.pila] == ["BLOQUE 2"]
+
+
+def test_medir_con_nombre_del_intermedio(encendida):
+    instrumentacion.medir()(lambda nombre: None)("data_final")
+    assert encendida.eventos[0]["name"].endswith("(data_final)")
+
+
+def test_guardar_y_combinar_trazas(encendida, tmp_path):
+    instrumentacion.bloque("BLOQUE 1")
+    ruta = instrumentacion.guardar_traza(tmp_path / "05.json")
+    traza = json.loads(ruta.read_text(encoding="utf-8"))
+    assert [e["ph"] for e in traza["traceEvents"]] == ["M", "X"]
+    assert encendida.pila == []
+    destino = instrumentacion.combinar_trazas([ruta, ruta, tmp_path / "no_existe.json"], tmp_path / "todo.json")
+    assert len(json.loads(destino.read_text(encoding="utf-8"))["traceEvents"]) == 4
@@ -0,0 +1,60 @@
+"""
+mapa_seguridad.normalizacion frente al antiguo limpiar_texto de 05_unir_y_riesgo.py.
+"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.normalizacion import normalizar_columnas, normalizar_geo, normalizar_texto
+
+TEXTOS = ["Medellín ", "MEDELLIN", "Itagüí", "  la Estrella", "El Poblado #14", "Belén-Rincón", "Ñuñoa",
+          "Comuna 1", "San Antonio de Prado (CT)", "  ", "", "ENVIGADO.", "bello\t", "Copacabana", "14"]
+
+
+def limpiar_texto(serie):
+    # 🐢 Implementación original del BLOQUE 2 de 05_unir_y_riesgo.py (referencia)
+    return (
+        serie.astype(str)
+        .str.upper()
+        .apply(lambda x: unicodedata.normalize("NFKD", x))
+        .str.encode("ascii", errors="ignore")
+        .str.decode("utf-8")
+        .str.replace(r"[^A-Z0-9 ]", "", regex=True)
+        .str.strip()
+    )
+
+
+def muestra(filas=4000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return pd.Series(rng.choice(np.array(TEXTOS, dtype=object), filas), name="municipio")
+
+
+def test_normalizar_texto_igual_que_limpiar_texto():
+    serie = pd.Series(TEXTOS)
+    assert [normalizar_texto(t) for t in TEXTOS] == limpiar_texto(serie).tolist()
+
+
+def test_normalizar_geo_igual_que_limpiar_texto_por_fila():
+    serie = muestra()
+    obtenido = normalizar_geo(serie)
+    assert isinstance(obtenido.dtype, pd.CategoricalDtype)
+    assert obtenido.astype(object).tolist() == limpiar_texto(serie).tolist()
+    # Categorías en orden alfabético: los groupby ordenan igual que con texto
+    assert list(obtenido.cat.categories) == sorted(obtenido.cat.categories)
+    assert obtenido.index.equals(serie.index) and obtenido.name == "municipio"
+
+
+def test_diferencias_deliberadas_con_limpiar_texto():
+    # Los códigos leídos como float ya no se pegan ("14.0" → "14", no "140") y los vacíos siguen vacíos
+    serie = pd.Series(["14.0", "1.0", "10", np.nan], dtype=object)
+    assert normalizar_geo(serie).astype(object).tolist()[:3] == ["14", "1", "10"]
+    assert pd.isna(normalizar_geo(serie).iloc[3])
+    assert limpiar_texto(serie).tolist() == ["140", "10", "10", "NAN"]
+
+
+def test_normalizar_columnas_solo_las_que_existen():
+    df = pd.DataFrame({"municipio": muestra(50), "casos": np.arange(50)})
+    normalizar_columnas(df, ["municipio", "comuna", None])
+    assert isinstance(df["municipio"].dtype, pd.CategoricalDtype)
+    assert df["casos"].dtype == np.int64
@@ -0,0 +1,71 @@
+"""
+mapa_seguridad.orquestador: decisión de caché de una etapa (acierto y cada motivo
+de fallo) y grafo de dependencias entre las etapas del pipeline.
+"""
+from mapa_seguridad.orquestador import (
+    ETAPAS, Etapa, Huellas, dependencias, motivo_para_ejecutar, registrar_ejecucion,
+)
+
+
+def etapa_de_prueba(tmp_path):
+    # 🧪 El script de 07 con una entrada y una salida en una carpeta temporal
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.json"
+    entrada.write_text("a,b\n1,2\n", encoding="utf-8")
+    salida.write_text("{}", encoding="utf-8")
+    return Etapa("07_generar_teselas", entradas=[entrada], salidas=[salida]), entrada, salida
+
+
+def ejecutada(etapa):
+    estado = {"etapas": {}, "huellas": {}}
+    registrar_ejecucion(etapa, estado, Huellas())
+    return estado
+
+
+def test_sin_ejecuciones_previas(tmp_path):
+    etapa, _, _ = etapa_de_prueba(tmp_path)
+    assert motivo_para_ejecutar(etapa, {"etapas": {}}, Huellas()) == "sin ejecuciones previas"
+
+
+def test_acierto_de_cache(tmp_path):
+    etapa, _, _ = etapa_de_prueba(tmp_path)
+    estado = ejecutada(etapa)
+    assert motivo_para_ejecutar(etapa, estado, Huellas()) is None
+
+
+def test_entrada_cambiada(tmp_path):
+    etapa, entrada, _ = etapa_de_prueba(tmp_path)
+    estado = ejecutada(etapa)
+    entrada.write_text("a,b\n1,3\n", encoding="utf-8")
+    assert motivo_para_ejecutar(etapa, estado, Huellas()) == "cambiaron las entradas: entrada.csv"
+
+
+def test_entrada_reescrita_con_el_mismo_contenido_no_invalida(tmp_path):
+    etapa, entrada, _ = etapa_de_prueba(tmp_path)
+    estado = ejecutada(etapa)
+    entrada.write_text(entrada.read_text(encoding="utf-8"), encoding="utf-8")
+    assert motivo_para_ejecutar(etapa, estado, Huellas()) is None
+
+
+def test_salida_borrada_o_modificada(tmp_path):
+    etapa, _, salida = etapa_de_prueba(tmp_path)
+    estado = ejecutada(etapa)
+    salida.write_text('{"a": 1}', encoding="utf-8")
+    assert motivo_para_ejecutar(etapa, estado, Huellas()) == "la salida salida.json se modificó por fuera del pipeline"
+    salida.unlink()
+    assert motivo_para_ejecutar(etapa, estado, Huellas()) == "falta la salida salida.json"
+
+
+def test_codigo_cambiado(tmp_path):
+    etapa, _, _ = etapa_de_prueba(tmp_path)
+    estado = ejecutada(etapa)
+    estado["etapas"][etapa.nombre]["script"] = "0" * 64
+    assert motivo_para_ejecutar(etapa, estado, Huellas()) == "cambió el código"
+
+
+def test_dependencias_del_pipeline():
+    deps = dependencias(ETAPAS)
+    cargadores = ["01_cargar_policia", "02_cargar_medata", "03_cargar_kaggle", "04_cargar_arriendos"]
+    assert all(deps[c] == [] for c in cargadores)
+    assert deps["05_unir_y_riesgo"] == cargadores
+    assert deps["06_validar_salida"] == ["04_cargar_arriendos", "05_unir_y_riesgo"]
+    assert deps["07_generar_teselas"] == deps["08_calcular_hotspots"] == ["03_cargar_kaggle"]
@@ -0,0 +1,73 @@
+"""
+mapa_seguridad.paquete_web: codificar → JSON → decodificar devuelve los mismos valores
+que el formato de registros que escribía el BLOQUE 8 de 05.
+"""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+
+from mapa_seguridad.paquete_web import FORMATO, codificar, decodificar, guardar_paquete
+
+
+def tabla(filas=300, semilla=0):
+    # 🧪 Enteros, decimales, textos con diccionario, booleanos y columnas con y sin vacíos
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({
+        "casos_totales": rng.integers(0, 5000, filas).astype(float),
+        "indice_riesgo": rng.random(filas),
+        "zona_id": np.arange(filas, dtype=np.int32),
+        "municipio": rng.choice(["MEDELLIN", "BELLO", "ITAGUI", "ENVIGADO"], filas),
+        "alerta": pd.Categorical(rng.choice(["🚨 Alerta Roja", "🟠 Alerta Media", "🟢 Zona Segura"], filas)),
+        "con_arriendo": rng.random(filas) < 0.5,
+        "vacia": np.nan,
+    })
+    df.loc[rng.random(filas) < 0.3, "casos_totales"] = np.nan
+    df.loc[rng.random(filas) < 0.2, "indice_riesgo"] = np.nan
+    df.loc[rng.random(filas) < 0.1, "municipio"] = None
+    return df
+
+
+def como_registros(df):
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def ida_y_vuelta(df):
+    return decodificar(json.loads(json.dumps(codificar(df), ensure_ascii=False)))
+
+
+def test_ida_y_vuelta_mismos_valores():
+    df = tabla()
+    assert como_registros(ida_y_vuelta(df)) == como_registros(df)
+
+
+def test_tipos_y_vacios():
+    paquete = codificar(tabla())
+    assert paquete["formato"] == FORMATO and paquete["filas"] == 300
+    columnas = {c["nombre"]: c for c in paquete["columnas"]}
+    assert columnas["casos_totales"]["tipo"] == "i32" and "validos" in columnas["casos_totales"]
+    assert columnas["indice_riesgo"]["tipo"] == "f64"
+    assert "validos" not in columnas["zona_id"]
+    assert columnas["alerta"]["tipo"] == "dic" and columnas["alerta"]["ancho"] == "u8"
+    assert sorted(columnas["alerta"]["diccionario"]) == ["🚨 Alerta Roja", "🟠 Alerta Media", "🟢 Zona Segura"]
+
+
+def test_diccionario_ancho_u16():
+    df = pd.DataFrame({"barrio": [f"BARRIO {i}" for i in range(300)]})
+    (columna,) = codificar(df)["columnas"]
+    assert columna["ancho"] == "u16"
+    assert ida_y_vuelta(df)["barrio"].tolist() == df["barrio"].tolist()
+
+
+def test_etag_solo_cambia_con_los_datos(tmp_path):
+    df = tabla()
+    assert codificar(df)["etag"] == codificar(df.copy())["etag"]
+    cambiada = df.copy()
+    cambiada.loc[0, "zona_id"] = 999
+    assert codificar(cambiada)["etag"] != codificar(df)["etag"]
+
+    rutas = guardar_paquete(df, tmp_path / "data_final.json")
+    contenido = rutas[0].read_bytes()
+    assert gzip.decompress(rutas[1].read_bytes()) == contenido
+    assert json.loads(contenido)["etag"] == codificar(df)["etag"]
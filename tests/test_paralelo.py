@@ -0,0 +1,63 @@
+"""
+mapa_seguridad.orquestador.ejecutar_pipeline con varias etapas a la vez: ninguna
+empieza antes que sus dependencias, un fallo omite solo lo que depende de él y la
+segunda corrida sale toda de la caché.
+"""
+import threading
+import time
+
+from mapa_seguridad import orquestador
+from mapa_seguridad.orquestador import dependencias, ejecutar_pipeline, resolver_salida
+
+
+def etapas_simuladas(monkeypatch, fallan=()):
+    # 🧪 En vez del script, cada etapa escribe sus salidas y anota cuándo empezó y terminó
+    eventos = []
+    candado = threading.Lock()
+
+    def ejecutar(etapa, capturar=False):
+        with candado:
+            eventos.append(("inicio", etapa.nombre))
+        time.sleep(0.05)
+        exito = etapa.nombre not in fallan
+        if exito:
+            for salida in etapa.salidas:
+                ruta = resolver_salida(salida)
+                ruta.parent.mkdir(parents=True, exist_ok=True)
+                ruta.write_text(etapa.nombre, encoding="utf-8")
+        with candado:
+            eventos.append(("fin", etapa.nombre))
+        return exito, 0.05, ""
+
+    monkeypatch.setattr(orquestador, "ejecutar_etapa", ejecutar)
+    return eventos
+
+
+def test_dependencias_respetadas_en_paralelo(proyecto, monkeypatch):
+    eventos = etapas_simuladas(monkeypatch)
+    resultados = ejecutar_pipeline(procesos=3)
+    assert all(r["resultado"] == "✅ ejecutada" for r in resultados)
+    deps = dependencias(orquestador.ETAPAS)
+    for i, (tipo, nombre) in enumerate(eventos):
+        if tipo == "inicio":
+            terminadas = {n for t, n in eventos[:i] if t == "fin"}
+            assert set(deps[nombre]) <= terminadas, nombre
+    # Los cargadores 01–04 corrieron a la vez (hay un inicio antes del primer fin)
+    primer_fin = next(i for i, (t, _) in enumerate(eventos) if t == "fin")
+    assert sum(t == "inicio" for t, _ in eventos[:primer_fin]) == 3
+
+    # ♻️ Sin cambios, la segunda corrida no ejecuta nada
+    eventos.clear()
+    assert all(r["resultado"] == "💾 caché" for r in ejecutar_pipeline(procesos=3))
+    assert eventos == []
+
+
+def test_un_fallo_omite_solo_sus_dependientes(proyecto, monkeypatch):
+    etapas_simuladas(monkeypatch, fallan={"02_cargar_medata"})
+    resultados = {r["etapa"]: r["resultado"] for r in ejecutar_pipeline(procesos=2)}
+    assert resultados["02_cargar_medata"] == "❌ error"
+    assert resultados["05_unir_y_riesgo"] == "⏭️ omitida"
+    assert resultados["06_validar_salida"] == "⏭️ omitida"
+    for nombre in ["01_cargar_policia", "03_cargar_kaggle", "04_cargar_arriendos",
+                   "07_generar_teselas", "08_calcular_hotspots"]:
+        assert resultados[nombre] == "✅ ejecutada", nombre
@@ -0,0 +1,42 @@
+"""
+mapa_seguridad.particiones: reparto por departamento y sumas en varios procesos.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.particiones import casos_por_zona_y_mes, particion
+
+
+def test_particion_de_grupos_vacios_o_negativos():
+    for grupos in (np.array([-1, -7], dtype=np.int32), np.array([np.nan, -2.0]),
+                   pd.array([None, -1], dtype="Int64")):
+        assert particion(grupos, 4).tolist() == [0, 0]
+    partes = particion(np.arange(1000, dtype=np.int32), 4)
+    assert partes.min() == 0 and partes.max() == 3
+
+
+def registros(filas=5000, semilla=0):
+    # 🧪 Algunas filas sin departamento (NaN y -1) y sin fecha
+    rng = np.random.default_rng(semilla)
+    meses = pd.period_range("2022-01", periods=18, freq="M").to_numpy()
+    mes = pd.Series(rng.choice(meses, filas))
+    mes[rng.random(filas) < 0.05] = pd.NaT
+    departamento = pd.array(rng.choice([1, 2, 3, 4, 5, -1], filas), dtype="Int64")
+    departamento[rng.random(filas) < 0.05] = None
+    return pd.DataFrame({
+        "municipio_id": rng.integers(0, 60, filas).astype(np.int32),
+        "departamento_id": departamento,
+        "mes": pd.PeriodIndex(mes, freq="M"),
+        "cantidad": rng.integers(1, 4, filas),
+    })
+
+
+@pytest.mark.parametrize("procesos", [2, 3])
+def test_mismas_sumas_que_en_un_proceso(procesos):
+    df = registros()
+    argumentos = ("municipio_id", "departamento_id", "mes", "cantidad")
+    esperado = casos_por_zona_y_mes(df, *argumentos, procesos=1)
+    obtenido = casos_por_zona_y_mes(df, *argumentos, procesos=procesos)
+    pd.testing.assert_frame_equal(obtenido, esperado)
+    assert esperado["casos_mes"].sum() == df["cantidad"].sum()
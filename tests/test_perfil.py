@@ -0,0 +1,58 @@
+"""
+mapa_seguridad.perfil: perfil de una sola pasada frente a los value_counts por
+columna y por año/mes de la versión anterior de 03.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.perfil import cargar_perfil, guardar_perfil, mas_frecuentes, perfilar
+
+
+def robos(filas=2000, semilla=0):
+    # 🧪 Una columna categórica, una de texto con vacíos, una numérica y fechas con NaT
+    rng = np.random.default_rng(semilla)
+    fechas = pd.Series(pd.to_datetime("2017-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365, filas), unit="D"))
+    fechas[rng.random(filas) < 0.05] = pd.NaT
+    modalidad = pd.Series(rng.choice(["Atraco", "Cosquilleo", "Raponazo", "Descuido", None], filas,
+                                     p=[0.4, 0.3, 0.15, 0.1, 0.05]))
+    return pd.DataFrame({
+        "sexo": pd.Categorical(rng.choice(["Hombre", "Mujer", "Sin dato"], filas)),
+        "modalidad": modalidad,
+        "edad": rng.integers(15, 70, filas),
+        "fecha": fechas,
+    })
+
+
+def test_top_nulos_y_distintos_como_value_counts():
+    df = robos()
+    perfil = perfilar(df, ["sexo", "modalidad", "edad", "no_existe", "sexo"], top=5)
+    assert list(perfil["columnas"]) == ["sexo", "modalidad", "edad"]
+    for columna, datos in perfil["columnas"].items():
+        # 🐢 Referencia: value_counts de la columna (en empates el orden puede variar)
+        conteos = df[columna].value_counts()
+        assert [n for _, n in datos["top"]] == conteos.head(5).tolist(), columna
+        assert all(conteos[v] == n for v, n in datos["top"]), columna
+        assert datos["nulos"] == int(df[columna].isna().sum())
+        assert datos["distintos"] == df[columna].nunique()
+
+
+def test_histogramas_por_anio_y_mes():
+    df = robos()
+    hist = perfilar(df, [], col_fecha="fecha")["histogramas"]
+    por_anio = df["fecha"].dt.year.value_counts().sort_index()
+    por_mes = df["fecha"].dt.month.value_counts().sort_index()
+    assert hist["anio"] == {"valores": por_anio.index.tolist(), "casos": por_anio.tolist()}
+    assert hist["mes"] == {"valores": por_mes.index.tolist(), "casos": por_mes.tolist()}
+
+
+def test_guardar_y_cargar(tmp_path):
+    perfil = perfilar(robos(), ["modalidad", "edad"], col_fecha="fecha")
+    guardar_perfil(perfil, tmp_path / "perfil.json")
+    cargado = cargar_perfil(tmp_path / "perfil.json")
+    assert cargado == perfil
+    assert mas_frecuentes(cargado, "modalidad", 2) == [tuple(p) for p in perfil["columnas"]["modalidad"]["top"][:2]]
+    assert cargar_perfil(tmp_path / "no_existe.json") is None
+    (tmp_path / "otro.json").write_text('{"formato": "mapa-columnar"}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        cargar_perfil(tmp_path / "otro.json")
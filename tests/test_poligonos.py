@@ -0,0 +1,57 @@
+"""
+mapa_seguridad.poligonos: asignación de puntos a polígonos frente a la respuesta
+exacta en figuras simples (cuadrados, un hueco, un MultiPolygon y un solape).
+"""
+import json
+
+import numpy as np
+
+from mapa_seguridad.poligonos import SIN_POLIGONO, asignar_poligonos, cargar_limites, codigos_asignados
+
+
+def cuadrado(x0, y0, lado):
+    return [[x0, y0], [x0 + lado, y0], [x0 + lado, y0 + lado], [x0, y0 + lado], [x0, y0]]
+
+
+def escribir_limites(ruta):
+    # 🧪 Comuna 1: cuadrado [0, 4]² con hueco [1, 2]²; comuna 2: dos cuadrados sueltos
+    # (MultiPolygon, el primer anillo sin cerrar); comuna 3: se solapa con la 1 en [3, 4] × [0, 4]
+    features = [
+        {"properties": {"CODIGO": "01", "NOMBRE": "Popular"},
+         "geometry": {"type": "Polygon", "coordinates": [cuadrado(0, 0, 4), cuadrado(1, 1, 1)]}},
+        {"properties": {"CODIGO": "02", "NOMBRE": "Santa Cruz"},
+         "geometry": {"type": "MultiPolygon", "coordinates": [[cuadrado(10, 0, 2)[:-1]], [[*cuadrado(10, 5, 2)]]]}},
+        {"properties": {"CODIGO": "03", "NOMBRE": "Manrique"},
+         "geometry": {"type": "Polygon", "coordinates": [cuadrado(3, 0, 4)]}},
+        {"properties": {"CODIGO": "99", "NOMBRE": "Sin geometría"}, "geometry": None},
+    ]
+    ruta.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+    return ruta
+
+
+def esperado(x, y):
+    # 🐢 Referencia: la respuesta exacta, figura por figura y en el orden del archivo
+    if 0 < x < 4 and 0 < y < 4 and not (1 < x < 2 and 1 < y < 2):
+        return 0
+    if 10 < x < 12 and (0 < y < 2 or 5 < y < 7):
+        return 1
+    if 3 < x < 7 and 0 < y < 4:
+        return 2
+    return SIN_POLIGONO
+
+
+def test_asignacion_exacta_en_una_malla_de_puntos(tmp_path):
+    limites = cargar_limites(escribir_limites(tmp_path / "comunas.geojson"))
+    assert limites.codigos == ["01", "02", "03"]
+    # Puntos en centros de media unidad: nunca caen justo sobre un lado
+    xs, ys = np.meshgrid(np.arange(-1.25, 13, 0.5), np.arange(-1.25, 8, 0.5))
+    lon, lat = xs.ravel(), ys.ravel()
+    obtenido = asignar_poligonos(lon, lat, limites)
+    np.testing.assert_array_equal(obtenido, [esperado(x, y) for x, y in zip(lon, lat)])
+
+
+def test_puntos_sin_coordenadas_y_codigos(tmp_path):
+    limites = cargar_limites(escribir_limites(tmp_path / "comunas.geojson"))
+    asignacion = asignar_poligonos([0.5, np.nan, 11.0, 50.0], [0.5, 1.0, 6.0, np.nan], limites)
+    assert asignacion.tolist() == [0, SIN_POLIGONO, 1, SIN_POLIGONO]
+    assert codigos_asignados(asignacion, limites).tolist() == ["01", None, "02", None]
@@ -0,0 +1,62 @@
+"""
+mapa_seguridad.serie_mensual.SerieMensual: agregar meses uno a uno frente a
+reconstruir la serie con todos los registros.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.serie_mensual import SerieMensual
+
+
+def registros(n=3000, meses=20, semilla=0):
+    # 🧪 Zonas con meses sin casos; la zona Z9 solo aparece en el último mes
+    rng = np.random.default_rng(semilla)
+    periodos = pd.period_range("2022-01", periods=meses, freq="M")
+    df = pd.DataFrame({
+        "zona": rng.choice([f"Z{i}" for i in range(8)], n),
+        "mes": periodos[rng.integers(0, meses, n)],
+        "cantidad": rng.integers(1, 4, n),
+    })
+    nueva = pd.DataFrame({"zona": ["Z9"], "mes": [periodos[-1]], "cantidad": [5]})
+    return pd.concat([df, nueva], ignore_index=True)
+
+
+def comparar(serie, completa):
+    orden = [serie.posicion[z] for z in completa.zonas]
+    np.testing.assert_array_equal(serie.conteos[orden], completa.conteos)
+    for w in serie.ventanas:
+        np.testing.assert_array_equal(serie.sumas[w][orden], completa.sumas[w])
+    incremental = serie.resumen().set_index("zona").loc[completa.zonas].reset_index()
+    pd.testing.assert_frame_equal(incremental, completa.resumen())
+
+
+def test_agregar_mes_igual_a_reconstruir():
+    df = registros()
+    ultimo_historico = df["mes"].min() + 11
+    serie = SerieMensual.desde_registros(df[df["mes"] <= ultimo_historico], "zona", col_peso="cantidad")
+    for mes in pd.period_range(ultimo_historico + 1, df["mes"].max(), freq="M"):
+        casos = df[df["mes"] == mes].groupby("zona")["cantidad"].sum()
+        serie.agregar_mes(casos, mes)
+        comparar(serie, SerieMensual.desde_registros(df[df["mes"] <= mes], "zona", col_peso="cantidad"))
+    assert "Z9" in serie.posicion
+
+
+def test_meses_saltados_se_rellenan_con_ceros():
+    df = registros()
+    df = df[(df["mes"] < pd.Period("2022-10", "M")) | (df["mes"] > pd.Period("2022-12", "M"))]
+    serie = SerieMensual.desde_registros(df[df["mes"] < pd.Period("2022-10", "M")], "zona", col_peso="cantidad")
+    mes = pd.Period("2023-01", "M")
+    serie.agregar_mes(df[df["mes"] == mes].groupby("zona")["cantidad"].sum(), mes)
+    comparar(serie, SerieMensual.desde_registros(df[df["mes"] <= mes], "zona", col_peso="cantidad"))
+    assert serie.ultimo_mes == mes
+    with pytest.raises(ValueError):
+        serie.agregar_mes({"Z0": 1}, "2022-11")
+
+
+def test_guardar_y_cargar(tmp_path):
+    serie = SerieMensual.desde_registros(registros(), "zona", col_peso="cantidad")
+    serie.guardar(tmp_path / "serie.npz")
+    cargada = SerieMensual.cargar(tmp_path / "serie.npz")
+    assert cargada.zonas == serie.zonas and cargada.primer_mes == serie.primer_mes
+    comparar(cargada, serie)
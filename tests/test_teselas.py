@@ -0,0 +1,73 @@
+"""
+mapa_seguridad.teselas: cuentas de Web Mercator frente a la fórmula de teselas de
+OpenStreetMap y conservación de los puntos en cada zoom de la pirámide.
+"""
+import json
+import math
+
+import numpy as np
+import pytest
+
+from mapa_seguridad.teselas import TAM_TESELA, a_pixeles, construir_piramide, guardar_piramide
+
+
+def tesela_osm(lat, lon, zoom):
+    # 🐢 Referencia: fórmula de la wiki de OpenStreetMap (slippy map tilenames)
+    n = 2 ** zoom
+    lat_rad = math.radians(lat)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return x, y
+
+
+def puntos(n=3000, semilla=0):
+    # 🧪 Puntos en el Valle de Aburrá, con algunas coordenadas vacías
+    rng = np.random.default_rng(semilla)
+    lat = rng.uniform(6.10, 6.40, n)
+    lon = rng.uniform(-75.70, -75.45, n)
+    lat[rng.random(n) < 0.05] = np.nan
+    return lat, lon
+
+
+def test_centro_del_mundo_en_el_zoom_cero():
+    x, y = a_pixeles(np.array([0.0]), np.array([0.0]), 0)
+    assert x[0] == pytest.approx(TAM_TESELA / 2)
+    assert y[0] == pytest.approx(TAM_TESELA / 2)
+
+
+@pytest.mark.parametrize("zoom", [0, 5, 11, 16])
+def test_teselas_coinciden_con_openstreetmap(zoom):
+    lat, lon = puntos(200)
+    validos = ~np.isnan(lat)
+    lat, lon = lat[validos], lon[validos]
+    x, y = a_pixeles(lat, lon, zoom)
+    obtenidas = list(zip((x // TAM_TESELA).astype(int), (y // TAM_TESELA).astype(int)))
+    assert obtenidas == [tesela_osm(a, o, zoom) for a, o in zip(lat, lon)]
+
+
+def test_piramide_conserva_los_puntos_en_cada_zoom():
+    lat, lon = puntos()
+    validos = int((~np.isnan(lat)).sum())
+    piramide = construir_piramide(lat, lon, 10, 15)
+    assert sorted(piramide) == list(range(10, 16))
+    for zoom, teselas in piramide.items():
+        assert sum(sum(t["n"]) for t in teselas.values()) == validos, zoom
+        for (tx, ty), contenido in teselas.items():
+            # El centro de cada celda cae dentro de su tesela
+            x, y = a_pixeles(np.array(contenido["lat"]), np.array(contenido["lon"]), zoom)
+            assert ((x // TAM_TESELA) == tx).all() and ((y // TAM_TESELA) == ty).all()
+
+
+def test_indice_con_rangos_y_etag_estable(tmp_path):
+    lat, lon = puntos()
+    piramide = construir_piramide(lat, lon, 11, 13)
+    indice = json.loads(guardar_piramide(piramide, tmp_path / "a", len(lat)).read_text(encoding="utf-8"))
+    otro = json.loads(guardar_piramide(piramide, tmp_path / "b", len(lat)).read_text(encoding="utf-8"))
+    assert indice["etag"] == otro["etag"]
+    assert (indice["zoom_min"], indice["zoom_max"]) == (11, 13)
+    for zoom, teselas in piramide.items():
+        rango = indice["rangos"][str(zoom)]
+        assert rango["teselas"] == len(teselas)
+        for x, y in teselas:
+            assert rango["x"][0] <= x <= rango["x"][1] and rango["y"][0] <= y <= rango["y"][1]
+            assert (tmp_path / "a" / str(zoom) / str(x) / f"{y}.json").exists()
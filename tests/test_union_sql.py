@@ -0,0 +1,73 @@
+"""
+mapa_seguridad.union_sql.unir_y_clasificar en sqlite frente a las dos uniones de
+pandas del BLOQUE 7 de 05_unir_y_riesgo.py: mismas filas, orden, nombres y tipos.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.riesgo import clasificar_alerta, clasificar_nivel, umbrales
+from mapa_seguridad.union_sql import nombres_union, resolver_motor, unir_y_clasificar
+
+
+def tablas(filas=800, semilla=0):
+    # 🧪 Llaves repetidas, zonas que solo están en la Policía, vacíos y tipos de pandas (Int32, Float64, category)
+    rng = np.random.default_rng(semilla)
+    municipios = filas // 20
+    zonas = np.arange(municipios, municipios + filas // 2, dtype=np.int32)
+    niveles = pd.DataFrame({
+        "zona_id": zonas[rng.integers(0, len(zonas), filas)],
+        "promedio_robos": np.round(rng.gamma(2.0, 3.0, filas), 4),
+        "casos_totales": rng.integers(1, 500, filas),
+        "tipo_delito": pd.Categorical(rng.choice(["Atraco", "Cosquilleo", "Descuido"], filas)),
+        "fuente": "kaggle",
+    })
+    niveles.loc[rng.random(filas) < 0.05, "promedio_robos"] = np.nan
+    policia = pd.DataFrame({
+        "zona_id": np.where(np.arange(municipios) % 2 == 0, zonas[rng.integers(0, len(zonas), municipios)],
+                            np.arange(municipios)).astype(np.int32),
+        "promedio_robos_municipio": pd.array(np.round(rng.gamma(2.0, 10.0, municipios), 3), dtype="Float64"),
+        "casos_municipio": pd.array(rng.integers(1, 10_000, municipios), dtype="Int32"),
+        "fuente": "policia",
+    })
+    n_arr = filas // 4
+    arriendos = pd.DataFrame({
+        "zona_id": zonas[rng.integers(0, len(zonas), n_arr)],
+        "sector": pd.Categorical(rng.choice([f"SECTOR {i}" for i in range(20)], n_arr)),
+        "promedio_arriendo_apartamento": np.round(rng.normal(1.8e6, 4e5, n_arr), 0),
+    })
+    return niveles, policia, arriendos
+
+
+def union_pandas(niveles, policia, arriendos):
+    # 🐼 Referencia: el BLOQUE 7 de 05 con MAPA_MOTOR_UNION=pandas
+    df = niveles.merge(policia, on="zona_id", how="outer").merge(arriendos, on="zona_id", how="left")
+    col_ref = next((c for c in df.columns if "promedio_robos" in c), None)
+    df["indice_riesgo"] = df[col_ref] / df[col_ref].max()
+    cortes = umbrales(df["indice_riesgo"])
+    df["nivel_riesgo"] = clasificar_nivel(df["indice_riesgo"], cortes)
+    df["alerta"] = clasificar_alerta(df["indice_riesgo"], cortes)
+    return df
+
+
+def test_sqlite_identico_a_pandas(tmp_path):
+    niveles, policia, arriendos = tablas()
+    esperado = union_pandas(niveles, policia, arriendos)
+    obtenido = unir_y_clasificar(niveles, policia, arriendos, motor="sqlite", carpeta=tmp_path)
+    assert {"fuente_x", "fuente_y"} <= set(obtenido.columns)
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+def test_nombres_union_con_la_regla_de_sufijos_de_pandas():
+    izq, der = nombres_union(["zona_id", "a", "b"], ["zona_id", "b", "c"])
+    assert izq == {"zona_id": "zona_id", "a": "a", "b": "b_x"}
+    assert der == {"b": "b_y", "c": "c"}
+
+
+def test_motores():
+    assert resolver_motor(None) == "pandas"
+    assert resolver_motor("SQLITE") == "sqlite"
+    with pytest.raises(ValueError):
+        resolver_motor("postgres")
+    with pytest.raises(ValueError):
+        unir_y_clasificar(*tablas(40), motor="pandas")
@@ -0,0 +1,23 @@
+"""
+Reglas de mapa_seguridad.validacion: los ejemplos solo aparecen cuando hay fallas.
+"""
+import pandas as pd
+import pytest
+
+from mapa_seguridad.validacion import unica, validar
+
+
+@pytest.mark.parametrize("tipo", ["object", "category"])
+def test_unica_sin_repetidos_no_trae_ejemplos(tipo):
+    df = pd.DataFrame({"zona_clave": pd.Series(["A|X", "A|Y", "B|Z"], dtype=tipo)})
+    (resultado,) = validar(df, [unica("zona_clave")])["reglas"]
+    assert resultado["ok"]
+    assert resultado["ejemplos"] == []
+
+
+@pytest.mark.parametrize("tipo", ["object", "category"])
+def test_unica_con_repetidos_muestra_los_mas_repetidos(tipo):
+    df = pd.DataFrame({"zona_clave": pd.Series(["A|X", "A|Y", "A|Y", "B|Z", "B|Z", "B|Z"], dtype=tipo)})
+    (resultado,) = validar(df, [unica("zona_clave")])["reglas"]
+    assert resultado["fallas"] == 3
+    assert resultado["ejemplos"] == ["B|Z", "A|Y"]
@@ -0,0 +1,101 @@
+"""
+Paridad de mapa_seguridad.zonas.construir_zona_clave con la llave original
+(construir_llave del BLOQUE 6 de 05, aplicada fila por fila con apply).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mapa_seguridad.zonas import combinaciones_distintas, construir_zona_clave
+
+
+def construir_llave(fila):
+    # 🐢 Implementación original, fila por fila (referencia)
+    dept = str(fila.get("departamento", "")).strip()
+    muni = str(fila.get("municipio", "")).strip()
+    com = str(fila.get("comuna", "")).strip()
+    bar = str(fila.get("barrio", "")).strip()
+    sec = str(fila.get("sector", "")).strip()
+
+    valores = [dept, muni, com, bar, sec]
+    valores = ["" if v.lower() in ["nan", "<na>", "none"] else v for v in valores]
+    dept, muni, com, bar, sec = valores
+
+    if com:
+        return f"{dept}|{muni}|COM_{com}"
+    if bar:
+        return f"{dept}|{muni}|BAR_{bar}"
+    if sec:
+        return f"{dept}|{muni}|SEC_{sec}"
+    if muni:
+        return f"{dept}|{muni}"
+    return "SIN_INFO"
+
+
+def llaves_fila_a_fila(df):
+    return df.apply(construir_llave, axis=1)
+
+
+def muestra_niveles(filas=3000, semilla=0):
+    # 🧪 Varios niveles presentes a la vez, vacíos de todas las formas y números mezclados con texto
+    rng = np.random.default_rng(semilla)
+    opciones = {
+        "departamento": ["ANTIOQUIA", " ANTIOQUIA ", np.nan, "none"],
+        "municipio": ["MEDELLIN", "BELLO", " ENVIGADO", np.nan, "", "NaN"],
+        "comuna": ["14", 14, 14.0, "14.0", 1, 1.0, True, np.nan, "<NA>", "", "SIN DATO"],
+        "barrio": ["LAURELES", "EL POBLADO", 7, 7.0, np.nan, "None", " "],
+        "sector": ["EL POBLADO", "CENTRO", np.nan, "nan"],
+    }
+    return pd.DataFrame({c: pd.Series(rng.choice(np.array(v, dtype=object), filas), dtype=object)
+                         for c, v in opciones.items()})
+
+
+def verificar(df):
+    esperado = llaves_fila_a_fila(df)
+    obtenido = construir_zona_clave(df)
+    diferentes = df.assign(esperado=esperado, obtenido=obtenido)[esperado != obtenido]
+    assert diferentes.empty, f"{len(diferentes)} llaves distintas:\n{diferentes.head()}"
+    return obtenido
+
+
+def test_paridad_con_varios_niveles():
+    obtenido = verificar(muestra_niveles())
+    # La muestra recorre todas las ramas de la llave
+    for prefijo in ("|COM_", "|BAR_", "|SEC_"):
+        assert obtenido.str.contains(prefijo, regex=False).any()
+    assert (obtenido == "SIN_INFO").any()
+    assert obtenido.nunique() > 50
+
+
+def test_numeros_y_texto_que_se_escriben_distinto():
+    # 1 y 1.0 (y True) son iguales para pd.factorize pero no para str()
+    df = pd.DataFrame({
+        "departamento": ["ANTIOQUIA"] * 6,
+        "municipio": ["MEDELLIN"] * 6,
+        "comuna": pd.Series([1, 1.0, True, "1", 14.0, "14"], dtype=object),
+    })
+    obtenido = verificar(df)
+    assert obtenido.tolist() == [
+        "ANTIOQUIA|MEDELLIN|COM_1", "ANTIOQUIA|MEDELLIN|COM_1.0", "ANTIOQUIA|MEDELLIN|COM_True",
+        "ANTIOQUIA|MEDELLIN|COM_1", "ANTIOQUIA|MEDELLIN|COM_14.0", "ANTIOQUIA|MEDELLIN|COM_14",
+    ]
+
+
+@pytest.mark.parametrize("tipo", ["category", "Int64", "float64"])
+def test_paridad_con_columnas_tipadas(tipo):
+    df = muestra_niveles(filas=500, semilla=1)
+    df["comuna"] = pd.Series(np.resize([1, 2, None, 14], len(df)), dtype=object).astype(tipo)
+    verificar(df)
+
+
+def test_columnas_ausentes_y_tabla_vacia():
+    verificar(muestra_niveles(filas=200)[["municipio", "sector"]])
+    vacia = muestra_niveles(filas=0)
+    assert construir_zona_clave(vacia).empty
+
+
+def test_combinaciones_distintas_compara_como_texto():
+    df = pd.DataFrame({"a": pd.Series([1, 1.0, "1", 1, np.nan], dtype=object), "b": ["x", "x", "x", "x", "x"]})
+    codigos, representantes = combinaciones_distintas(df, ["a", "b"])
+    assert codigos.tolist() == [0, 1, 0, 0, 2]
+    assert representantes.tolist() == [0, 1, 4]
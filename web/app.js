@@ -3,7 +3,8 @@
 // ==============================
 
 // Inicializar mapa
-const map = L.map('map').setView([6.25, -75.57], 11);
+// preferCanvas: todos los círculos se dibujan en un solo <canvas> en vez de un nodo SVG por punto
+const map = L.map('map', { preferCanvas: true }).setView([6.25, -75.57], 11);
 
 L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
   maxZoom: 18,
@@ -11,51 +12,301 @@ L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
 }).addTo(map);
 
 // ==============================
-// 🧾 Cargar datos
+// 📦 Decodificar el formato columnar (ver scripts/mapa_seguridad/paquete_web.py)
 // ==============================
-fetch("data_final.json")
-  .then(response => response.json())
-  .then(data => {
-    console.log("✅ Datos cargados:", data.length);
+function base64ABytes(texto) {
+  const binario = atob(texto || "");
+  const bytes = new Uint8Array(binario.length);
+  for (let i = 0; i < binario.length; i++) bytes[i] = binario.charCodeAt(i);
+  return bytes;
+}
 
-    data.forEach(d => {
-      if (!d.latitud && !d.longitud) {
-        // Si no hay coordenadas, puedes usar un centro predefinido por comuna
-        return;
+const TIPOS_ARREGLO = { i32: Int32Array, f64: Float64Array, u8: Uint8Array, u16: Uint16Array, u32: Uint32Array };
+
+function decodificarColumnar(paquete) {
+  const n = paquete.filas;
+  const filas = Array.from({ length: n }, () => ({}));
+
+  paquete.columnas.forEach(col => {
+    const Tipo = TIPOS_ARREGLO[col.tipo === "dic" ? col.ancho : col.tipo];
+    const bytes = base64ABytes(col.datos);
+    const datos = new Tipo(bytes.buffer, 0, bytes.length / Tipo.BYTES_PER_ELEMENT);
+    const validos = col.validos ? base64ABytes(col.validos) : null;
+
+    let j = 0;
+    for (let i = 0; i < n; i++) {
+      // Los vacíos no vienen en los datos: el mapa de bits dice qué filas tienen valor
+      if (validos && !((validos[i >> 3] >> (i & 7)) & 1)) {
+        filas[i][col.nombre] = null;
+        continue;
+      }
+      filas[i][col.nombre] = col.tipo === "dic" ? col.diccionario[datos[j++]] : datos[j++];
+    }
+  });
+  return filas;
+}
+
+// Acepta el formato columnar y el formato anterior (lista de registros)
+function aRegistros(json) {
+  if (Array.isArray(json)) return json;
+  if (json.formato === "mapa-columnar") {
+    console.log(`📦 Formato columnar v${json.version} (etag ${json.etag})`);
+    return decodificarColumnar(json);
+  }
+  throw new Error(`Formato de datos desconocido: ${json.formato}`);
+}
+
+// Primero la variante .gz (menos bytes por la red); si el navegador no sabe
+// descomprimirla o el servidor no la tiene, se usa el JSON normal
+async function cargarJSON(archivo) {
+  if ("DecompressionStream" in window) {
+    try {
+      const respuesta = await fetch(`${archivo}.gz`);
+      if (respuesta.ok) {
+        const flujo = respuesta.body.pipeThrough(new DecompressionStream("gzip"));
+        return JSON.parse(await new Response(flujo).text());
+      }
+    } catch (error) {
+      console.warn(`⚠️ No se pudo usar ${archivo}.gz, se carga ${archivo}`, error);
+    }
+  }
+  const respuesta = await fetch(archivo);
+  if (!respuesta.ok) throw new Error(`${archivo}: HTTP ${respuesta.status}`);
+  return respuesta.json();
+}
+
+async function cargarDatos(archivo) {
+  return aRegistros(await cargarJSON(archivo));
+}
+
+// ==============================
+// 🧱 Robos por teselas (solo las que se ven)
+// ==============================
+// scripts/07_generar_teselas.py agrupa los robos en teselas z/x/y por zoom.
+// Solo se descargan las teselas que caen en la vista actual, así que la carga
+// inicial no depende de cuántos robos haya en total.
+const COLORES_NIVEL = ["#1a9850", "#91cf60", "#fee08b", "#fc8d59", "#d73027"];
+const NOMBRES_NIVEL = ["💎 Diamante", "🥇 Oro", "🥈 Plata", "🥉 Bronce", "🧱 Cobre"];
+const indiceNivel = nombre => Math.max(NOMBRES_NIVEL.indexOf(nombre), 0);
+const capaTeselas = L.layerGroup().addTo(map);
+const teselasCargadas = new Map();  // "z/x/y" → capa con sus círculos (null mientras se descarga)
+let teselasVisibles = new Set();
+let indiceTeselas = null;
+
+function teselaDe(lat, lon, z) {
+  const n = 2 ** z;
+  const latRad = lat * Math.PI / 180;
+  return {
+    x: Math.floor((lon + 180) / 360 * n),
+    y: Math.floor((1 - Math.log(Math.tan(latRad) + 1 / Math.cos(latRad)) / Math.PI) / 2 * n)
+  };
+}
+
+function dibujarTesela(tesela) {
+  const capa = L.layerGroup();
+  tesela.n.forEach((n, i) => {
+    const nivel = tesela.nivel[i];
+    L.circleMarker([tesela.lat[i], tesela.lon[i]], {
+      radius: Math.min(4 + 2 * Math.log2(1 + n), 20),
+      color: COLORES_NIVEL[nivel],
+      weight: 1,
+      fillOpacity: 0.6
+    })
+      .bindTooltip(`${n.toLocaleString()} robos — ${indiceTeselas.niveles[nivel]} (${indiceTeselas.alertas[nivel]})`)
+      .addTo(capa);
+  });
+  return capa;
+}
+
+function cargarTesela(clave) {
+  teselasCargadas.set(clave, null);
+  // El etag en la URL invalida la caché del navegador solo cuando cambian las teselas
+  fetch(`teselas/${clave}.json?v=${indiceTeselas.etag}`)
+    .then(respuesta => (respuesta.ok ? respuesta.json() : null))  // 404 = tesela vacía
+    .then(tesela => {
+      const capa = tesela ? dibujarTesela(tesela) : L.layerGroup();
+      teselasCargadas.set(clave, capa);
+      if (teselasVisibles.has(clave)) capaTeselas.addLayer(capa);
+    })
+    .catch(() => teselasCargadas.delete(clave));
+}
+
+function actualizarTeselas() {
+  if (!indiceTeselas) return;
+  const z = Math.max(indiceTeselas.zoom_min, Math.min(indiceTeselas.zoom_max, map.getZoom()));
+  const rango = indiceTeselas.rangos[z];
+  const visibles = new Set();
+
+  if (rango) {
+    const limites = map.getBounds();
+    const noroeste = teselaDe(limites.getNorth(), limites.getWest(), z);
+    const sureste = teselaDe(limites.getSouth(), limites.getEast(), z);
+    for (let x = Math.max(noroeste.x, rango.x[0]); x <= Math.min(sureste.x, rango.x[1]); x++) {
+      for (let y = Math.max(noroeste.y, rango.y[0]); y <= Math.min(sureste.y, rango.y[1]); y++) {
+        visibles.add(`${z}/${x}/${y}`);
       }
+    }
+  }
+
+  // Quitar las que salieron de la vista y mostrar (o descargar) las que entraron
+  teselasVisibles.forEach(clave => {
+    const capa = teselasCargadas.get(clave);
+    if (!visibles.has(clave) && capa) capaTeselas.removeLayer(capa);
+  });
+  visibles.forEach(clave => {
+    if (!teselasCargadas.has(clave)) cargarTesela(clave);
+    else if (teselasCargadas.get(clave)) capaTeselas.addLayer(teselasCargadas.get(clave));
+  });
+  teselasVisibles = visibles;
+}
+
+fetch("teselas/indice.json")
+  .then(respuesta => (respuesta.ok ? respuesta.json() : null))
+  .then(indice => {
+    if (!indice || !indice.puntos) return;
+    indiceTeselas = indice;
+    console.log(`🧱 Teselas: ${indice.puntos.toLocaleString()} robos, zooms ${indice.zoom_min}–${indice.zoom_max}`);
+    map.on("moveend", actualizarTeselas);
+    actualizarTeselas();
+  })
+  .catch(error => console.warn("⚠️ Sin teselas de robos:", error));
+
+// ==============================
+// 🔥 Zonas calientes (densidad de robos, scripts/08_calcular_hotspots.py)
+// ==============================
+// Celdas de 100 m con la intensidad suavizada (robos por km²), en una capa que
+// se activa desde el control de capas.
+const capaHotspots = L.layerGroup();
+L.control.layers(null, { "🔥 Zonas calientes": capaHotspots, "🧱 Robos": capaTeselas }).addTo(map);
+
+cargarDatos("hotspots.json")
+  .then(celdas => {
+    celdas.forEach(c => {
+      L.circleMarker([c.latitud, c.longitud], {
+        radius: 6,
+        stroke: false,
+        color: COLORES_NIVEL[indiceNivel(c.nivel_riesgo)],
+        fillOpacity: 0.45
+      })
+        .bindTooltip(`🔥 ${c.intensidad.toLocaleString()} robos/km² — ${c.nivel_riesgo} (${c.alerta})`)
+        .addTo(capaHotspots);
+    });
+    console.log(`🔥 Zonas calientes: ${celdas.length} celdas`);
+  })
+  .catch(error => console.warn("⚠️ Sin zonas calientes:", error));
+
+// ==============================
+// 📊 Panel lateral: cubo de estadísticas (scripts/mapa_seguridad/cubo.py)
+// ==============================
+// 05 precalcula una celda por cada combinación de filtros (nivel × alerta ×
+// municipio × delito, cada uno con "todos"), así que cambiar un filtro es buscar
+// una llave en un Map, sin recorrer los registros.
+const FILTROS = { nivel_riesgo: "filterRiesgo", alerta: "filterAlerta", municipio: "filterMunicipio", delito: "filterDelito" };
+const COLORES_ALERTA = { "🚨 Alerta Roja": "#d73027", "🟠 Alerta Media": "#fc8d59", "🟢 Segura": "#1a9850" };
+let cubo = null;
+let graficaAlertas = null;
+
+function prepararCubo(json) {
+  const celdas = decodificarColumnar(json.celdas);
+  const dimensiones = json.dimensiones.map(d => ({
+    ...d,
+    codigo: new Map(d.valores.map((valor, i) => [valor, i + 1]))  // 0 = "todos"
+  }));
+  return { dimensiones, celdas, posicion: new Map(celdas.map((c, i) => [c.celda, i])) };
+}
+
+function buscarCelda(seleccion) {
+  let llave = 0;
+  for (const dim of cubo.dimensiones) {
+    const valor = seleccion[dim.nombre];
+    const codigo = valor ? dim.codigo.get(valor) : 0;
+    if (codigo === undefined) return null;
+    llave = llave * (dim.valores.length + 1) + codigo;
+  }
+  const i = cubo.posicion.get(llave);
+  return i === undefined ? null : cubo.celdas[i];
+}
 
-      // Definir color por alerta
-      const color = 
-        d.alerta === "🚨 Alerta Roja" ? "#d73027" :
-        d.alerta === "🟠 Alerta Media" ? "#fc8d59" :
-        "#1a9850";
-
-      const circle = L.circleMarker([d.latitud, d.longitud], {
-        radius: 10,
-        color: color,
-        weight: 2,
-        fillOpacity: 0.8
-      }).addTo(map);
-
-      // ==============================
-      // 💬 Popup detallado
-      // ==============================
-      const popup = `
-        <b>${d.sector_norm || "SIN SECTOR"} (${d.municipio_norm || "SIN MUNICIPIO"})</b><br>
-        ${d.alerta || ""} — Nivel: ${d.nivel_riesgo || ""}<br><br>
-
-        📊 <b>Promedio de casos mensuales:</b> ${d.promedio_mes ? d.promedio_mes.toFixed(1) : "N/A"}<br>
-        🚨 <b>Delito más común:</b> ${d.tipo_delito || "Sin datos"}<br>
-        <hr>
-        💰 <b>Arriendos promedio:</b><br>
-        🏢 Apartamento: $${d.promedio_arriendo_apartamento ? d.promedio_arriendo_apartamento.toLocaleString() : "N/A"}<br>
-        🏠 Casa: $${d.promedio_arriendo_casa ? d.promedio_arriendo_casa.toLocaleString() : "N/A"}<br>
-        🏪 Local: $${d.promedio_arriendo_local ? d.promedio_arriendo_local.toLocaleString() : "N/A"}<br>
-      `;
-      circle.bindPopup(popup);
+function llenarFiltro(id, valores) {
+  const select = document.getElementById(id);
+  valores.forEach(valor => {
+    if ([...select.options].some(o => o.value === valor)) return;
+    select.add(new Option(valor, valor));
+  });
+}
+
+function actualizarPanel() {
+  const seleccion = {};
+  Object.entries(FILTROS).forEach(([nombre, id]) => (seleccion[nombre] = document.getElementById(id).value));
+  const celda = buscarCelda(seleccion);
+  const municipios = cubo.dimensiones.find(d => d.nombre === "municipio").valores;
+
+  document.getElementById("statSectores").textContent = celda ? celda.zonas.toLocaleString() : "0";
+  document.getElementById("statCasos").textContent =
+    celda && celda.n_promedio ? (celda.suma_promedio / celda.n_promedio).toFixed(1) : "N/A";
+  document.getElementById("statMunicipio").textContent =
+    celda && celda.municipio_top !== null ? municipios[celda.municipio_top] : "N/A";
+  document.getElementById("statArriendo").textContent =
+    celda && celda.n_arriendo ? `$${Math.round(celda.suma_arriendo / celda.n_arriendo).toLocaleString()}` : "N/A";
+
+  // Gráfica: zonas por alerta con los demás filtros (una búsqueda por alerta)
+  if (typeof Chart === "undefined") return;
+  const alertas = cubo.dimensiones.find(d => d.nombre === "alerta").valores;
+  const zonas = alertas.map(alerta => (buscarCelda({ ...seleccion, alerta }) || { zonas: 0 }).zonas);
+  if (!graficaAlertas) {
+    graficaAlertas = new Chart(document.getElementById("alertChart"), {
+      type: "doughnut",
+      data: { labels: alertas, datasets: [{ data: zonas, backgroundColor: alertas.map(a => COLORES_ALERTA[a] || "#999") }] },
+      options: { plugins: { legend: { position: "bottom" } } }
     });
+  } else {
+    graficaAlertas.data.datasets[0].data = zonas;
+    graficaAlertas.update();
+  }
+}
+
+cargarJSON("estadisticas.json")
+  .then(json => {
+    cubo = prepararCubo(json);
+    cubo.dimensiones.forEach(dim => llenarFiltro(FILTROS[dim.nombre], dim.valores));
+    Object.values(FILTROS).forEach(id => document.getElementById(id).addEventListener("change", actualizarPanel));
+    console.log(`📊 Cubo de estadísticas: ${cubo.celdas.length} celdas`);
+    actualizarPanel();
   })
-  .catch(error => console.error("❌ Error cargando data_final.json:", error));
+  .catch(error => console.warn("⚠️ Sin cubo de estadísticas:", error));
+
+// ==============================
+// 🧮 Tendencias de robos: perfil de columnas (scripts/mapa_seguridad/perfil.py)
+// ==============================
+// 03 guarda los valores más frecuentes y los casos por año: el panel los muestra
+// sin descargar los registros de robos.
+const PERFIL_COLUMNAS = {
+  "📦 Modalidad": "seguridad.modalidad",
+  "💰 Bien": "seguridad.bien",
+  "🧍 Sexo": "seguridad.sexo",
+  "🚗 Transporte": "seguridad.medio_transporte",
+  "🏘️ Barrio": "seguridad.nombre_barrio"
+};
+
+function mostrarPerfil(perfil) {
+  const lista = document.getElementById("perfilList");
+  if (!lista) return;
+  const items = [];
+  const anios = (perfil.histogramas.anio || { valores: [] }).valores;
+  const rango = anios.length ? ` (${anios[0]}–${anios[anios.length - 1]})` : "";
+  items.push(`<li><strong>📋 Robos registrados:</strong> ${perfil.filas.toLocaleString()}${rango}</li>`);
+  Object.entries(PERFIL_COLUMNAS).forEach(([etiqueta, columna]) => {
+    const top = (perfil.columnas[columna] || { top: [] }).top;
+    if (!top.length) return;
+    const [valor, casos] = top[0];
+    items.push(`<li><strong>${etiqueta}:</strong> ${valor} (${(100 * casos / perfil.filas).toFixed(0)}%)</li>`);
+  });
+  lista.innerHTML = items.join("");
+}
+
+cargarJSON("perfil_robos.json")
+  .then(mostrarPerfil)
+  .catch(error => console.warn("⚠️ Sin perfil de robos:", error));
 
 // ==============================
 // 🧭 Leyenda de interpretación